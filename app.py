@@ -1,14 +1,29 @@
 import streamlit as st
 import os
 import json
+import uuid
+import importlib.machinery
 import yaml
-from yaml.loader import SafeLoader
 import streamlit_authenticator as stauth
 from datetime import datetime
 from dotenv import load_dotenv
-from scripts.streamlit_pipeline import StreamlitCVGenerator
 from scripts.generate_angebot import generate_angebot_json
 from scripts.generate_angebot_word import generate_angebot_word
+from scripts.utils_optimize_logo import optimized_logo
+from scripts.candidate_index import CandidateIndex, default_index_path
+from scripts.skill_taxonomy import get_skill_index
+from scripts.run_store import get_run_store
+from scripts.render_service import get_render_service, render_cv_pdf
+from scripts.speculative_extraction import get_speculative_extractor
+from scripts.job_queue import ACTIVE_STATES, JobLimitError, get_job_queue, get_worker_pool, submit_pipeline_job
+from scripts.app_cache import (
+    cache_stats, clear_caches, cv_preview_html, get_schemas, get_style_profile,
+    get_template_cache, load_config, read_artifact, read_dashboard, reset_cache_stats, tracked,
+)
+
+# Streamlit führt app.py als __main__ (ohne __spec__) aus; spawn-Kinder des Render-Service
+# würden die ganze App erneut ausführen. Mit __spec__.name == "__main__" überspringen sie das.
+__spec__ = importlib.machinery.ModuleSpec("__main__", None)
 
 # --- Helper Functions ---
 @st.dialog("KI-Modell Übersicht", width="large")
@@ -143,8 +158,7 @@ st.markdown("""
 load_dotenv()
 
 # --- Authentication ---
-with open('config.yaml') as file:
-    config = yaml.load(file, Loader=SafeLoader)
+config = load_config('config.yaml')
 
 authenticator = stauth.Authenticate(
     config['credentials'],
@@ -170,6 +184,10 @@ with col2:
 name = st.session_state["name"]
 username = st.session_state["username"]
 
+# Geteilte Ressourcen einmal pro Prozess laden (siehe scripts/app_cache.py)
+get_schemas()
+get_template_cache()
+
 # --- Sidebar ---
 with st.sidebar:
     # Logo (Top Left)
@@ -180,27 +198,62 @@ with st.sidebar:
     st.divider()
 
 # --- History Management ---
-HISTORY_FILE = os.path.join("output", "run_history.json")
+# Verlauf in output/run_history.sqlite3 (ein altes run_history.json wird einmalig übernommen)
+run_store = get_run_store(os.getcwd())
+
+HISTORY_PAGE_SIZE = 10
+
+# Prozessweit gecacht (für alle Sessions), invalidiert bei jedem neuen Lauf;
+# ttl fängt Einträge ab, die ausserhalb der App geschrieben werden
+@tracked(st.cache_data, "data", ttl=60)
+def load_history(page=0, page_size=HISTORY_PAGE_SIZE):
+    return run_store.list_runs(limit=page_size, offset=page * page_size)
+
+@tracked(st.cache_data, "data", ttl=60)
+def count_history():
+    return run_store.count_runs()
+
+def invalidate_history():
+    load_history.clear()
+    count_history.clear()
+
+# --- Pipeline Jobs ---
+# Läufe gehen an die Hintergrund-Warteschlange (scripts/job_queue.py), der Dialog fragt nur den Stand ab
+job_queue = get_job_queue(os.getcwd())
+
+# Nach dem Neuladen: laufenden oder noch nicht abgeholten Auftrag des Nutzers wieder anzeigen
+if "active_job_id" not in st.session_state:
+    open_jobs = job_queue.list_jobs(username, unacknowledged=True, limit=1)
+    st.session_state.active_job_id = open_jobs[0]["id"] if open_jobs else None
+    if open_jobs:
+        st.session_state.show_pipeline_dialog = True
+        st.session_state.show_results_view = False
 
-def load_history():
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-def save_to_history(entry):
-    history = load_history()
-    # Add new entry at the beginning
-    history.insert(0, entry)
-    # Keep only last 50 entries
-    history = history[:50]
-    
-    os.makedirs("output", exist_ok=True)
-    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(history, f, ensure_ascii=False, indent=2)
+def format_history_time(timestamp):
+    # YYYYMMDD_HHMMSS -> DD.MM. HH:MM
+    try:
+        return datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%d.%m. %H:%M")
+    except (TypeError, ValueError):
+        return timestamp
+
+def render_score_bar(score):
+    try:
+        score_val = float(score)
+    except (TypeError, ValueError):
+        return
+    # Thresholds matching visualize_results.py
+    if score_val >= 80:
+        bar_color = "#27ae60" # Green
+    elif score_val >= 60:
+        bar_color = "#f39c12" # Orange
+    else:
+        bar_color = "#c0392b" # Red
+    st.markdown(f"""
+        <div style="margin-bottom: 5px; font-size: 0.8em; color: #666;">Match Score: {score}%</div>
+        <div style="background-color: #eee; border-radius: 4px; height: 8px; width: 100%; margin-bottom: 15px;">
+            <div style="background-color: {bar_color}; width: {score_val}%; height: 100%; border-radius: 4px;"></div>
+        </div>
+    """, unsafe_allow_html=True)
 
 def get_api_key():
     """
@@ -231,6 +284,8 @@ def get_api_key():
 
 # --- Sidebar Settings ---
 with st.sidebar:
+    views = ["📄 CV Generator", "🔎 Kandidatensuche"] + (["🛠️ Admin"] if username == 'admin' else [])
+    page = st.radio("Ansicht", views, horizontal=True, label_visibility="collapsed")
     st.title("⚙️ Einstellungen")
     
     # --- Settings Menu ---
@@ -262,6 +317,11 @@ with st.sidebar:
             logo_path = os.path.join("input", "logos", "custom_logo.png")
             with open(logo_path, "wb") as f:
                 f.write(uploaded_logo.getbuffer())
+            # Optimierte Header-Variante einmalig erzeugen; alle Generatoren betten danach diese ein
+            try:
+                optimized_logo(logo_path, get_style_profile()["header"].get("logo_width_cm", 4.0))
+            except Exception as e:
+                st.warning(f"Logo konnte nicht optimiert werden: {e}")
             
             # Store path in session state
             st.session_state.custom_logo_path = logo_path
@@ -411,52 +471,48 @@ with st.sidebar:
     
     # --- History Section ---
     with st.expander("📜 Verlauf", expanded=False):
-        history = load_history()
-        
-        if not history:
+        total = count_history()
+
+        if not total:
             st.caption("Noch keine Läufe gespeichert.")
         else:
-            for item in history:
-                timestamp = item.get("timestamp", "")
-                # Format timestamp nicely if possible (YYYYMMDD_HHMMSS -> DD.MM.YYYY HH:MM)
-                try:
-                    dt = datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
-                    display_time = dt.strftime("%d.%m. %H:%M")
-                except:
-                    display_time = timestamp
+            # Nur eine Seite laden; Details nur für den geöffneten Eintrag rendern
+            pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+            history_page = min(st.session_state.get("history_page", 0), pages - 1)
+            open_id = st.session_state.get("history_open_id")
+
+            for item in load_history(history_page):
+                is_open = item["id"] == open_id
+                label = f"{'▾' if is_open else '▸'} {format_history_time(item.get('timestamp', ''))} - {item.get('candidate_name') or 'Unbekannt'}"
+                if st.button(label, key=f"hist_toggle_{item['id']}", type="tertiary"):
+                    st.session_state.history_open_id = None if is_open else item["id"]
+                    st.rerun()
 
-                name = item.get("candidate_name", "Unbekannt")
-                
-                with st.expander(f"{display_time} - {name}", expanded=False):
-                    st.caption(f"Modus: {item.get('mode')}")
-                    
-                    # 1. Visual Score Bar
-                    score = item.get("match_score")
-                    if score:
-                        try:
-                            score_val = float(score)
-                            # Thresholds matching visualize_results.py
-                            if score_val >= 80:
-                                bar_color = "#27ae60" # Green
-                            elif score_val >= 60:
-                                bar_color = "#f39c12" # Orange
-                            else:
-                                bar_color = "#c0392b" # Red
-                                
-                            st.markdown(f"""
-                                <div style="margin-bottom: 5px; font-size: 0.8em; color: #666;">Match Score: {score}%</div>
-                                <div style="background-color: #eee; border-radius: 4px; height: 8px; width: 100%; margin-bottom: 15px;">
-                                    <div style="background-color: {bar_color}; width: {score_val}%; height: 100%; border-radius: 4px;"></div>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        except:
-                            pass
-
-                    # 2. Action Buttons
-                    if st.button("🔎 Details anzeigen", key=f"hist_btn_{timestamp}", use_container_width=True):
-                        st.session_state.generation_results = item
-                        st.session_state.show_pipeline_dialog = True
-                        st.session_state.show_results_view = True
+                if is_open:
+                    with st.container(border=True):
+                        st.caption(f"Modus: {item.get('mode')}")
+                        # 1. Visual Score Bar
+                        if item.get("match_score"):
+                            render_score_bar(item["match_score"])
+
+                        # 2. Action Buttons
+                        if st.button("🔎 Details anzeigen", key=f"hist_btn_{item['id']}", use_container_width=True):
+                            st.session_state.generation_results = item
+                            st.session_state.show_pipeline_dialog = True
+                            st.session_state.show_results_view = True
+                            st.rerun()
+
+            if pages > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if st.button("◀", key="hist_prev", disabled=history_page == 0):
+                        st.session_state.history_page = history_page - 1
+                        st.rerun()
+                with col_page:
+                    st.caption(f"Seite {history_page + 1}/{pages} · {total} Läufe")
+                with col_next:
+                    if st.button("▶", key="hist_next", disabled=history_page >= pages - 1):
+                        st.session_state.history_page = history_page + 1
                         st.rerun()
     
     # Spacer to push content to bottom
@@ -468,6 +524,101 @@ with st.sidebar:
     st.write(f'Welcome *{name}*')
     authenticator.logout('Logout', 'sidebar')
 
+# --- Kandidatensuche ---
+def render_candidate_search():
+    st.title("🔎 Kandidatensuche")
+    st.markdown("Durchsuchen Sie alle bisher generierten Lebensläufe.")
+
+    index = CandidateIndex(default_index_path(os.getcwd()))
+    # Einmal pro Session mit output/ abgleichen (neue Läufe trägt die Pipeline selbst ein)
+    if not st.session_state.get("candidate_index_synced"):
+        with st.spinner("Index wird aktualisiert..."):
+            index.sync("output")
+        st.session_state.candidate_index_synced = True
+
+    col_text, col_skills = st.columns(2)
+    with col_text:
+        text = st.text_input("Freitext", placeholder="z.B. Migros Testmanager")
+    with col_skills:
+        skills = st.multiselect("Skills (alle erforderlich)", [skill.name for skill in get_skill_index().skills],
+                                accept_new_options=True)
+
+    col_lang, col_cert, col_since = st.columns(3)
+    with col_lang:
+        selected_languages = st.multiselect("Sprachen", [l.title() for l in index.languages()])
+    with col_cert:
+        certification = st.text_input("Zertifizierung", placeholder="z.B. PMP, Scrum.org")
+    with col_since:
+        current_year = datetime.now().year
+        since = st.selectbox("Projekt aktiv seit", ["Beliebig"] + list(range(current_year, current_year - 11, -1)))
+
+    languages = {}
+    if selected_languages:
+        level_cols = st.columns(len(selected_languages))
+        for col, sprache in zip(level_cols, selected_languages):
+            with col:
+                languages[sprache] = st.slider(f"{sprache}: Level ab", 1, 5, 3, key=f"search_level_{sprache}")
+
+    results = index.search(
+        text=text, skills=skills, languages=languages, certification=certification,
+        active_since=None if since == "Beliebig" else since, limit=200
+    )
+    stats = index.stats()
+    st.caption(f"{len(results)} Treffer · {stats['candidates']} CVs im Index")
+
+    if results:
+        st.dataframe(
+            [
+                {
+                    "Name": f"{row['vorname'] or ''} {row['nachname'] or ''}".strip() or "Unbekannt",
+                    "Rolle": row["hauptrolle"] or "",
+                    "Match-Score": row["match_score"],
+                    "Skills": ", ".join(row["skills"]),
+                    "Datei": os.path.relpath(row["cv_path"]),
+                }
+                for row in results
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("Keine Kandidaten gefunden.")
+
+
+# --- Admin: Cache-Statistik ---
+def render_cache_admin():
+    st.title("🛠️ Admin")
+    st.subheader("Caches")
+    st.caption("Aufrufe und Treffer seit Start des Servers (alle Sessions).")
+
+    rows = cache_stats()
+    total_calls = sum(row["Aufrufe"] for row in rows)
+    total_hits = sum(row["Treffer"] for row in rows)
+    col_calls, col_hits, col_rate = st.columns(3)
+    col_calls.metric("Aufrufe", total_calls)
+    col_hits.metric("Treffer", total_hits)
+    col_rate.metric("Trefferquote", f"{100 * total_hits / total_calls:.1f}%" if total_calls else "–")
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    col_reset, col_clear = st.columns(2)
+    with col_reset:
+        if st.button("Statistik zurücksetzen", use_container_width=True):
+            reset_cache_stats()
+            st.rerun()
+    with col_clear:
+        if st.button("Alle Caches leeren", use_container_width=True):
+            clear_caches()
+            invalidate_history()
+            st.rerun()
+
+
+if page == "🔎 Kandidatensuche":
+    render_candidate_search()
+    st.stop()
+if page == "🛠️ Admin":
+    render_cache_admin()
+    st.stop()
+
 # --- Main Content ---
 st.title("📄 CV Generator")
 st.markdown("Generieren Sie maßgeschneiderte Lebensläufe basierend auf PDF-Inputs.")
@@ -530,13 +681,32 @@ st.divider()
 is_mock = os.environ.get("MODEL_NAME") == "mock"
 
 # Helper function for custom upload UI
-def render_custom_uploader(label, key_prefix, file_type=["pdf"]):
+JOB_PROFILE_SCHEMA = "scripts/pdf_to_json_struktur_stellenprofil.json"
+
+def speculation_owner(key_prefix):
+    # Ein Besitzer pro Session und Uploader (siehe scripts/speculative_extraction.py)
+    if "speculation_session" not in st.session_state:
+        st.session_state.speculation_session = uuid.uuid4().hex
+    return f"{st.session_state.speculation_session}:{key_prefix}"
+
+def start_speculative_extraction(key_prefix, uploaded_file, schema_path=None, allow_llm=False, api_key=None):
+    extractor = get_speculative_extractor()
+    if extractor and uploaded_file is not None and not isinstance(uploaded_file, str):
+        extractor.prefetch(speculation_owner(key_prefix), uploaded_file, schema_path, allow_llm=allow_llm, api_key=api_key)
+
+def cancel_speculative_extraction(key_prefix):
+    extractor = get_speculative_extractor()
+    if extractor:
+        extractor.release(speculation_owner(key_prefix))
+
+def render_custom_uploader(label, key_prefix, file_type=["pdf"], schema_path=None):
     # Check for delete action via query param (triggered by HTML link)
     delete_key = f"delete_{key_prefix}"
     # Handle query params safely (Streamlit >= 1.30)
     try:
         if delete_key in st.query_params:
             st.session_state[f"{key_prefix}_file"] = None
+            cancel_speculative_extraction(key_prefix)
             st.query_params.clear()
             st.rerun()
     except:
@@ -587,6 +757,8 @@ def render_custom_uploader(label, key_prefix, file_type=["pdf"]):
         
         if new_file:
             st.session_state[file_state_key] = new_file
+            # Textextraktion sofort im Hintergrund starten (LLM erst nach Zustimmung, s.u.)
+            start_speculative_extraction(key_prefix, new_file, schema_path)
             # Reset pipeline state on new upload
             st.session_state.show_pipeline_dialog = False
             st.session_state.show_results_view = False
@@ -627,7 +799,7 @@ else:
             st.caption("Es wird ein beispielhaftes Stellenprofil verwendet.")
             job_file = None
         else:
-            job_file = render_custom_uploader("📋 2. Stellenprofil", "job_full")
+            job_file = render_custom_uploader("📋 2. Stellenprofil", "job_full", schema_path=JOB_PROFILE_SCHEMA)
 
 st.divider()
 
@@ -649,9 +821,98 @@ if is_mock:
     if not api_key: api_key = "mock-key"
 else:
     start_disabled = not cv_file or not api_key or not dsgvo_accepted
+    # Nach der Zustimmung darf die Extraktion an OpenAI gehen: schon jetzt starten,
+    # die Pipeline übernimmt das fertige oder laufende Ergebnis
+    if dsgvo_accepted and api_key:
+        # Key pro Aufruf übergeben, nicht prozessweit in os.environ (andere Sessions)
+        start_speculative_extraction("cv_basic" if mode.startswith("Basic") else "cv_full", cv_file,
+                                     allow_llm=True, api_key=api_key)
+        start_speculative_extraction("job_full", job_file, JOB_PROFILE_SCHEMA, allow_llm=True, api_key=api_key)
+
+PIPELINE_STEPS = [
+    (0, "Stellenprofil analysieren", "🔍"),
+    (1, "CV analysieren", "📄"),
+    (2, "Qualitätsprüfung & Validierung", "✅"),
+    (3, "Word-Dokument erstellen", "📝"),
+    (4, "Match-Making Analyse", "🤝"),
+    (5, "CV-Feedback generieren", "💡"),
+    (6, "Angebot erstellen", "💼"),
+    (7, "Dashboard erstellen", "📊")
+]
+
+def pipeline_steps(mode):
+    # Define steps based on mode
+    if mode == "Basic (Nur CV)":
+        return [s for s in PIPELINE_STEPS if s[0] in [1, 2, 3, 7]]
+    elif mode == "Analyse & Matching":
+        return [s for s in PIPELINE_STEPS if s[0] in [0, 1, 2, 3, 4, 5, 7]]
+    return PIPELINE_STEPS
+
+def step_status(idx, percent):
+    # Prozentwerte aus StreamlitCVGenerator.run -> Zustand des Schritts
+    if percent >= 100: return "completed"
+    if percent >= 90:
+        return "completed" if idx < 7 else "running"
+    if percent >= 70:
+        return "completed" if idx < 3 else "running" if idx in [3, 4, 5, 6] else "pending"
+    if percent >= 50:
+        return "completed" if idx < 2 else "running" if idx == 2 else "pending"
+    if percent >= 30:
+        return "completed" if idx < 1 else "running" if idx == 1 else "pending"
+    if percent >= 10 and idx == 0:
+        return "running"
+    return "pending"
+
+def render_step(label, icon, status):
+    color = "#cccccc"
+    status_icon = "⚪"
+    font_weight = "normal"
+    bg_color = "white"
+    
+    if status == "running":
+        color = "#FF7900"
+        status_icon = "🔄"
+        font_weight = "bold"
+        bg_color = "#FFF5EB"
+    elif status == "completed":
+        color = "#28a745"
+        status_icon = "✅"
+        bg_color = "#F8F9FA"
+    
+    st.markdown(
+        f"""
+        <div style="display: flex; align-items: center; margin-bottom: 8px; padding: 12px; background-color: {bg_color}; border-radius: 8px; border: 1px solid #eee;">
+            <div style="font-size: 24px; margin-right: 15px; width: 40px; text-align: center; color: {color};">{icon}</div>
+            <div style="flex-grow: 1; font-family: 'Segoe UI', sans-serif; color: #444;">
+                <div style="font-weight: {font_weight}; font-size: 16px;">{label}</div>
+            </div>
+            <div style="font-size: 20px; color: {color};">{status_icon}</div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def render_pipeline_progress(percent, text, visible_steps):
+    st.progress(percent)
+    st.markdown(f"**{text}**")
+    for idx, label, icon in visible_steps:
+        render_step(label, icon, step_status(idx, percent))
+
+# Nur dieser Teil des Dialogs wird jede Sekunde neu gezeichnet, der Lauf selbst blockiert keine Session
+@st.fragment(run_every=1)
+def poll_pipeline_job(job_id, visible_steps):
+    job = job_queue.get(job_id)
+    if job is None or job["status"] not in ACTIVE_STATES:
+        # Fertig: Ergebnis im ganzen Dialog anzeigen
+        st.rerun()
+    waiting_text = "Startet..." if job["status"] == "running" else "Wartet auf einen freien Worker..."
+    render_pipeline_progress(job["progress"], job["progress_text"] or waiting_text, visible_steps)
+    if st.button("Abbrechen", use_container_width=True):
+        job_queue.cancel(job_id)
+        st.rerun()
 
 @st.dialog("CV Generator Pipeline", width="large")
-def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, custom_logo_path):
+def run_cv_pipeline_dialog(api_key, mode):
     
     # Determine Phase: 'processing' or 'results'
     if "generation_results" in st.session_state and st.session_state.get("show_results_view"):
@@ -696,134 +957,42 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
         phase = "processing"
 
     if phase == "processing":
+        job_id = st.session_state.get("active_job_id")
+        job = job_queue.get(job_id) if job_id else None
+        if job is not None:
+            mode = job["params"].get("mode") or mode
+
         st.subheader("Verarbeitung läuft...")
-        progress_bar = st.progress(0)
-        status_text = st.empty()
         st.caption("ℹ️ Hinweis: Die Verarbeitung kann je nach Komplexität der Dateien 1-3 Minuten dauern.")
-        
-        # Define steps based on mode
-        all_steps = [
-            (0, "Stellenprofil analysieren", "🔍"),
-            (1, "CV analysieren", "📄"),
-            (2, "Qualitätsprüfung & Validierung", "✅"),
-            (3, "Word-Dokument erstellen", "📝"),
-            (4, "Match-Making Analyse", "🤝"),
-            (5, "CV-Feedback generieren", "💡"),
-            (6, "Angebot erstellen", "💼"),
-            (7, "Dashboard erstellen", "📊")
-        ]
-        
-        visible_steps = []
-        if mode == "Basic (Nur CV)":
-                visible_steps = [s for s in all_steps if s[0] in [1, 2, 3, 7]]
-        elif mode == "Analyse & Matching":
-                visible_steps = [s for s in all_steps if s[0] in [0, 1, 2, 3, 4, 5, 7]]
-        else:
-                visible_steps = all_steps
-
-        # Create placeholders for each step
-        step_placeholders = {}
-        for idx, label, icon in visible_steps:
-            step_placeholders[idx] = st.empty()
-
-        def render_step(idx, label, icon, status):
-            color = "#cccccc"
-            status_icon = "⚪"
-            font_weight = "normal"
-            bg_color = "white"
-            
-            if status == "running":
-                color = "#FF7900"
-                status_icon = "🔄"
-                font_weight = "bold"
-                bg_color = "#FFF5EB"
-            elif status == "completed":
-                color = "#28a745"
-                status_icon = "✅"
-                bg_color = "#F8F9FA"
-            
-            step_placeholders[idx].markdown(
-                f"""
-                <div style="display: flex; align-items: center; margin-bottom: 8px; padding: 12px; background-color: {bg_color}; border-radius: 8px; border: 1px solid #eee;">
-                    <div style="font-size: 24px; margin-right: 15px; width: 40px; text-align: center; color: {color};">{icon}</div>
-                    <div style="flex-grow: 1; font-family: 'Segoe UI', sans-serif; color: #444;">
-                        <div style="font-weight: {font_weight}; font-size: 16px;">{label}</div>
-                    </div>
-                    <div style="font-size: 20px; color: {color};">{status_icon}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-        # Initialize steps
-        initial_status = "completed" if "current_generation_results" in st.session_state else "pending"
-        for idx, label, icon in visible_steps:
-            render_step(idx, label, icon, initial_status)
+        visible_steps = pipeline_steps(mode)
 
-        def update_progress(percent, text, state):
-            progress_bar.progress(percent)
-            status_text.markdown(f"**{text}**")
-            
-            for idx, label, icon in visible_steps:
-                status = "pending"
-                if percent >= 100: status = "completed"
-                elif percent >= 90:
-                    if idx < 7: status = "completed"
-                    elif idx == 7: status = "running"
-                elif percent >= 70:
-                    if idx < 3: status = "completed"
-                    elif idx in [3, 4, 5, 6]: status = "running"
-                elif percent >= 50:
-                    if idx < 2: status = "completed"
-                    elif idx == 2: status = "running"
-                elif percent >= 30:
-                    if idx < 1: status = "completed"
-                    elif idx == 1: status = "running"
-                elif percent >= 10:
-                    if idx == 0: status = "running"
-                render_step(idx, label, icon, status)
-
-        generator = StreamlitCVGenerator(os.getcwd())
-        use_job_file = job_file if mode != "Basic (Nur CV)" else None
-        
         # 1. Check Cache
         if "current_generation_results" in st.session_state:
             results = st.session_state.current_generation_results
-            progress_bar.progress(100)
-            status_text.markdown("**Fertig!**")
+        elif job is None:
+            st.error("Der Auftrag wurde nicht gefunden.")
+            return
+        elif job["status"] in ACTIVE_STATES:
+            # 2. Auftrag läuft im Hintergrund; ersetzt abgestürzte Worker bzw. startet sie
+            # nach einem Neustart des Servers
+            get_worker_pool(os.getcwd(), api_key)
+            poll_pipeline_job(job_id, visible_steps)
+            return
         else:
-            # 2. Run Generation
-            results = generator.run(
-                cv_file=cv_file,
-                job_file=use_job_file,
-                api_key=api_key,
-                progress_callback=update_progress,
-                custom_styles=custom_styles,
-                custom_logo_path=custom_logo_path,
-                pipeline_mode=mode
-            )
+            # 3. Ergebnis abholen (den Verlauf hat der Worker bereits geschrieben)
+            job_queue.acknowledge(job_id)
+            st.session_state.active_job_id = None
+            if job["status"] == "cancelled":
+                results = {"success": False, "error": "Der Lauf wurde abgebrochen."}
+            else:
+                results = job["result"] or {"success": False, "error": job["error"]}
             st.session_state.current_generation_results = results
-            
-            # 3. Save History (Only on fresh run)
             if results["success"]:
-                history_entry = {
-                    "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
-                    "candidate_name": os.path.basename(results["cv_json"]).split('_')[1] + " " + os.path.basename(results["cv_json"]).split('_')[2] if results.get("cv_json") else "Unbekannt",
-                    "mode": mode,
-                    "word_path": results.get("word_path"),
-                    "cv_json": results.get("cv_json"),
-                    "dashboard_path": results.get("dashboard_path"),
-                    "match_score": results.get("match_score"),
-                    "stellenprofil_json": results.get("stellenprofil_json"),
-                    "match_json": results.get("match_json"),
-                    "offer_word_path": results.get("offer_word_path")
-                }
-                save_to_history(history_entry)
+                invalidate_history()
+
+        render_pipeline_progress(100, "Fertig!" if results["success"] else "Fehler", visible_steps)
 
         if results["success"]:
-            for idx, label, icon in visible_steps:
-                render_step(idx, label, icon, "completed")
-                
             st.success("✅ Generierung erfolgreich abgeschlossen!")
             
             st.session_state.generation_results = results
@@ -853,19 +1022,59 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
         
         # Downloads Section
         with st.success("📥 Downloads", icon="📥"):
-            res_col1, res_col2, res_col3 = st.columns(3)
+            res_col1, res_col_pdf, res_col2, res_col3 = st.columns(4)
             with res_col1:
                 if results.get("word_path") and os.path.exists(results["word_path"]):
-                    with open(results["word_path"], "rb") as f:
-                        st.download_button(cv_btn_label, f, os.path.basename(results["word_path"]), "application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True)
+                    st.download_button(cv_btn_label, read_artifact(results["word_path"]), os.path.basename(results["word_path"]), "application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True)
+            with res_col_pdf:
+                pdf_path = results.get("pdf_path")
+                if pdf_path and os.path.exists(pdf_path):
+                    st.download_button("📕 PDF-CV", read_artifact(pdf_path), os.path.basename(pdf_path), "application/pdf", use_container_width=True)
+                elif results.get("cv_json") and os.path.exists(results["cv_json"]):
+                    if st.button("PDF erstellen", use_container_width=True):
+                        with st.spinner("Erstelle PDF..."):
+                            try:
+                                with open(results["cv_json"], 'r', encoding='utf-8') as f:
+                                    cv_data = json.load(f)
+                                output_dir = os.path.dirname(results["cv_json"])
+                                style_profile = get_style_profile(
+                                    custom_styles=st.session_state.get("custom_styles"),
+                                    logo_path=st.session_state.get("custom_logo_path")
+                                )
+                                # PDF-Render im warmen Prozess-Pool statt im Streamlit-Thread
+                                render_service = get_render_service()
+                                if render_service:
+                                    pdf_path = render_service.submit_cv_pdf(cv_data, output_dir, style_profile=style_profile).result()
+                                else:
+                                    pdf_path = render_cv_pdf(cv_data, output_dir, style_profile=style_profile)
+                                results["pdf_path"] = pdf_path
+                                run_id = results.get("run_id") or results.get("id")
+                                if run_id:
+                                    run_store.add_artifact(run_id, "pdf_path", pdf_path)
+                                    invalidate_history()
+                                st.session_state.generation_results = results
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Fehler bei der PDF-Erstellung: {e}")
             with res_col2:
                 if results.get("cv_json") and os.path.exists(results["cv_json"]):
-                    with open(results["cv_json"], "rb") as f:
-                        st.download_button("📋 JSON-Daten", f, os.path.basename(results["cv_json"]), "application/json", use_container_width=True)
+                    st.download_button("📋 JSON-Daten", read_artifact(results["cv_json"]), os.path.basename(results["cv_json"]), "application/json", use_container_width=True)
             with res_col3:
                 if results.get("dashboard_path") and os.path.exists(results["dashboard_path"]):
-                    with open(results["dashboard_path"], "rb") as f:
-                        st.download_button("📊 Dashboard", f, os.path.basename(results["dashboard_path"]), "text/html", use_container_width=True)
+                    st.download_button("📊 Dashboard", read_artifact(results["dashboard_path"]), os.path.basename(results["dashboard_path"]), "text/html", use_container_width=True)
+
+        # Sofort-Vorschau des CVs (HTML aus derselben JSON und demselben Style-Profil wie das Word-Dokument)
+        if results.get("cv_json") and os.path.exists(results["cv_json"]):
+            with st.expander("👁️ CV-Vorschau", expanded=False):
+                try:
+                    preview_html = cv_preview_html(
+                        results["cv_json"],
+                        custom_styles=st.session_state.get("custom_styles"),
+                        logo_path=st.session_state.get("custom_logo_path")
+                    )
+                    st.components.v1.html(preview_html, height=800, scrolling=True)
+                except Exception as e:
+                    st.warning(f"Vorschau konnte nicht erstellt werden: {e}")
 
         # Offer Generation Section
         # Try to infer stellenprofil_json if missing (for history items)
@@ -905,8 +1114,7 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
                 off_col1, off_col2, off_col3 = st.columns(3)
                 with off_col1:
                     if is_offer_ready:
-                         with open(offer_word_path, "rb") as f:
-                            st.download_button("📄 Angebot herunterladen", f, os.path.basename(offer_word_path), "application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True, type="primary")
+                        st.download_button("📄 Angebot herunterladen", read_artifact(offer_word_path), os.path.basename(offer_word_path), "application/vnd.openxmlformats-officedocument.wordprocessingml.document", use_container_width=True, type="primary")
                     else:
                         if st.button("Angebot erstellen", use_container_width=True):
                             with st.spinner("Erstelle Angebot..."):
@@ -920,8 +1128,24 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
                                     angebot_word_path = os.path.join(output_dir, f"Angebot_{base_name}.docx")
                                     schema_path = os.path.join(os.getcwd(), "scripts", "angebot_json_schema.json")
                                     generate_angebot_json(cv_json, stellenprofil_json, match_json, angebot_json_path, schema_path)
-                                    generate_angebot_word(angebot_json_path, angebot_word_path)
+                                    style_profile = get_style_profile(
+                                        custom_styles=st.session_state.get("custom_styles"),
+                                        logo_path=st.session_state.get("custom_logo_path")
+                                    )
+                                    # Word-Render im warmen Prozess-Pool statt im Streamlit-Thread
+                                    render_service = get_render_service()
+                                    if render_service:
+                                        with open(angebot_json_path, 'r', encoding='utf-8') as f:
+                                            angebot_data = json.load(f)
+                                        render_service.submit_angebot(angebot_data, angebot_word_path, style_profile=style_profile).result()
+                                    else:
+                                        generate_angebot_word(angebot_json_path, angebot_word_path, style_profile=style_profile)
                                     results["offer_word_path"] = angebot_word_path
+                                    # Verlaufseinträge haben "id", frische Läufe "run_id"
+                                    run_id = results.get("run_id") or results.get("id")
+                                    if run_id:
+                                        run_store.add_artifact(run_id, "offer_word_path", angebot_word_path)
+                                        invalidate_history()
                                     st.session_state.generation_results = results
                                     st.rerun()
                                 except Exception as e:
@@ -936,9 +1160,7 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
 
         # Show Dashboard Preview
         if results.get("dashboard_path") and os.path.exists(results["dashboard_path"]):
-            with open(results["dashboard_path"], "r", encoding='utf-8') as f:
-                html_content = f.read()
-                st.components.v1.html(html_content, height=800, scrolling=True)
+            st.components.v1.html(read_dashboard(results["dashboard_path"]), height=800, scrolling=True)
                 
         if st.button("Schließen", use_container_width=True):
             st.session_state.show_pipeline_dialog = False
@@ -951,11 +1173,40 @@ def run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, custom_styles, cust
 btn_col, _ = st.columns([1, 2])
 with btn_col:
     if st.button("🚀 Generierung starten", disabled=start_disabled, type="primary", use_container_width=True):
-        st.session_state.show_pipeline_dialog = True
-        st.session_state.show_results_view = False
-        if "current_generation_results" in st.session_state:
-            del st.session_state.current_generation_results
+        try:
+            st.session_state.active_job_id = submit_pipeline_job(
+                job_queue,
+                username,
+                cv_file,
+                job_file if mode != "Basic (Nur CV)" else None,
+                mode=mode,
+                api_key=api_key,
+                model_name=os.environ.get("MODEL_NAME"),
+                custom_styles=st.session_state.get("custom_styles"),
+                custom_logo_path=st.session_state.get("custom_logo_path"),
+                # Fertige oder laufende Extraktion aus dem Upload mitgeben
+                extractor=get_speculative_extractor(),
+                schemas={"stellenprofil": JOB_PROFILE_SCHEMA},
+            )
+            get_worker_pool(os.getcwd(), api_key)
+            st.session_state.show_pipeline_dialog = True
+            st.session_state.show_results_view = False
+            if "current_generation_results" in st.session_state:
+                del st.session_state.current_generation_results
+        except JobLimitError as e:
+            st.warning(str(e))
+
+# Dialog geschlossen, Lauf noch offen: er läuft im Hintergrund weiter
+if st.session_state.get("active_job_id") and not st.session_state.get("show_pipeline_dialog"):
+    info_col, show_col = st.columns([3, 1])
+    with info_col:
+        st.info("⏳ Ein Lauf wird im Hintergrund verarbeitet.")
+    with show_col:
+        if st.button("Fortschritt anzeigen", use_container_width=True):
+            st.session_state.show_pipeline_dialog = True
+            st.session_state.show_results_view = False
+            st.rerun()
 
 if st.session_state.get("show_pipeline_dialog"):
-    run_cv_pipeline_dialog(cv_file, job_file, api_key, mode, st.session_state.get("custom_styles"), st.session_state.get("custom_logo_path"))
+    run_cv_pipeline_dialog(api_key, mode)
 
@@ -0,0 +1,172 @@
+"""
+Caching-Schicht der Streamlit-App.
+
+app.py hat bei jedem Rerun config.yaml neu gelesen, für jeden Lauf einen neuen
+StreamlitCVGenerator gebaut, für jeden download_button die Datei neu geöffnet und das
+Dashboard-HTML neu eingelesen. Hier ist das explizit geregelt:
+
+- st.cache_resource (ein Objekt pro Prozess, von allen Sessions geteilt): Schema-Registry,
+  Template-Cache (Sektionen der Word-Vorlage) und Style-Profile
+- st.cache_data (pro Aufruf eine Kopie): config.yaml, Download-Bytes, Dashboard-HTML und
+  CV-Vorschau, jeweils unter der Signatur der Datei (Pfad, mtime, Grösse) - eine neu
+  geschriebene Datei ergibt einen neuen Schlüssel, ohne dass sie gehasht werden muss
+
+Den StreamlitCVGenerator baut der Worker der Auftrags-Warteschlange (job_queue._work),
+die App selbst führt keine Läufe mehr aus.
+
+Jeder Cache zählt Aufrufe und Neuberechnungen; cache_stats() liefert die Trefferquoten
+für die Admin-Seite.
+"""
+import functools
+import json
+import os
+import threading
+
+import streamlit as st
+import yaml
+from yaml.loader import SafeLoader
+
+from scripts.html_preview import render_cv_html
+from scripts.schema_registry import preload_schemas
+from scripts.section_cache import get_section_cache
+from scripts.style_profile import resolve_style_profile
+
+# Registrierte Caches nach Name (app.py definiert seine bei jedem Rerun neu)
+_CACHES = {}
+
+# Cache-Name -> [Aufrufe, Neuberechnungen]
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count(name, miss=False):
+    with _stats_lock:
+        entry = _stats.setdefault(name, [0, 0])
+        entry[1 if miss else 0] += 1
+
+
+def tracked(cache, kind, **options):
+    """Wie st.cache_resource/st.cache_data, zählt aber Aufrufe und Neuberechnungen."""
+    def decorator(func):
+        name = func.__name__.lstrip("_")
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _count(name, miss=True)
+            return func(*args, **kwargs)
+
+        cached = cache(show_spinner=False, **options)(compute)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _count(name)
+            return cached(*args, **kwargs)
+
+        wrapper.clear = cached.clear
+        wrapper.kind = kind
+        _CACHES[name] = wrapper
+        return wrapper
+    return decorator
+
+
+def file_signature(path):
+    """Schlüssel einer Datei für die Daten-Caches: (Pfad, mtime, Grösse)."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+# -------------------------------------
+# Ressourcen (prozessweit geteilt)
+# -------------------------------------
+@tracked(st.cache_resource, "resource")
+def get_schemas():
+    return preload_schemas()
+
+
+@tracked(st.cache_resource, "resource")
+def get_template_cache():
+    return get_section_cache()
+
+
+@tracked(st.cache_resource, "resource", max_entries=32)
+def get_style_profile(custom_styles=None, logo_path=None):
+    return resolve_style_profile(custom_styles=custom_styles, logo_path=logo_path)
+
+
+# -------------------------------------
+# Daten (unter der Datei-Signatur)
+# -------------------------------------
+@tracked(st.cache_data, "data")
+def _load_config(signature):
+    with open(signature[0]) as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+
+@tracked(st.cache_data, "data", max_entries=64)
+def _artifact_bytes(signature):
+    with open(signature[0], "rb") as f:
+        return f.read()
+
+
+@tracked(st.cache_data, "data", max_entries=16)
+def _dashboard_html(signature):
+    with open(signature[0], "r", encoding='utf-8') as f:
+        return f.read()
+
+
+@tracked(st.cache_data, "data", max_entries=16)
+def _cv_preview_html(signature, custom_styles=None, logo_path=None):
+    with open(signature[0], "r", encoding="utf-8") as f:
+        cv_data = json.load(f)
+    return render_cv_html(cv_data, get_style_profile(custom_styles, logo_path))
+
+
+def load_config(path):
+    """config.yaml, neu eingelesen nur nach Änderungen (z.B. Passwort-Reset)."""
+    return _load_config(file_signature(path))
+
+
+def read_artifact(path):
+    """Inhalt einer erzeugten Datei für st.download_button."""
+    return _artifact_bytes(file_signature(path))
+
+
+def read_dashboard(path):
+    return _dashboard_html(file_signature(path))
+
+
+def cv_preview_html(cv_json_path, custom_styles=None, logo_path=None):
+    """HTML-Vorschau eines CVs im Style-Profil der Session."""
+    return _cv_preview_html(file_signature(cv_json_path), custom_styles, logo_path)
+
+
+# -------------------------------------
+# Statistik
+# -------------------------------------
+def cache_stats():
+    """Aufrufe, Treffer und Trefferquote pro Cache (seit Prozessstart bzw. reset_cache_stats)."""
+    with _stats_lock:
+        stats = {name: tuple(entry) for name, entry in _stats.items()}
+    rows = []
+    for name, cache in _CACHES.items():
+        calls, misses = stats.get(name, (0, 0))
+        hits = max(calls - misses, 0)
+        rows.append({
+            "Cache": name,
+            "Art": cache.kind,
+            "Aufrufe": calls,
+            "Treffer": hits,
+            "Trefferquote": round(100 * hits / calls, 1) if calls else None,
+        })
+    return rows
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def clear_caches():
+    """Leert alle Caches dieser Schicht (Statistik bleibt erhalten)."""
+    for cache in _CACHES.values():
+        cache.clear()
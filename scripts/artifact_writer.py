@@ -0,0 +1,128 @@
+"""
+Write-behind für Pipeline-Artefakte.
+
+Bisher hat jeder Pipeline-Schritt sein Ergebnis (CV-JSON, Stellenprofil, Matchmaking,
+Feedback, Angebot, Dashboard) in den Run-Ordner geschrieben und der nächste Schritt hat
+es von dort wieder eingelesen. Auf langsamen Netzlaufwerken blockierte so jeder Schritt
+auf Dateisystem-I/O.
+
+Die Schritte reichen ihre Ergebnisse jetzt als Dicts im Speicher weiter. Persistiert wird
+in einer einzigen Hintergrund-Stufe: der ArtifactWriter nimmt Schreibaufträge entgegen,
+serialisiert sie sofort (spätere Änderungen am Dict wirken sich nicht aus) und schreibt
+sie in Auftragsreihenfolge in einem eigenen Thread. Jede Datei wird erst unter einem
+temporären Namen geschrieben und dann umbenannt, Leser sehen nie halbe Dateien.
+
+Vor dem Ausliefern der Pfade (Erfolgsdialog, Downloads) wartet flush() auf alle Aufträge
+und meldet Schreibfehler.
+"""
+import json
+import os
+import queue
+import threading
+
+_STOP = object()
+
+
+class ArtifactWriteError(IOError):
+    """Mindestens ein Artefakt konnte nicht geschrieben werden."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(f"{path}: {error}" for path, error in errors))
+
+
+class ArtifactWriter:
+    """
+    Asynchroner Writer für Run-Artefakte (ein Hintergrund-Thread, FIFO).
+
+    Beispiel:
+        with ArtifactWriter() as writer:
+            writer.write_json(cv_json_path, cv_data)   # blockiert nicht
+            ...
+            writer.flush()                              # alle Dateien liegen vor
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._errors = []
+        self._errors_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def write_json(self, path, data):
+        """Plant das Schreiben von data als JSON (UTF-8, eingerückt) nach path ein."""
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        self._queue.put((path, payload))
+        return path
+
+    def write_text(self, path, text):
+        """Plant das Schreiben von text (UTF-8) nach path ein."""
+        self._queue.put((path, text.encode("utf-8")))
+        return path
+
+    def write_bytes(self, path, payload):
+        """Plant das Schreiben von payload nach path ein."""
+        self._queue.put((path, bytes(payload)))
+        return path
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                path, payload = item
+                try:
+                    _write_atomic(path, payload)
+                except Exception as e:
+                    with self._errors_lock:
+                        self._errors.append((path, e))
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Wartet, bis alle bisher eingeplanten Artefakte geschrieben sind.
+
+        Raises:
+            ArtifactWriteError: wenn seit dem letzten flush() Schreibfehler auftraten
+        """
+        self._queue.join()
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise ArtifactWriteError(errors)
+
+    def close(self):
+        """Schreibt alle ausstehenden Artefakte und beendet den Hintergrund-Thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # Ursprünglichen Fehler nicht durch Schreibfehler verdecken
+        try:
+            self.close()
+        except ArtifactWriteError as e:
+            print(f"⚠️  Artefakte konnten nicht geschrieben werden: {e}")
+
+
+def _write_atomic(path, payload):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
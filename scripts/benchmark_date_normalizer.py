@@ -0,0 +1,157 @@
+"""
+Benchmark für die Datums-Normalisierung.
+
+Vergleicht die bisherige Normalisierung (Monatstabelle pro Aufruf, rekursive Zeiträume,
+Feld für Feld) mit dem tabellengesteuerten Normalizer mit LRU-Cache und Batch-Funktion.
+
+Aufruf:
+    python scripts/benchmark_date_normalizer.py
+    python scripts/benchmark_date_normalizer.py --docs 200 --items 40 --runs 10
+"""
+import argparse
+import copy
+import os
+import re
+import statistics
+import sys
+import time
+
+# Add project root to sys.path to allow imports from scripts module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.date_normalizer import ZEITRAUM_FIELDS, clear_cache, normalize_date, normalize_zeitraum_fields
+
+SAMPLES = [
+    "2020", "01/2020", "01.2020", "Jan 2020", "Januar 2020", "Sept. 2019", "März 2018",
+    "2019 - 2021", "01/2019 – heute", "Okt 2015 — Dez 2017", "heute", "Frühjahr 2020",
+]
+
+
+def legacy_normalize_date_format(date_str):
+    """Bisherige Implementierung aus pdf_to_json (Referenz für den Vergleich)."""
+    if not date_str or not isinstance(date_str, str):
+        return date_str
+    if date_str.strip().lower() in ['heute', 'today', 'present', 'aktuell']:
+        return date_str
+    months_de = {
+        'januar': '01', 'jan': '01', 'jan.': '01',
+        'februar': '02', 'feb': '02', 'feb.': '02',
+        'märz': '03', 'mrz': '03', 'mar': '03', 'mar.': '03', 'mär': '03', 'mär.': '03',
+        'april': '04', 'apr': '04', 'apr.': '04',
+        'mai': '05',
+        'juni': '06', 'jun': '06', 'jun.': '06',
+        'juli': '07', 'jul': '07', 'jul.': '07',
+        'august': '08', 'aug': '08', 'aug.': '08',
+        'september': '09', 'sep': '09', 'sep.': '09', 'sept': '09', 'sept.': '09',
+        'oktober': '10', 'okt': '10', 'okt.': '10', 'oct': '10', 'oct.': '10',
+        'november': '11', 'nov': '11', 'nov.': '11',
+        'dezember': '12', 'dez': '12', 'dez.': '12', 'dec': '12', 'dec.': '12'
+    }
+    if ' - ' in date_str or ' – ' in date_str or ' — ' in date_str:
+        separator = ' - ' if ' - ' in date_str else (' – ' if ' – ' in date_str else ' — ')
+        parts = date_str.split(separator)
+        if len(parts) == 2:
+            start = legacy_normalize_date_format(parts[0].strip())
+            end = legacy_normalize_date_format(parts[1].strip())
+            return f"{start} - {end}"
+    if re.match(r'^\d{2}[/\.]\d{4}$', date_str.strip()):
+        return date_str.replace('.', '/')
+    if re.match(r'^\d{4}$', date_str.strip()):
+        return f"01/{date_str.strip()}"
+    parts = re.split(r'[\s.]+', date_str.lower().strip())
+    parts = [p for p in parts if p]
+    if len(parts) >= 2:
+        month_part = parts[0].strip('.').lower()
+        year_part = parts[-1]
+        if month_part in months_de and re.match(r'^\d{4}$', year_part):
+            return f"{months_de[month_part]}/{year_part}"
+    return date_str
+
+
+def build_docs(docs=100, items=30):
+    """Erstellt CV-Dicts mit je `items` Einträgen pro Zeitraum-Liste."""
+    return [
+        {
+            field: [{"Zeitraum": SAMPLES[(d + f + i) % len(SAMPLES)]} for i in range(items)]
+            for f, field in enumerate(ZEITRAUM_FIELDS)
+        }
+        for d in range(docs)
+    ]
+
+
+def legacy_normalize_fields(data):
+    for field in ZEITRAUM_FIELDS:
+        if field in data and isinstance(data[field], list):
+            for item in data[field]:
+                if "Zeitraum" in item:
+                    item["Zeitraum"] = legacy_normalize_date_format(item["Zeitraum"])
+
+
+def bench_single(runs, n=10000):
+    """Mittlere Zeit pro Aufruf (µs): bisher, kompiliert ohne Cache-Treffer, mit Cache."""
+    values = [SAMPLES[i % len(SAMPLES)] for i in range(n)]
+    # Eindeutige Strings erzwingen Cache-Misses
+    unique = [f"{value} " * (1 + i // len(SAMPLES) % 3) + str(i) for i, value in enumerate(values)]
+
+    def measure(func, inputs, before=None):
+        timings = []
+        for _ in range(runs):
+            if before:
+                before()
+            start = time.perf_counter()
+            for value in inputs:
+                func(value)
+            timings.append((time.perf_counter() - start) / len(inputs) * 1e6)
+        return statistics.median(timings)
+
+    return (
+        measure(legacy_normalize_date_format, values),
+        measure(normalize_date, unique, before=clear_cache),
+        measure(normalize_date, values),
+    )
+
+
+def bench_batch(docs, items, runs):
+    """Gesamtzeit (ms) für alle Dokumente: Feld für Feld (bisher) vs. Batch-Funktion."""
+    template = build_docs(docs, items)
+    legacy, batch = [], []
+    for _ in range(runs):
+        data = copy.deepcopy(template)
+        start = time.perf_counter()
+        for doc in data:
+            legacy_normalize_fields(doc)
+        legacy.append(time.perf_counter() - start)
+
+        data = copy.deepcopy(template)
+        start = time.perf_counter()
+        normalize_zeitraum_fields(data)
+        batch.append(time.perf_counter() - start)
+    return statistics.median(legacy) * 1000, statistics.median(batch) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark für die Datums-Normalisierung")
+    parser.add_argument("--docs", type=int, default=100, help="Anzahl CV-Dokumente")
+    parser.add_argument("--items", type=int, default=30, help="Einträge pro Zeitraum-Liste")
+    parser.add_argument("--runs", type=int, default=5, help="Anzahl Durchläufe")
+    args = parser.parse_args(argv)
+
+    legacy_us, miss_us, hit_us = bench_single(args.runs)
+    print("=" * 60)
+    print("Einzelaufruf (µs pro String)")
+    print("=" * 60)
+    print(f"  Bisher:                  {legacy_us:8.2f} µs")
+    print(f"  Kompiliert (Cache-Miss): {miss_us:8.2f} µs")
+    print(f"  Kompiliert (Cache-Hit):  {hit_us:8.2f} µs")
+
+    legacy_ms, batch_ms = bench_batch(args.docs, args.items, args.runs)
+    fields = args.docs * args.items * len(ZEITRAUM_FIELDS)
+    print("=" * 60)
+    print(f"Batch: {args.docs} Dokumente, {fields} Zeitraum-Felder")
+    print("=" * 60)
+    print(f"  Feld für Feld (bisher):  {legacy_ms:8.1f} ms")
+    print(f"  Batch-Funktion:          {batch_ms:8.1f} ms (Faktor {legacy_ms / batch_ms:5.1f})")
+
+
+if __name__ == "__main__":
+    main()
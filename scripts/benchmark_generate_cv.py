@@ -0,0 +1,240 @@
+"""
+Benchmark für die Word-Generierung.
+
+Misst die Renderzeit pro Dokument für einen synthetischen CV mit vielen
+Referenzprojekten und Trainings, die Kosten der OOXML-Fragmente sowie die
+Tabellen-Renderzeit (Zelle für Zelle via python-docx vs. Bulk-Builder).
+
+Aufruf:
+    python scripts/benchmark_generate_cv.py
+    python scripts/benchmark_generate_cv.py --projects 30 --trainings 60 --runs 10
+    python scripts/benchmark_generate_cv.py --table-rows 10 100 1000
+    python scripts/benchmark_generate_cv.py --batch 16 --workers 4
+    python scripts/benchmark_generate_cv.py --pdf
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from io import BytesIO
+
+# Add project root to sys.path to allow imports from scripts module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt, RGBColor
+
+from scripts.generate_cv import generate_cv, build_cv_document, add_trainings_table, get_available_width
+from scripts.docx_fragments import CELL_BORDERS_NONE, clone, remove_table_borders, remove_cell_borders
+from scripts.style_profile import get_profile
+from scripts.render_service import RenderService, render_cv
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "valid_cv.json")
+
+
+def build_synthetic_cv(projects=30, trainings=60):
+    """Erstellt einen CV mit der gewünschten Anzahl Projekte und Trainings."""
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    data["Trainings_und_Zertifizierungen"] = [
+        {
+            "Zeitraum": f"{(i % 12) + 1:02d}/{2000 + i % 25}",
+            "Institution": f"Institut {i}",
+            "Titel": f"Zertifizierung {i}"
+        }
+        for i in range(trainings)
+    ]
+    data["Ausgewählte_Referenzprojekte"] = [
+        {
+            "Zeitraum": "01/2020 - 12/2021",
+            "Rolle": "Projektleiter",
+            "Kunde": f"Kunde {i}",
+            "Tätigkeiten": [f"Tätigkeit {j} im Projekt {i}" for j in range(5)],
+            "Technologien": "Python, Azure, Kubernetes",
+            "Methodik": "Scrum, SAFe"
+        }
+        for i in range(projects)
+    ]
+    return data
+
+
+def bench_fragments(number=20000):
+    """Vergleicht parse_xml pro Zelle mit dem Klonen eines vorgeparsten Fragments."""
+    xml = ('<w:tcBorders %s>'
+           '<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+           '<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+           '<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+           '<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+           '</w:tcBorders>' % nsdecls('w'))
+    parse_time = timeit.timeit(lambda: parse_xml(xml), number=number)
+    clone_time = timeit.timeit(lambda: clone(CELL_BORDERS_NONE), number=number)
+    return parse_time / number * 1e6, clone_time / number * 1e6
+
+
+def _trainings_table_cell_by_cell(doc, trainings_data):
+    """Referenz: bisheriger Aufbau über table.rows[i].cells[j] (vor dem Bulk-Builder)."""
+    table = doc.add_table(rows=len(trainings_data), cols=3)
+    remove_table_borders(table)
+    available_width = get_available_width(doc)
+    widths = [available_width * 0.20, available_width * 0.20, available_width * 0.60]
+    for row in table.rows:
+        for idx, width in enumerate(widths):
+            row.cells[idx].width = width
+
+    s_text = get_profile()["text"]
+    for row_idx, item in enumerate(trainings_data):
+        values = (item["Zeitraum"], item["Institution"], item["Titel"])
+        for col_idx, value in enumerate(values):
+            cell = table.rows[row_idx].cells[col_idx]
+            remove_cell_borders(cell)
+            cell.text = ""
+            p = cell.paragraphs[0]
+            run = p.add_run(value)
+            run.font.name = s_text["font"]
+            run.font.size = Pt(s_text["size"])
+            run.font.color.rgb = RGBColor(*s_text["color"])
+            if col_idx == 1:
+                run.font.bold = True
+            p.paragraph_format.space_after = Pt(3)
+
+
+def bench_table_rows(row_counts=(10, 100, 1000), runs=3):
+    """Misst die Renderzeit einer Trainings-Tabelle pro Zeilenzahl (alt vs. Bulk-Builder)."""
+    results = []
+    for rows in row_counts:
+        trainings = build_synthetic_cv(projects=0, trainings=rows)["Trainings_und_Zertifizierungen"]
+        timings = {}
+        for label, render in (("cell_by_cell", _trainings_table_cell_by_cell), ("bulk", add_trainings_table)):
+            best = None
+            for _ in range(runs):
+                doc = Document()
+                start = time.perf_counter()
+                render(doc, trainings)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+        results.append((rows, timings["cell_by_cell"], timings["bulk"]))
+    return results
+
+
+def bench_generate_cv(data, runs=5):
+    """Rendert den CV mehrfach und gibt die Einzelzeiten in Sekunden zurück."""
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "benchmark_cv.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        for _ in range(runs):
+            start = time.perf_counter()
+            generate_cv(json_path, tmp_dir, interactive=False, use_cache=False)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_render_service(data, documents=16, workers=None):
+    """Vergleicht sequentielles Rendern mit dem warmen Prozess-Pool (Dokumente pro Sekunde)."""
+    batch = [data] * documents
+
+    start = time.perf_counter()
+    for cv in batch:
+        render_cv(cv, as_bytes=True)
+    sequential = time.perf_counter() - start
+
+    with RenderService(max_workers=workers) as service:
+        service.warm_up()
+        start = time.perf_counter()
+        service.render_cv_batch(batch, as_bytes=True)
+        pooled = time.perf_counter() - start
+        workers = service.max_workers
+    return sequential, pooled, workers
+
+
+def bench_pdf(data, runs=5):
+    """
+    Vergleicht PDF-Renderer und Word-Generierung (ohne Cache).
+
+    Returns:
+        {"docx": (Zeiten, Bytes), "pdf": (Zeiten, Bytes)}
+    """
+    from scripts.pdf_renderer import render_cv_pdf
+
+    def render_docx():
+        buffer = BytesIO()
+        build_cv_document(data).save(buffer)
+        return buffer.getvalue()
+
+    results = {}
+    for label, render in (("docx", render_docx), ("pdf", lambda: render_cv_pdf(data))):
+        render()  # Warm-up (Template, Schriften)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            content = render()
+            timings.append(time.perf_counter() - start)
+        results[label] = (timings, len(content))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark für generate_cv")
+    parser.add_argument("--projects", type=int, default=30, help="Anzahl Referenzprojekte")
+    parser.add_argument("--trainings", type=int, default=60, help="Anzahl Trainings")
+    parser.add_argument("--runs", type=int, default=5, help="Anzahl Durchläufe")
+    parser.add_argument("--table-rows", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Zeilenzahlen für den Tabellen-Benchmark")
+    parser.add_argument("--batch", type=int, default=0,
+                        help="Anzahl Dokumente für den Render-Service-Benchmark (0 = überspringen)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker-Prozesse für den Render-Service")
+    parser.add_argument("--pdf", action="store_true", help="PDF-Renderer mit der Word-Generierung vergleichen")
+    args = parser.parse_args(argv)
+
+    parse_us, clone_us = bench_fragments()
+    print("=" * 60)
+    print("OOXML-Fragmente (tcBorders)")
+    print("=" * 60)
+    print(f"  parse_xml pro Zelle: {parse_us:8.2f} µs")
+    print(f"  clone pro Zelle:     {clone_us:8.2f} µs")
+
+    print("=" * 60)
+    print("Trainings-Tabelle: Zelle für Zelle vs. Bulk-Builder")
+    print("=" * 60)
+    for rows, cell_by_cell, bulk in bench_table_rows(args.table_rows):
+        print(f"  {rows:5d} Zeilen: {cell_by_cell * 1000:9.1f} ms vs. {bulk * 1000:8.1f} ms "
+              f"(Faktor {cell_by_cell / bulk:5.1f})")
+
+    data = build_synthetic_cv(args.projects, args.trainings)
+    timings = bench_generate_cv(data, args.runs)
+    print("=" * 60)
+    print(f"generate_cv: {args.projects} Projekte, {args.trainings} Trainings, {args.runs} Durchläufe")
+    print("=" * 60)
+    print(f"  Median pro Dokument: {statistics.median(timings) * 1000:8.1f} ms")
+    print(f"  Minimum:             {min(timings) * 1000:8.1f} ms")
+    print(f"  Maximum:             {max(timings) * 1000:8.1f} ms")
+
+    if args.batch:
+        sequential, pooled, workers = bench_render_service(data, args.batch, args.workers)
+        print("=" * 60)
+        print(f"Render-Service: {args.batch} Dokumente, {workers} Worker")
+        print("=" * 60)
+        print(f"  Sequentiell:   {sequential:6.2f} s ({args.batch / sequential:5.1f} Dok/s)")
+        print(f"  Prozess-Pool:  {pooled:6.2f} s ({args.batch / pooled:5.1f} Dok/s)")
+
+    if args.pdf:
+        print("=" * 60)
+        print(f"PDF vs. Word: {args.projects} Projekte, {args.runs} Durchläufe")
+        print("=" * 60)
+        for label, (timings, size) in bench_pdf(data, args.runs).items():
+            print(f"  {label:5s} Median: {statistics.median(timings) * 1000:8.1f} ms, "
+                  f"Grösse: {size / 1024:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+"""
+Lokaler Suchindex über alle generierten CV-JSONs (Kandidatensuche).
+
+In output/ sammeln sich mit der Zeit hunderte cv_*.json. Fragen wie "alle mit SAFe und
+Azure und Französisch ab Level 4" liessen sich bisher nur durch Durchsuchen der Dateien
+beantworten. Der Index liegt als SQLite-Datenbank in output/candidate_index.sqlite3
+(oder CV_CANDIDATE_INDEX) und enthält:
+
+- candidate_fts: FTS5-Volltext über alle Textfelder des CVs
+- candidate_skills: kanonische Skills (Skill-Taxonomie plus Einträge aus Fachwissen)
+- candidate_languages: Sprache und Level 1-5
+- candidate_certifications: Trainings und Zertifizierungen mit Jahr
+- candidate_projects: Referenzprojekte mit Beginn/Ende (YYYY-MM, offenes Ende = 9999-12)
+
+Die Pipeline trägt jeden erfolgreichen Lauf direkt ein (index_run). sync() gleicht den
+Index inkrementell mit output/ ab (nur neue oder geänderte Dateien werden gelesen).
+"""
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+try:
+    from cv_normalizer import LANGUAGE_MAPPING, parse_level_text
+    from date_normalizer import OPEN_END, normalize_date
+    from skill_taxonomy import get_skill_index, normalize_term
+except ImportError:
+    from scripts.cv_normalizer import LANGUAGE_MAPPING, parse_level_text
+    from scripts.date_normalizer import OPEN_END, normalize_date
+    from scripts.skill_taxonomy import get_skill_index, normalize_term
+
+INDEX_FILENAME = "candidate_index.sqlite3"
+OPEN_END_DATE = "9999-12"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    cv_path TEXT NOT NULL UNIQUE,
+    mtime REAL,
+    size INTEGER,
+    vorname TEXT,
+    nachname TEXT,
+    hauptrolle TEXT,
+    match_score INTEGER,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    skill_key TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (skill_key, candidate_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS candidate_languages (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    sprache TEXT NOT NULL,
+    level INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_languages ON candidate_languages (sprache, level, candidate_id);
+CREATE TABLE IF NOT EXISTS candidate_certifications (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    titel TEXT,
+    institution TEXT,
+    jahr INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_certifications ON candidate_certifications (candidate_id);
+CREATE TABLE IF NOT EXISTS candidate_projects (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    kunde TEXT,
+    rolle TEXT,
+    beginn TEXT,
+    ende TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_projects ON candidate_projects (ende, candidate_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts USING fts5(
+    content, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_MONTH_YEAR = re.compile(r'(\d{2})/(\d{4})')
+_YEAR = re.compile(r'\b(19|20)\d{2}\b')
+_FTS_TOKEN = re.compile(r'\w+')
+
+
+def default_index_path(base_dir=None):
+    """Pfad der Index-Datenbank (CV_CANDIDATE_INDEX oder <base_dir>/output/candidate_index.sqlite3)."""
+    configured = os.environ.get("CV_CANDIDATE_INDEX")
+    if configured:
+        return configured
+    return os.path.join(base_dir or os.getcwd(), "output", INDEX_FILENAME)
+
+
+def language_key(name):
+    """Vergleichsform eines Sprachnamens ("French", "französisch" -> "französisch")."""
+    key = normalize_term(name)
+    return normalize_term(LANGUAGE_MAPPING.get(key, key))
+
+
+def parse_level(value):
+    """Level 1-5 aus Zahl oder Text, 0 wenn unbekannt."""
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        return parse_level_text(value) or 0
+    return 0
+
+
+def parse_zeitraum(value):
+    """(beginn, ende) als YYYY-MM aus einem Zeitraum wie "01/2020 - heute", sonst (None, None)."""
+    if not isinstance(value, str):
+        return None, None
+    normalized = normalize_date(value)
+    dates = [f"{year}-{month}" for month, year in _MONTH_YEAR.findall(normalized)]
+    if not dates:
+        return None, None
+    if len(dates) >= 2:
+        return dates[0], dates[-1]
+    parts = normalized.split(" - ")
+    if len(parts) == 2 and parts[1].strip().lower() in OPEN_END:
+        return dates[0], OPEN_END_DATE
+    return dates[0], dates[0]
+
+
+def fts_query(text):
+    """Freitext -> FTS5-Abfrage: alle Wörter müssen vorkommen (als Präfix)."""
+    return " ".join(f'"{token}"*' for token in _FTS_TOKEN.findall(text or ""))
+
+
+def _texts(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if not str(key).startswith("_"):
+                yield from _texts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _texts(item)
+
+
+def _score(match_data):
+    """score_gesamt aus einem Matchmaking-Ergebnis als int oder None."""
+    if not isinstance(match_data, dict):
+        return None
+    score = (match_data.get("match_score") or {}).get("score_gesamt")
+    if isinstance(score, str):
+        score = score.replace('%', '').strip()
+        return int(score) if score.isdigit() else None
+    if isinstance(score, (int, float)) and not isinstance(score, bool):
+        return int(score)
+    return None
+
+
+def extract_skills(cv_data, index=None):
+    """Kanonische Skills eines CVs: Taxonomie-Treffer im ganzen Dokument plus Fachwissen-Einträge."""
+    index = index or get_skill_index()
+    skills = {normalize_term(name): name for name in index.skills_in(cv_data)}
+    for kategorie in cv_data.get("Fachwissen_und_Schwerpunkte") or []:
+        if not isinstance(kategorie, dict):
+            continue
+        for entry in kategorie.get("Inhalt") or []:
+            if isinstance(entry, str) and entry.strip() and not entry.startswith("!"):
+                name = index.canonical(entry.strip())
+                skills.setdefault(normalize_term(name), name)
+    return skills
+
+
+class CandidateIndex:
+    """SQLite-Index über CV-JSONs. Eine Verbindung pro Operation, daher threadsicher."""
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self):
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._initialized = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    # -------------------------------------
+    # Schreiben
+    # -------------------------------------
+    def add(self, cv_data, cv_path, match_score=None, mtime=None, size=None):
+        """Trägt ein CV ein (ersetzt einen bestehenden Eintrag für denselben Pfad). Gibt die ID zurück."""
+        cv_path = os.path.abspath(cv_path)
+        skills = extract_skills(cv_data)
+        hauptrolle = cv_data.get("Hauptrolle")
+        titel = hauptrolle.get("Titel") if isinstance(hauptrolle, dict) else hauptrolle
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT id, match_score FROM candidates WHERE cv_path = ?", (cv_path,)).fetchone()
+            if row:
+                if match_score is None:
+                    match_score = row["match_score"]
+                self._delete(conn, row["id"])
+            candidate_id = conn.execute(
+                "INSERT INTO candidates (cv_path, mtime, size, vorname, nachname, hauptrolle, match_score, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cv_path, mtime, size, cv_data.get("Vorname"), cv_data.get("Nachname"),
+                 titel if isinstance(titel, str) else None, match_score,
+                 datetime.now().isoformat(timespec="seconds"))
+            ).lastrowid
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO candidate_skills (skill_key, candidate_id, skill) VALUES (?, ?, ?)",
+                [(key, candidate_id, name) for key, name in skills.items()]
+            )
+            conn.executemany(
+                "INSERT INTO candidate_languages (candidate_id, sprache, level) VALUES (?, ?, ?)",
+                [
+                    (candidate_id, language_key(item["Sprache"]), parse_level(item.get("Level")))
+                    for item in cv_data.get("Sprachen") or []
+                    if isinstance(item, dict) and isinstance(item.get("Sprache"), str)
+                ]
+            )
+            certifications = []
+            for item in cv_data.get("Trainings_und_Zertifizierungen") or []:
+                if isinstance(item, dict):
+                    year = _YEAR.search(str(item.get("Zeitraum", "")))
+                    certifications.append((candidate_id, item.get("Titel"), item.get("Institution"),
+                                           int(year.group()) if year else None))
+            conn.executemany(
+                "INSERT INTO candidate_certifications (candidate_id, titel, institution, jahr) VALUES (?, ?, ?, ?)",
+                certifications
+            )
+            projects = []
+            for item in cv_data.get("Ausgewählte_Referenzprojekte") or []:
+                if isinstance(item, dict):
+                    beginn, ende = parse_zeitraum(item.get("Zeitraum"))
+                    projects.append((candidate_id, item.get("Kunde"), item.get("Rolle"), beginn, ende))
+            conn.executemany(
+                "INSERT INTO candidate_projects (candidate_id, kunde, rolle, beginn, ende) VALUES (?, ?, ?, ?, ?)",
+                projects
+            )
+            conn.execute(
+                "INSERT INTO candidate_fts (rowid, content) VALUES (?, ?)",
+                (candidate_id, "\n".join(_texts(cv_data)))
+            )
+        return candidate_id
+
+    def add_file(self, cv_path, match_score=None):
+        """Trägt eine cv_*.json-Datei ein. Unveränderte Dateien (mtime/Grösse) werden übersprungen."""
+        stat = os.stat(cv_path)
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT mtime, size FROM candidates WHERE cv_path = ?", (os.path.abspath(cv_path),)
+            ).fetchone()
+        if row and row["mtime"] == stat.st_mtime and row["size"] == stat.st_size:
+            return False
+        with open(cv_path, 'r', encoding='utf-8') as f:
+            cv_data = json.load(f)
+        self.add(cv_data, cv_path, match_score=match_score, mtime=stat.st_mtime, size=stat.st_size)
+        return True
+
+    def remove(self, cv_path):
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT id FROM candidates WHERE cv_path = ?", (os.path.abspath(cv_path),)).fetchone()
+            if row:
+                self._delete(conn, row["id"])
+        return bool(row)
+
+    @staticmethod
+    def _delete(conn, candidate_id):
+        conn.execute("DELETE FROM candidate_fts WHERE rowid = ?", (candidate_id,))
+        conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+
+    def sync(self, output_dir):
+        """
+        Gleicht den Index mit allen cv_*.json unter output_dir ab.
+
+        Returns:
+            (hinzugefügt/aktualisiert, entfernt)
+        """
+        output_dir = os.path.abspath(output_dir)
+        files = {os.path.abspath(p) for p in glob.glob(os.path.join(output_dir, "**", "cv_*.json"), recursive=True)}
+        with closing(self._connect()) as conn:
+            known = {row["cv_path"]: (row["mtime"], row["size"])
+                     for row in conn.execute("SELECT cv_path, mtime, size FROM candidates")}
+
+        added = 0
+        for path in sorted(files):
+            try:
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_mtime, stat.st_size):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    cv_data = json.load(f)
+                self.add(cv_data, path, mtime=stat.st_mtime, size=stat.st_size)
+                added += 1
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Kandidatenindex: {os.path.basename(path)} übersprungen ({e})")
+
+        stale = [path for path in known if path.startswith(output_dir + os.sep) and path not in files]
+        for path in stale:
+            self.remove(path)
+        return added, len(stale)
+
+    # -------------------------------------
+    # Suchen
+    # -------------------------------------
+    def search(self, text=None, skills=(), languages=None, certification=None, active_since=None, limit=50):
+        """
+        Sucht Kandidaten, alle Kriterien müssen erfüllt sein.
+
+        Args:
+            text: Freitext (alle Wörter, Präfix-Suche)
+            skills: Skills (Synonyme werden über die Taxonomie aufgelöst)
+            languages: {Sprache: Mindest-Level}, z.B. {"Französisch": 4}
+            certification: Teil des Titels oder der Institution eines Trainings
+            active_since: Projekt mit Ende ab diesem Monat/Jahr ("2022" oder "2022-06")
+            limit: maximale Anzahl Treffer
+
+        Returns:
+            Liste von dicts (id, vorname, nachname, hauptrolle, match_score, cv_path, skills)
+        """
+        where, params = [], []
+
+        query = fts_query(text)
+        if query:
+            where.append("c.id IN (SELECT rowid FROM candidate_fts WHERE candidate_fts MATCH ?)")
+            params.append(query)
+
+        index = get_skill_index()
+        skill_keys = sorted({normalize_term(index.canonical(s)) for s in skills if str(s).strip()})
+        if skill_keys:
+            where.append(
+                "c.id IN (SELECT candidate_id FROM candidate_skills WHERE skill_key IN ({})"
+                " GROUP BY candidate_id HAVING COUNT(*) = ?)".format(",".join("?" * len(skill_keys)))
+            )
+            params.extend(skill_keys)
+            params.append(len(skill_keys))
+
+        for sprache, level in (languages or {}).items():
+            where.append("c.id IN (SELECT candidate_id FROM candidate_languages WHERE sprache = ? AND level >= ?)")
+            params.extend([language_key(sprache), int(level or 0)])
+
+        if certification and certification.strip():
+            where.append(
+                "EXISTS (SELECT 1 FROM candidate_certifications z WHERE z.candidate_id = c.id"
+                " AND (instr(lower(z.titel), ?) OR instr(lower(z.institution), ?)))"
+            )
+            needle = certification.strip().lower()
+            params.extend([needle, needle])
+
+        if active_since:
+            since = str(active_since)
+            since = since if len(since) > 4 else f"{since}-01"
+            where.append("c.id IN (SELECT candidate_id FROM candidate_projects WHERE ende >= ?)")
+            params.append(since)
+
+        sql = (
+            "SELECT c.id, c.vorname, c.nachname, c.hauptrolle, c.match_score, c.cv_path, c.indexed_at"
+            " FROM candidates c"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY c.match_score IS NULL, c.match_score DESC, c.indexed_at DESC LIMIT ?"
+        )
+        params.append(int(limit))
+
+        with closing(self._connect()) as conn:
+            rows = [dict(row) for row in conn.execute(sql, params)]
+            if rows:
+                ids = [row["id"] for row in rows]
+                skills_by_id = {}
+                for row in conn.execute(
+                    "SELECT candidate_id, skill FROM candidate_skills WHERE candidate_id IN ({}) ORDER BY skill".format(
+                        ",".join("?" * len(ids))),
+                    ids
+                ):
+                    skills_by_id.setdefault(row["candidate_id"], []).append(row["skill"])
+                for row in rows:
+                    row["skills"] = skills_by_id.get(row["id"], [])
+        return rows
+
+    def stats(self):
+        """Anzahl indexierter CVs, Skills und Sprachen."""
+        with closing(self._connect()) as conn:
+            return {
+                "candidates": conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0],
+                "skills": conn.execute("SELECT COUNT(DISTINCT skill_key) FROM candidate_skills").fetchone()[0],
+                "languages": conn.execute("SELECT COUNT(DISTINCT sprache) FROM candidate_languages").fetchone()[0],
+            }
+
+    def languages(self):
+        """Alle indexierten Sprachen (für Auswahllisten)."""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT sprache FROM candidate_languages ORDER BY sprache")]
+
+
+def index_run(base_dir, cv_data, cv_path, match_data=None):
+    """
+    Trägt das CV eines abgeschlossenen Pipeline-Laufs in den Kandidatenindex ein.
+    Fehler werden nur gemeldet, der Lauf selbst bleibt erfolgreich.
+    """
+    try:
+        stat = os.stat(cv_path) if os.path.exists(cv_path) else None
+        CandidateIndex(default_index_path(base_dir)).add(
+            cv_data, cv_path, match_score=_score(match_data),
+            mtime=stat.st_mtime if stat else None, size=stat.st_size if stat else None
+        )
+    except Exception as e:
+        print(f"⚠️  Kandidatenindex konnte nicht aktualisiert werden: {e}")
@@ -7,6 +7,7 @@ from datetime import datetime
 sys.path.append(os.path.dirname(__file__))
 
 from visualize_results import generate_dashboard
+from run_store import get_run_store
 
 def create_test_data():
     # Base paths
@@ -51,8 +52,7 @@ def create_test_data():
     
     print(f"Dashboard created at: {dashboard_path}")
     
-    # Update run_history.json
-    history_path = os.path.join(base_dir, "output", "run_history.json")
+    # Lauf im Verlauf eintragen
     history_entry = {
         "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
         "candidate_name": "Test User (Validation Warnings)",
@@ -66,19 +66,7 @@ def create_test_data():
         "offer_word_path": None
     }
     
-    history = []
-    if os.path.exists(history_path):
-        with open(history_path, "r", encoding="utf-8") as f:
-            try:
-                history = json.load(f)
-            except:
-                pass
-    
-    # Insert at beginning
-    history.insert(0, history_entry)
-    
-    with open(history_path, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
+    get_run_store(base_dir).add_run(history_entry)
         
     print("Run history updated.")
 
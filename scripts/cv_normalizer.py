@@ -0,0 +1,266 @@
+"""
+Regelwerk für die Nachbearbeitung des extrahierten CV-JSON.
+
+normalize_json_structure hat das CV in mehreren getrennten Durchgängen korrigiert
+(Expertise entpacken, BulletList -> Inhalt, Skills neu kategorisieren, Referenzprojekte
+entpacken, Zeiträume, Sprachen). Die Korrekturen sind hier als deklarative Regeln
+beschrieben, die apply_rules in einem einzigen Durchgang anwendet:
+
+- DOCUMENT_RULES: Umbauten auf oberster Ebene (Felder umbenennen oder entpacken)
+- FIELD_RULES: je Array-Feld Regeln pro Element und optional eine Abschlussregel,
+  die das Ergebnis des Durchgangs (z.B. die drei Skill-Kategorien) zusammensetzt
+
+Die Skill-Kategorien (Schlüsselwörter für Kategorienamen, Methoden im Inhalt) kommen aus
+der Skill-Taxonomie (skill_taxonomy). Die Schlüsselwort-Suche für Sprachen und Sprach-Level
+läuft über vorkompilierte Alternationen statt verschachtelter any()-Schleifen.
+
+Jede Regel zählt ihre Treffer (Regel hat etwas geändert), abrufbar über rule_metrics().
+"""
+import re
+import threading
+from collections import Counter, namedtuple
+
+try:
+    from date_normalizer import ZEITRAUM_FIELDS, normalize_date
+    from skill_taxonomy import get_skill_index, keyword_pattern
+except ImportError:
+    from scripts.date_normalizer import ZEITRAUM_FIELDS, normalize_date
+    from scripts.skill_taxonomy import get_skill_index, keyword_pattern
+
+MISSING_MARKER = "! fehlt – bitte prüfen!"
+
+SKILL_CATEGORIES = ("Projektmethodik", "Tech Stack", "Weitere Skills")
+
+# Gängige Sprachen (Englisch -> Deutsch)
+LANGUAGE_MAPPING = {
+    "english": "Englisch",
+    "german": "Deutsch",
+    "french": "Französisch",
+    "italian": "Italienisch",
+    "spanish": "Spanisch",
+    "portuguese": "Portugiesisch",
+    "russian": "Russisch",
+    "chinese": "Chinesisch",
+    "japanese": "Japanisch"
+}
+
+NATIVE_LEVELS = frozenset(("muttersprache", "native", "native speaker"))
+# Stufe -> Schlüsselwörter der Text-Beschreibung, in Prüfreihenfolge
+LEVEL_KEYWORDS = (
+    (4, ("verhandlungssicher", "fluent", "business fluent", "c2", "c1")),
+    (3, ("sehr gute kenntnisse", "very good", "proficient", "b2")),
+    (2, ("gute kenntnisse", "good", "intermediate", "b1")),
+    (1, ("grundkenntnisse", "basic", "beginner", "a1", "a2")),
+)
+
+_LANGUAGES = keyword_pattern(LANGUAGE_MAPPING)
+_LEVEL_TEXTS = tuple((level, keyword_pattern(keywords)) for level, keywords in LEVEL_KEYWORDS)
+# Explizite Zahl ("Level 5", "5/5"), aber nicht "C1"
+_LEVEL_FRACTION = re.compile(r'\b[1-5]\s*/\s*5')
+_LEVEL_NUMBER = re.compile(r'^\s*[1-5]\s*$')
+_LEVEL_DIGIT = re.compile(r'([1-5])')
+
+Rule = namedtuple("Rule", "name apply")
+Rule.__doc__ = "Eine Korrektur: Name (für die Metriken) und Funktion, die True liefert, wenn sie etwas geändert hat."
+
+FieldRules = namedtuple("FieldRules", "items finish")
+FieldRules.__doc__ = "Regeln eines Array-Felds: pro Element (item, state) und Abschluss (data, field, state)."
+
+
+# -------------------------------------
+# Regeln auf oberster Ebene
+# -------------------------------------
+def _rename_hauptausbildung(data):
+    # Hauptausbildung -> Ausbildung (Abwärtskompatibilität)
+    if "Hauptausbildung" in data and "Ausbildung" not in data:
+        data["Ausbildung"] = data.pop("Hauptausbildung")
+        return True
+    return False
+
+
+def _unwrap_expertise(data):
+    # Expertise.Fachwissen_und_Schwerpunkte -> Fachwissen_und_Schwerpunkte
+    expertise = data.get("Expertise")
+    if isinstance(expertise, dict) and "Fachwissen_und_Schwerpunkte" in expertise:
+        data["Fachwissen_und_Schwerpunkte"] = expertise["Fachwissen_und_Schwerpunkte"]
+        del data["Expertise"]
+        return True
+    return False
+
+
+def _unwrap_referenzprojekte(data):
+    # Ausgewählte_Referenzprojekte.Referenzprojekte -> Ausgewählte_Referenzprojekte
+    projekte = data.get("Ausgewählte_Referenzprojekte")
+    if isinstance(projekte, dict) and "Referenzprojekte" in projekte:
+        data["Ausgewählte_Referenzprojekte"] = projekte["Referenzprojekte"]
+        return True
+    return False
+
+
+# -------------------------------------
+# Regeln pro Element
+# -------------------------------------
+def _bulletlist_to_inhalt(item, state):
+    if "BulletList" in item and "Inhalt" not in item:
+        item["Inhalt"] = item.pop("BulletList")
+        return True
+    return False
+
+
+def _classify_skill(item, state):
+    """Ordnet die Inhalte einer Kategorie einer der drei Standard-Kategorien zu."""
+    index = get_skill_index()
+    inhalt = item.get("Inhalt", [])
+
+    # Kategorie-Schlüsselwörter der Taxonomie (Projektmethodik hat Priorität)
+    category = index.categorize(item.get("Kategorie", ""))
+    if category is None:
+        # Kategorie unklar: Methoden im Inhalt (Skills der Kategorie Projektmethodik)?
+        if any(index.mentions(i, "Projektmethodik") for i in inhalt):
+            category = "Projektmethodik"
+        else:
+            category = "Weitere Skills"
+
+    state.setdefault(category, []).extend(inhalt)
+    return item.get("Kategorie") != category
+
+
+def _normalize_zeitraum(item, state):
+    if "Zeitraum" not in item:
+        return False
+    value = item["Zeitraum"]
+    item["Zeitraum"] = normalize_date(value)
+    return item["Zeitraum"] != value
+
+
+def _normalize_sprache(item, state):
+    sprache = item.get("Sprache")
+    if not isinstance(sprache, str):
+        return False
+    lang_lower = sprache.lower().strip()
+    mapped = LANGUAGE_MAPPING.get(lang_lower)
+    if mapped is None and _LANGUAGES.search(lang_lower):
+        # "English (Native)" -> "Englisch" (erster Treffer in Reihenfolge des Mappings)
+        mapped = next(v for k, v in LANGUAGE_MAPPING.items() if k in lang_lower)
+    if mapped is None:
+        return False
+    item["Sprache"] = mapped
+    return mapped != sprache
+
+
+def parse_level_text(level):
+    """
+    Stufe 1-5 aus einer Level-Beschreibung oder None, wenn nichts erkannt wird.
+
+    Priorität: Sterne, explizite Zahl ("5/5", "3"), Text ("Muttersprache", "C1", ...).
+    """
+    if "★" in level or "*" in level:
+        return min(level.count("★") + level.count("*"), 5)
+    if _LEVEL_FRACTION.search(level) or _LEVEL_NUMBER.match(level):
+        return int(_LEVEL_DIGIT.search(level).group(1))
+    lower = level.lower()
+    if lower in NATIVE_LEVELS:
+        return 5
+    for value, pattern in _LEVEL_TEXTS:
+        if pattern.search(lower):
+            return value
+    return None
+
+
+def _normalize_level(item, state):
+    level = item.get("Level")
+    if not isinstance(level, str):
+        return False
+    value = parse_level_text(level)
+    if value is None:
+        return False
+    item["Level"] = value
+    return True
+
+
+# -------------------------------------
+# Abschlussregeln
+# -------------------------------------
+def _build_skill_categories(data, field, state):
+    """Erzwingt die feste Struktur mit drei Kategorien (leere mit Platzhalter)."""
+    categories = [
+        {"Kategorie": name, "Inhalt": state.get(name) or [MISSING_MARKER]}
+        for name in SKILL_CATEGORIES
+    ]
+    changed = categories != data[field]
+    data[field] = categories
+    return changed
+
+
+DOCUMENT_RULES = (
+    Rule("hauptausbildung_umbenannt", _rename_hauptausbildung),
+    Rule("expertise_entpackt", _unwrap_expertise),
+    Rule("referenzprojekte_entpackt", _unwrap_referenzprojekte),
+)
+
+_ZEITRAUM = (Rule("zeitraum_normalisiert", _normalize_zeitraum),)
+
+FIELD_RULES = {
+    "Fachwissen_und_Schwerpunkte": FieldRules(
+        items=(Rule("bulletlist_zu_inhalt", _bulletlist_to_inhalt),
+               Rule("skill_kategorie_zugeordnet", _classify_skill)),
+        finish=Rule("fachwissen_drei_kategorien", _build_skill_categories),
+    ),
+    **{field: FieldRules(items=_ZEITRAUM, finish=None) for field in ZEITRAUM_FIELDS},
+    "Sprachen": FieldRules(
+        items=(Rule("sprache_uebersetzt", _normalize_sprache),
+               Rule("level_normalisiert", _normalize_level)),
+        finish=None,
+    ),
+}
+
+RULE_NAMES = tuple(dict.fromkeys(
+    [rule.name for rule in DOCUMENT_RULES]
+    + [rule.name for rules in FIELD_RULES.values() for rule in rules.items]
+    + [rules.finish.name for rules in FIELD_RULES.values() if rules.finish]
+))
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def apply_rules(data):
+    """
+    Wendet alle Regeln in einem Durchgang auf ein CV-Dict an (in-place).
+
+    Returns:
+        Counter Regelname -> Treffer für dieses Dokument
+    """
+    hits = Counter()
+    for rule in DOCUMENT_RULES:
+        if rule.apply(data):
+            hits[rule.name] += 1
+
+    for field, rules in FIELD_RULES.items():
+        items = data.get(field)
+        if not isinstance(items, list):
+            continue
+        state = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for rule in rules.items:
+                if rule.apply(item, state):
+                    hits[rule.name] += 1
+        if rules.finish and rules.finish.apply(data, field, state):
+            hits[rules.finish.name] += 1
+
+    with _metrics_lock:
+        _metrics.update(hits)
+    return hits
+
+
+def rule_metrics():
+    """Treffer pro Regel seit Prozessstart (bzw. seit reset_rule_metrics)."""
+    with _metrics_lock:
+        return {name: _metrics[name] for name in RULE_NAMES}
+
+
+def reset_rule_metrics():
+    with _metrics_lock:
+        _metrics.clear()
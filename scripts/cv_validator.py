@@ -0,0 +1,300 @@
+"""
+Kompilierter Validator für CV-JSON.
+
+validate_json_structure war eine Folge handgeschriebener Schleifen über das CV-Dict.
+Der Validator wird stattdessen einmal pro Prozess aus scripts/pdf_to_json_schema.json
+erzeugt (Pflichtfelder, Objekte, Arrays, String-Felder) und um die projektspezifischen
+Regeln ergänzt:
+
+- Hauptrolle.Beschreibung sollte 5-10 Wörter haben
+- Sprachen[].Level: Zahl 1-5, Text der Niveau-Skala ("Muttersprache", ...) oder Kombination
+- Schema-Pflichtfelder, die beim Rendern toleriert werden (Technologien, Methodik), werden
+  nicht gemeldet
+
+Jeder Befund ist ein ValidationIssue mit maschinenlesbarem Pfad (z.B. ("Sprachen", 0, "Level")),
+Schweregrad (critical/info), Code und der bisherigen deutschen Meldung.
+
+Ergebnisse werden unter dem Dokument-Hash gemerkt, wenn der Aufrufer ihn bereits kennt
+(z.B. generate_cv über den Render-Cache). Die Validierung selbst ist billiger als das
+Hashen des Dokuments, ohne Hash wird deshalb direkt validiert.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+try:
+    from schema_registry import get_schema
+except ImportError:
+    from scripts.schema_registry import get_schema
+
+CV_JSON_SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdf_to_json_schema.json")
+
+CRITICAL = "critical"
+INFO = "info"
+
+# Niveau-Skala (Text -> Stufe), siehe "language_levels" im Schema
+LEVEL_TEXTS = {
+    "Muttersprache": 5,
+    "Verhandlungssicher": 4,
+    "Sehr gute Kenntnisse": 3,
+    "Gute Kenntnisse": 2,
+    "Grundkenntnisse": 1,
+}
+
+_LEADING_NUMBER = re.compile(r'\d+')
+
+# Schema-Pflichtfelder, die generate_cv bei Fehlen leer rendert
+TOLERATED_FIELDS = {
+    ("Ausgewählte_Referenzprojekte", "Technologien"),
+    ("Ausgewählte_Referenzprojekte", "Methodik"),
+}
+
+MEMO_SIZE = 256
+
+ValidationIssue = namedtuple("ValidationIssue", "path severity code message")
+ValidationIssue.__doc__ = "Ein Befund: Pfad (Tupel), Schweregrad, Code und Meldung."
+
+
+def parse_level(level):
+    """Parst das Level zu einer Zahl 1-5"""
+    if isinstance(level, int):
+        return level
+    if isinstance(level, str):
+        level = level.strip()
+        # Versuche Zahl am Anfang
+        match = _LEADING_NUMBER.match(level)
+        if match:
+            return int(match.group())
+        # Mappe Text
+        return LEVEL_TEXTS.get(level, 0)
+    return 0
+
+
+def is_valid_level(level):
+    """Prüft, ob das Level gültig ist"""
+    if isinstance(level, int) and 1 <= level <= 5:
+        return True
+    if isinstance(level, str):
+        level = level.strip()
+        if level in LEVEL_TEXTS:
+            return True
+        match = _LEADING_NUMBER.match(level)
+        if match:
+            return 1 <= int(match.group()) <= 5
+    return False
+
+
+class ValidationResult:
+    """Alle Befunde einer Validierung (unveränderlich, daher sicher memoisierbar)."""
+
+    __slots__ = ("issues",)
+
+    def __init__(self, issues):
+        self.issues = tuple(issues)
+
+    def __iter__(self):
+        return iter(self.issues)
+
+    def __len__(self):
+        return len(self.issues)
+
+    @property
+    def critical(self):
+        return [issue.message for issue in self.issues if issue.severity == CRITICAL]
+
+    @property
+    def info(self):
+        return [issue.message for issue in self.issues if issue.severity == INFO]
+
+    def to_list(self):
+        """Befunde als JSON-serialisierbare Liste (Pfad als "Sprachen[0].Level")."""
+        return [
+            {"path": format_path(issue.path), "severity": issue.severity, "code": issue.code, "message": issue.message}
+            for issue in self.issues
+        ]
+
+
+def format_path(path):
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else part)
+    return text
+
+
+# -------------------------------------
+# Projektspezifische Regeln
+# -------------------------------------
+def _hauptrolle_rule(value, issues):
+    word_count = len(str(value["Beschreibung"]).split())
+    if word_count < 5 or word_count > 10:
+        issues.append(ValidationIssue(
+            ("Hauptrolle", "Beschreibung"), INFO, "word_count",
+            f"Hauptrolle.Beschreibung sollte 5-10 Wörter haben (aktuell {word_count})"
+        ))
+
+
+def _level_rule(field, i, item, issues):
+    if "Level" not in item or not is_valid_level(item["Level"]):
+        issues.append(ValidationIssue(
+            (field, i, "Level"), INFO, "level",
+            f"{field}[{i}]: Ungültiges oder fehlendes Feld 'Level' (muss eine Zahl 1-5, Text wie 'Muttersprache' oder Kombination sein)"
+        ))
+
+
+# Feld -> Regel für gültige Objekte (nach der Strukturprüfung)
+FIELD_RULES = {"Hauptrolle": _hauptrolle_rule}
+# (Array-Feld, Element-Feld) -> Regel anstelle der generischen Pflichtfeld-Prüfung
+ITEM_RULES = {("Sprachen", "Level"): _level_rule}
+
+
+# -------------------------------------
+# Compiler: Schema -> Prüffunktionen
+# -------------------------------------
+def _compile_field(field, spec):
+    kind = spec.get("type")
+    if kind == "object":
+        required = tuple(spec.get("required", ()))
+        message = f"Feld '{field}' muss ein Objekt mit " + " und ".join(f"'{r}'" for r in required) + " sein"
+        rule = FIELD_RULES.get(field)
+
+        def check(value, issues):
+            if not isinstance(value, dict) or any(r not in value for r in required):
+                issues.append(ValidationIssue((field,), CRITICAL, "type", message))
+            elif rule:
+                rule(value, issues)
+        return check
+
+    if kind == "array":
+        message = f"Feld '{field}' muss ein Array sein"
+
+        def check(value, issues):
+            if not isinstance(value, list):
+                issues.append(ValidationIssue((field,), CRITICAL, "type", message))
+        return check
+
+    if kind == "string":
+        def check(value, issues):
+            if not isinstance(value, str):
+                issues.append(ValidationIssue(
+                    (field,), INFO, "type",
+                    f"Feld '{field}' sollte ein String sein (ist {type(value).__name__})"
+                ))
+        return check
+
+    return None
+
+
+def _compile_items(field, spec):
+    items = spec.get("items")
+    if isinstance(items, list):
+        # Tupel-Schema (z.B. die drei Fachwissen-Kategorien): gleiche Struktur je Position
+        items = items[0] if items else None
+    if not items or items.get("type") != "object":
+        return None
+
+    properties = items.get("properties", {})
+    rules = [rule for (array_field, _), rule in ITEM_RULES.items() if array_field == field]
+    skipped = {name for (array_field, name) in ITEM_RULES if array_field == field}
+    skipped |= {name for (array_field, name) in TOLERATED_FIELDS if array_field == field}
+    required = tuple(r for r in items.get("required", ()) if r not in skipped)
+    arrays = tuple(name for name in required if properties.get(name, {}).get("type") == "array")
+
+    def check(values, issues):
+        append = issues.append
+        for i, item in enumerate(values):
+            if not isinstance(item, dict):
+                append(ValidationIssue((field, i), CRITICAL, "type", f"{field}[{i}]: Muss ein Objekt sein"))
+                continue
+            for req in required:
+                if req not in item:
+                    append(ValidationIssue((field, i, req), CRITICAL, "missing", f"{field}[{i}]: Fehlendes Feld '{req}'"))
+            for name in arrays:
+                if name in item and not isinstance(item[name], list):
+                    append(ValidationIssue((field, i, name), CRITICAL, "type", f"{field}[{i}]: '{name}' muss ein Array sein"))
+            for rule in rules:
+                rule(field, i, item, issues)
+    return check
+
+
+def compile_cv_validator(schema):
+    """
+    Erzeugt aus einem CV-JSON-Schema eine Prüffunktion data -> [ValidationIssue].
+    Reihenfolge der Befunde: erst alle Top-Level-Felder, dann die Array-Elemente.
+    """
+    properties = schema.get("properties", {})
+    fields = [(field, _compile_field(field, properties.get(field, {}))) for field in schema.get("required", ())]
+    item_checks = [
+        (field, check) for field, check in
+        ((field, _compile_items(field, spec)) for field, spec in properties.items() if spec.get("type") == "array")
+        if check
+    ]
+
+    def validate(data):
+        issues = []
+        if not isinstance(data, dict):
+            return [ValidationIssue((), CRITICAL, "type", "CV-JSON muss ein Objekt sein")]
+        for field, check in fields:
+            if field not in data:
+                issues.append(ValidationIssue((field,), CRITICAL, "missing", f"Fehlendes Feld: {field}"))
+            elif data[field] is None:
+                issues.append(ValidationIssue((field,), CRITICAL, "none", f"Feld ist None: {field}"))
+            elif check:
+                check(data[field], issues)
+        for field, check in item_checks:
+            values = data.get(field)
+            if isinstance(values, list):
+                check(values, issues)
+        return issues
+    return validate
+
+
+_validator = None
+_compile_lock = threading.Lock()
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def get_cv_validator():
+    """Liefert den kompilierten Validator (einmal pro Prozess aus dem Schema erzeugt)."""
+    global _validator
+    if _validator is None:
+        with _compile_lock:
+            if _validator is None:
+                _validator = compile_cv_validator(get_schema(CV_JSON_SCHEMA_PATH).content)
+    return _validator
+
+
+def validate_cv(data, doc_hash=None):
+    """
+    Validiert ein CV-Dict.
+
+    Args:
+        data: CV als JSON-Dict
+        doc_hash: Optionaler Hash des Dokuments (z.B. render_cache.canonical_json_hash);
+            mit Hash wird das Ergebnis gemerkt und bei erneutem Aufruf direkt geliefert
+
+    Returns:
+        ValidationResult
+    """
+    if doc_hash is not None:
+        result = _memo.get(doc_hash)
+        if result is not None:
+            with _memo_lock:
+                if doc_hash in _memo:
+                    _memo.move_to_end(doc_hash)
+            return result
+
+    result = ValidationResult(get_cv_validator()(data))
+
+    if doc_hash is not None:
+        with _memo_lock:
+            _memo[doc_hash] = result
+            while len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+    return result
+
+
+def clear_validation_memo():
+    with _memo_lock:
+        _memo.clear()
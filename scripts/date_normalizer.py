@@ -0,0 +1,137 @@
+"""
+Tabellengesteuerte Normalisierung von Zeitangaben zu MM/YYYY.
+
+normalize_date_format in pdf_to_json hat bei jedem Aufruf die Monatstabelle neu aufgebaut,
+die Muster neu nachgeschlagen und Zeiträume rekursiv zerlegt. Hier liegen Tabelle und
+Muster einmal auf Modulebene, Ergebnisse für wiederkehrende Strings (z.B. "heute",
+"2020 - 2021") werden in einem LRU-Cache gemerkt.
+
+normalize_zeitraum_fields normalisiert alle Zeitraum-Felder (Aus- und Weiterbildung,
+Trainings, Referenzprojekte) eines oder mehrerer CV-Dicts in einem Durchgang.
+
+Die Ergebnisse sind identisch mit der bisherigen Funktion (siehe tests/test_date_normalizer.py).
+"""
+import re
+from functools import lru_cache
+
+# Werte, die unverändert bleiben (Vergleich nach strip().lower())
+OPEN_END = frozenset(('heute', 'today', 'present', 'aktuell'))
+
+# Monatsnamen (Deutsch und Englisch) -> MM. Punkte trennt der Tokenizer ab,
+# "Jan." wird also über "jan" gefunden.
+MONTHS = {
+    'januar': '01', 'jan': '01',
+    'februar': '02', 'feb': '02',
+    'märz': '03', 'mrz': '03', 'mar': '03', 'mär': '03',
+    'april': '04', 'apr': '04',
+    'mai': '05',
+    'juni': '06', 'jun': '06',
+    'juli': '07', 'jul': '07',
+    'august': '08', 'aug': '08',
+    'september': '09', 'sep': '09', 'sept': '09',
+    'oktober': '10', 'okt': '10', 'oct': '10',
+    'november': '11', 'nov': '11',
+    'dezember': '12', 'dez': '12', 'dec': '12',
+}
+
+# Trenner für Zeiträume, in Prioritätsreihenfolge (Bindestrich, Halbgeviert-, Geviertstrich)
+RANGE_SEPARATORS = (' - ', ' – ', ' — ')
+
+ZEITRAUM_FIELDS = ("Aus_und_Weiterbildung", "Trainings_und_Zertifizierungen", "Ausgewählte_Referenzprojekte")
+
+CACHE_SIZE = 4096
+
+_MONTH_YEAR = re.compile(r'^\d{2}[/\.]\d{4}$')
+_YEAR = re.compile(r'^\d{4}$')
+_TOKEN_SPLIT = re.compile(r'[\s.]+')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize(date_str):
+    stripped = date_str.strip()
+    if stripped.lower() in OPEN_END:
+        return date_str
+
+    # Zeiträume zuerst: beide Seiten einzeln normalisieren
+    for separator in RANGE_SEPARATORS:
+        if separator in date_str:
+            parts = date_str.split(separator)
+            if len(parts) == 2:
+                return f"{normalize_date(parts[0].strip())} - {normalize_date(parts[1].strip())}"
+            break
+
+    # "MM/YYYY" oder "MM.YYYY"
+    if _MONTH_YEAR.match(stripped):
+        return date_str.replace('.', '/')
+
+    # "YYYY" -> "01/YYYY"
+    if _YEAR.match(stripped):
+        return f"01/{stripped}"
+
+    # "Monat YYYY", "MMM. YYYY"
+    parts = [p for p in _TOKEN_SPLIT.split(stripped.lower()) if p]
+    if len(parts) >= 2:
+        month = MONTHS.get(parts[0])
+        if month and _YEAR.match(parts[-1]):
+            return f"{month}/{parts[-1]}"
+
+    return date_str
+
+
+def normalize_date(date_str):
+    """
+    Konvertiert verschiedene Datumsformate zu MM/YYYY
+
+    Beispiele:
+    - "2020" -> "01/2020"
+    - "Jan 2020" -> "01/2020"
+    - "Januar 2020" -> "01/2020"
+    - "2020 - 2021" -> "01/2020 - 01/2021"
+    - "heute" -> "heute" (unverändert)
+
+    Leere Werte und Nicht-Strings werden unverändert zurückgegeben.
+    """
+    if not date_str or not isinstance(date_str, str):
+        return date_str
+    if type(date_str) is not str:
+        # str-Unterklassen nicht im Cache ablegen (Identität der Rückgabe bleibt erhalten)
+        return _normalize.__wrapped__(date_str)
+    return _normalize(date_str)
+
+
+def normalize_zeitraum_fields(docs):
+    """
+    Normalisiert alle Zeitraum-Felder eines oder mehrerer CV-Dicts (in-place).
+
+    Args:
+        docs: CV-Dict oder Liste von CV-Dicts
+
+    Returns:
+        Anzahl geänderter Felder
+    """
+    if isinstance(docs, dict):
+        docs = (docs,)
+
+    changed = 0
+    for data in docs:
+        for field in ZEITRAUM_FIELDS:
+            items = data.get(field)
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, dict) and "Zeitraum" in item:
+                    value = item["Zeitraum"]
+                    normalized = normalize_date(value)
+                    if normalized != value:
+                        item["Zeitraum"] = normalized
+                        changed += 1
+    return changed
+
+
+def cache_info():
+    """Statistik des LRU-Caches (hits, misses, maxsize, currsize)."""
+    return _normalize.cache_info()
+
+
+def clear_cache():
+    _normalize.cache_clear()
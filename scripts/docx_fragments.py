@@ -0,0 +1,77 @@
+"""
+Vorgeparste OOXML-Fragmente für die Word-Generierung.
+
+Die Rahmen-, Schattierungs- und Tabelleneigenschaften sind für jede Zelle identisch.
+Statt sie pro Zelle mit parse_xml neu zu parsen, werden sie hier einmal beim Import
+geparst und pro Verwendung nur noch als lxml-Element geklont.
+"""
+from copy import deepcopy
+
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+_NONE_BORDER = '<w:%s w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+
+# Tabellenrahmen (alle Seiten + Innenlinien) ausgeblendet
+TABLE_BORDERS_NONE = parse_xml(
+    '<w:tBorders %s>' % nsdecls('w')
+    + ''.join(_NONE_BORDER % side for side in ("top", "left", "bottom", "right", "insideH", "insideV"))
+    + '</w:tBorders>'
+)
+
+# Zellrahmen ausgeblendet
+CELL_BORDERS_NONE = parse_xml(
+    '<w:tcBorders %s>' % nsdecls('w')
+    + ''.join(_NONE_BORDER % side for side in ("top", "left", "bottom", "right"))
+    + '</w:tcBorders>'
+)
+
+# Leere Tabelleneigenschaften (falls eine Tabelle noch kein tblPr hat)
+TABLE_PROPERTIES_EMPTY = parse_xml('<w:tblPr %s></w:tblPr>' % nsdecls('w'))
+
+# Schattierungen werden pro Füllfarbe einmal gebaut und danach nur noch geklont
+_shading_cache = {}
+
+
+def clone(fragment):
+    """Gibt eine unabhängige Kopie eines vorgeparsten Fragments zurück."""
+    return deepcopy(fragment)
+
+
+def cell_shading(fill_color):
+    """Liefert ein w:shd-Element mit der gewünschten Füllfarbe (z.B. 'FFFFFF')."""
+    fragment = _shading_cache.get(fill_color)
+    if fragment is None:
+        fragment = parse_xml('<w:shd %s w:fill="%s"/>' % (nsdecls('w'), fill_color))
+        _shading_cache[fill_color] = fragment
+    return deepcopy(fragment)
+
+
+def remove_table_borders(table):
+    """Blendet alle Rahmen einer python-docx Tabelle aus."""
+    tbl = table._element
+    tblPr = tbl.tblPr
+    if tblPr is None:
+        tblPr = clone(TABLE_PROPERTIES_EMPTY)
+        tbl.insert(0, tblPr)
+
+    existing_borders = tblPr.find(qn('w:tBorders'))
+    if existing_borders is not None:
+        tblPr.remove(existing_borders)
+    tblPr.append(clone(TABLE_BORDERS_NONE))
+
+
+def remove_cell_borders(cell):
+    """Blendet die Rahmen einer einzelnen Zelle aus."""
+    tcPr = cell._element.get_or_add_tcPr()
+    existing = tcPr.find(qn('w:tcBorders'))
+    if existing is not None:
+        tcPr.remove(existing)
+    tcPr.append(clone(CELL_BORDERS_NONE))
+
+
+def set_cell_background_and_borders(cell, fill_color='FFFFFF'):
+    """Setzt die Hintergrundfarbe einer Zelle und blendet ihre Rahmen aus."""
+    tcPr = cell._element.get_or_add_tcPr()
+    tcPr.append(cell_shading(fill_color))
+    tcPr.append(clone(CELL_BORDERS_NONE))
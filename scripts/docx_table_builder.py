@@ -0,0 +1,220 @@
+"""
+Bulk-Tabellenbau für die Word-Generierung.
+
+python-docx baut bei jedem Zugriff auf table.rows[i].cells[j] die Zellliste neu auf,
+wodurch grosse Tabellen quadratisch teuer werden. Dieses Modul baut stattdessen den
+kompletten w:tbl-Baum in einem Durchgang aus einer Zeilen/Spalten-Matrix von
+formatierten Runs und hängt ihn danach als Ganzes an den Dokumentkörper an.
+
+Eine Zelle wird als Dictionary beschrieben:
+    {"paragraphs": [paragraph, ...], "v_align": "top"}
+Ein Absatz:
+    {"runs": [run, ...], "alignment": "left", "space_before": 0, "space_after": 3,
+     "line_spacing": 1.0}
+Ein Run (siehe styled_run):
+    {"text": "...", "font": "Aptos", "size": 11, "color": (0, 0, 0), "bold": False,
+     "highlight": False, "break_after": False}
+"""
+import re
+from copy import deepcopy
+
+from lxml import etree
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Emu, Pt
+
+try:
+    from docx_fragments import TABLE_BORDERS_NONE, CELL_BORDERS_NONE, clone
+except ImportError:
+    from scripts.docx_fragments import TABLE_BORDERS_NONE, CELL_BORDERS_NONE, clone
+
+_W_TBL_PR = qn('w:tblPr')
+_W_TBL_W = qn('w:tblW')
+_W_TBL_LOOK = qn('w:tblLook')
+_W_TBL_GRID = qn('w:tblGrid')
+_W_GRID_COL = qn('w:gridCol')
+_W_TR = qn('w:tr')
+_W_TR_PR = qn('w:trPr')
+_W_TR_HEIGHT = qn('w:trHeight')
+_W_TC = qn('w:tc')
+_W_TC_PR = qn('w:tcPr')
+_W_TC_W = qn('w:tcW')
+_W_V_ALIGN = qn('w:vAlign')
+_W_P = qn('w:p')
+_W_P_PR = qn('w:pPr')
+_W_SPACING = qn('w:spacing')
+_W_JC = qn('w:jc')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_BR = qn('w:br')
+_W_TAB = qn('w:tab')
+_W_VAL = qn('w:val')
+_W_W = qn('w:w')
+_W_TYPE = qn('w:type')
+_XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
+_TBL_LOOK_ATTRS = (
+    ('firstColumn', '1'), ('firstRow', '1'), ('lastColumn', '0'),
+    ('lastRow', '0'), ('noHBand', '0'), ('noVBand', '1'), ('val', '04A0'),
+)
+
+# Run-Eigenschaften werden pro Formatkombination einmal gebaut und danach geklont
+_rpr_cache = {}
+
+
+def styled_run(text, font, size, color, bold=False, highlight=False, break_after=False):
+    """Beschreibt einen formatierten Run für build_table."""
+    return {
+        "text": text,
+        "font": font,
+        "size": size,
+        "color": tuple(color),
+        "bold": bold,
+        "highlight": highlight,
+        "break_after": break_after,
+    }
+
+
+def _twips(length):
+    """Rechnet eine python-docx Länge (EMU, auch float) in Twips um."""
+    return Emu(length).twips
+
+
+def _run_properties(font, size, color, bold, highlight):
+    key = (font, size, color, bold, highlight)
+    rPr = _rpr_cache.get(key)
+    if rPr is None:
+        rPr = OxmlElement('w:rPr')
+        rFonts = etree.SubElement(rPr, qn('w:rFonts'))
+        rFonts.set(qn('w:ascii'), font)
+        rFonts.set(qn('w:hAnsi'), font)
+        if bold:
+            etree.SubElement(rPr, qn('w:b'))
+        etree.SubElement(rPr, qn('w:color')).set(_W_VAL, '%02X%02X%02X' % color)
+        etree.SubElement(rPr, qn('w:sz')).set(_W_VAL, str(int(Pt(size).pt * 2)))
+        if highlight:
+            etree.SubElement(rPr, qn('w:highlight')).set(_W_VAL, 'yellow')
+        _rpr_cache[key] = rPr
+    return deepcopy(rPr)
+
+
+def _append_text(r, text):
+    t = etree.SubElement(r, _W_T)
+    t.text = text
+    if text[:1].isspace() or text[-1:].isspace():
+        t.set(_XML_SPACE, 'preserve')
+
+
+def _append_run(p, run):
+    r = etree.SubElement(p, _W_R)
+    r.append(_run_properties(run["font"], run["size"], run["color"], run["bold"], run["highlight"]))
+    text = run["text"]
+    if '\n' in text or '\t' in text or '\r' in text:
+        # Wie python-docx: Zeilenumbrüche und Tabulatoren als eigene Elemente
+        for part in re.split(r'(\r\n|[\n\r\t])', text):
+            if part == '\t':
+                etree.SubElement(r, _W_TAB)
+            elif part in ('\n', '\r', '\r\n'):
+                etree.SubElement(r, _W_BR)
+            elif part:
+                _append_text(r, part)
+    elif text:
+        _append_text(r, text)
+    if run.get("break_after"):
+        etree.SubElement(r, _W_BR)
+
+
+def _append_paragraph(tc, paragraph):
+    p = etree.SubElement(tc, _W_P)
+    space_before = paragraph.get("space_before")
+    space_after = paragraph.get("space_after")
+    line_spacing = paragraph.get("line_spacing")
+    alignment = paragraph.get("alignment")
+
+    if space_before is not None or space_after is not None or line_spacing is not None or alignment:
+        pPr = etree.SubElement(p, _W_P_PR)
+        if space_before is not None or space_after is not None or line_spacing is not None:
+            spacing = etree.SubElement(pPr, _W_SPACING)
+            if space_before is not None:
+                spacing.set(qn('w:before'), str(_twips(Pt(space_before))))
+            if space_after is not None:
+                spacing.set(qn('w:after'), str(_twips(Pt(space_after))))
+            if line_spacing is not None:
+                spacing.set(qn('w:line'), str(int(round(line_spacing * 240))))
+                spacing.set(qn('w:lineRule'), 'auto')
+        if alignment:
+            etree.SubElement(pPr, _W_JC).set(_W_VAL, alignment)
+
+    for run in paragraph.get("runs", []):
+        if run["text"] or run.get("break_after"):
+            _append_run(p, run)
+
+
+def build_table(rows, col_widths, block_width, row_height=None, row_height_rule='atLeast', cell_borders=True):
+    """
+    Baut ein randloses w:tbl-Element in einem Durchgang.
+
+    Args:
+        rows: Liste von Zeilen, jede Zeile eine Liste von Zell-Dictionaries
+        col_widths: Spaltenbreiten als python-docx Längen (für w:tcW)
+        block_width: Verfügbare Breite zwischen den Seitenrändern (für w:tblGrid)
+        row_height: Optionale Höhe jeder Zeile in Punkt
+        row_height_rule: 'atLeast' oder 'exact' (w:hRule)
+        cell_borders: Wenn True, werden die Rahmen jeder Zelle ausgeblendet
+
+    Returns:
+        CT_Tbl-Element, bereit zum Anhängen mit append_table
+    """
+    cols = len(col_widths)
+    tbl = OxmlElement('w:tbl')
+
+    tblPr = etree.SubElement(tbl, _W_TBL_PR)
+    tblW = etree.SubElement(tblPr, _W_TBL_W)
+    tblW.set(_W_TYPE, 'auto')
+    tblW.set(_W_W, '0')
+    tblLook = etree.SubElement(tblPr, _W_TBL_LOOK)
+    for name, value in _TBL_LOOK_ATTRS:
+        tblLook.set(qn('w:%s' % name), value)
+    tblPr.append(clone(TABLE_BORDERS_NONE))
+
+    grid = etree.SubElement(tbl, _W_TBL_GRID)
+    grid_col_width = str(_twips(Emu(block_width // cols)))
+    for _ in range(cols):
+        etree.SubElement(grid, _W_GRID_COL).set(_W_W, grid_col_width)
+
+    tc_widths = [str(_twips(width)) for width in col_widths]
+    row_height_twips = str(_twips(Pt(row_height))) if row_height else None
+
+    for row in rows:
+        tr = etree.SubElement(tbl, _W_TR)
+        if row_height_twips:
+            trHeight = etree.SubElement(etree.SubElement(tr, _W_TR_PR), _W_TR_HEIGHT)
+            trHeight.set(_W_VAL, row_height_twips)
+            trHeight.set(qn('w:hRule'), row_height_rule)
+
+        for col, cell in enumerate(row):
+            tc = etree.SubElement(tr, _W_TC)
+            tcPr = etree.SubElement(tc, _W_TC_PR)
+            tcW = etree.SubElement(tcPr, _W_TC_W)
+            tcW.set(_W_TYPE, 'dxa')
+            tcW.set(_W_W, tc_widths[col])
+            if cell_borders:
+                tcPr.append(clone(CELL_BORDERS_NONE))
+            if cell.get("v_align"):
+                etree.SubElement(tcPr, _W_V_ALIGN).set(_W_VAL, cell["v_align"])
+
+            for paragraph in cell.get("paragraphs") or [{}]:
+                _append_paragraph(tc, paragraph)
+
+    return tbl
+
+
+def append_table(doc, tbl):
+    """Hängt ein fertiges w:tbl-Element vor den Abschnittseigenschaften an den Dokumentkörper."""
+    body = doc.element.body
+    sectPr = body.find(qn('w:sectPr'))
+    if sectPr is not None:
+        sectPr.addprevious(tbl)
+    else:
+        body.append(tbl)
+    return tbl
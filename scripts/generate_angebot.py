@@ -3,15 +3,17 @@ import json
 from openai import OpenAI
 from datetime import datetime
 
+try:
+    from schema_registry import get_schema
+except ImportError:
+    from scripts.schema_registry import get_schema
+
+
 def generate_angebot_json(cv_json_path, stellenprofil_json_path, match_json_path, output_path, schema_path):
     """
     Generate an Offer (Angebot) JSON using the provided CV, Stellenprofil, and Match JSONs.
+    Path-based wrapper around generate_angebot (reads the inputs, writes output_path).
     """
-    # Load schema
-    with open(schema_path, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
-    
-    # Load input data
     with open(cv_json_path, 'r', encoding='utf-8') as f:
         cv_data = json.load(f)
     
@@ -23,6 +25,24 @@ def generate_angebot_json(cv_json_path, stellenprofil_json_path, match_json_path
         with open(match_json_path, 'r', encoding='utf-8') as f:
             match_data = json.load(f)
 
+    angebot_json = generate_angebot(cv_data, stellenprofil_data, match_data, schema_path)
+
+    # Save result
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(angebot_json, f, ensure_ascii=False, indent=2)
+    
+    print(f"✅ Angebot JSON generiert: {output_path}")
+    return output_path
+
+
+def generate_angebot(cv_data, stellenprofil_data, match_data, schema_path):
+    """
+    Generate an Offer (Angebot) from in-memory CV, Stellenprofil and (optional) Match dicts.
+    Nothing is written to disk; returns the Angebot dict.
+    """
+    # Schema aus der Registry (einmal pro Prozess geladen und serialisiert)
+    schema = get_schema(schema_path)
+
     # Prepare prompt for OpenAI
     system_prompt = (
         "Du bist ein Experte für die Erstellung von professionellen IT-Dienstleistungsangeboten. "
@@ -30,7 +50,7 @@ def generate_angebot_json(cv_json_path, stellenprofil_json_path, match_json_path
         "Halte dich strikt an das vorgegebene JSON-Schema. "
         "Erfinde keine Fakten, sondern leite alles aus den Eingabedaten ab. "
         "Schema (nur als Vorgabe, nicht ausgeben):\n" +
-        json.dumps(schema, ensure_ascii=False, indent=2)
+        schema.prompt
     )
     
     user_prompt = (
@@ -134,9 +154,4 @@ def generate_angebot_json(cv_json_path, stellenprofil_json_path, match_json_path
             print(f"❌ Fehler bei der Angebots-Generierung: {e}")
             raise e
 
-    # Save result
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(angebot_json, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ Angebot JSON generiert: {output_path}")
-    return output_path
+    return angebot_json
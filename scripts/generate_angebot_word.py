@@ -6,6 +6,13 @@ from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+try:
+    from style_profile import resolve_style_profile
+    from utils_optimize_logo import optimized_logo_stream
+except ImportError:
+    from scripts.style_profile import resolve_style_profile
+    from scripts.utils_optimize_logo import optimized_logo_stream
+
 def hex_to_rgb(hex_color):
     """Converts hex color to RGB tuple"""
     hex_color = hex_color.lstrip('#')
@@ -41,19 +48,32 @@ def add_page_number(run):
     run._element.append(instrText)
     run._element.append(fldChar2)
 
-def generate_angebot_word(json_path, output_path):
+def generate_angebot_word(json_path, output_path, style_profile=None):
     """
     Generates a Word document for the Offer based on the JSON data.
+    style_profile: Optionales StyleProfile für Farben, Schrift und Logo (Standard: styles.json)
     """
     # Load Data
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    # Load Styles (simplified for this script, ideally shared)
-    ORANGE = RGBColor(255, 121, 0)
-    GRAY = RGBColor(68, 68, 68)
-    BLACK = RGBColor(0, 0, 0)
-    FONT_NAME = "Aptos" # Fallback to Arial if not available
+    doc = build_angebot_document(data, style_profile=style_profile)
+    doc.save(output_path)
+    print(f"✅ Angebot Word generiert: {output_path}")
+    return output_path
+
+def build_angebot_document(data, style_profile=None):
+    """
+    Builds the offer document from already loaded JSON data (without saving).
+    Used by generate_angebot_word and the render service.
+    """
+    # Load Styles (shared with generate_cv via the style profile)
+    styles = resolve_style_profile(style_profile)
+    header_config = styles.get("header", {})
+    ORANGE = RGBColor(*styles["heading1"]["color"])
+    GRAY = RGBColor(*styles["heading2"]["color"])
+    BLACK = RGBColor(*styles["text"]["color"])
+    FONT_NAME = styles["text"]["font"]
 
     doc = Document()
     
@@ -89,22 +109,22 @@ def generate_angebot_word(json_path, output_path):
     # Logo (Placeholder logic - assumes logo exists in templates)
     # In a real scenario, we'd resolve the path properly
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    logo_path = os.path.join(script_dir, "..", "templates", "logo.png")
+    logo_path = os.path.join(script_dir, header_config.get("logo_path", "../templates/logo.png"))
     
     cell_logo = header_table.cell(0, 0)
     if os.path.exists(logo_path):
         paragraph = cell_logo.paragraphs[0]
         run = paragraph.add_run()
-        run.add_picture(logo_path, width=Cm(4.0))
+        run.add_picture(optimized_logo_stream(logo_path, 4.0), width=Cm(4.0))
     else:
         cell_logo.text = "Orange Business"
 
     cell_text = header_table.cell(0, 1)
     paragraph = cell_text.paragraphs[0]
     paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.RIGHT
-    run = paragraph.add_run("digital.orange-business.com")
-    run.font.color.rgb = ORANGE
-    run.font.size = Pt(10)
+    run = paragraph.add_run(header_config.get("text", "digital.orange-business.com"))
+    run.font.color.rgb = RGBColor(*header_config.get("text_color", styles["heading1"]["color"]))
+    run.font.size = Pt(header_config.get("text_size", 10))
 
     # --- Footer ---
     footer = section.footer
@@ -277,9 +297,7 @@ def generate_angebot_word(json_path, output_path):
     doc.add_paragraph(abschluss.get("kontakt_hinweis", ""))
 
     # Save
-    doc.save(output_path)
-    print(f"✅ Angebot Word generiert: {output_path}")
-    return output_path
+    return doc
 
 if __name__ == "__main__":
     # Test
@@ -1,163 +1,74 @@
 import json
 import os
+import re
+from copy import deepcopy
 from datetime import datetime
+from io import BytesIO
 from docx import Document
 from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT, WD_COLOR_INDEX
+from docx.oxml.ns import qn
+from docx.text.run import Run
 
 # Handle imports for both direct execution and module import
+# (Dialoge/tkinter werden nur im interaktiven Modus geladen, siehe generate_cv und select_json_file)
 try:
-    from dialogs import show_warning, select_json_file
+    from docx_fragments import remove_table_borders, remove_cell_borders, set_cell_background_and_borders
+    from docx_table_builder import styled_run, build_table, append_table
+    from style_profile import resolve_style_profile
+    from cv_validator import is_valid_level, parse_level, validate_cv  # noqa: F401 (Re-Export)
 except ImportError:
-    from scripts.dialogs import show_warning, select_json_file
+    from scripts.docx_fragments import remove_table_borders, remove_cell_borders, set_cell_background_and_borders
+    from scripts.docx_table_builder import styled_run, build_table, append_table
+    from scripts.style_profile import resolve_style_profile
+    from scripts.cv_validator import is_valid_level, parse_level, validate_cv  # noqa: F401 (Re-Export)
+
+# Template-Dateien pro Prozess (Pfad -> Bytes oder None)
+_template_cache = {}
+
+# Bei jeder Änderung am Layout erhöhen: macht alle Einträge im Render-Cache ungültig
+CV_GENERATOR_VERSION = "2"
 
 # Globale Konstante für fehlende Daten
 MISSING_DATA_MARKER = "! bitte prüfen !"
 
+# Alle möglichen Varianten des Markers (OpenAI verwendet oft andere Bindestriche/Leerzeichen)
+MISSING_DATA_VARIANTS = (
+    "! bitte prüfen!",           # Ohne Leerzeichen vor !
+    "! bitte prüfen !",          # Mit Leerzeichen vor ! (unser Standard)
+    "! fehlt – bitte prüfen!",   # Alt: Gedankenstrich ohne Leerzeichen vor !
+    "! fehlt – bitte prüfen !",  # Alt: Gedankenstrich mit Leerzeichen vor !
+    "! fehlt - bitte prüfen!",   # Alt: Normaler Bindestrich ohne Leerzeichen vor !
+    "! fehlt - bitte prüfen !",  # Alt: Normaler Bindestrich mit Leerzeichen vor !
+    "! fehlt — bitte prüfen!",   # Alt: Em-Dash ohne Leerzeichen vor !
+    "! fehlt — bitte prüfen !",  # Alt: Em-Dash mit Leerzeichen vor !
+)
+
+# Ein vorkompiliertes Muster über alle Varianten (längste zuerst, damit " !" mitgenommen wird)
+MISSING_DATA_PATTERN = re.compile(
+    "|".join(re.escape(v) for v in sorted(MISSING_DATA_VARIANTS, key=len, reverse=True))
+)
+
 # -------------------------------------
-# Hilfsfunktion: Absoluten Pfad bilden
+# Validierung der JSON-Struktur
 # -------------------------------------
-def validate_json_structure(data):
-    """Validiert die Struktur der JSON-Daten und gibt kritische Fehler und Info zurück"""
-    critical = []
-    info = []
-    
-    # Erforderliche Top-Level-Felder
-    required_fields = [
-        "Vorname", "Nachname", "Hauptrolle", "Nationalität", "Ausbildung",
-        "Kurzprofil", "Fachwissen_und_Schwerpunkte", "Aus_und_Weiterbildung",
-        "Trainings_und_Zertifizierungen", "Sprachen", "Ausgewählte_Referenzprojekte"
-    ]
-    
-    # Prüfe Arrays
-    array_fields = [
-        "Fachwissen_und_Schwerpunkte", "Aus_und_Weiterbildung",
-        "Trainings_und_Zertifizierungen", "Sprachen", "Ausgewählte_Referenzprojekte"
-    ]
-    
-    for field in required_fields:
-        if field not in data:
-            critical.append(f"Fehlendes Feld: {field}")
-        elif data[field] is None:
-            critical.append(f"Feld ist None: {field}")
-        else:
-            # Typ-Prüfungen
-            if field == "Hauptrolle":
-                if not isinstance(data[field], dict) or "Titel" not in data[field] or "Beschreibung" not in data[field]:
-                    critical.append(f"Feld 'Hauptrolle' muss ein Objekt mit 'Titel' und 'Beschreibung' sein")
-                else:
-                    beschreibung = data[field]["Beschreibung"]
-                    word_count = len(beschreibung.split())
-                    if word_count < 5 or word_count > 10:
-                        info.append(f"Hauptrolle.Beschreibung sollte 5-10 Wörter haben (aktuell {word_count})")
-            elif field in ["Vorname", "Nachname", "Nationalität", "Ausbildung", "Kurzprofil"]:
-                if not isinstance(data[field], str):
-                    info.append(f"Feld '{field}' sollte ein String sein (ist {type(data[field]).__name__})")
-            elif field in array_fields:
-                if not isinstance(data[field], list):
-                    critical.append(f"Feld '{field}' muss ein Array sein")
-    
-    # Entferne die doppelte Definition
-    # array_fields = [...
-    
-    # Prüfe Fachwissen_und_Schwerpunkte Struktur
-    if "Fachwissen_und_Schwerpunkte" in data and isinstance(data["Fachwissen_und_Schwerpunkte"], list):
-        for i, item in enumerate(data["Fachwissen_und_Schwerpunkte"]):
-            if not isinstance(item, dict):
-                critical.append(f"Fachwissen_und_Schwerpunkte[{i}]: Muss ein Objekt sein")
-                continue
-            if "Kategorie" not in item:
-                critical.append(f"Fachwissen_und_Schwerpunkte[{i}]: Fehlendes Feld 'Kategorie'")
-            if "Inhalt" not in item or not isinstance(item["Inhalt"], list):
-                critical.append(f"Fachwissen_und_Schwerpunkte[{i}]: 'Inhalt' muss ein Array sein")
-    
-    # Prüfe Aus_und_Weiterbildung Struktur
-    if "Aus_und_Weiterbildung" in data and isinstance(data["Aus_und_Weiterbildung"], list):
-        for i, item in enumerate(data["Aus_und_Weiterbildung"]):
-            if not isinstance(item, dict):
-                critical.append(f"Aus_und_Weiterbildung[{i}]: Muss ein Objekt sein")
-                continue
-            required = ["Zeitraum", "Institution", "Abschluss"]
-            for req in required:
-                if req not in item:
-                    critical.append(f"Aus_und_Weiterbildung[{i}]: Fehlendes Feld '{req}'")
-    
-    # Prüfe Trainings_und_Zertifizierungen Struktur
-    if "Trainings_und_Zertifizierungen" in data and isinstance(data["Trainings_und_Zertifizierungen"], list):
-        for i, item in enumerate(data["Trainings_und_Zertifizierungen"]):
-            if not isinstance(item, dict):
-                critical.append(f"Trainings_und_Zertifizierungen[{i}]: Muss ein Objekt sein")
-                continue
-            required = ["Zeitraum", "Institution", "Titel"]
-            for req in required:
-                if req not in item:
-                    critical.append(f"Trainings_und_Zertifizierungen[{i}]: Fehlendes Feld '{req}'")
-    
-    # Prüfe Sprachen Struktur
-    if "Sprachen" in data and isinstance(data["Sprachen"], list):
-        for i, item in enumerate(data["Sprachen"]):
-            if not isinstance(item, dict):
-                critical.append(f"Sprachen[{i}]: Muss ein Objekt sein")
-                continue
-            if "Sprache" not in item:
-                critical.append(f"Sprachen[{i}]: Fehlendes Feld 'Sprache'")
-            if "Level" not in item or not is_valid_level(item["Level"]):
-                info.append(f"Sprachen[{i}]: Ungültiges oder fehlendes Feld 'Level' (muss eine Zahl 1-5, Text wie 'Muttersprache' oder Kombination sein)")
-    
-    # Prüfe Referenzprojekte Struktur
-    if "Ausgewählte_Referenzprojekte" in data and isinstance(data["Ausgewählte_Referenzprojekte"], list):
-        for i, item in enumerate(data["Ausgewählte_Referenzprojekte"]):
-            if not isinstance(item, dict):
-                critical.append(f"Ausgewählte_Referenzprojekte[{i}]: Muss ein Objekt sein")
-                continue
-            required = ["Zeitraum", "Rolle", "Kunde", "Tätigkeiten"]
-            for req in required:
-                if req not in item:
-                    critical.append(f"Ausgewählte_Referenzprojekte[{i}]: Fehlendes Feld '{req}'")
-            if "Tätigkeiten" in item and not isinstance(item["Tätigkeiten"], list):
-                critical.append(f"Ausgewählte_Referenzprojekte[{i}]: 'Tätigkeiten' muss ein Array sein")
-    
-    return critical, info
-
-
-def parse_level(level):
-    """Parst das Level zu einer Zahl 1-5"""
-    if isinstance(level, int):
-        return level
-    if isinstance(level, str):
-        import re
-        level = level.strip()
-        # Versuche Zahl am Anfang
-        match = re.match(r'(\d+)', level)
-        if match:
-            return int(match.group(1))
-        # Mappe Text
-        text_to_num = {
-            "Muttersprache": 5,
-            "Verhandlungssicher": 4,
-            "Sehr gute Kenntnisse": 3,
-            "Gute Kenntnisse": 2,
-            "Grundkenntnisse": 1
-        }
-        return text_to_num.get(level, 0)
-    return 0
-
+def validate_json_structure(data, doc_hash=None):
+    """
+    Validiert die Struktur der JSON-Daten und gibt kritische Fehler und Info zurück.
+    Nutzt den kompilierten Validator (cv_validator); Pfade und Schweregrade der
+    einzelnen Befunde liefert cv_validator.validate_cv.
 
-def is_valid_level(level):
-    """Prüft, ob das Level gültig ist"""
-    if isinstance(level, int) and 1 <= level <= 5:
-        return True
-    if isinstance(level, str):
-        import re
-        level = level.strip()
-        if level in ["Muttersprache", "Verhandlungssicher", "Sehr gute Kenntnisse", "Gute Kenntnisse", "Grundkenntnisse"]:
-            return True
-        if re.match(r'^\d+', level):
-            num = int(re.match(r'^\d+', level).group())
-            return 1 <= num <= 5
-    return False
+    Args:
+        data: CV als JSON-Dict
+        doc_hash: Optionaler Dokument-Hash, wiederholte Validierungen sind dann gemerkt
+    """
+    result = validate_cv(data, doc_hash=doc_hash)
+    return result.critical, result.info
 
 
+# -------------------------------------
+# Hilfsfunktion: Absoluten Pfad bilden
+# -------------------------------------
 def abs_path(relative_path):
     """Gibt den absoluten Pfad relativ zum Skript-Verzeichnis zurück"""
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -175,145 +86,135 @@ def load_styles(filename="styles.json"):
     with open(path, "r", encoding="utf-8") as sf:
         return json.load(sf)
 
-def add_heading_1(doc, text):
+def add_heading_1(doc, text, style_profile=None):
+    styles = resolve_style_profile(style_profile)
     p = doc.add_paragraph()
     s = styles["heading1"]
     p.paragraph_format.space_before = Pt(s["space_before"])
     p.paragraph_format.space_after = Pt(s["space_after"])
     
-    run = p.add_run(text)
-    run.font.name = s["font"]
-    run.font.size = Pt(s["size"])
-    run.font.bold = s["bold"]
     c = s["color"]
-    run.font.color.rgb = RGBColor(c[0], c[1], c[2])
+    for part, is_marker in split_missing_data(text):
+        run = p.add_run(part)
+        run.font.name = s["font"]
+        run.font.size = Pt(s["size"])
+        run.font.bold = s["bold"]
+        run.font.color.rgb = RGBColor(c[0], c[1], c[2])
+        if is_marker:
+            run.font.highlight_color = WD_COLOR_INDEX.YELLOW
     return p
 
 
-def add_heading_2(doc, text, bold=None):
+def add_heading_2(doc, text, bold=None, style_profile=None):
+    styles = resolve_style_profile(style_profile)
     p = doc.add_paragraph()
     s = styles["heading2"]
     p.paragraph_format.space_before = Pt(s["space_before"])
     p.paragraph_format.space_after = Pt(s["space_after"])
 
-    run = p.add_run(text)
-    run.font.name = s["font"]
-    run.font.size = Pt(s["size"])
-    run.font.bold = bold if bold is not None else s["bold"]
     c = s["color"]
-    run.font.color.rgb = RGBColor(c[0], c[1], c[2])
+    for part, is_marker in split_missing_data(text):
+        run = p.add_run(part)
+        run.font.name = s["font"]
+        run.font.size = Pt(s["size"])
+        run.font.bold = bold if bold is not None else s["bold"]
+        run.font.color.rgb = RGBColor(c[0], c[1], c[2])
+        if is_marker:
+            run.font.highlight_color = WD_COLOR_INDEX.YELLOW
     return p
 
 
-def add_normal_text(doc, text):
+def add_normal_text(doc, text, style_profile=None):
+    styles = resolve_style_profile(style_profile)
     p = doc.add_paragraph()
     s = styles["text"]
     add_text_with_highlight(p, text, s["font"], s["size"], s["color"])
     return p
 
 
+def split_missing_data(text):
+    """
+    Zerlegt einen Text in (Teil, ist_marker)-Paare.
+    Alle Varianten des Fehlenden-Daten-Markers werden dabei auf MISSING_DATA_MARKER normalisiert.
+    Texte ohne Marker werden unverändert als einziges Paar zurückgegeben.
+    """
+    if not text or not isinstance(text, str):
+        return [(text, False)]
+
+    segments = []
+    pos = 0
+    for match in MISSING_DATA_PATTERN.finditer(text):
+        if match.start() > pos:
+            segments.append((text[pos:match.start()], False))
+        segments.append((MISSING_DATA_MARKER, True))
+        pos = match.end()
+
+    if not segments:
+        return [(text, False)]
+    if pos < len(text):
+        segments.append((text[pos:], False))
+    return segments
+
+
 def add_text_with_highlight(paragraph, text, font_name, font_size, font_color, bold=False):
-    """Helper function to add text (highlighting wird am Ende global durchgeführt)"""
-    run = paragraph.add_run(text)
-    run.font.name = font_name
-    run.font.size = Pt(font_size)
-    run.font.color.rgb = RGBColor(*font_color) if isinstance(font_color, (list, tuple)) else font_color
-    if bold:
-        run.font.bold = True
+    """Helper function to add text; Marker für fehlende Daten werden direkt beim Schreiben gelb hervorgehoben"""
+    rgb = RGBColor(*font_color) if isinstance(font_color, (list, tuple)) else font_color
+    for part, is_marker in split_missing_data(text):
+        run = paragraph.add_run(part)
+        run.font.name = font_name
+        run.font.size = Pt(font_size)
+        run.font.color.rgb = rgb
+        if bold:
+            run.font.bold = True
+        if is_marker:
+            run.font.highlight_color = WD_COLOR_INDEX.YELLOW
+
+
+def styled_runs(text, font, size, color, bold=False, break_after=False):
+    """Wie add_text_with_highlight, aber als Run-Beschreibungen für den Bulk-Tabellenbau."""
+    segments = split_missing_data(text)
+    runs = [styled_run(part, font, size, color, bold=bold, highlight=is_marker) for part, is_marker in segments]
+    runs[-1]["break_after"] = break_after
+    return runs
 
 
 def highlight_missing_data_in_document(doc):
     """
-    Durchsucht das gesamte Dokument nach verschiedenen Varianten des Fehlenden-Daten-Markers,
-    normalisiert sie auf die einheitliche Version und hebt alle Vorkommen gelb hervor.
+    Prüfmodus: Durchsucht das fertige Dokument nach Markern, die beim Schreiben nicht
+    hervorgehoben wurden, normalisiert sie auf die einheitliche Version und hebt sie gelb hervor.
+
+    Jeder Run wird genau einmal besucht (auch in verbundenen Zellen), die Ersatz-Runs
+    werden an der Stelle des Originals eingefügt.
+
+    Returns:
+        int: Anzahl der nachträglich korrigierten Runs (0 = alles bereits korrekt)
     """
-    from docx.enum.text import WD_COLOR_INDEX
-    
-    # Alle möglichen Varianten des Markers (OpenAI verwendet oft andere Bindestriche/Leerzeichen)
-    marker_variants = [
-        "! bitte prüfen!",           # Ohne Leerzeichen vor !
-        "! bitte prüfen !",          # Mit Leerzeichen vor ! (unser Standard)
-        "! fehlt – bitte prüfen!",   # Alt: Gedankenstrich ohne Leerzeichen vor !
-        "! fehlt – bitte prüfen !",  # Alt: Gedankenstrich mit Leerzeichen vor !
-        "! fehlt - bitte prüfen!",   # Alt: Normaler Bindestrich ohne Leerzeichen vor !
-        "! fehlt - bitte prüfen !",  # Alt: Normaler Bindestrich mit Leerzeichen vor !
-        "! fehlt — bitte prüfen!",   # Alt: Em-Dash ohne Leerzeichen vor !
-        "! fehlt — bitte prüfen !",  # Alt: Em-Dash mit Leerzeichen vor !
-    ]
-    
-    # Durchsuche alle Paragraphen im Hauptdokument
-    for paragraph in doc.paragraphs:
-        for run in paragraph.runs:
-            # Prüfe alle Varianten
-            found_variant = None
-            for variant in marker_variants:
-                if variant in run.text:
-                    found_variant = variant
-                    break
-            
-            if found_variant:
-                # Split den Run-Text am gefundenen Marker
-                parts = run.text.split(found_variant)
-                
-                # Lösche den aktuellen Run-Text
-                run.text = ""
-                
-                # Füge Teile und normalisierte Marker hinzu
-                for i, part in enumerate(parts):
-                    if i > 0:
-                        # Füge neuen Run mit normalisiertem Marker und Highlighting hinzu
-                        new_run = paragraph.add_run(MISSING_DATA_MARKER)
-                        new_run.font.name = run.font.name
-                        new_run.font.size = run.font.size
-                        new_run.font.color.rgb = run.font.color.rgb
-                        new_run.font.bold = run.font.bold
-                        new_run.font.highlight_color = WD_COLOR_INDEX.YELLOW
-                    
-                    if part:
-                        # Füge Text-Teil hinzu
-                        text_run = paragraph.add_run(part)
-                        text_run.font.name = run.font.name
-                        text_run.font.size = run.font.size
-                        text_run.font.color.rgb = run.font.color.rgb
-                        text_run.font.bold = run.font.bold
-    
-    # Durchsuche auch Tabellen
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    for run in paragraph.runs:
-                        # Prüfe alle Varianten
-                        found_variant = None
-                        for variant in marker_variants:
-                            if variant in run.text:
-                                found_variant = variant
-                                break
-                        
-                        if found_variant:
-                            parts = run.text.split(found_variant)
-                            run.text = ""
-                            
-                            for i, part in enumerate(parts):
-                                if i > 0:
-                                    new_run = paragraph.add_run(MISSING_DATA_MARKER)
-                                    new_run.font.name = run.font.name
-                                    new_run.font.size = run.font.size
-                                    new_run.font.color.rgb = run.font.color.rgb
-                                    new_run.font.bold = run.font.bold
-                                    new_run.font.highlight_color = WD_COLOR_INDEX.YELLOW
-                                
-                                if part:
-                                    text_run = paragraph.add_run(part)
-                                    text_run.font.name = run.font.name
-                                    text_run.font.size = run.font.size
-                                    text_run.font.color.rgb = run.font.color.rgb
-                                    text_run.font.bold = run.font.bold
-
-                                    text_run.font.bold = run.font.bold
-
-
-def add_bullet_item(doc, text):
+    highlight_tag = qn('w:rPr') + '/' + qn('w:highlight')
+    fixed = 0
+
+    for r in list(doc.element.body.iter(qn('w:r'))):
+        text = r.text
+        if not MISSING_DATA_PATTERN.search(text):
+            continue
+        if text.strip() == MISSING_DATA_MARKER and r.find(highlight_tag) is not None:
+            continue
+
+        anchor = r
+        for part, is_marker in split_missing_data(text):
+            new_r = deepcopy(r)
+            new_r.text = part
+            if is_marker:
+                Run(new_r, None).font.highlight_color = WD_COLOR_INDEX.YELLOW
+            anchor.addnext(new_r)
+            anchor = new_r
+        r.getparent().remove(r)
+        fixed += 1
+
+    return fixed
+
+
+def add_bullet_item(doc, text, style_profile=None):
+    styles = resolve_style_profile(style_profile)
     s = styles["bullet"]
     s_text = styles["text"]
     
@@ -386,36 +287,21 @@ def get_available_width(doc):
     return page_width - left_margin - right_margin
 
 
-def add_basic_info_table(doc, hauptrolle_desc, nationalität, ausbildung):
+def add_basic_info_table(doc, hauptrolle_desc, nationalität, ausbildung, style_profile=None):
     """
     Render basic info as a 3-column borderless table with white background.
     Column 1 (20%): Labels (bold)
     Column 2 (60%): Values
     Column 3 (20%): Image placeholder (merged across all 3 rows)
     """
+    styles = resolve_style_profile(style_profile)
     from docx.shared import Inches
-    from docx.oxml import parse_xml, OxmlElement
-    from docx.oxml.ns import nsdecls
     
     table = doc.add_table(rows=3, cols=3)
     # Don't set a style that may not exist; instead, manually remove borders below
 
     # Remove all table borders completely
-    tbl = table._element
-    tblPr = tbl.tblPr
-    
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    # Create and add borders element with no borders
-    tblBorders = parse_xml(r'<w:tBorders %s><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tBorders>' % nsdecls('w'))
-    
-    # Remove existing borders if any
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
+    remove_table_borders(table)
 
     # Set column widths: 20%, 60%, 20%
     available_width = get_available_width(doc)
@@ -424,18 +310,6 @@ def add_basic_info_table(doc, hauptrolle_desc, nationalität, ausbildung):
         for idx, width in enumerate(widths):
             row.cells[idx].width = width
 
-    # Helper function to set cell background to white and remove individual cell borders
-    def set_cell_background_and_borders(cell, fill_color='FFFFFF'):
-        """Set cell background color and remove borders"""
-        tcPr = cell._element.get_or_add_tcPr()
-        shd = OxmlElement('w:shd')
-        shd.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}fill', fill_color)
-        tcPr.append(shd)
-        
-        # Remove cell borders
-        tcBorders = parse_xml(r'<w:tcBorders %s><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tcBorders>' % nsdecls('w'))
-        tcPr.append(tcBorders)
-
     s = styles["text"]
     
     # Row 1: Hauptrolle
@@ -535,14 +409,15 @@ def add_basic_info_table(doc, hauptrolle_desc, nationalität, ausbildung):
             pass
 
 
-def add_bullet_table(doc, items, max_items_per_column=4):
+def add_bullet_table(doc, items, max_items_per_column=4, style_profile=None):
+    styles = resolve_style_profile(style_profile)
     # Calculate number of columns based on item count
     num_cols = max(1, (len(items) + max_items_per_column - 1) // max_items_per_column)
     
     if num_cols == 1:
         # Single column: just use regular bullet items
         for item in items:
-            add_bullet_item(doc, item)
+            add_bullet_item(doc, item, style_profile=styles)
         return
 
     # Multi-column: create a table with no visible borders
@@ -550,42 +425,7 @@ def add_bullet_table(doc, items, max_items_per_column=4):
     table = doc.add_table(rows=rows_per_col, cols=num_cols)
 
     # Remove table borders via XML (don't rely on built-in styles)
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    # remove existing and append
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
-
-    # helper to remove cell borders (ensures no visible lines)
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'</w:tcBorders>' % nsdecls('w'))
-        # remove any existing tcBorders
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
+    remove_table_borders(table)
 
     # Fill table cells with items (column-wise distribution)
     s = styles["bullet"]
@@ -623,311 +463,143 @@ def add_bullet_table(doc, items, max_items_per_column=4):
         c = s["color"]
         bullet.font.color.rgb = RGBColor(c[0], c[1], c[2])
 
-        run = p.add_run(item)
-        run.font.name = s["font"]
-        run.font.size = Pt(s["size"])
+        add_text_with_highlight(p, item, s["font"], s["size"], None)
 
 
-def add_fachwissen_table(doc, skills_data):
+def add_fachwissen_table(doc, skills_data, style_profile=None):
     """
     Render Fachwissen_und_Schwerpunkte as a 2-column table.
     Column 1: Category (bold) - 20%
     Column 2: Bullet list of Inhalt items - 80%
     """
-    from docx.shared import Inches
-    from docx.oxml import parse_xml, OxmlElement
-    from docx.oxml.ns import nsdecls
-    
+    styles = resolve_style_profile(style_profile)
     if not skills_data:
         return
     
-    # Create table: one row per category
-    table = doc.add_table(rows=len(skills_data), cols=2)
-    
-    # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
-    
-    # Set column widths: 20% for category, 80% for content
-    available_width = get_available_width(doc)
-    widths = [available_width * 0.20, available_width * 0.80]
-    for row in table.rows:
-        for idx, width in enumerate(widths):
-            row.cells[idx].width = width
-    
-    # Helper to remove cell borders
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'</w:tcBorders>' % nsdecls('w'))
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
-    
     s_text = styles["text"]
-    s_bullet = styles["bullet"]
+    font, size, color = s_text["font"], s_text["size"], s_text["color"]
+    line_spacing = s_text.get("line_spacing", 1.0)
     
-    # Fill rows
-    for row_idx, item in enumerate(skills_data):
+    # Build rows: one row per category
+    rows = []
+    for item in skills_data:
         kategorie = item.get("Kategorie", "")
         inhalt = item.get("Inhalt", item.get("BulletList", []))  # Support both formats
         
-        cell_cat = table.rows[row_idx].cells[0]
-        cell_list = table.rows[row_idx].cells[1]
-        
-        remove_cell_borders(cell_cat)
-        remove_cell_borders(cell_list)
-        
-        # Clear and populate category cell
-        cell_cat.text = ""
-        p_cat = cell_cat.paragraphs[0]
-        p_cat.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-        p_cat.paragraph_format.space_before = Pt(0)
-        p_cat.paragraph_format.space_after = Pt(0)
-        run_cat = p_cat.add_run(kategorie)
-        run_cat.font.name = s_text["font"]
-        run_cat.font.size = Pt(s_text["size"])
-        run_cat.font.bold = True
-        run_cat.font.color.rgb = RGBColor(*s_text["color"])
-        
-        # Set vertical alignment to top for category cell
-        from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT
-        cell_cat.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.TOP
-        
-        # Clear and populate content cell with comma-separated list
-        cell_list.text = ""
-        p = cell_list.paragraphs[0]
-        p.paragraph_format.space_before = Pt(0)
-        p.paragraph_format.space_after = Pt(0)
-        p.paragraph_format.line_spacing = s_text.get("line_spacing", 1.0)
-        
-        # Join all items with comma and space
-        comma_separated = ", ".join(inhalt)
-        
-        # Add as single run
-        run = p.add_run(comma_separated)
-        run.font.name = s_text["font"]
-        run.font.size = Pt(s_text["size"])
-        run.font.color.rgb = RGBColor(*s_text["color"])
+        # Category cell (bold, top aligned)
+        cell_cat = {
+            "v_align": "top",
+            "paragraphs": [{
+                "alignment": "left", "space_before": 0, "space_after": 0,
+                "runs": styled_runs(kategorie, font, size, color, bold=True)
+            }]
+        }
+        # Content cell: all items joined with comma and space as single run
+        cell_list = {
+            "paragraphs": [{
+                "space_before": 0, "space_after": 0, "line_spacing": line_spacing,
+                "runs": styled_runs(", ".join(inhalt), font, size, color)
+            }]
+        }
+        rows.append([cell_cat, cell_list])
+    
+    # Column widths: 20% for category, 80% for content
+    available_width = get_available_width(doc)
+    widths = [available_width * 0.20, available_width * 0.80]
+    append_table(doc, build_table(rows, widths, doc._block_width))
 
 
-def add_education_table(doc, education_data):
+def add_education_table(doc, education_data, style_profile=None):
     """
     Render Aus_und_Weiterbildung as a 2-column table.
     Column 1: Time Range (YYYY - YYYY or single year)
     Column 2: Row1 = Institution, Row2 = Ausbildung/Titel
     """
-    from docx.shared import Inches
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-    
+    styles = resolve_style_profile(style_profile)
     if not education_data:
         return
     
-    # Create table: one row per education item
-    table = doc.add_table(rows=len(education_data), cols=2)
-    
-    # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
-    
-    # Set column widths: 20% for time range, 80% for institution/title
-    available_width = get_available_width(doc)
-    widths = [available_width * 0.20, available_width * 0.80]
-    for row in table.rows:
-        for idx, width in enumerate(widths):
-            row.cells[idx].width = width
-    
-    # Helper to remove cell borders
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'</w:tcBorders>' % nsdecls('w'))
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
-    
     s_text = styles["text"]
+    font, size, color = s_text["font"], s_text["size"], s_text["color"]
     
-    # Fill rows
-    for row_idx, item in enumerate(education_data):
+    # Build rows: one row per education item
+    rows = []
+    for item in education_data:
         zeitraum = item.get("Zeitraum", "")
         institution = item.get("Institution", "")
         ausbildung_titel = item.get("Abschluss", "")
         
-        cell_time = table.rows[row_idx].cells[0]
-        cell_info = table.rows[row_idx].cells[1]
-        
-        remove_cell_borders(cell_time)
-        remove_cell_borders(cell_info)
-        
         # Column 1: Time Range
-        cell_time.text = ""
-        p_time = cell_time.paragraphs[0]
-        p_time.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-        add_text_with_highlight(p_time, zeitraum, s_text["font"], s_text["size"], s_text["color"])
-        
-        # Column 2: Institution and Title in one paragraph separated by soft line break
-        cell_info.text = ""
-        p_info = cell_info.paragraphs[0]
-        p_info.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-        # Institution (bold)
-        add_text_with_highlight(p_info, institution, s_text["font"], s_text["size"], s_text["color"], bold=True)
-
-        # soft line break (shift+Enter)
-        from docx.enum.text import WD_BREAK
-        p_info.runs[-1].add_break(WD_BREAK.LINE)
-
-        # Title on the next visual line (same paragraph)
-        add_text_with_highlight(p_info, ausbildung_titel, s_text["font"], s_text["size"], s_text["color"])
-
-        # Add spacing after the combined paragraph so rows are visually separated
-        p_info.paragraph_format.space_after = Pt(6)
+        cell_time = {
+            "paragraphs": [{
+                "alignment": "left",
+                "runs": styled_runs(zeitraum, font, size, color)
+            }]
+        }
+        # Column 2: Institution (bold) and Title in one paragraph separated by soft line break,
+        # with spacing after so rows are visually separated
+        cell_info = {
+            "paragraphs": [{
+                "alignment": "left", "space_after": 6,
+                "runs": (styled_runs(institution, font, size, color, bold=True, break_after=True)
+                         + styled_runs(ausbildung_titel, font, size, color))
+            }]
+        }
+        rows.append([cell_time, cell_info])
+    
+    # Column widths: 20% for time range, 80% for institution/title
+    available_width = get_available_width(doc)
+    widths = [available_width * 0.20, available_width * 0.80]
+    append_table(doc, build_table(rows, widths, doc._block_width))
 
 
-def add_trainings_table(doc, trainings_data):
+def add_trainings_table(doc, trainings_data, style_profile=None):
     """
     Render Trainings_und_Zertifizierungen as a 2-column table.
     Column 1: Time Range (YYYY - YYYY)
     Column 2: Row1 = Institution (bold), Row2 = Ausbildung/Titel or Zertifizierung
     """
-    from docx.shared import Inches
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-
+    styles = resolve_style_profile(style_profile)
     if not trainings_data:
         return
 
-    table = doc.add_table(rows=len(trainings_data), cols=3)
-
-    # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
-
-    # Column widths: 20% time, 20% institution, 60% certification/title
-    available_width = get_available_width(doc)
-    widths = [available_width * 0.20, available_width * 0.20, available_width * 0.60]
-    for row in table.rows:
-        for idx, width in enumerate(widths):
-            row.cells[idx].width = width
-
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'</w:tcBorders>' % nsdecls('w'))
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
-
     s_text = styles["text"]
+    font, size, color = s_text["font"], s_text["size"], s_text["color"]
 
-    for row_idx, item in enumerate(trainings_data):
+    rows = []
+    for item in trainings_data:
         zeitraum = item.get("Zeitraum", "")
         institution = item.get("Institution", "")
         titel = item.get("Titel", item.get("Ausbildung_Titel", ""))
 
-        cell_time = table.rows[row_idx].cells[0]
-        cell_inst = table.rows[row_idx].cells[1]
-        cell_title = table.rows[row_idx].cells[2]
-
-        remove_cell_borders(cell_time)
-        remove_cell_borders(cell_inst)
-        remove_cell_borders(cell_title)
+        # Time | Institution (bold) | Certification / Training (title), reduced spacing
+        rows.append([
+            {"paragraphs": [{"space_after": 3, "runs": styled_runs(zeitraum, font, size, color)}]},
+            {"paragraphs": [{"space_after": 3, "runs": styled_runs(institution, font, size, color, bold=True)}]},
+            {"paragraphs": [{"space_after": 3, "runs": styled_runs(titel, font, size, color)}]},
+        ])
 
-        # Time
-        cell_time.text = ""
-        p_time = cell_time.paragraphs[0]
-        add_text_with_highlight(p_time, zeitraum, s_text["font"], s_text["size"], s_text["color"])
-        p_time.paragraph_format.space_after = Pt(3)  # Reduced spacing
-
-        # Institution (bold)
-        cell_inst.text = ""
-        p_inst = cell_inst.paragraphs[0]
-        add_text_with_highlight(p_inst, institution, s_text["font"], s_text["size"], s_text["color"], bold=True)
-        p_inst.paragraph_format.space_after = Pt(3)  # Reduced spacing
-
-        # Certification / Training (title)
-        cell_title.text = ""
-        p_t = cell_title.paragraphs[0]
-        add_text_with_highlight(p_t, titel, s_text["font"], s_text["size"], s_text["color"])
-        p_t.paragraph_format.space_after = Pt(3)  # Reduced spacing
+    # Column widths: 20% time, 20% institution, 60% certification/title
+    available_width = get_available_width(doc)
+    widths = [available_width * 0.20, available_width * 0.20, available_width * 0.60]
+    append_table(doc, build_table(rows, widths, doc._block_width))
 
 
 # -------------------------------------
 # Hauptfunktion zum Erstellen des CVs
 # -------------------------------------
 
-def add_header_with_logo(doc):
+def add_header_with_logo(doc, style_profile=None):
     """Add a header with 3-column table: logo (40%), empty (10%), text (50%)."""
+    styles = resolve_style_profile(style_profile)
     from docx.shared import Cm, Pt, RGBColor
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.enum.table import WD_TABLE_ALIGNMENT
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
     import os
+    try:
+        from utils_optimize_logo import optimized_logo_stream
+    except ImportError:
+        from scripts.utils_optimize_logo import optimized_logo_stream
     
     header_config = styles.get("header", {})
     logo_path = header_config.get("logo_path", "")
@@ -957,39 +629,9 @@ def add_header_with_logo(doc):
         table.columns[idx].width = int(width)
     
     # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
+    remove_table_borders(table)
     
     # Remove cell borders for all cells
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'</w:tcBorders>' % nsdecls('w'))
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
-    
     for cell in table.rows[0].cells:
         remove_cell_borders(cell)
     
@@ -1005,7 +647,8 @@ def add_header_with_logo(doc):
             try:
                 run = p_logo.add_run()
                 # Only set width, let Word calculate height to maintain aspect ratio
-                run.add_picture(full_logo_path, width=Cm(logo_width))
+                # Auf die Header-Breite optimierte, gecachte Variante statt der Originaldatei
+                run.add_picture(optimized_logo_stream(full_logo_path, logo_width), width=Cm(logo_width))
                 print(f"✅ Logo erfolgreich eingefügt: {full_logo_path}")
             except Exception as e:
                 print(f"⚠️  Logo konnte nicht geladen werden: {e}")
@@ -1047,16 +690,49 @@ def add_header_with_logo(doc):
                 p_element.getparent().remove(p_element)
 
 
-def generate_cv(json_path, output_dir=None, interactive=True):
-
+def generate_cv(json_path, output_dir=None, interactive=True, verify_highlighting=False, style_profile=None,
+                streaming=None, use_cache=True):
+    """Pfad-basierter Wrapper um generate_cv_from_data (liest die CV-JSON von json_path)."""
     json_path = abs_path(json_path)
 
     # JSON einlesen
     with open(json_path, 'r', encoding="utf-8") as f:
         data = json.load(f)
-    
+
+    return generate_cv_from_data(
+        data, output_dir=output_dir, interactive=interactive, verify_highlighting=verify_highlighting,
+        style_profile=style_profile, streaming=streaming, use_cache=use_cache
+    )
+
+
+def generate_cv_from_data(data, output_dir=None, interactive=True, verify_highlighting=False, style_profile=None,
+                          streaming=None, use_cache=True):
+    """
+    Erzeugt das Word-Dokument aus einem bereits geladenen CV-Dict
+    (z.B. direkt aus der Pipeline, ohne die CV-JSON erneut von der Platte zu lesen).
+
+    Returns:
+        Pfad der .docx-Datei oder None (Abbruch durch Benutzer)
+    """
+    # Style-Profil pro Render (Standard: styles.json), keine globalen Styles
+    styles = resolve_style_profile(style_profile)
+
+    try:
+        import render_cache
+        from section_cache import get_section_cache
+        from streaming_docx import should_stream, render_cv_streaming
+    except ImportError:
+        from scripts import render_cache
+        from scripts.section_cache import get_section_cache
+        from scripts.streaming_docx import should_stream, render_cv_streaming
+
+    # Dokument-Hash einmal bilden: Schlüssel für Render-Cache und gemerkte Validierung
+    cv_hash = None
+    if use_cache and not verify_highlighting and render_cache.cache_enabled():
+        cv_hash = render_cache.canonical_json_hash(data)
+
     # JSON-Struktur validieren
-    critical, info = validate_json_structure(data)
+    critical, info = validate_json_structure(data, doc_hash=cv_hash)
     if (critical or info) and interactive:
         # Build warning message with explanation
         warning_msg = (
@@ -1101,6 +777,10 @@ def generate_cv(json_path, output_dir=None, interactive=True):
         details = "\n".join(details_parts)
         
         try:
+            try:
+                from dialogs import show_warning
+            except ImportError:
+                from scripts.dialogs import show_warning
             proceed = show_warning(warning_msg, title="JSON-Validierung", details=details)
             if not proceed:
                 print("❌ Benutzer hat abgebrochen.")
@@ -1112,12 +792,92 @@ def generate_cv(json_path, output_dir=None, interactive=True):
             if user_input.lower() not in ['j', 'ja', 'y', 'yes']:
                 return None
 
+    out_docx = cv_output_path(data, output_dir)
+
+    # Unveränderte Eingaben: vorhandenes Ergebnis übernehmen statt neu zu rendern
+    # (der Prüfmodus rendert immer neu)
+    cache_key = None
+    if cv_hash:
+        cache_key = render_cache.render_key(data, styles, cv_hash=cv_hash)
+        cached = render_cache.fetch(cache_key, out_docx)
+        if cached:
+            print(f"♻️ Unverändert, vorhandene Word-Datei übernommen: {cached}")
+            return cached
+
+        render_cache.detach(out_docx)
+
+    # Sehr grosse CVs (viele Referenzprojekte) werden abschnittweise gestreamt geschrieben
+    if streaming is None:
+        streaming = should_stream(data)
+    if streaming:
+        render_cv_streaming(data, out_docx, style_profile=styles, verify_highlighting=verify_highlighting)
+    else:
+        # Unveränderte Abschnitte kommen aus dem Abschnitts-Cache
+        doc = build_cv_document(data, style_profile=styles, section_cache=get_section_cache())
+
+        # Marker werden beim Schreiben hervorgehoben; der Gesamtdurchlauf dient nur noch als Prüfmodus
+        if verify_highlighting:
+            missed = highlight_missing_data_in_document(doc)
+            if missed:
+                print(f"⚠️ {missed} nicht hervorgehobene Marker nachträglich korrigiert")
+
+        doc.save(out_docx)
+
+    if cache_key:
+        render_cache.store(cache_key, out_docx)
+    print(f"✅ Word-Datei erstellt: {out_docx}")
+    return out_docx
+
+
+def load_template_bytes(template_path=None):
+    """
+    Liest die Template-Datei einmal pro Prozess ein (None, falls nicht vorhanden).
+    Jeder Render öffnet danach nur noch eine In-Memory-Kopie statt der Datei.
+    """
+    template_path = template_path or abs_path("../templates/cv_template.docx")
+    cached = _template_cache.get(template_path)
+    if cached is None and template_path not in _template_cache:
+        if os.path.exists(template_path):
+            with open(template_path, 'rb') as f:
+                cached = f.read()
+        _template_cache[template_path] = cached
+    return cached
+
+
+def cv_output_path(data, output_dir=None):
+    """Dateiname des Word-Dokuments: cv_{Vorname}_{Nachname}_{Zeitstempel}.docx"""
+    firstname = str(data.get("Vorname", "Unbekannt"))
+    lastname = str(data.get("Nachname", "Unbekannt"))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if output_dir is None:
+        # Fallback to old structure if not provided
+        return abs_path(f"../output/word/cv_{firstname}_{lastname}_{timestamp}.docx")
+    return os.path.join(output_dir, f"cv_{firstname}_{lastname}_{timestamp}.docx")
+
+
+def build_cv_document(data, style_profile=None, section_cache=None):
+    """
+    Baut das CV-Dokument aus bereits geladenen (und validierten) JSON-Daten.
+    Keine Dialoge, kein Speichern - wird von generate_cv und vom Render-Service genutzt.
+    """
+    styles = resolve_style_profile(style_profile)
+    doc = open_cv_template(style_profile=styles)
+    for _ in iter_cv_sections(doc, data, style_profile=styles, section_cache=section_cache):
+        pass
+    return doc
+
+
+def open_cv_template(style_profile=None):
+    """Öffnet das CV-Template (bzw. ein leeres Dokument mit Header) ohne leeren Startabsatz."""
+    styles = resolve_style_profile(style_profile)
+
     # Lade Template-Datei mit Header/Footer oder erstelle leeres Dokument
-    template_path = abs_path("../templates/cv_template.docx")
-    if os.path.exists(template_path):
-        doc = Document(template_path)
+    template_bytes = load_template_bytes()
+    if template_bytes is not None:
+        doc = Document(BytesIO(template_bytes))
         # Template bringt bereits Header, Footer und Seitenränder mit
     else:
+        template_path = abs_path("../templates/cv_template.docx")
         print(f"Warnung: Template nicht gefunden ({template_path}). Erstelle leeres Dokument.")
         doc = Document()
         # Set page margins: 1.5 cm all sides
@@ -1129,92 +889,107 @@ def generate_cv(json_path, output_dir=None, interactive=True):
             section.left_margin = Cm(1.5)
             section.right_margin = Cm(1.5)
         # Add header with logo
-        add_header_with_logo(doc)
-
-    firstname = str(data.get("Vorname", "Unbekannt"))
-    lastname = str(data.get("Nachname", "Unbekannt"))
+        add_header_with_logo(doc, style_profile=styles)
 
     # Remove default empty paragraph if it exists
     if doc.paragraphs and not doc.paragraphs[0].text.strip():
         p_element = doc.paragraphs[0]._element
         p_element.getparent().remove(p_element)
+    return doc
 
-    # -----------------------------
-    # Überschrift 1 (Name)
-    # -----------------------------
-    add_heading_1(doc, f"{firstname} {lastname}")
 
-    # -----------------------------
-    # Basisinfos
-    # -----------------------------
-    hauptrolle = data.get("Hauptrolle", {})
+def _render_name(doc, name, styles):
+    add_heading_1(doc, f"{name['Vorname']} {name['Nachname']}", style_profile=styles)
+
+
+def _render_basic_info(doc, info, styles):
+    hauptrolle = info["Hauptrolle"]
     rolle_desc = hauptrolle.get("Beschreibung", "") if isinstance(hauptrolle, dict) else str(hauptrolle)
-    add_basic_info_table(doc, 
+    add_basic_info_table(doc,
                          rolle_desc,
-                         str(data.get("Nationalität", "")),
-                         str(data.get("Ausbildung", "")))
-
-    # -----------------------------
-    # Kurzprofil
-    # -----------------------------
-    add_heading_1(doc, "Kurzprofil")
-    add_normal_text(doc, str(data.get("Kurzprofil", "")))
-
-    # -----------------------------
-    # Expertise & Fachwissen
-    # -----------------------------
-    add_heading_1(doc, "Expertise")
-    add_heading_2(doc, "Fachwissen & Schwerpunkte")
-    skills = data.get("Fachwissen_und_Schwerpunkte", [])
-    add_fachwissen_table(doc, skills)
-
-    # -----------------------------
-    # Aus- und Weiterbildung
-    # -----------------------------
-    add_heading_2(doc, "Aus- und Weiterbildung")
-    education = data.get("Aus_und_Weiterbildung", [])
-    add_education_table(doc, education)
-
-    # -----------------------------
-    # Trainings & Zertifizierungen
-    # -----------------------------
-    add_heading_2(doc, "Trainings & Zertifizierungen")
-    trainings = data.get("Trainings_und_Zertifizierungen", [])
-    add_trainings_table(doc, trainings)
-
-    # -----------------------------
-    # Sprachen
-    # -----------------------------
-    add_heading_2(doc, "Sprachen")
-    sprachen = data.get("Sprachen", [])
-    add_sprachen_table(doc, sprachen)
-
-    # -----------------------------
-    # Referenzprojekte
-    # -----------------------------
+                         str(info["Nationalität"]),
+                         str(info["Ausbildung"]),
+                         style_profile=styles)
+
+
+def _render_kurzprofil(doc, kurzprofil, styles):
+    add_heading_1(doc, "Kurzprofil", style_profile=styles)
+    add_normal_text(doc, str(kurzprofil), style_profile=styles)
+
+
+def _render_fachwissen(doc, skills, styles):
+    add_heading_1(doc, "Expertise", style_profile=styles)
+    add_heading_2(doc, "Fachwissen & Schwerpunkte", style_profile=styles)
+    add_fachwissen_table(doc, skills, style_profile=styles)
+
+
+def _render_education(doc, education, styles):
+    add_heading_2(doc, "Aus- und Weiterbildung", style_profile=styles)
+    add_education_table(doc, education, style_profile=styles)
+
+
+def _render_trainings(doc, trainings, styles):
+    add_heading_2(doc, "Trainings & Zertifizierungen", style_profile=styles)
+    add_trainings_table(doc, trainings, style_profile=styles)
+
+
+def _render_sprachen(doc, sprachen, styles):
+    add_heading_2(doc, "Sprachen", style_profile=styles)
+    add_sprachen_table(doc, sprachen, style_profile=styles)
+
+
+def _render_referenzprojekte_heading(doc, _, styles):
     doc.add_page_break()
-    add_heading_1(doc, "Ausgewählte Referenzprojekte")
-    referenzprojekte = data.get("Ausgewählte_Referenzprojekte", [])
-    for projekt in referenzprojekte:
-        add_referenzprojekt_section(doc, projekt)
+    add_heading_1(doc, "Ausgewählte Referenzprojekte", style_profile=styles)
 
 
-    # -----------------------------
-    # Dateien speichern
-    # -----------------------------
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    if output_dir is None:
-        # Fallback to old structure if not provided
-        out_docx = abs_path(f"../output/word/cv_{firstname}_{lastname}_{timestamp}.docx")
-    else:
-        out_docx = os.path.join(output_dir, f"cv_{firstname}_{lastname}_{timestamp}.docx")
+def _render_referenzprojekt(doc, projekt, styles):
+    add_referenzprojekt_section(doc, projekt, style_profile=styles)
 
-    # Vor dem Speichern: Highlight alle fehlenden Daten im gesamten Dokument
-    highlight_missing_data_in_document(doc)
-    
-    doc.save(out_docx)
-    print(f"✅ Word-Datei erstellt: {out_docx}")
-    return out_docx
+
+def cv_sections(data):
+    """
+    Zerlegt einen CV in unabhängig renderbare Abschnitte.
+
+    Returns:
+        Liste von (Name, Eingabe, Renderer) in Dokumentreihenfolge. Ein Renderer hängt
+        seinen Abschnitt mit renderer(doc, eingabe, styles) an und liest ausschliesslich
+        seine Eingabe (den zugehörigen Teilbaum der JSON).
+    """
+    sections = [
+        ("name", {"Vorname": str(data.get("Vorname", "Unbekannt")),
+                  "Nachname": str(data.get("Nachname", "Unbekannt"))}, _render_name),
+        ("basisinfos", {"Hauptrolle": data.get("Hauptrolle", {}),
+                        "Nationalität": data.get("Nationalität", ""),
+                        "Ausbildung": data.get("Ausbildung", "")}, _render_basic_info),
+        ("kurzprofil", data.get("Kurzprofil", ""), _render_kurzprofil),
+        ("fachwissen", data.get("Fachwissen_und_Schwerpunkte", []), _render_fachwissen),
+        ("ausbildung", data.get("Aus_und_Weiterbildung", []), _render_education),
+        ("trainings", data.get("Trainings_und_Zertifizierungen", []), _render_trainings),
+        ("sprachen", data.get("Sprachen", []), _render_sprachen),
+        ("referenzprojekte", None, _render_referenzprojekte_heading),
+    ]
+    for projekt in data.get("Ausgewählte_Referenzprojekte", []):
+        sections.append(("referenzprojekt", projekt, _render_referenzprojekt))
+    return sections
+
+
+def iter_cv_sections(doc, data, style_profile=None, section_cache=None):
+    """
+    Hängt die CV-Abschnitte nacheinander an doc an und gibt nach jedem Abschnitt
+    (bzw. nach jedem Referenzprojekt) die Kontrolle zurück.
+    So kann der Streaming-Writer fertige Abschnitte sofort schreiben und verwerfen.
+
+    Mit section_cache (siehe section_cache.SectionCache) werden unveränderte Abschnitte
+    aus dem Cache übernommen statt neu gerendert.
+    """
+    styles = resolve_style_profile(style_profile)
+    for name, section_input, renderer in cv_sections(data):
+        if section_cache is None:
+            renderer(doc, section_input, styles)
+        else:
+            section_cache.render(doc, name, section_input, styles, renderer)
+        yield
 
 
 # Old dialog removed - now using modern_dialogs.select_json_file() directly
@@ -1233,123 +1008,79 @@ def select_json_file():
     return picker("Wählen Sie eine JSON-Datei für den CV", initialdir=output_dir)
 
 
-def add_sprachen_table(doc, sprachen_data):
+# Level -> Anzahl Sterne für die Sortierung der Sprachen (Strings und Zahlen)
+LEVEL_STARS = {
+    "Muttersprache": 5,
+    "Verhandlungssicher": 4,
+    "Sehr gute Kenntnisse": 3,
+    "Gute Kenntnisse": 2,
+    "Grundkenntnisse": 1,
+    5: 5,
+    4: 4,
+    3: 3,
+    2: 2,
+    1: 1
+}
+
+
+def sorted_sprachen(sprachen_data, limit=6):
+    """Sprachen nach Sternen absteigend sortiert, höchstens limit (2 Zeilen × 3 Paare)."""
+    return sorted(sprachen_data,
+                  key=lambda x: LEVEL_STARS.get(x.get("Level", ""), 0),
+                  reverse=True)[:limit]
+
+
+def add_sprachen_table(doc, sprachen_data, style_profile=None):
     """
     Render Sprachen as a 6-column table (2 rows max).
     Columns: Sprache | Level (stars) | Sprache | Level (stars) | Sprache | Level (stars)
     Sorted by star count descending, max 6 languages (2 rows × 3 pairs)
     Stars: ★ = full, ☆ = empty
     """
-    from docx.shared import Inches
-    from docx.oxml import parse_xml, OxmlElement
-    from docx.oxml.ns import nsdecls
-    
+    styles = resolve_style_profile(style_profile)
     if not sprachen_data:
         return
     
-    # Define level to star count mapping (supports both strings and numbers)
-    level_stars = {
-        "Muttersprache": 5,
-        "Verhandlungssicher": 4,
-        "Sehr gute Kenntnisse": 3,
-        "Gute Kenntnisse": 2,
-        "Grundkenntnisse": 1,
-        5: 5,
-        4: 4,
-        3: 3,
-        2: 2,
-        1: 1
-    }
-    
-    # Sort languages by star count descending
-    sorted_sprachen = sorted(sprachen_data, 
-                           key=lambda x: level_stars.get(x.get("Level", ""), 0), 
-                           reverse=True)
-    
-    # Take max 6 languages (2 rows × 3 pairs)
-    display_sprachen = sorted_sprachen[:6]
-    
-    # Create table: 2 rows, 6 columns
-    table = doc.add_table(rows=2, cols=6)
+    display_sprachen = sorted_sprachen(sprachen_data)
     
-    # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
-    
-    # Set column widths: equal distribution
-    available_width = get_available_width(doc)
-    col_width = available_width / 6
-    for row in table.rows:
-        for idx in range(6):
-            row.cells[idx].width = col_width
-        # Set smaller row height for compact display
-        from docx.shared import Pt
-        row.height = Pt(18)  # Smaller row height
-        row.height_rule = 2  # WD_ROW_HEIGHT_RULE.AT_LEAST
-    
-    # Fill table cells
     s_text = styles["text"]
+    font, size = s_text["font"], s_text["size"]
+    
+    # 2 rows, 6 columns; unused cells stay empty
+    rows = [[{} for _ in range(6)] for _ in range(2)]
     
     for i, sprache in enumerate(display_sprachen):
         row_idx = i // 3  # 0 or 1
         col_start = (i % 3) * 2  # 0, 2, 4
         
-        if row_idx >= 2:  # Safety check
-            break
-            
-        # Sprache cell
-        cell_sprache = table.rows[row_idx].cells[col_start]
-        cell_sprache.text = ""
-        p_sprache = cell_sprache.paragraphs[0]
-        p_sprache.paragraph_format.line_spacing = 0.8  # Tighter spacing
-        run_sprache = p_sprache.add_run(sprache.get("Sprache", ""))
-        run_sprache.font.name = s_text["font"]
-        run_sprache.font.size = Pt(s_text["size"])
-        run_sprache.font.color.rgb = RGBColor(*s_text["color"])
-        
-        # Level cell (stars)
-        cell_level = table.rows[row_idx].cells[col_start + 1]
-        cell_level.text = ""
-        p_level = cell_level.paragraphs[0]
-        p_level.paragraph_format.line_spacing = 0.8  # Tighter spacing
-        
-        level = sprache.get("Level", "")
-        star_count = parse_level(level)
-        
-        # Add full stars
-        for _ in range(star_count):
-            run_star = p_level.add_run("★")
-            run_star.font.name = s_text["font"]
-            run_star.font.size = Pt(s_text["size"])
-            run_star.font.color.rgb = RGBColor(255, 121, 0)  # Orange color
+        # Sprache cell (tighter spacing)
+        rows[row_idx][col_start] = {
+            "paragraphs": [{
+                "line_spacing": 0.8,
+                "runs": styled_runs(sprache.get("Sprache", ""), font, size, s_text["color"])
+            }]
+        }
         
-        # Add empty stars
-        for _ in range(5 - star_count):
-            run_empty = p_level.add_run("☆")
-            run_empty.font.name = s_text["font"]
-            run_empty.font.size = Pt(s_text["size"])
-            run_empty.font.color.rgb = RGBColor(128, 128, 128)  # Gray color
-
-            run_empty.font.color.rgb = RGBColor(128, 128, 128)  # Gray color
+        # Level cell: full stars in orange, empty stars in gray
+        star_count = parse_level(sprache.get("Level", ""))
+        rows[row_idx][col_start + 1] = {
+            "paragraphs": [{
+                "line_spacing": 0.8,
+                "runs": [
+                    styled_run("★" * star_count, font, size, (255, 121, 0)),
+                    styled_run("☆" * (5 - star_count), font, size, (128, 128, 128))
+                ]
+            }]
+        }
+    
+    # Equal column widths, fixed smaller row height for compact display
+    available_width = get_available_width(doc)
+    widths = [available_width / 6] * 6
+    table = build_table(rows, widths, doc._block_width, row_height=18, row_height_rule='exact', cell_borders=False)
+    append_table(doc, table)
 
 
-def add_referenzprojekt_section(doc, projekt):
+def add_referenzprojekt_section(doc, projekt, style_profile=None):
     """
     Render a single reference project as a unified 5-row table block:
     Row 1: Kunde (100% width, Heading 2)
@@ -1358,8 +1089,7 @@ def add_referenzprojekt_section(doc, projekt):
     Row 4: Technologien Titel (20%) | Technologien Inhalt (80%) (text style)
     Row 5: Methodik Titel (20%) | Methodik Inhalt (80%) (text style)
     """
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
+    styles = resolve_style_profile(style_profile)
     from docx.shared import Pt, Cm, RGBColor
     
     kunde = projekt.get("Kunde", "")
@@ -1373,24 +1103,7 @@ def add_referenzprojekt_section(doc, projekt):
     table = doc.add_table(rows=5, cols=2)
     
     # Remove table borders
-    tbl = table._element
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr %s></w:tblPr>' % nsdecls('w'))
-        tbl.insert(0, tblPr)
-    
-    tblBorders = parse_xml(r'<w:tBorders %s>'
-                          r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                          r'<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'  
-                          r'</w:tBorders>' % nsdecls('w'))
-    existing_borders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tBorders')
-    if existing_borders is not None:
-        tblPr.remove(existing_borders)
-    tblPr.append(tblBorders)
+    remove_table_borders(table)
     
     # Set column widths: 20% for col1, 80% for col2
     available_width = get_available_width(doc)
@@ -1399,20 +1112,6 @@ def add_referenzprojekt_section(doc, projekt):
         for idx, width in enumerate(widths):
             row.cells[idx].width = width
     
-    # Remove cell borders function
-    def remove_cell_borders(cell):
-        tcPr = cell._element.get_or_add_tcPr()
-        tcBorders = parse_xml(r'<w:tcBorders %s>'
-                              r'<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
-                              r'<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'  
-                              r'</w:tcBorders>' % nsdecls('w'))
-        existing = tcPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tcBorders')
-        if existing is not None:
-            tcPr.remove(existing)
-        tcPr.append(tcBorders)
-    
     # Row 1: Kunde (merge both columns for 100% width)
     row1_cell = table.rows[0].cells[0].merge(table.rows[0].cells[1])
     remove_cell_borders(row1_cell)
@@ -1542,9 +1241,6 @@ def add_referenzprojekt_section(doc, projekt):
 
 # Old dialog removed - now using modern_dialogs functions
 
-
-# Lade Stile global nach allen Definitionen
-styles = load_styles("styles.json")
 if __name__ == "__main__":
     # Import dialogs - handle both direct execution and module import
     try:
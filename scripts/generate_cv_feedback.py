@@ -3,14 +3,17 @@ import json
 from openai import OpenAI
 from datetime import datetime
 
+try:
+    from schema_registry import get_schema
+except ImportError:
+    from scripts.schema_registry import get_schema
+
+
 def generate_cv_feedback_json(cv_json_path, output_path, schema_path, stellenprofil_json_path=None):
     """
     Generate a CV feedback JSON using the provided CV JSON and the feedback schema prompt.
+    Path-based wrapper around generate_cv_feedback (reads the inputs, writes output_path).
     """
-    # Load schema
-    with open(schema_path, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
-    # Load input data
     with open(cv_json_path, 'r', encoding='utf-8') as f:
         cv_data = json.load(f)
     stellenprofil_data = None
@@ -18,13 +21,30 @@ def generate_cv_feedback_json(cv_json_path, output_path, schema_path, stellenpro
         with open(stellenprofil_json_path, 'r', encoding='utf-8') as f:
             stellenprofil_data = json.load(f)
 
+    feedback_json = generate_cv_feedback(cv_data, schema_path, stellenprofil_data)
+
+    # Save result
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(feedback_json, f, ensure_ascii=False, indent=2)
+    print(f"✅ CV-Feedback JSON gespeichert: {output_path}")
+    return feedback_json
+
+
+def generate_cv_feedback(cv_data, schema_path, stellenprofil_data=None):
+    """
+    Generate CV feedback from an in-memory CV dict (and optional Stellenprofil dict).
+    Nothing is written to disk; returns the feedback dict.
+    """
+    # Schema aus der Registry (einmal pro Prozess geladen und serialisiert)
+    schema = get_schema(schema_path)
+
     # Prepare prompt for OpenAI
     system_prompt = (
         "Du bist ein CV-Qualitätsprüfer. Analysiere das folgende CV-JSON (und optional das Stellenprofil) gemäß der Feedback-Schema-Vorgabe. "
         "Fülle die Struktur exakt aus, keine Felder hinzufügen oder weglassen. "
         "Nutze ausschließlich die bereitgestellten JSON-Daten. "
         "Schema (nur als Vorgabe, nicht ausgeben):\n" +
-        json.dumps(schema, ensure_ascii=False, indent=2)
+        schema.prompt
     )
     user_prompt = (
         "CV JSON:\n" + json.dumps(cv_data, ensure_ascii=False, indent=2)
@@ -81,9 +101,5 @@ def generate_cv_feedback_json(cv_json_path, output_path, schema_path, stellenpro
     # Ensure feedback_datum is set to current date
     if "feedback_metadata" in feedback_json:
         feedback_json["feedback_metadata"]["feedback_datum"] = datetime.now().strftime("%Y-%m-%d")
-        
-    # Save result
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(feedback_json, f, ensure_ascii=False, indent=2)
-    print(f"✅ CV-Feedback JSON gespeichert: {output_path}")
+
     return feedback_json
@@ -3,19 +3,41 @@ import json
 from openai import OpenAI
 from datetime import datetime
 
+try:
+    from schema_registry import get_schema
+    from skill_taxonomy import skill_prescore
+except ImportError:
+    from scripts.schema_registry import get_schema
+    from scripts.skill_taxonomy import skill_prescore
+
+
 def generate_matchmaking_json(cv_json_path, stellenprofil_json_path, output_path, schema_path):
     """
     Generate a matchmaking JSON using the provided CV and Stellenprofil JSONs and the schema prompt.
+    Path-based wrapper around generate_matchmaking (reads the inputs, writes output_path).
     """
-    # Load schema
-    with open(schema_path, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
-    # Load input data
     with open(cv_json_path, 'r', encoding='utf-8') as f:
         cv_data = json.load(f)
     with open(stellenprofil_json_path, 'r', encoding='utf-8') as f:
         stellenprofil_data = json.load(f)
 
+    match_json = generate_matchmaking(cv_data, stellenprofil_data, schema_path)
+
+    # Save result
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(match_json, f, ensure_ascii=False, indent=2)
+    print(f"✅ Matchmaking JSON gespeichert: {output_path}")
+    return match_json
+
+
+def generate_matchmaking(cv_data, stellenprofil_data, schema_path):
+    """
+    Generate a matchmaking result from in-memory CV and Stellenprofil dicts.
+    Nothing is written to disk; returns the matchmaking dict.
+    """
+    # Schema aus der Registry (einmal pro Prozess geladen und serialisiert)
+    schema = get_schema(schema_path)
+
     # Prepare prompt for OpenAI
     system_prompt = (
         "Du bist ein kritischer Auditor für CV-Matching. Vergleiche das folgende Stellenprofil und den CV gemäß der JSON-Schema-Vorgabe.\n"
@@ -30,7 +52,7 @@ def generate_matchmaking_json(cv_json_path, stellenprofil_json_path, output_path
         "8. WEITERE KRITERIEN: Falls im Stellenprofil Anforderungen gefunden werden, die weder explizit als 'Muss' noch als 'Soll' markiert sind (z.B. aus dem Fließtext oder 'Aufgaben'), füge diese in die Liste 'weitere_kriterien_abgleich' ein.\n"
         "9. SOFT SKILLS: Extrahiere persönliche Kompetenzen (z.B. Teamfähigkeit, Belastbarkeit, Kommunikation) in die Liste 'soft_skills_abgleich'. Diese sind oft schwer zu beweisen. Wenn sie im CV nicht explizit stehen, bewerte sie als 'nicht explizit erwähnt' (neutral) und ziehe KEINE Punkte vom Score ab. Wenn Hinweise existieren (z.B. in Projekten), bewerte als 'erfüllt'.\n\n"
         "Schema (nur als Vorgabe, nicht ausgeben):\n" +
-        json.dumps(schema, ensure_ascii=False, indent=2)
+        schema.prompt
     )
     user_prompt = (
         "Stellenprofil JSON:\n" + json.dumps(stellenprofil_data, ensure_ascii=False, indent=2) +
@@ -101,9 +123,8 @@ def generate_matchmaking_json(cv_json_path, stellenprofil_json_path, output_path
     # Ensure matching_datum is set to current date
     if "match_metadata" in match_json:
         match_json["match_metadata"]["matching_datum"] = datetime.now().strftime("%Y-%m-%d")
-        
-    # Save result
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(match_json, f, ensure_ascii=False, indent=2)
-    print(f"✅ Matchmaking JSON gespeichert: {output_path}")
+
+    # Lokale Skill-Vorprüfung über die Skill-Taxonomie (deterministisch, ohne LLM)
+    match_json["skill_vorpruefung"] = skill_prescore(cv_data, stellenprofil_data)
+
     return match_json
@@ -0,0 +1,220 @@
+"""
+HTML-Vorschau für CV-JSON.
+
+Bisher liess sich das Ergebnis nur über das heruntergeladene Word-Dokument prüfen.
+render_cv_html erzeugt in wenigen Millisekunden eine HTML-Ansicht mit denselben
+Abschnitten in derselben Reihenfolge (generate_cv.cv_sections) und demselben
+StyleProfile wie generate_cv. Fehlende Daten ("! bitte prüfen !") werden wie im
+Word-Dokument gelb hervorgehoben.
+
+Die Vorschau ist eine Annäherung an das Layout (Seitenumbrüche, Header und exakte
+Abstände bestimmt erst Word), aber inhaltlich 1:1.
+"""
+import base64
+import os
+from html import escape
+
+try:
+    from generate_cv import cv_sections, parse_level, sorted_sprachen, split_missing_data
+    from style_profile import resolve_style_profile
+    from utils_optimize_logo import optimized_logo
+except ImportError:
+    from scripts.generate_cv import cv_sections, parse_level, sorted_sprachen, split_missing_data
+    from scripts.style_profile import resolve_style_profile
+    from scripts.utils_optimize_logo import optimized_logo
+
+
+def _rgb(color):
+    return "#%02x%02x%02x" % tuple(color)
+
+
+def _text(text):
+    """Escaped Text mit hervorgehobenen Markern und Zeilenumbrüchen."""
+    parts = []
+    for part, is_marker in split_missing_data(str(text)):
+        part = escape(part).replace("\n", "<br>")
+        parts.append(f"<mark>{part}</mark>" if is_marker else part)
+    return "".join(parts)
+
+
+def _logo_data_uri(logo_path, width_cm):
+    if not logo_path or not os.path.exists(logo_path):
+        return None
+    image = optimized_logo(logo_path, width_cm)
+    mime = "image/jpeg" if image[:2] == b"\xff\xd8" else "image/png"
+    return f"data:{mime};base64,{base64.b64encode(image).decode('ascii')}"
+
+
+def _css(styles):
+    h1, h2, text, bullet = styles["heading1"], styles["heading2"], styles["text"], styles["bullet"]
+    return f"""
+    body {{ margin: 0; background: #f0f0f0; }}
+    .page {{ background: #fff; max-width: 21cm; margin: 0 auto; padding: 1.5cm;
+             box-sizing: border-box; font-family: '{text["font"]}', sans-serif;
+             font-size: {text["size"]}pt; color: {_rgb(text["color"])}; }}
+    .cv-header {{ display: flex; justify-content: space-between; align-items: center;
+                  margin-bottom: 1cm; font-family: '{styles["header"].get("text_font", text["font"])}', sans-serif;
+                  font-size: {styles["header"].get("text_size", 10)}pt;
+                  color: {_rgb(styles["header"].get("text_color", h1["color"]))}; }}
+    .cv-header img {{ max-width: {styles["header"].get("logo_width_cm", 4)}cm;
+                      max-height: {styles["header"].get("logo_height_cm", 1.5)}cm; }}
+    h1 {{ font-family: '{h1["font"]}', sans-serif; font-size: {h1["size"]}pt;
+          font-weight: {"bold" if h1.get("bold") else "normal"}; color: {_rgb(h1["color"])};
+          margin: {h1.get("space_before", 0)}pt 0 {h1.get("space_after", 0)}pt; }}
+    h2, .h2 {{ font-family: '{h2["font"]}', sans-serif; font-size: {h2["size"]}pt;
+               font-weight: {"bold" if h2.get("bold") else "normal"}; color: {_rgb(h2["color"])}; }}
+    h2 {{ margin: {h2.get("space_before", 0)}pt 0 {h2.get("space_after", 0)}pt; }}
+    table {{ width: 100%; border-collapse: collapse; }}
+    td {{ vertical-align: top; padding: 0 4pt 0 0; }}
+    p {{ margin: 0 0 6pt; }}
+    mark {{ background: yellow; }}
+    .label {{ font-weight: bold; }}
+    .w20 {{ width: 20%; }} .w30 {{ width: 30%; }} .w50 {{ width: 50%; }}
+    .bild {{ text-align: center; vertical-align: middle; }}
+    .sprachen td {{ width: 16.66%; line-height: 0.8; height: 18pt; }}
+    .star-full {{ color: #ff7900; }} .star-empty {{ color: #808080; }}
+    ul.bullets {{ list-style: none; margin: 0; padding: 0; }}
+    ul.bullets li {{ padding-left: 18pt; text-indent: -18pt; margin-bottom: 3pt;
+                     line-height: {bullet.get("line_spacing", 1.0)}; }}
+    ul.bullets li::before {{ content: '{bullet.get("symbol", "■")}'; color: {_rgb(bullet["color"])};
+                            font-size: {bullet.get("symbol_size", bullet["size"])}pt;
+                            display: inline-block; width: 18pt; text-indent: 0; }}
+    .projekt {{ margin-bottom: 24pt; }}
+    .page-break {{ border-top: 1px dashed #bbb; margin: 12pt 0; }}
+    """
+
+
+def _name(name, styles):
+    return f"<h1>{_text(name['Vorname'] + ' ' + name['Nachname'])}</h1>"
+
+
+def _basic_info(info, styles):
+    hauptrolle = info["Hauptrolle"]
+    rolle = hauptrolle.get("Beschreibung", "") if isinstance(hauptrolle, dict) else str(hauptrolle)
+    rows = [("Hauptrolle:", rolle), ("Nationalität:", info["Nationalität"]), ("Ausbildung:", info["Ausbildung"])]
+    html = ["<table class='basisinfos'>"]
+    for i, (label, value) in enumerate(rows):
+        bild = "<td class='w30 bild' rowspan='3'><mark>BILD EINFÜGEN</mark></td>" if i == 0 else ""
+        html.append(f"<tr><td class='w20 label'>{label}</td><td class='w50'>{_text(value)}</td>{bild}</tr>")
+    html.append("</table>")
+    return "".join(html)
+
+
+def _kurzprofil(kurzprofil, styles):
+    return f"<h1>Kurzprofil</h1><p>{_text(kurzprofil)}</p>"
+
+
+def _fachwissen(skills, styles):
+    html = ["<h1>Expertise</h1><h2>Fachwissen &amp; Schwerpunkte</h2>"]
+    if skills:
+        html.append("<table>")
+        for item in skills:
+            inhalt = item.get("Inhalt", item.get("BulletList", []))
+            html.append(f"<tr><td class='w20 label'>{_text(item.get('Kategorie', ''))}</td>"
+                        f"<td>{_text(', '.join(inhalt))}</td></tr>")
+        html.append("</table>")
+    return "".join(html)
+
+
+def _education(education, styles):
+    html = ["<h2>Aus- und Weiterbildung</h2>"]
+    if education:
+        html.append("<table>")
+        for item in education:
+            html.append(f"<tr><td class='w20'>{_text(item.get('Zeitraum', ''))}</td>"
+                        f"<td><p><span class='label'>{_text(item.get('Institution', ''))}</span><br>"
+                        f"{_text(item.get('Abschluss', ''))}</p></td></tr>")
+        html.append("</table>")
+    return "".join(html)
+
+
+def _trainings(trainings, styles):
+    html = ["<h2>Trainings &amp; Zertifizierungen</h2>"]
+    if trainings:
+        html.append("<table>")
+        for item in trainings:
+            titel = item.get("Titel", item.get("Ausbildung_Titel", ""))
+            html.append(f"<tr><td class='w20'>{_text(item.get('Zeitraum', ''))}</td>"
+                        f"<td class='w20 label'>{_text(item.get('Institution', ''))}</td>"
+                        f"<td>{_text(titel)}</td></tr>")
+        html.append("</table>")
+    return "".join(html)
+
+
+def _sprachen(sprachen, styles):
+    html = ["<h2>Sprachen</h2>"]
+    if sprachen:
+        cells = []
+        for sprache in sorted_sprachen(sprachen):
+            stars = parse_level(sprache.get("Level", ""))
+            cells.append(f"<td>{_text(sprache.get('Sprache', ''))}</td>"
+                         f"<td><span class='star-full'>{'★' * stars}</span>"
+                         f"<span class='star-empty'>{'☆' * (5 - stars)}</span></td>")
+        html.append("<table class='sprachen'>")
+        for row in (cells[:3], cells[3:6]):
+            html.append("<tr>" + "".join(row) + "<td></td><td></td>" * (3 - len(row)) + "</tr>")
+        html.append("</table>")
+    return "".join(html)
+
+
+def _referenzprojekte_heading(_, styles):
+    return "<div class='page-break'></div><h1>Ausgewählte Referenzprojekte</h1>"
+
+
+def _referenzprojekt(projekt, styles):
+    taetigkeiten = "".join(
+        f"<li>{_text(t)}</li>" for t in projekt.get("Tätigkeiten", []) if t.strip()
+    )
+    return (
+        "<table class='projekt'>"
+        f"<tr><td colspan='2' class='h2'>{_text(projekt.get('Kunde', ''))}</td></tr>"
+        f"<tr><td class='w20 h2'>{_text(projekt.get('Zeitraum', ''))}</td>"
+        f"<td class='h2'>{_text(projekt.get('Rolle', ''))}</td></tr>"
+        f"<tr><td colspan='2'><ul class='bullets'>{taetigkeiten}</ul></td></tr>"
+        f"<tr><td class='w20 label'>Technologien</td><td>{_text(projekt.get('Technologien', ''))}</td></tr>"
+        f"<tr><td class='w20 label'>Methodik</td><td>{_text(projekt.get('Methodik', ''))}</td></tr>"
+        "</table>"
+    )
+
+
+# Abschnittsname (siehe generate_cv.cv_sections) -> HTML-Renderer
+SECTION_RENDERERS = {
+    "name": _name,
+    "basisinfos": _basic_info,
+    "kurzprofil": _kurzprofil,
+    "fachwissen": _fachwissen,
+    "ausbildung": _education,
+    "trainings": _trainings,
+    "sprachen": _sprachen,
+    "referenzprojekte": _referenzprojekte_heading,
+    "referenzprojekt": _referenzprojekt,
+}
+
+
+def render_cv_html(data, style_profile=None):
+    """
+    Rendert einen CV (JSON-Dict) als eigenständige HTML-Seite.
+
+    Args:
+        data: CV als JSON-Dict
+        style_profile: Optionales StyleProfile (Standard: styles.json)
+
+    Returns:
+        HTML als String
+    """
+    styles = resolve_style_profile(style_profile)
+    header = styles["header"]
+    logo = _logo_data_uri(os.path.abspath(os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), header.get("logo_path", "")
+    )) if header.get("logo_path") else None, header.get("logo_width_cm", 4.0))
+
+    body = [f"<div class='cv-header'><span>{escape(header.get('text', ''))}</span>"
+            + (f"<img src='{logo}' alt='Logo'>" if logo else "") + "</div>"]
+    for name, section_input, _ in cv_sections(data):
+        body.append(SECTION_RENDERERS[name](section_input, styles))
+
+    return (
+        "<!DOCTYPE html><html lang='de'><head><meta charset='UTF-8'>"
+        f"<style>{_css(styles)}</style></head>"
+        f"<body><div class='page'>{''.join(body)}</div></body></html>"
+    )
@@ -0,0 +1,727 @@
+"""
+Hintergrund-Warteschlange für Pipeline-Läufe.
+
+run_cv_pipeline_dialog hat StreamlitCVGenerator.run bisher direkt im Skript-Thread der
+Session ausgeführt: 1-3 Minuten, in denen die Session blockiert war, ein Neuladen der Seite
+den Fortschritt verlor und parallele Läufe vieler Nutzer um dieselben Threads konkurrierten.
+Läufe sind jetzt Aufträge in einer lokalen SQLite-Warteschlange (output/jobs.sqlite3 oder
+CV_JOB_QUEUE):
+
+- jobs: ein Auftrag pro Lauf (ID, Nutzer, Status, Parameter, Ergebnis, letzter Fortschritt)
+- job_events: Fortschrittsmeldungen (Prozent, Text, Zustand) zum Abfragen durch die App
+- Worker-Prozesse (CV_JOB_WORKERS, Standard 2; 0 = ein Thread im App-Prozess) holen
+  Aufträge atomar ab, führen die Pipeline aus und tragen erfolgreiche Läufe selbst in den
+  Verlauf ein
+- die App fragt nur noch den Stand ab und findet einen laufenden Auftrag nach dem Neuladen
+  über den Nutzer wieder (list_jobs)
+- pro Nutzer sind höchstens CV_JOB_USER_LIMIT Aufträge gleichzeitig offen (Standard 1)
+
+Der API-Key wird nie gespeichert: Aufträge tragen nur seinen Fingerabdruck (key_id), die
+Worker bekommen die Keys von der App im Speicher (stdin) und holen nur Aufträge ab, deren
+Key sie kennen. Es gibt einen Pool mit fester Grösse, egal wie viele Keys verwendet werden.
+
+Worker lassen sich auch unabhängig von der App starten (Key aus OPENAI_API_KEY):
+    python -m scripts.job_queue worker output/jobs.sqlite3 .
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from scripts.run_store import get_run_store, history_entry
+from scripts.streamlit_pipeline import StreamlitCVGenerator
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+QUEUE_FILENAME = "jobs.sqlite3"
+POLL_INTERVAL = 0.5
+# Aufträge, die auf eine spekulative Extraktion warten, laufen spätestens danach ohne sie los
+WAIT_TIMEOUT_S = 120
+# Versuche pro Auftrag, wenn ein Worker-Prozess mitten im Lauf abstürzt
+MAX_ATTEMPTS = 2
+
+ACTIVE_STATES = ("waiting", "queued", "running")
+FINAL_STATES = ("completed", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    user TEXT NOT NULL,
+    key_id TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    progress INTEGER NOT NULL DEFAULT 0,
+    progress_text TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_pid INTEGER,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, key_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs (user, created_at DESC);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    ts TEXT NOT NULL,
+    percent INTEGER,
+    text TEXT,
+    state TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_job ON job_events (job_id, id);
+"""
+
+
+class JobLimitError(RuntimeError):
+    """Der Nutzer hat bereits die maximale Anzahl offener Aufträge."""
+
+
+class JobCancelled(Exception):
+    """Wird im Fortschritts-Callback ausgelöst, wenn der Auftrag abgebrochen wurde."""
+
+
+def default_queue_path(base_dir=None):
+    """Pfad der Warteschlange (CV_JOB_QUEUE oder <base_dir>/output/jobs.sqlite3)."""
+    configured = os.environ.get("CV_JOB_QUEUE")
+    if configured:
+        return configured
+    return os.path.join(base_dir or os.getcwd(), "output", QUEUE_FILENAME)
+
+
+def key_fingerprint(api_key):
+    """Fingerabdruck eines API-Keys (der Key selbst landet nie in der Datenbank)."""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+
+def _now():
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+# Windows: OpenProcess/GetExitCodeProcess (os.kill beendet dort den Prozess, auch mit Signal 0)
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_ERROR_ACCESS_DENIED = 5
+_STILL_ACTIVE = 259
+
+
+def _windows_pid_alive(pid, kernel32=None):
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = kernel32 or ctypes.WinDLL("kernel32", use_last_error=True)
+    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Prozess existiert, gehört aber einem anderen Benutzer
+        return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == _STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _pid_alive(pid):
+    """Läuft der Prozess noch? Prüft nur, sendet kein Signal (auch nicht unter Windows)."""
+    if not pid or pid < 0:
+        return False
+    if os.name == "nt":
+        return _windows_pid_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """SQLite-Warteschlange der Pipeline-Aufträge. Eine Verbindung pro Operation, daher threadsicher."""
+
+    def __init__(self, path=None, user_limit=None):
+        self.path = path or default_queue_path()
+        self.user_limit = user_limit if user_limit is not None else int(os.environ.get("CV_JOB_USER_LIMIT", 1))
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self):
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._initialized = True
+        # Autocommit: Transaktionen werden explizit mit BEGIN IMMEDIATE geöffnet
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def job_dir(self, job_id):
+        """Verzeichnis für die Eingabedateien eines Auftrags (neben der Datenbank)."""
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), "jobs", job_id)
+
+    def remove_inputs(self, job_id):
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+    # -------------------------------------
+    # App-Seite
+    # -------------------------------------
+    def submit(self, user, params, key_id="", status="queued"):
+        """
+        Legt einen Auftrag an.
+
+        Args:
+            user: Nutzername (für Limit und Wiederfinden nach dem Neuladen)
+            params: JSON-serialisierbare Parameter des Laufs
+            key_id: Fingerabdruck des API-Keys (siehe key_fingerprint)
+            status: "queued" oder "waiting" (wartet auf mark_ready, z.B. bis die Eingaben liegen)
+
+        Returns:
+            ID des Auftrags
+
+        Raises:
+            JobLimitError: Der Nutzer hat bereits user_limit offene Aufträge
+        """
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                active = conn.execute(
+                    f"SELECT COUNT(*) FROM jobs WHERE user = ? AND status IN ({','.join('?' * len(ACTIVE_STATES))})",
+                    (user, *ACTIVE_STATES)
+                ).fetchone()[0]
+                if self.user_limit > 0 and active >= self.user_limit:
+                    raise JobLimitError(
+                        f"Es läuft bereits {'ein Auftrag' if active == 1 else f'{active} Aufträge'} - "
+                        "bitte warten, bis der Lauf abgeschlossen ist."
+                    )
+                conn.execute(
+                    "INSERT INTO jobs (id, user, key_id, status, params, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, user, key_id, status, json.dumps(params), _now())
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def mark_ready(self, job_id, params=None):
+        """Gibt einen wartenden Auftrag frei (optional mit ergänzten Parametern)."""
+        with closing(self._connect()) as conn:
+            if params is None:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'waiting'", (job_id,))
+            else:
+                cursor = conn.execute(
+                    "UPDATE jobs SET status = 'queued', params = ? WHERE id = ? AND status = 'waiting'",
+                    (json.dumps(params), job_id))
+            return bool(cursor.rowcount)
+
+    def update_params(self, job_id, params):
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET params = ? WHERE id = ?", (json.dumps(params), job_id))
+
+    def cancel(self, job_id):
+        """
+        Bricht einen Auftrag ab. Wartende Aufträge werden sofort verworfen, laufende beim
+        nächsten Fortschrittsschritt (ein laufender LLM-Aufruf wird noch abgewartet).
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            cursor = conn.execute(
+                f"UPDATE jobs SET status = 'cancelled', finished_at = ?"
+                f" WHERE id = ? AND status IN ({','.join('?' * len(ACTIVE_STATES))})",
+                (_now(), job_id, *ACTIVE_STATES)
+            )
+        if cursor.rowcount and row["status"] != "running":
+            self.remove_inputs(job_id)
+        return bool(cursor.rowcount)
+
+    def acknowledge(self, job_id):
+        """Markiert das Ergebnis als abgeholt (wird beim Neuladen nicht mehr angezeigt)."""
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET acknowledged = 1 WHERE id = ?", (job_id,))
+
+    def get(self, job_id):
+        """Ein Auftrag (mit letztem Fortschritt und ggf. Ergebnis) oder None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def events(self, job_id, after=0):
+        """Fortschrittsmeldungen eines Auftrags nach der Meldung mit ID after."""
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(
+                "SELECT id, ts, percent, text, state FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+                (job_id, after)
+            )]
+
+    def list_jobs(self, user, unacknowledged=False, limit=20):
+        """Aufträge eines Nutzers, neueste zuerst (unacknowledged: nur nicht abgeholte)."""
+        query = "SELECT * FROM jobs WHERE user = ?"
+        if unacknowledged:
+            query += " AND acknowledged = 0"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (user, int(limit))).fetchall()
+        return [self._job(row) for row in rows]
+
+    @staticmethod
+    def _job(row):
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["acknowledged"] = bool(job["acknowledged"])
+        return job
+
+    # -------------------------------------
+    # Worker-Seite
+    # -------------------------------------
+    def claim(self, worker_pid, key_ids=""):
+        """
+        Holt den ältesten wartenden Auftrag für einen der Keys atomar ab (BEGIN IMMEDIATE:
+        zwei Worker können nie denselben Auftrag bekommen). Aufträge im Zustand "waiting"
+        werden nach WAIT_TIMEOUT_S ebenfalls abgeholt.
+
+        Args:
+            worker_pid: Prozess-ID des Workers (für recover)
+            key_ids: Fingerabdruck oder Liste von Fingerabdrücken der bekannten API-Keys
+
+        Returns:
+            Auftrag oder None
+        """
+        key_ids = [key_ids] if isinstance(key_ids, str) else list(key_ids)
+        if not key_ids:
+            return None
+        wait_limit = (datetime.now() - timedelta(seconds=WAIT_TIMEOUT_S)).isoformat(timespec="milliseconds")
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    f"SELECT * FROM jobs WHERE key_id IN ({','.join('?' * len(key_ids))})"
+                    " AND (status = 'queued' OR (status = 'waiting' AND created_at < ?))"
+                    " ORDER BY created_at LIMIT 1",
+                    (*key_ids, wait_limit)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ?, attempts = attempts + 1"
+                        " WHERE id = ?",
+                        (worker_pid, _now(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self._job(row)
+        job["status"] = "running"
+        return job
+
+    def report_progress(self, job_id, percent, text, state="running"):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO job_events (job_id, ts, percent, text, state) VALUES (?, ?, ?, ?, ?)",
+                (job_id, _now(), percent, text, state)
+            )
+            conn.execute("UPDATE jobs SET progress = ?, progress_text = ? WHERE id = ?", (percent, text, job_id))
+
+    def is_cancelled(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row is None or row["status"] == "cancelled"
+
+    def finish(self, job_id, result):
+        """Schliesst einen laufenden Auftrag ab (ein zwischenzeitlich abgebrochener bleibt abgebrochen)."""
+        return self._close(job_id, "completed", result, None)
+
+    def fail(self, job_id, error, result=None):
+        return self._close(job_id, "failed", result, error)
+
+    def _close(self, job_id, status, result, error):
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (status, json.dumps(result, default=str) if result is not None else None, error, _now(), job_id)
+            )
+        return bool(cursor.rowcount)
+
+    def recover(self):
+        """
+        Stellt Aufträge abgestürzter Worker wieder ein (Prozess existiert nicht mehr); nach
+        MAX_ATTEMPTS Versuchen schlägt der Auftrag fehl.
+
+        Returns:
+            Anzahl wieder eingestellter Aufträge
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT id, worker_pid, attempts FROM jobs WHERE status = 'running'").fetchall()
+            requeued = 0
+            for row in rows:
+                if _pid_alive(row["worker_pid"]):
+                    continue
+                if row["attempts"] < MAX_ATTEMPTS:
+                    requeued += conn.execute(
+                        "UPDATE jobs SET status = 'queued', worker_pid = NULL WHERE id = ? AND status = 'running'",
+                        (row["id"],)
+                    ).rowcount
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                        ("Worker-Prozess wurde unerwartet beendet", _now(), row["id"])
+                    )
+        return requeued
+
+
+# -------------------------------------
+# Pipeline-Aufträge
+# -------------------------------------
+def _save_input(directory, name, pdf_file):
+    """Legt einen Upload im Auftragsverzeichnis ab; Pfade (CLI, Mock-Modus) bleiben unverändert."""
+    if not hasattr(pdf_file, "getvalue"):
+        return pdf_file
+    path = os.path.join(directory, f"{name}_{os.path.basename(getattr(pdf_file, 'name', '') or 'upload.pdf')}")
+    with open(path, "wb") as f:
+        f.write(pdf_file.getvalue())
+    return path
+
+
+def _save_json(directory, name, data):
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+def submit_pipeline_job(queue, user, cv_file, job_file=None, mode=None, api_key=None, model_name=None,
+                        custom_styles=None, custom_logo_path=None, extractor=None, schemas=None):
+    """
+    Stellt einen Pipeline-Lauf ein: Uploads werden ins Auftragsverzeichnis geschrieben,
+    fertige Ergebnisse der spekulativen Extraktion mitgegeben. Läuft die Extraktion noch,
+    wartet der Auftrag (in einem Hintergrund-Thread) auf ihr Ergebnis.
+
+    Args:
+        queue: JobQueue
+        user: Nutzername
+        cv_file / job_file: Uploads oder Pfade
+        model_name: Modell für den Lauf (die App setzt MODEL_NAME erst nach dem Start der Worker)
+        extractor: SpeculativeExtractor oder None
+        schemas: {"cv": Schema-Pfad, "stellenprofil": Schema-Pfad} für die Spekulation
+
+    Returns:
+        ID des Auftrags
+
+    Raises:
+        JobLimitError: Der Nutzer hat bereits die maximale Anzahl offener Aufträge
+    """
+    params = {
+        "mode": mode,
+        "model_name": model_name,
+        "custom_styles": custom_styles,
+        "custom_logo_path": custom_logo_path,
+    }
+    job_id = queue.submit(user, params, key_fingerprint(api_key), status="waiting")
+    directory = queue.job_dir(job_id)
+    os.makedirs(directory, exist_ok=True)
+    params["cv_path"] = _save_input(directory, "cv", cv_file)
+    params["job_path"] = _save_input(directory, "stellenprofil", job_file) if job_file else None
+
+    schemas = schemas or {}
+    pending = {}
+    if extractor is not None:
+        for name, pdf_file in (("cv", cv_file), ("stellenprofil", job_file)):
+            state = extractor.status(pdf_file, schemas.get(name)) if pdf_file else None
+            if state in ("llm", "fertig"):
+                pending[name] = pdf_file
+
+    if not pending:
+        queue.mark_ready(job_id, params)
+        return job_id
+    # Eingaben schon jetzt eintragen: nach WAIT_TIMEOUT_S läuft der Auftrag auch ohne Spekulation
+    queue.update_params(job_id, params)
+
+    def wait_for_speculation():
+        for name, pdf_file in pending.items():
+            try:
+                params[f"{name}_data_path"] = _save_json(
+                    directory, name, extractor.extract(pdf_file, schemas.get(name)))
+            except Exception as e:
+                # Der Worker extrahiert dann selbst
+                print(f"⚠️  Spekulative Extraktion für Auftrag {job_id[:8]} nicht übernommen: {e}")
+        queue.mark_ready(job_id, params)
+
+    threading.Thread(target=wait_for_speculation, name=f"job-{job_id[:8]}", daemon=True).start()
+    return job_id
+
+
+def _load_json(path):
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_pipeline_job(queue, job, base_dir, generator=None, api_key=None):
+    """
+    Führt einen abgeholten Auftrag aus: Fortschritt wird als Ereignis gespeichert, ein
+    erfolgreicher Lauf in den Verlauf eingetragen.
+
+    Returns:
+        Ergebnis von StreamlitCVGenerator.run
+    """
+    job_id = job["id"]
+    params = job["params"]
+    generator = generator or StreamlitCVGenerator(base_dir)
+
+    def on_progress(percent, text, state):
+        queue.report_progress(job_id, percent, text, state)
+        if state == "running" and queue.is_cancelled(job_id):
+            raise JobCancelled("Lauf abgebrochen")
+
+    if params.get("model_name"):
+        os.environ["MODEL_NAME"] = params["model_name"]
+    started = time.perf_counter()
+    try:
+        results = generator.run(
+            cv_file=params["cv_path"],
+            job_file=params.get("job_path"),
+            api_key=api_key,
+            progress_callback=on_progress,
+            custom_styles=params.get("custom_styles"),
+            custom_logo_path=params.get("custom_logo_path"),
+            pipeline_mode=params.get("mode"),
+            cv_data=_load_json(params.get("cv_data_path")),
+            stellenprofil_data=_load_json(params.get("stellenprofil_data_path")),
+        )
+        if results["success"]:
+            results["run_id"] = get_run_store(base_dir).add_run(
+                history_entry(results, params.get("mode")),
+                metrics={"dauer_s": round(time.perf_counter() - started, 1)}
+            )
+            queue.finish(job_id, results)
+        else:
+            queue.fail(job_id, results.get("error") or "Unbekannter Fehler", results)
+        return results
+    except Exception as e:
+        queue.fail(job_id, str(e))
+        raise
+    finally:
+        queue.remove_inputs(job_id)
+
+
+def _work(db_path, base_dir, keys, stop_event, poll_interval, parent_pid=None):
+    """
+    Worker-Schleife: Aufträge für die bekannten Keys abholen und ausführen, bis stop_event
+    gesetzt ist (bzw. der App-Prozess parent_pid nicht mehr läuft).
+
+    Args:
+        keys: {Fingerabdruck: API-Key}; wird während des Laufs ergänzt (neue Keys der App)
+    """
+    queue = JobQueue(db_path)
+    generator = None
+    while not stop_event.is_set():
+        if parent_pid and not _pid_alive(parent_pid):
+            break
+        job = queue.claim(os.getpid(), list(keys))
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+        generator = generator or StreamlitCVGenerator(base_dir)
+        try:
+            run_pipeline_job(queue, job, base_dir, generator, keys.get(job["key_id"]))
+        except Exception as e:
+            print(f"❌ Auftrag {job['id'][:8]} fehlgeschlagen: {e}")
+
+
+def _read_keys(stream, keys):
+    """Liest API-Keys der App (eine JSON-Zeile pro Key) in den Worker ein."""
+    for line in stream:
+        try:
+            api_key = json.loads(line)["api_key"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        keys[key_fingerprint(api_key)] = api_key
+
+
+class WorkerPool:
+    """
+    Feste Anzahl Worker für alle Nutzer und API-Keys: eigene Prozesse
+    (python -m scripts.job_queue worker) oder, mit workers=0, ein Thread im App-Prozess.
+
+    API-Keys kennt der Pool nur im Speicher (add_key); Prozess-Worker bekommen sie über
+    stdin, nie über die Datenbank oder die Kommandozeile. Die Prozesse werden per subprocess
+    gestartet, nicht über multiprocessing: Streamlit führt app.py als __main__ aus, ein
+    spawn-Kind würde die ganze App erneut ausführen.
+    """
+
+    def __init__(self, db_path, base_dir, workers=2, poll_interval=POLL_INTERVAL):
+        self.db_path = db_path
+        self.base_dir = base_dir
+        self.workers = workers
+        self.poll_interval = poll_interval
+        # Jobs ohne Key (Key aus der Umgebung des Workers) sind immer erlaubt
+        self._keys = {key_fingerprint(None): None}
+        self._stop = threading.Event()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def add_key(self, api_key):
+        """Macht einen API-Key allen Workern bekannt (einmal pro Key)."""
+        key_id = key_fingerprint(api_key)
+        with self._lock:
+            if key_id in self._keys:
+                return
+            self._keys[key_id] = api_key
+            for worker in self._workers:
+                self._send_key(worker, api_key)
+
+    @staticmethod
+    def _send_key(worker, api_key):
+        if isinstance(worker, threading.Thread) or not api_key:
+            return
+        try:
+            worker.stdin.write(json.dumps({"api_key": api_key}) + "\n")
+            worker.stdin.flush()
+        except (OSError, ValueError):
+            # Worker ist beendet; ensure() startet einen neuen, der alle Keys bekommt
+            pass
+
+    def _start_worker(self):
+        if self.workers <= 0:
+            # Thread im App-Prozess: liest dasselbe Key-Dict
+            worker = threading.Thread(
+                target=_work,
+                args=(self.db_path, self.base_dir, self._keys, self._stop, self.poll_interval),
+                name="cv-job-worker",
+                daemon=True,
+            )
+            worker.start()
+            return worker
+        env = dict(os.environ)
+        # Keys nur über stdin
+        env.pop("OPENAI_API_KEY", None)
+        # Die Worker laufen bereits parallel: Rendern im eigenen Prozess statt eines weiteren Pools
+        env["CV_RENDER_WORKERS"] = "0"
+        worker = subprocess.Popen(
+            [sys.executable, "-m", "scripts.job_queue", "worker", self.db_path, self.base_dir,
+             "--parent", str(os.getpid()), "--poll", str(self.poll_interval), "--keys-from-stdin", "1"],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            text=True,
+        )
+        for api_key in self._keys.values():
+            self._send_key(worker, api_key)
+        return worker
+
+    @staticmethod
+    def _alive(worker):
+        if isinstance(worker, threading.Thread):
+            return worker.is_alive()
+        return worker.poll() is None
+
+    def ensure(self):
+        """Startet fehlende bzw. abgestürzte Worker und stellt deren Aufträge wieder ein."""
+        with self._lock:
+            if self._stop.is_set():
+                return
+            alive = [worker for worker in self._workers if self._alive(worker)]
+            missing = max(self.workers, 1) - len(alive)
+            if missing <= 0:
+                return
+            self._workers = alive + [self._start_worker() for _ in range(missing)]
+            requeued = JobQueue(self.db_path).recover()
+            if requeued:
+                print(f"🔁 {requeued} Aufträge abgestürzter Worker wieder eingestellt")
+
+    def alive(self):
+        return sum(self._alive(worker) for worker in self._workers)
+
+    def stop(self, timeout=10):
+        """Beendet die Worker; laufende Aufträge werden beim nächsten Start wieder eingestellt."""
+        with self._lock:
+            self._stop.set()
+            for worker in self._workers:
+                if isinstance(worker, threading.Thread):
+                    worker.join(timeout)
+                    continue
+                worker.terminate()
+                try:
+                    worker.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    worker.kill()
+                worker.stdin.close()
+            self._workers = []
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_job_queue(base_dir=None):
+    """Die Warteschlange unter default_queue_path (pro Aufruf neu, das Objekt ist leichtgewichtig)."""
+    return JobQueue(os.path.abspath(default_queue_path(base_dir)))
+
+
+def get_worker_pool(base_dir=None, api_key=None):
+    """
+    Liefert den prozessweiten WorkerPool der Warteschlange (lazy gestartet, abgestürzte
+    Worker werden bei jedem Aufruf ersetzt) und macht ihm api_key bekannt. Anzahl Worker
+    über CV_JOB_WORKERS - unabhängig davon, wie viele Keys verwendet werden.
+    """
+    db_path = os.path.abspath(default_queue_path(base_dir))
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None:
+                pool = WorkerPool(db_path, os.path.abspath(base_dir or os.getcwd()),
+                                  workers=int(os.environ.get("CV_JOB_WORKERS", 2)))
+                _pools[db_path] = pool
+    pool.add_key(api_key)
+    pool.ensure()
+    return pool
+
+
+def stop_worker_pools(timeout=10):
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.stop(timeout)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 3 or argv[0] != "worker":
+        print("Verwendung: python -m scripts.job_queue worker <jobs.sqlite3> <base_dir> [--parent PID] [--poll SEKUNDEN]")
+        return 2
+    options = dict(zip(argv[3::2], argv[4::2]))
+    # Eigenständig gestartet: Key aus der Umgebung; aus der App: weitere Keys über stdin
+    api_key = os.environ.get("OPENAI_API_KEY")
+    keys = {key_fingerprint(None): None, key_fingerprint(api_key): api_key}
+    if options.get("--keys-from-stdin") == "1":
+        threading.Thread(target=_read_keys, args=(sys.stdin, keys), daemon=True).start()
+    print(f"👷 Worker {os.getpid()} wartet auf Aufträge ({argv[1]})")
+    _work(argv[1], argv[2], keys, threading.Event(),
+          float(options.get("--poll", POLL_INTERVAL)), int(options.get("--parent", 0)) or None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
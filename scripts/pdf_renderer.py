@@ -0,0 +1,381 @@
+"""
+PDF-Renderer für CVs (ohne Word/Office).
+
+Kunden erhalten CVs als PDF; bisher wurde die .docx von Hand in Word exportiert
+(siehe output/pdf/). render_cv_pdf erzeugt das PDF direkt aus derselben CV-JSON
+und demselben StyleProfile wie generate_cv, mit denselben Abschnitten in derselben
+Reihenfolge (generate_cv.cv_sections) und demselben Tabellen-Layout.
+
+Abhängigkeit: reportlab (requirements.txt). Das Modul wird erst beim ersten PDF-Auftrag
+importiert (render_service.render_cv_pdf), der Start der Anwendung bleibt davon unberührt.
+
+Schriften: Ist die Schrift des Profils (z.B. Aptos) als .ttf im System installiert,
+wird sie eingebettet, sonst Helvetica. Für Sterne und Aufzählungszeichen wird eine
+Symbolschrift (DejaVu Sans, Segoe UI Symbol oder ZapfDingbats) verwendet.
+"""
+import os
+import threading
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib.colors import Color
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+try:
+    from generate_cv import abs_path, cv_sections, parse_level, sorted_sprachen, split_missing_data
+    from style_profile import resolve_style_profile
+    from utils_optimize_logo import optimized_logo_stream
+except ImportError:
+    from scripts.generate_cv import abs_path, cv_sections, parse_level, sorted_sprachen, split_missing_data
+    from scripts.style_profile import resolve_style_profile
+    from scripts.utils_optimize_logo import optimized_logo_stream
+
+MARGIN_CM = 1.5
+HEADER_HEIGHT_CM = 2.0
+
+_FONT_DIRS = [
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+    os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    "/Library/Fonts",
+    os.path.expanduser("~/Library/Fonts"),
+]
+_SYMBOL_FONTS = ["DejaVuSans", "seguisym", "Symbola"]
+
+_fonts = {}
+_font_lock = threading.Lock()
+_font_files = None
+
+
+def _find_font_file(*stems):
+    """Sucht eine .ttf-Datei mit einem der Namen (ohne Endung, Gross-/Kleinschreibung egal)."""
+    global _font_files
+    if _font_files is None:
+        files = {}
+        for directory in _FONT_DIRS:
+            if not os.path.isdir(directory):
+                continue
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    stem, ext = os.path.splitext(name)
+                    if ext.lower() == ".ttf":
+                        files.setdefault(stem.lower(), os.path.join(root, name))
+        _font_files = files
+    for stem in stems:
+        path = _font_files.get(stem.lower())
+        if path:
+            return path
+    return None
+
+
+def _register(name, path):
+    try:
+        pdfmetrics.registerFont(TTFont(name, path))
+        return name
+    except Exception:
+        return None
+
+
+def _text_fonts(family):
+    """(normal, fett) für eine Schriftfamilie des Profils; Fallback Helvetica."""
+    with _font_lock:
+        fonts = _fonts.get(family)
+        if fonts is None:
+            key = family.replace(" ", "")
+            regular = _find_font_file(key, f"{key}-Regular", family)
+            bold = _find_font_file(f"{key}-Bold", f"{key}bd", f"{key}b", f"{family} Bold")
+            regular_name = regular and _register(f"CV-{key}", regular)
+            bold_name = bold and _register(f"CV-{key}-Bold", bold)
+            if regular_name:
+                fonts = (regular_name, bold_name or regular_name)
+            else:
+                fonts = ("Helvetica", "Helvetica-Bold")
+            _fonts[family] = fonts
+        return fonts
+
+
+def _symbol_font():
+    """Schrift für ★ ☆ ■; ZapfDingbats (immer vorhanden) als Fallback."""
+    with _font_lock:
+        font = _fonts.get("__symbol__")
+        if font is None:
+            font = "ZapfDingbats"
+            for stem in _SYMBOL_FONTS:
+                path = _find_font_file(stem)
+                if path and _register(f"CV-Symbol-{stem}", path):
+                    font = f"CV-Symbol-{stem}"
+                    break
+            _fonts["__symbol__"] = font
+        return font
+
+
+def _symbols(text):
+    # ZapfDingbats kennt ☆ nicht, nur den umrandeten Stern ✩
+    return text.replace("☆", "✩") if _symbol_font() == "ZapfDingbats" else text
+
+
+def _color(rgb):
+    return Color(rgb[0] / 255, rgb[1] / 255, rgb[2] / 255)
+
+
+def _hex(rgb):
+    return "#%02x%02x%02x" % tuple(rgb)
+
+
+class _Styles:
+    """Paragraph-Styles aus einem StyleProfile."""
+
+    def __init__(self, profile):
+        self.profile = profile
+        h1, h2, text, bullet = profile["heading1"], profile["heading2"], profile["text"], profile["bullet"]
+        self.text_fonts = _text_fonts(text["font"])
+        self.symbol = _symbol_font()
+
+        def style(name, s, bold=False, **kwargs):
+            regular, fett = _text_fonts(s["font"])
+            return ParagraphStyle(
+                name, fontName=fett if bold else regular, fontSize=s["size"],
+                leading=s["size"] * 1.2 * s.get("line_spacing", 1.0), textColor=_color(s["color"]),
+                alignment=TA_LEFT, **kwargs
+            )
+
+        self.h1 = style("h1", h1, h1.get("bold", False),
+                        spaceBefore=h1.get("space_before", 0), spaceAfter=h1.get("space_after", 0))
+        self.h2 = style("h2", h2, h2.get("bold", False),
+                        spaceBefore=h2.get("space_before", 0), spaceAfter=h2.get("space_after", 0))
+        self.h2_cell = style("h2_cell", h2, h2.get("bold", False))
+        self.text = style("text", text)
+        self.text_bold = style("text_bold", text, True)
+        self.text_center = style("text_center", text)
+        self.text_center.alignment = TA_CENTER
+        self.sprache = style("sprache", dict(text, line_spacing=0.8))
+        self.bullet = style("bullet", dict(bullet, font=text["font"], color=text["color"]),
+                            leftIndent=18, bulletIndent=0, spaceAfter=3)
+        self.bullet_symbol = (bullet.get("symbol", "■"), bullet.get("symbol_size", bullet["size"]),
+                              _hex(bullet["color"]))
+        header = profile["header"]
+        self.header = ParagraphStyle(
+            "header", fontName=_text_fonts(header.get("text_font", text["font"]))[0],
+            fontSize=header.get("text_size", 10), textColor=_color(header.get("text_color", h1["color"])),
+            alignment=TA_RIGHT
+        )
+
+
+def _markup(text):
+    """Escaped Text mit gelb hinterlegten "! bitte prüfen !"-Markern."""
+    parts = []
+    for part, is_marker in split_missing_data(str(text)):
+        part = escape(part).replace("\n", "<br/>")
+        parts.append(f'<font backColor="yellow">{part}</font>' if is_marker else part)
+    return "".join(parts)
+
+
+def _p(text, style):
+    return Paragraph(_markup(text), style)
+
+
+def _table(rows, widths, style_commands=(), row_heights=None):
+    table = Table(rows, colWidths=widths, rowHeights=row_heights, hAlign="LEFT")
+    table.setStyle(TableStyle([
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 0),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+        ("TOPPADDING", (0, 0), (-1, -1), 0),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+        *style_commands,
+    ]))
+    return table
+
+
+def _name(name, st, width):
+    return [_p(f"{name['Vorname']} {name['Nachname']}", st.h1)]
+
+
+def _basic_info(info, st, width):
+    hauptrolle = info["Hauptrolle"]
+    rolle = hauptrolle.get("Beschreibung", "") if isinstance(hauptrolle, dict) else str(hauptrolle)
+    bild = Paragraph('<font backColor="yellow">BILD EINFÜGEN</font>', st.text_center)
+    rows = [
+        [Paragraph("Hauptrolle:", st.text_bold), _p(rolle, st.text), bild],
+        [Paragraph("Nationalität:", st.text_bold), _p(info["Nationalität"], st.text), ""],
+        [Paragraph("Ausbildung:", st.text_bold), _p(info["Ausbildung"], st.text), ""],
+    ]
+    return [_table(rows, [width * 0.20, width * 0.50, width * 0.30],
+                   [("SPAN", (2, 0), (2, 2)), ("VALIGN", (2, 0), (2, 2), "MIDDLE")])]
+
+
+def _kurzprofil(kurzprofil, st, width):
+    return [_p("Kurzprofil", st.h1), _p(kurzprofil, st.text)]
+
+
+def _fachwissen(skills, st, width):
+    flowables = [_p("Expertise", st.h1), _p("Fachwissen & Schwerpunkte", st.h2)]
+    if skills:
+        rows = [[_p(item.get("Kategorie", ""), st.text_bold),
+                 _p(", ".join(item.get("Inhalt", item.get("BulletList", []))), st.text)]
+                for item in skills]
+        flowables.append(_table(rows, [width * 0.20, width * 0.80]))
+    return flowables
+
+
+def _education(education, st, width):
+    flowables = [_p("Aus- und Weiterbildung", st.h2)]
+    if education:
+        bold = st.text_fonts[1]
+        rows = [[_p(item.get("Zeitraum", ""), st.text),
+                 Paragraph(f'<font name="{bold}">{_markup(item.get("Institution", ""))}</font><br/>'
+                           f'{_markup(item.get("Abschluss", ""))}', st.text)]
+                for item in education]
+        flowables.append(_table(rows, [width * 0.20, width * 0.80], [("BOTTOMPADDING", (0, 0), (-1, -1), 6)]))
+    return flowables
+
+
+def _trainings(trainings, st, width):
+    flowables = [_p("Trainings & Zertifizierungen", st.h2)]
+    if trainings:
+        rows = [[_p(item.get("Zeitraum", ""), st.text),
+                 _p(item.get("Institution", ""), st.text_bold),
+                 _p(item.get("Titel", item.get("Ausbildung_Titel", "")), st.text)]
+                for item in trainings]
+        flowables.append(_table(rows, [width * 0.20, width * 0.20, width * 0.60],
+                                [("BOTTOMPADDING", (0, 0), (-1, -1), 3)]))
+    return flowables
+
+
+def _sprachen(sprachen, st, width):
+    flowables = [_p("Sprachen", st.h2)]
+    if sprachen:
+        rows = [["" for _ in range(6)] for _ in range(2)]
+        for i, sprache in enumerate(sorted_sprachen(sprachen)):
+            stars = parse_level(sprache.get("Level", ""))
+            row, col = i // 3, (i % 3) * 2
+            rows[row][col] = _p(sprache.get("Sprache", ""), st.sprache)
+            rows[row][col + 1] = Paragraph(
+                f'<font name="{st.symbol}" color="#ff7900">{"★" * stars}</font>'
+                f'<font name="{st.symbol}" color="#808080">{_symbols("☆" * (5 - stars))}</font>',
+                st.sprache
+            )
+        flowables.append(_table(rows, [width / 6] * 6, row_heights=[18, 18]))
+    return flowables
+
+
+def _referenzprojekte_heading(_, st, width):
+    return [PageBreak(), _p("Ausgewählte Referenzprojekte", st.h1)]
+
+
+def _referenzprojekt(projekt, st, width):
+    symbol, symbol_size, symbol_color = st.bullet_symbol
+    bullets = [
+        Paragraph(_markup(t), st.bullet,
+                  bulletText=f'<font name="{st.symbol}" size="{symbol_size}" color="{symbol_color}">'
+                             f'{_symbols(symbol)}</font>')
+        for t in projekt.get("Tätigkeiten", []) if t.strip()
+    ]
+    rows = [
+        [_p(projekt.get("Kunde", ""), st.h2_cell), ""],
+        [_p(projekt.get("Zeitraum", ""), st.h2_cell), _p(projekt.get("Rolle", ""), st.h2_cell)],
+        [bullets or "", ""],
+        [Paragraph("Technologien", st.text_bold), _p(projekt.get("Technologien", ""), st.text)],
+        [Paragraph("Methodik", st.text_bold), _p(projekt.get("Methodik", ""), st.text)],
+    ]
+    table = _table(rows, [width * 0.20, width * 0.80], [
+        ("SPAN", (0, 0), (1, 0)),
+        ("SPAN", (0, 2), (1, 2)),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 3),
+    ])
+    return [table, Spacer(1, 24)]
+
+
+# Abschnittsname (siehe generate_cv.cv_sections) -> PDF-Renderer
+SECTION_RENDERERS = {
+    "name": _name,
+    "basisinfos": _basic_info,
+    "kurzprofil": _kurzprofil,
+    "fachwissen": _fachwissen,
+    "ausbildung": _education,
+    "trainings": _trainings,
+    "sprachen": _sprachen,
+    "referenzprojekte": _referenzprojekte_heading,
+    "referenzprojekt": _referenzprojekt,
+}
+
+
+def _draw_header(profile, st):
+    """Header wie im Word-Template: Logo links (40 %), Text rechtsbündig (50 %)."""
+    header = profile["header"]
+    logo_path = header.get("logo_path", "")
+    logo = None
+    if logo_path:
+        full_logo_path = abs_path(logo_path)
+        if os.path.exists(full_logo_path):
+            logo = ImageReader(optimized_logo_stream(full_logo_path, header.get("logo_width_cm", 4.0)))
+
+    def on_page(canvas, doc):
+        canvas.saveState()
+        top = doc.pagesize[1] - MARGIN_CM * cm
+        if logo is not None:
+            width = header.get("logo_width_cm", 4.0) * cm
+            img_w, img_h = logo.getSize()
+            height = width * img_h / img_w
+            canvas.drawImage(logo, doc.leftMargin, top - height, width=width, height=height, mask="auto")
+        if header.get("text"):
+            text = Paragraph(escape(header["text"]), st.header)
+            text_width = doc.width * 0.50
+            _, text_height = text.wrap(text_width, HEADER_HEIGHT_CM * cm)
+            text.drawOn(canvas, doc.leftMargin + doc.width - text_width, top - text_height)
+        canvas.restoreState()
+
+    return on_page
+
+
+def render_cv_pdf(data, output=None, style_profile=None):
+    """
+    Rendert einen CV (JSON-Dict) als PDF.
+
+    Args:
+        data: CV als JSON-Dict
+        output: Zielpfad oder beschreibbares File-Objekt; None = Bytes zurückgeben
+        style_profile: Optionales StyleProfile (Standard: styles.json)
+
+    Returns:
+        output bzw. der Inhalt des PDFs als Bytes
+    """
+    profile = resolve_style_profile(style_profile)
+    st = _Styles(profile)
+    target = BytesIO() if output is None else output
+
+    doc = SimpleDocTemplate(
+        target, pagesize=A4,
+        leftMargin=MARGIN_CM * cm, rightMargin=MARGIN_CM * cm,
+        topMargin=(MARGIN_CM + HEADER_HEIGHT_CM) * cm, bottomMargin=MARGIN_CM * cm,
+        title=f"CV {data.get('Vorname', '')} {data.get('Nachname', '')}".strip(),
+    )
+    story = []
+    for name, section_input, _ in cv_sections(data):
+        story.extend(SECTION_RENDERERS[name](section_input, st, doc.width))
+
+    on_page = _draw_header(profile, st)
+    doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
+    return target.getvalue() if output is None else output
+
+
+def cv_pdf_output_path(data, output_dir=None):
+    """Dateiname des PDFs analog zur Word-Datei: cv_{Vorname}_{Nachname}_{Zeitstempel}.pdf"""
+    try:
+        from generate_cv import cv_output_path
+    except ImportError:
+        from scripts.generate_cv import cv_output_path
+    path = cv_output_path(data, output_dir)
+    if output_dir is None:
+        return os.path.join(os.path.dirname(os.path.dirname(path)), "pdf",
+                            os.path.basename(path)[:-len(".docx")] + ".pdf")
+    return path[:-len(".docx")] + ".pdf"
@@ -8,233 +8,43 @@ import json
 from openai import OpenAI
 from pypdf import PdfReader
 from dotenv import load_dotenv
-import re
+import copy
+
+try:
+    from schema_registry import get_schema
+    from date_normalizer import normalize_date
+    from cv_normalizer import apply_rules
+except ImportError:
+    from scripts.schema_registry import get_schema
+    from scripts.date_normalizer import normalize_date
+    from scripts.cv_normalizer import apply_rules
 
 
 def normalize_date_format(date_str):
     """
     Konvertiert verschiedene Datumsformate zu MM/YYYY
-    
+
     Beispiele:
     - "2020" -> "01/2020"
     - "Jan 2020" -> "01/2020"
     - "Januar 2020" -> "01/2020"
     - "2020 - 2021" -> "01/2020 - 01/2021"
     - "heute" / "heute" -> "heute" (unverändert)
+
+    Siehe date_normalizer.normalize_date (vorkompilierte Muster, LRU-Cache).
     """
-    if not date_str or not isinstance(date_str, str):
-        return date_str
-    
-    # Wenn "heute", "Heute", "today" etc. -> unverändert
-    if date_str.strip().lower() in ['heute', 'today', 'present', 'aktuell']:
-        return date_str
-    
-    # Monatsnamen Mapping (Deutsch und Englisch)
-    months_de = {
-        'januar': '01', 'jan': '01', 'jan.': '01',
-        'februar': '02', 'feb': '02', 'feb.': '02',
-        'märz': '03', 'mrz': '03', 'mar': '03', 'mar.': '03', 'mär': '03', 'mär.': '03',
-        'april': '04', 'apr': '04', 'apr.': '04',
-        'mai': '05',
-        'juni': '06', 'jun': '06', 'jun.': '06',
-        'juli': '07', 'jul': '07', 'jul.': '07',
-        'august': '08', 'aug': '08', 'aug.': '08',
-        'september': '09', 'sep': '09', 'sep.': '09', 'sept': '09', 'sept.': '09',
-        'oktober': '10', 'okt': '10', 'okt.': '10', 'oct': '10', 'oct.': '10',
-        'november': '11', 'nov': '11', 'nov.': '11',
-        'dezember': '12', 'dez': '12', 'dez.': '12', 'dec': '12', 'dec.': '12'
-    }
-    
-    # Pattern: "YYYY - YYYY" oder ähnliche Ranges - ZUERST behandeln!
-    if ' - ' in date_str or ' – ' in date_str or ' — ' in date_str:
-        separator = ' - ' if ' - ' in date_str else (' – ' if ' – ' in date_str else ' — ')
-        parts = date_str.split(separator)
-        if len(parts) == 2:
-            start = normalize_date_format(parts[0].strip())
-            end = normalize_date_format(parts[1].strip())
-            return f"{start} - {end}"
-    
-    # Pattern: "MM/YYYY" oder "MM.YYYY" -> bereits korrekt oder leicht anpassbar
-    if re.match(r'^\d{2}[/\.]\d{4}$', date_str.strip()):
-        return date_str.replace('.', '/')
-    
-    # Pattern: "YYYY" -> "01/YYYY"
-    if re.match(r'^\d{4}$', date_str.strip()):
-        return f"01/{date_str.strip()}"
-    
-    # Pattern: "Monat YYYY" oder "MM YYYY" oder "MMM. YYYY"
-    parts = re.split(r'[\s.]+', date_str.lower().strip())
-    parts = [p for p in parts if p]  # Remove empty strings
-    
-    if len(parts) >= 2:
-        month_part = parts[0].strip('.').lower()
-        year_part = parts[-1]  # Last part is usually year
-        
-        # Check if month is in German names
-        if month_part in months_de and re.match(r'^\d{4}$', year_part):
-            return f"{months_de[month_part]}/{year_part}"
-    
-    # Fallback: unverändert zurückgeben
-    return date_str
+    return normalize_date(date_str)
 
 
 def normalize_json_structure(data):
     """
     Korrigiert verschachtelte Strukturen von OpenAI zum erwarteten Format
-    """
-    # Korrektur 0: Hauptausbildung -> Ausbildung (Abwärtskompatibilität)
-    if "Hauptausbildung" in data and "Ausbildung" not in data:
-        data["Ausbildung"] = data["Hauptausbildung"]
-        del data["Hauptausbildung"]
-    
-    # Korrektur 1: Expertise -> Fachwissen_und_Schwerpunkte
-    if "Expertise" in data and isinstance(data["Expertise"], dict):
-        if "Fachwissen_und_Schwerpunkte" in data["Expertise"]:
-            data["Fachwissen_und_Schwerpunkte"] = data["Expertise"]["Fachwissen_und_Schwerpunkte"]
-            del data["Expertise"]
-    
-    # Korrektur 2: BulletList -> Inhalt in Fachwissen_und_Schwerpunkte
-    if "Fachwissen_und_Schwerpunkte" in data and isinstance(data["Fachwissen_und_Schwerpunkte"], list):
-        for item in data["Fachwissen_und_Schwerpunkte"]:
-            if "BulletList" in item and "Inhalt" not in item:
-                item["Inhalt"] = item["BulletList"]
-                del item["BulletList"]
-    
-    # Korrektur 2b: Erzwinge feste 3-Kategorien Struktur für Fachwissen_und_Schwerpunkte
-    if "Fachwissen_und_Schwerpunkte" in data and isinstance(data["Fachwissen_und_Schwerpunkte"], list):
-        skills = data["Fachwissen_und_Schwerpunkte"]
-        
-        # Erstelle die 3 Standard-Kategorien
-        projektmethodik_items = []
-        tech_stack_items = []
-        weitere_skills_items = []
-        
-        # Mapping von Kategorienamen zu den 3 Standard-Kategorien
-        projektmethodik_keywords = ['projekt', 'methodik', 'methodologie', 'agil', 'agile', 'scrum', 'hermes', 'safe', 'kanban', 'waterfall']
-        tech_keywords = ['tech', 'stack', 'tool', 'technolog', 'plattform', 'framework', 'sprach', 'databa', 'cloud', 
-                         'analytic', 'data', 'bi', 'microsoft', 'office', 'collaboration', 'software', 
-                         'python', 'java', 'sql', 'web', 'app', 'system', 'server']
-        
-        for item in skills:
-            kategorie_lower = item.get("Kategorie", "").lower()
-            inhalt = item.get("Inhalt", [])
-            
-            # Versuche die Kategorie zuzuordnen - Projektmethodik hat Priorität
-            if any(kw in kategorie_lower for kw in projektmethodik_keywords):
-                projektmethodik_items.extend(inhalt)
-            elif any(kw in kategorie_lower for kw in tech_keywords):
-                tech_stack_items.extend(inhalt)
-            else:
-                # Wenn unklar, prüfe auch die Inhalte
-                # Wenn es Methodiken sind (enthält bekannte Methoden-Namen)
-                methoden_in_content = any(
-                    any(method in str(i).lower() for method in ['scrum', 'agile', 'hermes', 'safe', 'kanban', 'waterfall'])
-                    for i in inhalt
-                )
-                if methoden_in_content:
-                    projektmethodik_items.extend(inhalt)
-                else:
-                    weitere_skills_items.extend(inhalt)
-        
-        # Falls Kategorien leer sind, Platzhalter einfügen
-        if not projektmethodik_items:
-            projektmethodik_items = ["! fehlt – bitte prüfen!"]
-        if not tech_stack_items:
-            tech_stack_items = ["! fehlt – bitte prüfen!"]
-        if not weitere_skills_items:
-            weitere_skills_items = ["! fehlt – bitte prüfen!"]
-        
-        # Ersetze mit fester Struktur
-        data["Fachwissen_und_Schwerpunkte"] = [
-            {"Kategorie": "Projektmethodik", "Inhalt": projektmethodik_items},
-            {"Kategorie": "Tech Stack", "Inhalt": tech_stack_items},
-            {"Kategorie": "Weitere Skills", "Inhalt": weitere_skills_items}
-        ]
-    
-    # Korrektur 3: Verschachtelte Referenzprojekte
-    if "Ausgewählte_Referenzprojekte" in data and isinstance(data["Ausgewählte_Referenzprojekte"], dict):
-        if "Referenzprojekte" in data["Ausgewählte_Referenzprojekte"]:
-            data["Ausgewählte_Referenzprojekte"] = data["Ausgewählte_Referenzprojekte"]["Referenzprojekte"]
-    
-    # Korrektur 4: Normalisiere alle Zeitformate zu MM/YYYY
-    # Aus- und Weiterbildung
-    if "Aus_und_Weiterbildung" in data and isinstance(data["Aus_und_Weiterbildung"], list):
-        for item in data["Aus_und_Weiterbildung"]:
-            if "Zeitraum" in item:
-                item["Zeitraum"] = normalize_date_format(item["Zeitraum"])
-    
-    # Trainings & Zertifizierungen
-    if "Trainings_und_Zertifizierungen" in data and isinstance(data["Trainings_und_Zertifizierungen"], list):
-        for item in data["Trainings_und_Zertifizierungen"]:
-            if "Zeitraum" in item:
-                item["Zeitraum"] = normalize_date_format(item["Zeitraum"])
-    
-    # Referenzprojekte
-    if "Ausgewählte_Referenzprojekte" in data and isinstance(data["Ausgewählte_Referenzprojekte"], list):
-        for item in data["Ausgewählte_Referenzprojekte"]:
-            if "Zeitraum" in item:
-                item["Zeitraum"] = normalize_date_format(item["Zeitraum"])
-    
-    # Korrektur 5: Normalisiere Sprachen Level und Namen
-    if "Sprachen" in data and isinstance(data["Sprachen"], list):
-        # Mapping für gängige Sprachen (Englisch -> Deutsch)
-        language_mapping = {
-            "english": "Englisch",
-            "german": "Deutsch",
-            "french": "Französisch",
-            "italian": "Italienisch",
-            "spanish": "Spanisch",
-            "portuguese": "Portugiesisch",
-            "russian": "Russisch",
-            "chinese": "Chinesisch",
-            "japanese": "Japanisch"
-        }
-
-        for item in data["Sprachen"]:
-            # 5a: Sprache Name normalisieren
-            if "Sprache" in item and isinstance(item["Sprache"], str):
-                lang_lower = item["Sprache"].lower().strip()
-                # Direktes Match
-                if lang_lower in language_mapping:
-                    item["Sprache"] = language_mapping[lang_lower]
-                # "English (Native)" -> "Englisch"
-                elif any(k in lang_lower for k in language_mapping):
-                    for k, v in language_mapping.items():
-                        if k in lang_lower:
-                            item["Sprache"] = v
-                            break
-
-            # 5b: Level normalisieren
-            if "Level" in item:
-                level = item["Level"]
-                # Wenn String
-                if isinstance(level, str):
-                    # 1. Priorität: Sterne
-                    if "★" in level or "*" in level:
-                        # Zähle Sterne (ignoriere leere Sterne ☆ wenn möglich, aber hier zählen wir nur volle)
-                        count = level.count("★") + level.count("*")
-                        if count > 0:
-                            item["Level"] = min(count, 5)
-                    
-                    # 2. Priorität: Explizite Zahl im String (z.B. "Level 5", "5/5")
-                    # Aber Vorsicht vor "C1" (enthält 1) -> Regex muss isolierte Zahl oder X/5 sein
-                    elif re.search(r'\b[1-5]\s*/\s*5', level) or re.match(r'^\s*[1-5]\s*$', level):
-                         match = re.search(r'([1-5])', level)
-                         if match:
-                             item["Level"] = int(match.group(1))
-
-                    # 3. Priorität: Text-Beschreibung
-                    elif level.lower() in ["muttersprache", "native", "native speaker"]:
-                        item["Level"] = 5
-                    elif any(x in level.lower() for x in ["verhandlungssicher", "fluent", "business fluent", "c2", "c1"]):
-                        item["Level"] = 4
-                    elif any(x in level.lower() for x in ["sehr gute kenntnisse", "very good", "proficient", "b2"]):
-                        item["Level"] = 3
-                    elif any(x in level.lower() for x in ["gute kenntnisse", "good", "intermediate", "b1"]):
-                        item["Level"] = 2
-                    elif any(x in level.lower() for x in ["grundkenntnisse", "basic", "beginner", "a1", "a2"]):
-                        item["Level"] = 1
 
+    Die Korrekturen (Expertise, BulletList, 3-Kategorien-Struktur, Referenzprojekte,
+    Zeiträume, Sprachen) sind als Regeln in cv_normalizer beschrieben und werden in
+    einem Durchgang angewendet; Treffer pro Regel über cv_normalizer.rule_metrics().
+    """
+    apply_rules(data)
     return data
 
 
@@ -268,26 +78,19 @@ def extract_text_from_pdf(pdf_path):
 
 def load_schema(schema_path="scripts/pdf_to_json_struktur_cv.json"):
     """
-    Lädt das JSON-Schema für die CV-Struktur
+    Lädt das JSON-Schema für die CV-Struktur (über die Schema-Registry)
     
     Args:
-        schema_path: Pfad zur Schema-Datei
+        schema_path: Pfad zur Schema-Datei (relativ zum Projekt-Root oder absolut)
         
     Returns:
-        Dictionary mit dem Schema
+        Dictionary mit dem Schema (eigene Kopie, darf verändert werden)
     """
-    # Absoluten Pfad bilden
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    full_path = os.path.join(base_dir, schema_path)
-    
-    if not os.path.exists(full_path):
-        raise FileNotFoundError(f"Schema nicht gefunden: {full_path}")
-    
-    with open(full_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return copy.deepcopy(get_schema(schema_path).content)
 
 
-def pdf_to_json(pdf_path, output_path=None, schema_path="scripts/pdf_to_json_struktur_cv.json", job_profile_context=None):
+def pdf_to_json(pdf_path, output_path=None, schema_path="scripts/pdf_to_json_struktur_cv.json", job_profile_context=None, pdf_text=None,
+                api_key=None):
     """
     Konvertiert eine PDF-CV zu strukturiertem JSON via OpenAI API
     
@@ -296,6 +99,8 @@ def pdf_to_json(pdf_path, output_path=None, schema_path="scripts/pdf_to_json_str
         output_path: Optionaler Pfad für JSON-Output (wenn None, nur zurückgeben)
         schema_path: Pfad zur Schema-Datei
         job_profile_context: Optionales Dictionary mit Stellenprofildaten zur Kontextualisierung
+        pdf_text: Bereits extrahierter Text der PDF (z.B. aus der spekulativen Extraktion)
+        api_key: OpenAI API Key des Aufrufers (Standard: OPENAI_API_KEY aus der Umgebung)
         
     Returns:
         Dictionary mit den extrahierten CV-Daten
@@ -342,7 +147,7 @@ def pdf_to_json(pdf_path, output_path=None, schema_path="scripts/pdf_to_json_str
             
         return mock_data
 
-    api_key = os.getenv("OPENAI_API_KEY")
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError(
             "OpenAI API Key nicht gefunden!\n"
@@ -352,11 +157,11 @@ def pdf_to_json(pdf_path, output_path=None, schema_path="scripts/pdf_to_json_str
     
     filename = os.path.basename(pdf_path) if isinstance(pdf_path, str) else "Uploaded File"
     print(f"📄 Lese PDF: {filename}")
-    cv_text = extract_text_from_pdf(pdf_path)
+    cv_text = pdf_text if pdf_text is not None else extract_text_from_pdf(pdf_path)
     print(f"   → {len(cv_text)} Zeichen extrahiert")
     
-    print("📋 Lade Schema...")
-    schema = load_schema(schema_path)
+    # Schema aus der Registry (einmal pro Prozess geladen und serialisiert)
+    schema = get_schema(schema_path)
     
     print("🤖 Sende Anfrage an OpenAI API...")
     client = OpenAI(api_key=api_key)
@@ -394,7 +199,7 @@ WICHTIGE REGELN:
 13. ROLLE in Referenzprojekten: Maximal 8 Wörter! Kurz und prägnant formulieren.
 
 SCHEMA:
-{json.dumps(schema, ensure_ascii=False, indent=2)}
+{schema.prompt}
 
 Antworte ausschliesslich mit dem validen JSON-Objekt gemäss diesem Schema."""
 
@@ -1,15 +1,21 @@
+import time
+
+# Referenzpunkt für --startup-profile (so früh wie möglich gesetzt)
+_MODULE_START = time.perf_counter()
+
 import os
 import sys
 import json
+import argparse
+import importlib.util
 import socket
 import threading
-import time
 import subprocess
 import platform
 import traceback
 from datetime import datetime
 from typing import Optional, Tuple, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 # Add project root to sys.path to allow imports from scripts module
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,7 +24,10 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 def check_dependencies():
-    """Check if all required packages are installed."""
+    """
+    Check if all required packages are installed.
+    Uses find_spec only, the packages themselves are imported on first use.
+    """
     required_packages = {
         'openai': 'openai',
         'pypdf': 'pypdf',
@@ -28,9 +37,7 @@ def check_dependencies():
     
     missing = []
     for package_name, import_name in required_packages.items():
-        try:
-            __import__(import_name)
-        except ImportError:
+        if importlib.util.find_spec(import_name) is None:
             missing.append(package_name)
     
     if missing:
@@ -44,21 +51,65 @@ def check_dependencies():
         print(f"  pip install {' '.join(missing)}")
         sys.exit(1)
 
-# Check dependencies before importing local modules that might use them
+# Check dependencies before any local module tries to use them
 check_dependencies()
 
-# Local imports
-from scripts.pdf_to_json import pdf_to_json
-from scripts.generate_cv import generate_cv, validate_json_structure
-from scripts.generate_matchmaking import generate_matchmaking_json
-from scripts.generate_cv_feedback import generate_cv_feedback_json
-from scripts.generate_angebot import generate_angebot_json
-from scripts.visualize_results import generate_dashboard
-from scripts.dialogs import (
-    show_success, show_error, show_warning, ask_yes_no,
-    select_pdf_file, show_welcome, show_processing, ModernDialog
+# Schwere Module (openai, pypdf, python-docx, Generatoren) werden erst in den
+# Pipeline-Schritten importiert, die sie brauchen. prewarm_imports() lädt sie
+# im Hintergrund vor, während der Willkommens-Dialog offen ist.
+HEAVY_MODULES = (
+    "scripts.pdf_to_json",
+    "scripts.generate_cv",
+    "scripts.generate_matchmaking",
+    "scripts.generate_cv_feedback",
+    "scripts.generate_angebot",
+    "scripts.visualize_results",
 )
 
+
+def prewarm_imports():
+    """Importiert HEAVY_MODULES und lädt die Schemas in einem Daemon-Thread vor (blockiert nicht)."""
+    def _import_all():
+        for module in HEAVY_MODULES:
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                # Fehler tritt beim eigentlichen Import im Pipeline-Schritt erneut auf
+                print(f"⚠️  Vorladen von {module} fehlgeschlagen: {e}")
+        try:
+            importlib.import_module("scripts.schema_registry").preload_schemas()
+        except Exception as e:
+            print(f"⚠️  Vorladen der Schemas fehlgeschlagen: {e}")
+
+    thread = threading.Thread(target=_import_all, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
+
+
+class StartupProfile:
+    """Misst die Startzeit (ab Modul-Import) bis zu benannten Punkten, z.B. dem ersten Dialog."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.marks = []
+
+    def mark(self, label: str) -> float:
+        elapsed_ms = (time.perf_counter() - _MODULE_START) * 1000
+        self.marks.append((label, elapsed_ms))
+        if self.enabled:
+            print(f"⏱️  [startup] {label}: {elapsed_ms:.0f} ms", flush=True)
+        return elapsed_ms
+
+
+def _dialogs():
+    """
+    Lädt die tkinter-Dialoge erst bei Bedarf. So lässt sich die Pipeline auch
+    headless (Tests, Batch-Worker, Images ohne Tk) importieren.
+    """
+    from scripts import dialogs
+    return dialogs
+
+
 class CVPipeline:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
@@ -69,13 +120,29 @@ class CVPipeline:
 
     def check_internet_connection(self) -> bool:
         try:
-            socket.create_connection(("api.openai.com", 443), timeout=5)
-            return True
+            with socket.create_connection(("api.openai.com", 443), timeout=5):
+                return True
         except OSError:
             return False
 
+    def start_connectivity_check(self) -> Future:
+        """
+        Startet check_internet_connection in einem Daemon-Thread.
+        Das Ergebnis wird erst nach der Dateiauswahl abgefragt, der Start blockiert nicht.
+        """
+        future = Future()
+
+        def _check():
+            try:
+                future.set_result(self.check_internet_connection())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_check, name="connectivity-check", daemon=True).start()
+        return future
+
     def _show_processing_dialog(self, cv_filename: str, stellenprofil_filename: Optional[str], mode: str = "full"):
-        self.processing_dialog = show_processing(cv_filename, stellenprofil_filename, mode=mode)
+        self.processing_dialog = _dialogs().show_processing(cv_filename, stellenprofil_filename, mode=mode)
         self.processing_dialog.show()
         self.dialog_closed_event.set()
 
@@ -123,6 +190,7 @@ class CVPipeline:
         if job_profile_context:
             print("ℹ️  Mit Stellenprofil-Kontext für maßgeschneiderte Extraktion")
         print("="*60)
+        from scripts.pdf_to_json import pdf_to_json
         return pdf_to_json(pdf_path, output_path=None, job_profile_context=job_profile_context)
 
     def process_job_profile_pdf(self, pdf_path: str, output_path: str) -> Dict[str, Any]:
@@ -130,6 +198,7 @@ class CVPipeline:
         print("SCHRITT 1b: PDF -> JSON Konvertierung (Stellenprofil)")
         print("="*60)
         schema_path = os.path.join(self.base_dir, "scripts", "pdf_to_json_struktur_stellenprofil.json")
+        from scripts.pdf_to_json import pdf_to_json
         return pdf_to_json(
             pdf_path,
             output_path=output_path,
@@ -144,6 +213,7 @@ class CVPipeline:
         print("\n" + "="*60)
         print("SCHRITT 2: JSON Validierung")
         print("="*60)
+        from scripts.generate_cv import validate_json_structure
         critical, info = validate_json_structure(json_data)
         
         if critical:
@@ -157,7 +227,7 @@ class CVPipeline:
             
             # Stop dialog before showing error
             self.stop_processing_dialog()
-            show_error(error_msg, title="JSON-Validierungsfehler", details=details)
+            _dialogs().show_error(error_msg, title="JSON-Validierungsfehler", details=details)
             return False
             
         if info:
@@ -168,11 +238,16 @@ class CVPipeline:
         print("✅ JSON-Struktur ist valid")
         return True
 
-    def generate_word(self, json_path: str, output_dir: str) -> Optional[str]:
+    def generate_word(self, cv_data, output_dir: str) -> Optional[str]:
+        """Erzeugt das Word-Dokument aus dem CV-Dict (oder, wie bisher, aus dem Pfad der CV-JSON)."""
         print("\n" + "="*60)
         print("SCHRITT 3: Word-Dokument Generierung")
         print("="*60)
-        word_path = generate_cv(json_path, output_dir=output_dir)
+        from scripts.generate_cv import generate_cv, generate_cv_from_data
+        if isinstance(cv_data, dict):
+            word_path = generate_cv_from_data(cv_data, output_dir=output_dir)
+        else:
+            word_path = generate_cv(cv_data, output_dir=output_dir)
         if not word_path:
             # Don't stop dialog here, let the caller handle it or just log error
             print("❌ Word-Dokument-Generierung fehlgeschlagen.")
@@ -199,7 +274,17 @@ class CVPipeline:
         mode = os.environ.get("CV_GENERATOR_MODE", "full")
         self.start_processing_dialog(cv_filename, stellenprofil_filename, mode=mode)
 
+        # Zwischenergebnisse bleiben im Speicher, Dateien schreibt der Write-Behind-Writer
+        from scripts.artifact_writer import ArtifactWriter
+        writer = ArtifactWriter()
         try:
+            from scripts.pdf_to_json import pdf_to_json
+            from scripts.generate_matchmaking import generate_matchmaking
+            from scripts.generate_cv_feedback import generate_cv_feedback
+            from scripts.generate_angebot import generate_angebot
+            from scripts.visualize_results import dashboard_filename, render_dashboard_html
+            from scripts.render_service import get_render_service
+
             # --- STEP 1: PDF Extraction ---
             cv_data = None
             stellenprofil_data = None
@@ -231,21 +316,22 @@ class CVPipeline:
             os.makedirs(output_dir, exist_ok=True)
             
             cv_json_filename = f"cv_{vorname}_{nachname}_{self.timestamp}.json"
-            cv_json_path = os.path.join(output_dir, cv_json_filename)
-            self.save_json(cv_data, cv_json_path)
+            cv_json_path = writer.write_json(os.path.join(output_dir, cv_json_filename), cv_data)
 
             # Save Offer Data if it exists
             if stellenprofil_data:
                 # Use original filename of the job profile for the JSON file
                 sp_basename = os.path.splitext(stellenprofil_filename)[0]
                 stellenprofil_json_filename = f"stellenprofil_{sp_basename}_{self.timestamp}.json"
-                stellenprofil_json_path = os.path.join(output_dir, stellenprofil_json_filename)
-                self.save_json(stellenprofil_data, stellenprofil_json_path)
+                stellenprofil_json_path = writer.write_json(
+                    os.path.join(output_dir, stellenprofil_json_filename), stellenprofil_data
+                )
 
             # --- STEP 2: Validation ---
             self.update_progress(2, "running") # Qualitätsprüfung
             if not self.validate_data(cv_data, cv_json_path):
                 self.update_progress(2, "error")
+                writer.close()
                 return None
             self.update_progress(2, "completed")
 
@@ -253,6 +339,8 @@ class CVPipeline:
             word_path = None
             matchmaking_json_path = None
             feedback_json_path = None
+            match_data = None
+            feedback_data = None
             
             # Mark steps as running/skipped
             self.update_progress(3, "running") # Word
@@ -264,32 +352,32 @@ class CVPipeline:
                 
             self.update_progress(5, "running") # Feedback
             
+            render_service = get_render_service()
             with ThreadPoolExecutor(max_workers=3) as executor:
-                # 1. Word Generation
-                future_word = executor.submit(self.generate_word, cv_json_path, output_dir)
+                # 1. Word Generation: CPU-gebunden, daher im warmen Prozess-Pool (GIL-frei neben den LLM-Aufrufen)
+                if render_service:
+                    future_word = render_service.submit_cv(cv_data, output_dir)
+                else:
+                    future_word = executor.submit(self.generate_word, cv_data, output_dir)
                 
                 # 2. Matchmaking (if offer exists)
                 future_match = None
-                if stellenprofil_json_path and os.path.exists(stellenprofil_json_path):
-                    matchmaking_json_path = os.path.join(output_dir, f"Match_{vorname}_{nachname}_{self.timestamp}.json")
+                if stellenprofil_data:
                     schema_path = os.path.join(self.base_dir, "scripts", "matchmaking_json_schema.json")
                     future_match = executor.submit(
-                        generate_matchmaking_json,
-                        cv_json_path,
-                        stellenprofil_json_path,
-                        matchmaking_json_path,
+                        generate_matchmaking,
+                        cv_data,
+                        stellenprofil_data,
                         schema_path
                     )
 
                 # 3. Feedback
-                feedback_json_path = os.path.join(output_dir, f"CV_Feedback_{vorname}_{nachname}_{self.timestamp}.json")
                 feedback_schema_path = os.path.join(self.base_dir, "scripts", "cv_feedback_json_schema.json")
                 future_feedback = executor.submit(
-                    generate_cv_feedback_json,
-                    cv_json_path,
-                    feedback_json_path,
+                    generate_cv_feedback,
+                    cv_data,
                     feedback_schema_path,
-                    stellenprofil_json_path
+                    stellenprofil_data
                 )
 
                 # Collect results
@@ -298,13 +386,19 @@ class CVPipeline:
                 
                 if future_match:
                     try:
-                        future_match.result() # Wait for completion
+                        match_data = future_match.result() # Wait for completion
+                        matchmaking_json_path = writer.write_json(
+                            os.path.join(output_dir, f"Match_{vorname}_{nachname}_{self.timestamp}.json"), match_data
+                        )
                         self.update_progress(4, "completed")
                     except Exception:
                         self.update_progress(4, "error")
                         
                 try:
-                    future_feedback.result() # Wait for completion
+                    feedback_data = future_feedback.result() # Wait for completion
+                    feedback_json_path = writer.write_json(
+                        os.path.join(output_dir, f"CV_Feedback_{vorname}_{nachname}_{self.timestamp}.json"), feedback_data
+                    )
                     self.update_progress(5, "completed")
                 except Exception:
                     self.update_progress(5, "error")
@@ -313,18 +407,19 @@ class CVPipeline:
             angebot_json_path = None
             mode = os.environ.get("CV_GENERATOR_MODE", "full")
             
-            if mode == "full" and stellenprofil_json_path and matchmaking_json_path and os.path.exists(matchmaking_json_path):
+            if mode == "full" and stellenprofil_data and match_data:
                 self.update_progress(6, "running") # Angebot
                 try:
-                    angebot_json_path = os.path.join(output_dir, f"Angebot_{vorname}_{nachname}_{self.timestamp}.json")
                     schema_path = os.path.join(self.base_dir, "scripts", "angebot_json_schema.json")
-                    generate_angebot_json(
-                        cv_json_path,
-                        stellenprofil_json_path,
-                        matchmaking_json_path,
-                        angebot_json_path,
+                    angebot_data = generate_angebot(
+                        cv_data,
+                        stellenprofil_data,
+                        match_data,
                         schema_path
                     )
+                    angebot_json_path = writer.write_json(
+                        os.path.join(output_dir, f"Angebot_{vorname}_{nachname}_{self.timestamp}.json"), angebot_data
+                    )
                     self.update_progress(6, "completed")
                 except Exception as e:
                     print(f"❌ Fehler bei Angebots-Generierung: {e}")
@@ -333,8 +428,9 @@ class CVPipeline:
                 self.update_progress(6, "skipped")
 
             if not word_path:
+                writer.close()
                 self.stop_processing_dialog()
-                show_error(
+                _dialogs().show_error(
                     "Die Word-Dokument-Generierung konnte nicht abgeschlossen werden.",
                     title="Word-Generierungsfehler",
                     details="Bitte überprüfen Sie die Konsole für weitere Details."
@@ -343,16 +439,20 @@ class CVPipeline:
 
             # --- STEP 4: Dashboard ---
             self.update_progress(7, "running") # Dashboard
-            dashboard_path = generate_dashboard(
-                cv_json_path=cv_json_path,
-                match_json_path=matchmaking_json_path if stellenprofil_json_path and os.path.exists(stellenprofil_json_path) else None,
-                feedback_json_path=feedback_json_path,
-                output_dir=output_dir,
+            dashboard_html = render_dashboard_html(
+                cv_data,
+                match_data,
+                feedback_data,
                 model_name=os.environ.get("MODEL_NAME", "gpt-4o"),
                 pipeline_mode="CLI Pipeline"
             )
+            dashboard_path = writer.write_text(os.path.join(output_dir, dashboard_filename(cv_data)), dashboard_html)
             self.update_progress(7, "completed")
 
+            # Erst hier auf die Platte warten: Erfolgsdialog öffnet die Dateien
+            writer.close()
+            from scripts.candidate_index import index_run
+            index_run(self.base_dir, cv_data, cv_json_path, match_data)
             self.stop_processing_dialog()
             
             # Success Message
@@ -403,41 +503,74 @@ class CVPipeline:
 
             # Extract match score if available
             match_score = None
-            if matchmaking_json_path and os.path.exists(matchmaking_json_path):
+            if match_data:
                 try:
-                    with open(matchmaking_json_path, 'r', encoding='utf-8') as f:
-                        match_data = json.load(f)
-                        # Try to get score from match_score.score_gesamt
-                        score_val = match_data.get("match_score", {}).get("score_gesamt")
-                        if score_val is not None:
-                            # Handle string or int
-                            if isinstance(score_val, str):
-                                # Remove % if present
-                                score_val = score_val.replace('%', '').strip()
-                                if score_val.isdigit():
-                                    match_score = int(score_val)
-                            elif isinstance(score_val, (int, float)):
+                    # Try to get score from match_score.score_gesamt
+                    score_val = match_data.get("match_score", {}).get("score_gesamt")
+                    if score_val is not None:
+                        # Handle string or int
+                        if isinstance(score_val, str):
+                            # Remove % if present
+                            score_val = score_val.replace('%', '').strip()
+                            if score_val.isdigit():
                                 match_score = int(score_val)
+                        elif isinstance(score_val, (int, float)):
+                            match_score = int(score_val)
                 except Exception as e:
                     print(f"⚠️  Konnte Match-Score nicht lesen: {e}")
 
             # Dialog handles opening files now
-            show_success(success_msg, details=details, file_path=word_path, dashboard_path=dashboard_path, match_score=match_score, angebot_json_path=angebot_json_path)
+            _dialogs().show_success(success_msg, details=details, file_path=word_path, dashboard_path=dashboard_path, match_score=match_score, angebot_json_path=angebot_json_path)
                 
             return word_path
 
         except Exception as e:
             self.stop_processing_dialog()
             print(f"\n❌ Fehler in Pipeline: {str(e)}")
+            # Bereits erzeugte Artefakte trotzdem sichern
+            try:
+                writer.close()
+            except Exception as write_error:
+                print(f"⚠️  {write_error}")
             details = traceback.format_exc()
-            show_error(
+            _dialogs().show_error(
                 "Ein unerwarteter Fehler ist während der Pipeline-Ausführung aufgetreten.",
                 title="Pipeline-Fehler",
                 details=details
             )
             return None
 
-def main():
+def _show_no_internet_error():
+    _dialogs().show_error(
+        "Für die CV-Generierung ist eine Internetverbindung erforderlich.",
+        title="Keine Internetverbindung",
+        details=(
+            "Die Applikation benötigt Zugriff auf die OpenAI API zur "
+            "Extraktion und Strukturierung der CV-Daten aus PDF-Dateien.\n\n"
+            "Bitte stellen Sie sicher, dass:\n"
+            "• Sie mit dem Internet verbunden sind\n"
+            "• Ihre Firewall den Zugriff auf api.openai.com erlaubt\n"
+            "• Keine Proxy-Einstellungen die Verbindung blockieren"
+        )
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CV GENERATOR - Unified Pipeline (PDF -> JSON -> Word)")
+    parser.add_argument("cv_path", nargs="?", help="CV als PDF (ohne Angabe: Auswahl-Dialog)")
+    parser.add_argument("stellenprofil_path", nargs="?", help="Optionales Stellenprofil als PDF")
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Zeit bis zum ersten Dialog messen und ausgeben"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profile = StartupProfile(enabled=args.startup_profile)
+
     print("[DEBUG] main() wurde gestartet", flush=True)
     print("="*60)
     print("CV GENERATOR - Unified Pipeline")
@@ -447,40 +580,27 @@ def main():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     pipeline = CVPipeline(base_dir)
 
-    print("\n🌐 Prüfe Internetverbindung...")
-    if not pipeline.check_internet_connection():
-        show_error(
-            "Für die CV-Generierung ist eine Internetverbindung erforderlich.",
-            title="Keine Internetverbindung",
-            details=(
-                "Die Applikation benötigt Zugriff auf die OpenAI API zur "
-                "Extraktion und Strukturierung der CV-Daten aus PDF-Dateien.\n\n"
-                "Bitte stellen Sie sicher, dass:\n"
-                "• Sie mit dem Internet verbunden sind\n"
-                "• Ihre Firewall den Zugriff auf api.openai.com erlaubt\n"
-                "• Keine Proxy-Einstellungen die Verbindung blockieren"
-            )
-        )
-        print("❌ Keine Internetverbindung. Programm abgebrochen.")
-        return 1
-    print("✅ Internetverbindung verfügbar")
+    # Verbindung und schwere Imports laufen im Hintergrund, während der Dialog offen ist
+    print("\n🌐 Prüfe Internetverbindung (im Hintergrund)...")
+    connectivity = pipeline.start_connectivity_check()
+    prewarm_imports()
+    profile.mark("Hintergrund-Checks gestartet")
 
-    cv_path = None
-    stellenprofil_path = None
+    cv_path = args.cv_path
+    stellenprofil_path = args.stellenprofil_path
 
-    if len(sys.argv) > 1:
-        cv_path = sys.argv[1]
+    if cv_path:
         if not os.path.exists(cv_path):
             print(f"❌ Datei nicht gefunden: {cv_path}")
             return 1
         
-        if len(sys.argv) > 2:
-            stellenprofil_path = sys.argv[2]
-            if not os.path.exists(stellenprofil_path):
-                print(f"⚠️  Stellenprofil-Datei nicht gefunden: {stellenprofil_path}")
-                stellenprofil_path = None
+        if stellenprofil_path and not os.path.exists(stellenprofil_path):
+            print(f"⚠️  Stellenprofil-Datei nicht gefunden: {stellenprofil_path}")
+            stellenprofil_path = None
     else:
-        result = show_welcome()
+        dialogs = _dialogs()
+        profile.mark("Erster Dialog (Willkommen)")
+        result = dialogs.show_welcome()
         if not result:
             print("❌ Keine Datei ausgewählt. Programm abgebrochen.")
             return 1
@@ -488,6 +608,15 @@ def main():
         if stellenprofil_path:
             print(f"📋 Stellenprofil ausgewählt: {os.path.basename(stellenprofil_path)}")
 
+    if not connectivity.result():
+        _show_no_internet_error()
+        print("❌ Keine Internetverbindung. Programm abgebrochen.")
+        return 1
+    print("✅ Internetverbindung verfügbar")
+
+    if args.cv_path:
+        # Ohne Willkommens-Dialog ist der Fortschritts-Dialog der erste
+        profile.mark("Erster Dialog (Verarbeitung)")
     result_path = pipeline.run(cv_path, stellenprofil_path)
     return 0 if result_path else 1
 
@@ -0,0 +1,211 @@
+"""
+Render-Cache für Word-CVs.
+
+Ein erneuter Pipeline-Lauf oder "Neu generieren" in Streamlit hat bisher jedes Mal neu
+gerendert und eine weitere, inhaltlich identische .docx-Datei mit neuem Zeitstempel
+geschrieben. Der Render-Cache legt jedes Ergebnis unter einem Schlüssel aus
+
+- kanonischem Hash der CV-JSON
+- Style-Profil und Inhalt des Logos (Uploads landen immer unter demselben Pfad)
+- Hash des Templates (templates/cv_template.docx)
+- Generator-Version (CV_GENERATOR_VERSION) und python-docx-Version
+
+ab. Bei einem Treffer wird nicht neu gerendert: liegt das Ergebnis bereits im Zielordner,
+wird diese Datei zurückgegeben, sonst wird sie in den neuen Run-Ordner kopiert (keine
+Hardlinks: eine nachträglich bearbeitete .docx darf den Cache-Eintrag nicht verändern).
+
+Der Cache ist begrenzt: Einträge, die länger als CV_RENDER_CACHE_MAX_AGE_DAYS (Standard 30)
+nicht mehr verwendet wurden, und darüber hinaus die am längsten unbenutzten Einträge über
+CV_RENDER_CACHE_MAX_MB (Standard 500) werden beim Ablegen entfernt.
+
+Cache-Ordner über CV_RENDER_CACHE_DIR (Standard: output/.render_cache),
+abschalten mit CV_RENDER_CACHE=0.
+"""
+import hashlib
+import json
+import os
+import filecmp
+import shutil
+import threading
+import time
+
+import docx
+
+try:
+    from generate_cv import CV_GENERATOR_VERSION, abs_path, load_template_bytes
+    from style_profile import resolve_style_profile
+    from utils_optimize_logo import _content_hash
+except ImportError:
+    from scripts.generate_cv import CV_GENERATOR_VERSION, abs_path, load_template_bytes
+    from scripts.style_profile import resolve_style_profile
+    from scripts.utils_optimize_logo import _content_hash
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", ".render_cache"
+)
+
+_template_digests = {}
+_store_lock = threading.Lock()
+
+
+def cache_enabled():
+    return os.environ.get("CV_RENDER_CACHE", "1") != "0"
+
+
+def cache_dir():
+    return os.environ.get("CV_RENDER_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def max_cache_bytes():
+    return int(float(os.environ.get("CV_RENDER_CACHE_MAX_MB", 500)) * 1024 * 1024)
+
+
+def max_cache_age():
+    return float(os.environ.get("CV_RENDER_CACHE_MAX_AGE_DAYS", 30)) * 24 * 3600
+
+
+def canonical_json_hash(data):
+    """SHA-256 der CV-JSON in kanonischer Form (sortierte Schlüssel, ohne Whitespace)."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def template_hash():
+    """SHA-256 des CV-Templates (einmal pro Prozess berechnet)."""
+    template_bytes = load_template_bytes()
+    digest = _template_digests.get(id(template_bytes))
+    if digest is None:
+        digest = hashlib.sha256(template_bytes or b"").hexdigest()
+        _template_digests[id(template_bytes)] = digest
+    return digest
+
+
+def logo_hash(styles):
+    """Inhalt des Logos im Style-Profil (wie generate_cv den Pfad auflöst) oder None."""
+    logo_path = styles.get("header", {}).get("logo_path")
+    if not logo_path:
+        return None
+    full_logo_path = abs_path(logo_path)
+    if not os.path.exists(full_logo_path):
+        return None
+    return _content_hash(full_logo_path)
+
+
+def render_key(data, style_profile=None, cv_hash=None):
+    """Cache-Schlüssel eines CV-Renders (cv_hash: bereits berechneter canonical_json_hash)."""
+    styles = resolve_style_profile(style_profile)
+    parts = {
+        "cv": cv_hash or canonical_json_hash(data),
+        "styles": hashlib.sha256(styles._key.encode("utf-8")).hexdigest(),
+        # Das Profil enthält nur den Pfad des Logos, ein neuer Upload überschreibt dieselbe Datei
+        "logo": logo_hash(styles),
+        "template": template_hash(),
+        "generator": CV_GENERATOR_VERSION,
+        "python-docx": docx.__version__,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(cache_dir(), f"{key}.docx")
+
+
+def _existing_in_dir(cached, output_path):
+    """Sucht im Zielordner eine Datei mit demselben Inhalt wie der Cache-Eintrag."""
+    directory = os.path.dirname(output_path)
+    if not os.path.isdir(directory):
+        return None
+    cached_size = os.path.getsize(cached)
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".docx") or not entry.is_file():
+            continue
+        if entry.stat().st_size == cached_size and filecmp.cmp(entry.path, cached, shallow=False):
+            return entry.path
+    return None
+
+
+def fetch(key, output_path):
+    """
+    Liefert das gecachte Ergebnis für output_path oder None (kein Treffer).
+
+    Returns:
+        Bestehende Datei im Zielordner oder output_path (neu kopiert)
+    """
+    cached = _cache_path(key)
+    if not os.path.exists(cached):
+        return None
+    # Zuletzt verwendet (für die Verdrängung in prune)
+    os.utime(cached)
+    existing = _existing_in_dir(cached, output_path)
+    if existing:
+        return existing
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    shutil.copyfile(cached, output_path)
+    return output_path
+
+
+def detach(output_path):
+    """
+    Entfernt eine bereits bestehende Zieldatei vor dem Rendern (gleicher Zeitstempel).
+    Sie kann aus einer älteren Version mit Hardlinks stammen und darf dann den
+    Cache-Eintrag nicht überschreiben.
+    """
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+
+def store(key, output_path):
+    """Legt ein frisch gerendertes Dokument im Cache ab."""
+    cached = _cache_path(key)
+    with _store_lock:
+        if os.path.exists(cached):
+            return cached
+        os.makedirs(cache_dir(), exist_ok=True)
+        # Erst unter temporärem Namen ablegen, damit parallele Leser nie halbe Dateien sehen
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        shutil.copyfile(output_path, tmp)
+        os.replace(tmp, cached)
+        prune()
+    return cached
+
+
+def prune(max_bytes=None, max_age=None):
+    """
+    Begrenzt den Cache: entfernt Einträge, die länger als max_age Sekunden nicht verwendet
+    wurden, danach die am längsten unbenutzten, bis höchstens max_bytes belegt sind.
+
+    Returns:
+        Anzahl entfernter Einträge
+    """
+    max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+    max_age = max_cache_age() if max_age is None else max_age
+    directory = cache_dir()
+    if not os.path.isdir(directory):
+        return 0
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".docx") and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    entries.sort()
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_cache():
+    """Löscht alle Einträge des Render-Caches."""
+    directory = cache_dir()
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
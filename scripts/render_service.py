@@ -0,0 +1,221 @@
+"""
+Render-Service: Word-Generierung in einem warmen Prozess-Pool.
+
+generate_cv und generate_angebot_word sind reine, CPU-gebundene lxml/python-docx-Arbeit.
+In einem ThreadPoolExecutor neben den I/O-gebundenen LLM-Aufrufen konkurrieren sie um die
+GIL. Der Render-Service führt sie stattdessen in eigenen Prozessen aus:
+
+- Worker werden einmal gestartet und bleiben warm (Module, Template und Style-Profile
+  sind vorgeladen)
+- Aufträge bestehen aus JSON-Dicts und einem StyleProfile (picklebar)
+- Ergebnis ist der Pfad der gespeicherten .docx-/.pdf-Datei oder deren Bytes
+
+Anzahl Worker über die Umgebungsvariable CV_RENDER_WORKERS (0 = kein Pool, im Thread rendern).
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+try:
+    from style_profile import get_profile, register_profile
+except ImportError:
+    from scripts.style_profile import get_profile, register_profile
+
+
+def _default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _init_worker(style_profiles=None):
+    """Initialisiert einen Worker: Module importieren, Template und Profile vorladen."""
+    try:
+        from generate_cv import load_template_bytes
+    except ImportError:
+        from scripts.generate_cv import load_template_bytes
+    try:
+        import generate_angebot_word  # noqa: F401
+    except ImportError:
+        import scripts.generate_angebot_word  # noqa: F401
+
+    load_template_bytes()
+    get_profile()
+    for name, profile in (style_profiles or {}).items():
+        register_profile(name, profile)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _save(doc, output_path=None):
+    """Speichert das Dokument als Datei oder gibt es als Bytes zurück."""
+    if output_path is None:
+        buffer = BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    doc.save(output_path)
+    return output_path
+
+
+def render_cv(cv_data, output_dir=None, style_profile=None, as_bytes=False, use_cache=True):
+    """
+    Rendert einen CV aus einem JSON-Dict (ohne Dialoge und ohne Validierung).
+    Unveränderte CVs werden beim Schreiben in eine Datei aus dem Render-Cache übernommen.
+
+    Returns:
+        Pfad der .docx-Datei oder, mit as_bytes=True, deren Inhalt
+    """
+    try:
+        import render_cache
+        from generate_cv import build_cv_document, cv_output_path
+        from section_cache import get_section_cache
+        from streaming_docx import should_stream, render_cv_streaming
+    except ImportError:
+        from scripts import render_cache
+        from scripts.generate_cv import build_cv_document, cv_output_path
+        from scripts.section_cache import get_section_cache
+        from scripts.streaming_docx import should_stream, render_cv_streaming
+
+    if as_bytes:
+        if should_stream(cv_data):
+            # Grosse CVs mit beschränktem Speicher direkt ins Ziel streamen
+            buffer = BytesIO()
+            render_cv_streaming(cv_data, buffer, style_profile=style_profile)
+            return buffer.getvalue()
+        return _save(build_cv_document(cv_data, style_profile=style_profile, section_cache=get_section_cache()))
+
+    output_path = cv_output_path(cv_data, output_dir)
+    cache_key = None
+    if use_cache and render_cache.cache_enabled():
+        cache_key = render_cache.render_key(cv_data, style_profile)
+        cached = render_cache.fetch(cache_key, output_path)
+        if cached:
+            print(f"♻️ Unverändert, vorhandene Word-Datei übernommen: {cached}")
+            return cached
+
+        render_cache.detach(output_path)
+
+    if should_stream(cv_data):
+        render_cv_streaming(cv_data, output_path, style_profile=style_profile)
+    else:
+        _save(build_cv_document(cv_data, style_profile=style_profile, section_cache=get_section_cache()), output_path)
+    if cache_key:
+        render_cache.store(cache_key, output_path)
+    print(f"✅ Word-Datei erstellt: {output_path}")
+    return output_path
+
+
+def render_cv_pdf(cv_data, output_dir=None, style_profile=None, as_bytes=False):
+    """
+    Rendert einen CV aus einem JSON-Dict direkt als PDF (reportlab, ohne Office).
+
+    Returns:
+        Pfad der .pdf-Datei oder, mit as_bytes=True, deren Inhalt
+    """
+    try:
+        from pdf_renderer import render_cv_pdf as _render_pdf, cv_pdf_output_path
+    except ImportError:
+        from scripts.pdf_renderer import render_cv_pdf as _render_pdf, cv_pdf_output_path
+
+    if as_bytes:
+        return _render_pdf(cv_data, style_profile=style_profile)
+    output_path = cv_pdf_output_path(cv_data, output_dir)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    _render_pdf(cv_data, output_path, style_profile=style_profile)
+    print(f"✅ PDF-Datei erstellt: {output_path}")
+    return output_path
+
+
+def render_angebot(angebot_data, output_path=None, style_profile=None):
+    """
+    Rendert ein Angebot aus einem JSON-Dict.
+
+    Returns:
+        output_path oder, ohne output_path, der Inhalt der .docx-Datei
+    """
+    try:
+        from generate_angebot_word import build_angebot_document
+    except ImportError:
+        from scripts.generate_angebot_word import build_angebot_document
+
+    doc = build_angebot_document(angebot_data, style_profile=style_profile)
+    return _save(doc, output_path)
+
+
+class RenderService:
+    """
+    Warmer Prozess-Pool für die Word-Generierung.
+
+    Beispiel:
+        with RenderService(max_workers=4) as service:
+            paths = service.render_cv_batch(cv_dicts, output_dir)
+    """
+
+    def __init__(self, max_workers=None, style_profiles=None):
+        """
+        Args:
+            max_workers: Anzahl Worker-Prozesse (Standard: CPU-Kerne - 1)
+            style_profiles: Optionale benannte Profile {name: StyleProfile}, die in jedem
+                Worker vorgeladen werden und danach per Name übergeben werden können
+        """
+        self.max_workers = max_workers or _default_workers()
+        # spawn statt fork: sicher auch aus Streamlit mit laufenden Threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(style_profiles,)
+        )
+
+    def warm_up(self):
+        """Startet alle Worker sofort statt beim ersten Auftrag."""
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        return sorted({f.result() for f in futures})
+
+    def submit_cv(self, cv_data, output_dir=None, style_profile=None, as_bytes=False, use_cache=True):
+        """Reicht einen CV ein und gibt ein Future (Pfad oder Bytes) zurück."""
+        return self._executor.submit(render_cv, cv_data, output_dir, style_profile, as_bytes, use_cache)
+
+    def submit_cv_pdf(self, cv_data, output_dir=None, style_profile=None, as_bytes=False):
+        """Reicht einen CV zur PDF-Ausgabe ein und gibt ein Future (Pfad oder Bytes) zurück."""
+        return self._executor.submit(render_cv_pdf, cv_data, output_dir, style_profile, as_bytes)
+
+    def submit_angebot(self, angebot_data, output_path=None, style_profile=None):
+        """Reicht ein Angebot ein und gibt ein Future (Pfad oder Bytes) zurück."""
+        return self._executor.submit(render_angebot, angebot_data, output_path, style_profile)
+
+    def render_cv_batch(self, cv_list, output_dir=None, style_profile=None, as_bytes=False):
+        """Rendert viele CVs parallel; die Reihenfolge der Ergebnisse entspricht cv_list."""
+        futures = [self.submit_cv(cv, output_dir, style_profile, as_bytes) for cv in cv_list]
+        return [f.result() for f in futures]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_render_service():
+    """
+    Liefert den prozessweiten Render-Service (lazy gestartet).
+    Gibt None zurück, wenn CV_RENDER_WORKERS=0 gesetzt ist.
+    """
+    global _service
+    workers = int(os.environ.get("CV_RENDER_WORKERS", _default_workers()))
+    if workers <= 0:
+        return None
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RenderService(max_workers=workers)
+    return _service
@@ -0,0 +1,327 @@
+"""
+Lauf-Verlauf als SQLite-Datenbank (ersetzt output/run_history.json).
+
+save_to_history hat bisher bei jedem Lauf die ganze JSON-Datei gelesen, vorne eingefügt,
+auf 50 Einträge gekürzt und komplett neu geschrieben - ohne Sperre, parallele Sessions
+haben sich gegenseitig Einträge überschrieben. Der Verlauf liegt jetzt in
+output/run_history.sqlite3 (oder CV_RUN_STORE):
+
+- runs: ein Eintrag pro Lauf (Zeitstempel, Kandidat, Modus)
+- run_artifacts: erzeugte Dateien pro Lauf (cv_json, word_path, dashboard_path, ...)
+- run_scores: Bewertungen pro Lauf (z.B. match_score)
+- run_metrics: Messwerte pro Lauf (z.B. Dauer)
+- store_meta: Verwaltungsangaben (z.B. wann run_history.json übernommen wurde)
+
+Ein Lauf wird in einer Transaktion eingetragen, Abfragen sind seitenweise (list_runs) und
+es gibt keine feste Obergrenze mehr. Ein bestehendes run_history.json wird über
+get_run_store einmalig übernommen (import_json_history, auch über die Kommandozeile);
+der Import ist in store_meta vermerkt, auch wenn die Datenbank schon vorher angelegt wurde.
+
+Verwendung:
+    python scripts/run_store.py import [output/run_history.json]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import closing
+from datetime import datetime
+
+STORE_FILENAME = "run_history.sqlite3"
+LEGACY_HISTORY_FILENAME = "run_history.json"
+# store_meta-Schlüssel: Zeitpunkt, zu dem run_history.json übernommen wurde
+LEGACY_IMPORT_KEY = "legacy_json_imported"
+
+# Felder eines Verlaufseintrags, die als Artefakt (Dateipfad) gespeichert werden
+ARTIFACT_KINDS = (
+    "cv_json", "word_path", "pdf_path", "dashboard_path", "stellenprofil_json", "match_json", "offer_word_path",
+)
+# Felder eines Verlaufseintrags, die als Bewertung gespeichert werden
+SCORE_NAMES = ("match_score",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    candidate_name TEXT,
+    mode TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (timestamp, candidate_name)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp DESC, id DESC);
+CREATE TABLE IF NOT EXISTS run_artifacts (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (run_id, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS run_scores (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_scores_name ON run_scores (name, value);
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+def default_store_path(base_dir=None):
+    """Pfad der Verlaufs-Datenbank (CV_RUN_STORE oder <base_dir>/output/run_history.sqlite3)."""
+    configured = os.environ.get("CV_RUN_STORE")
+    if configured:
+        return configured
+    return os.path.join(base_dir or os.getcwd(), "output", STORE_FILENAME)
+
+
+def _number(value):
+    """Score/Messwert als float oder None ("85%", 85, "abc" -> 85.0, 85.0, None)."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace('%', '').strip())
+    except ValueError:
+        return None
+
+
+def history_entry(results, mode, timestamp=None):
+    """Verlaufseintrag aus dem Ergebnis von StreamlitCVGenerator.run."""
+    cv_json = results.get("cv_json")
+    parts = os.path.basename(cv_json).split('_') if cv_json else []
+    return {
+        "timestamp": timestamp or datetime.now().strftime("%Y%m%d_%H%M%S"),
+        # cv_<Vorname>_<Nachname>_<Zeitstempel>.json
+        "candidate_name": f"{parts[1]} {parts[2]}" if len(parts) > 2 else "Unbekannt",
+        "mode": mode,
+        **{kind: results.get(kind) for kind in ARTIFACT_KINDS},
+        **{name: results.get(name) for name in SCORE_NAMES},
+    }
+
+
+class RunStore:
+    """SQLite-Verlauf der Pipeline-Läufe. Eine Verbindung pro Operation, daher threadsicher."""
+
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self):
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._initialized = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    # -------------------------------------
+    # Schreiben
+    # -------------------------------------
+    def add_run(self, entry, metrics=None):
+        """
+        Trägt einen Lauf atomar ein (Lauf, Artefakte, Scores und Messwerte in einer Transaktion).
+
+        Args:
+            entry: Verlaufseintrag wie bisher in run_history.json (timestamp, candidate_name,
+                mode, Pfade aus ARTIFACT_KINDS, match_score)
+            metrics: optionale Messwerte {Name: Zahl}, z.B. {"dauer_s": 42.1}
+
+        Returns:
+            ID des Laufs (bestehende ID, wenn Zeitstempel und Kandidat schon vorhanden sind)
+        """
+        timestamp = entry.get("timestamp") or datetime.now().strftime("%Y%m%d_%H%M%S")
+        candidate_name = entry.get("candidate_name")
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO runs (timestamp, candidate_name, mode, created_at) VALUES (?, ?, ?, ?)",
+                (timestamp, candidate_name, entry.get("mode"), datetime.now().isoformat(timespec="seconds"))
+            )
+            if not cursor.rowcount:
+                return conn.execute(
+                    "SELECT id FROM runs WHERE timestamp = ? AND candidate_name IS ?", (timestamp, candidate_name)
+                ).fetchone()["id"]
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO run_artifacts (run_id, kind, path) VALUES (?, ?, ?)",
+                [(run_id, kind, entry[kind]) for kind in ARTIFACT_KINDS if entry.get(kind)]
+            )
+            conn.executemany(
+                "INSERT INTO run_scores (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, _number(entry.get(name))) for name in SCORE_NAMES if entry.get(name) is not None]
+            )
+            conn.executemany(
+                "INSERT INTO run_metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, _number(value)) for name, value in (metrics or {}).items()]
+            )
+        return run_id
+
+    def add_artifact(self, run_id, kind, path):
+        """Ergänzt oder ersetzt ein Artefakt eines Laufs (z.B. nachträglich erstelltes Angebot)."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO run_artifacts (run_id, kind, path) VALUES (?, ?, ?)", (run_id, kind, path)
+            )
+
+    def set_meta(self, key, value):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def get_meta(self, key):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+            return row["value"] if row else None
+
+    def delete_run(self, run_id):
+        with closing(self._connect()) as conn, conn:
+            return bool(conn.execute("DELETE FROM runs WHERE id = ?", (run_id,)).rowcount)
+
+    # -------------------------------------
+    # Lesen
+    # -------------------------------------
+    def count_runs(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def list_runs(self, limit=20, offset=0):
+        """
+        Eine Seite des Verlaufs, neueste Läufe zuerst.
+
+        Returns:
+            Liste von Verlaufseinträgen im bisherigen Format (plus id)
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT id, timestamp, candidate_name, mode FROM runs"
+                " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (int(limit), int(offset))
+            ).fetchall()
+            return self._entries(conn, rows)
+
+    def get_run(self, run_id):
+        """Ein Lauf als Verlaufseintrag oder None."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT id, timestamp, candidate_name, mode FROM runs WHERE id = ?", (run_id,)).fetchall()
+            entries = self._entries(conn, rows)
+        return entries[0] if entries else None
+
+    def get_metrics(self, run_id):
+        with closing(self._connect()) as conn:
+            return {row["name"]: row["value"] for row in conn.execute(
+                "SELECT name, value FROM run_metrics WHERE run_id = ? ORDER BY name", (run_id,))}
+
+    @staticmethod
+    def _entries(conn, rows):
+        # Artefakte und Scores der ganzen Seite mit je einer Abfrage nachladen
+        entries = [
+            {"id": row["id"], "timestamp": row["timestamp"], "candidate_name": row["candidate_name"],
+             "mode": row["mode"], **{kind: None for kind in ARTIFACT_KINDS}, **{name: None for name in SCORE_NAMES}}
+            for row in rows
+        ]
+        if not entries:
+            return entries
+        by_id = {entry["id"]: entry for entry in entries}
+        placeholders = ",".join("?" * len(by_id))
+        for row in conn.execute(
+            f"SELECT run_id, kind, path FROM run_artifacts WHERE run_id IN ({placeholders})", list(by_id)
+        ):
+            by_id[row["run_id"]][row["kind"]] = row["path"]
+        for row in conn.execute(
+            f"SELECT run_id, name, value FROM run_scores WHERE run_id IN ({placeholders})", list(by_id)
+        ):
+            value = row["value"]
+            by_id[row["run_id"]][row["name"]] = int(value) if value is not None and value.is_integer() else value
+        return entries
+
+
+def import_json_history(store, json_path):
+    """
+    Übernimmt Einträge aus einem run_history.json (neueste zuerst) in den Store.
+    Mehrfaches Importieren ist unschädlich: bekannte Läufe werden übersprungen.
+
+    Returns:
+        Anzahl neu übernommener Läufe
+    """
+    if not os.path.exists(json_path):
+        return 0
+    with open(json_path, 'r', encoding='utf-8') as f:
+        history = json.load(f)
+    if not isinstance(history, list):
+        raise ValueError(f"{json_path}: Liste von Verlaufseinträgen erwartet")
+
+    before = store.count_runs()
+    # Älteste zuerst, damit die IDs der zeitlichen Reihenfolge folgen
+    for entry in reversed(history):
+        if isinstance(entry, dict):
+            store.add_run(entry)
+    return store.count_runs() - before
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_run_store(base_dir=None):
+    """
+    Liefert den RunStore (einmal pro Prozess und Pfad). Ein vorhandenes run_history.json
+    aus demselben Verzeichnis wird einmalig übernommen; der Import wird in store_meta
+    vermerkt, damit er auch greift, wenn die Datenbank vorher ohne Import angelegt wurde.
+    """
+    path = os.path.abspath(default_store_path(base_dir))
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = RunStore(path)
+                legacy = os.path.join(os.path.dirname(path), LEGACY_HISTORY_FILENAME)
+                if os.path.exists(legacy) and not store.get_meta(LEGACY_IMPORT_KEY):
+                    try:
+                        imported = import_json_history(store, legacy)
+                        store.set_meta(LEGACY_IMPORT_KEY, datetime.now().isoformat(timespec="seconds"))
+                        if imported:
+                            print(f"📜 {imported} Läufe aus {LEGACY_HISTORY_FILENAME} übernommen")
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️  {LEGACY_HISTORY_FILENAME} konnte nicht übernommen werden: {e}")
+                _stores[path] = store
+    return store
+
+
+def clear_run_stores():
+    with _stores_lock:
+        _stores.clear()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "import":
+        print("Verwendung: python scripts/run_store.py import [run_history.json]")
+        return 2
+    json_path = argv[1] if len(argv) > 1 else os.path.join("output", LEGACY_HISTORY_FILENAME)
+    store = RunStore(os.environ.get("CV_RUN_STORE")
+                     or os.path.join(os.path.dirname(os.path.abspath(json_path)), STORE_FILENAME))
+    imported = import_json_history(store, json_path)
+    store.set_meta(LEGACY_IMPORT_KEY, datetime.now().isoformat(timespec="seconds"))
+    print(f"✅ {imported} Läufe importiert ({store.count_runs()} insgesamt) -> {store.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Zentrale Registry für die JSON-Schemas der LLM-Schritte.
+
+Bisher haben pdf_to_json (load_schema) und die Generatoren für Matchmaking, Feedback und
+Angebot ihre Schema-Datei bei jedem Aufruf neu von der Platte gelesen und für den Prompt
+neu serialisiert. Die Registry lädt jedes Schema einmal pro Prozess und stellt bereit:
+
+- content: das geladene Schema (nicht verändern, es wird geteilt)
+- hash: SHA-256 der kanonischen Form, z.B. als Teil von Cache-Schlüsseln
+- prompt: kompakte Serialisierung für den System-Prompt (einmal berechnet)
+- validator: kompilierter jsonschema-Validator für die Struktur der LLM-Antwort
+
+Die Schema-Dateien sind Vorlagen (Beispielstruktur mit '_hint_'-Feldern), keine
+JSON-Schemas im Sinne der Spezifikation. Der Validator wird aus der Vorlage abgeleitet:
+alle Datenfelder sind Pflicht, Objekte und Listen müssen als solche vorliegen, Werte
+dürfen beliebige Skalare sein ('! bitte prüfen !' statt Zahl ist erlaubt).
+"""
+import hashlib
+import json
+import os
+import threading
+
+SCHEMA_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCHEMA_DIR)
+
+# Name -> Dateiname in scripts/
+SCHEMA_FILES = {
+    "cv": "pdf_to_json_struktur_cv.json",
+    "stellenprofil": "pdf_to_json_struktur_stellenprofil.json",
+    "matchmaking": "matchmaking_json_schema.json",
+    "cv_feedback": "cv_feedback_json_schema.json",
+    "angebot": "angebot_json_schema.json",
+}
+
+_SCALAR = {"type": ["string", "number", "boolean", "null"]}
+
+_schemas = {}
+_lock = threading.Lock()
+
+
+def template_to_json_schema(template):
+    """Leitet aus einer Schema-Vorlage ein JSON-Schema (Draft 7) ab."""
+    if isinstance(template, dict):
+        fields = {key: value for key, value in template.items() if not key.startswith("_")}
+        return {
+            "type": "object",
+            "properties": {key: template_to_json_schema(value) for key, value in fields.items()},
+            "required": list(fields),
+        }
+    if isinstance(template, list):
+        if template:
+            return {"type": "array", "items": template_to_json_schema(template[0])}
+        return {"type": "array"}
+    return _SCALAR
+
+
+class Schema:
+    """Ein geladenes Schema mit Hash, Prompt-Serialisierung und Validator."""
+
+    __slots__ = ("name", "path", "content", "hash", "prompt", "_validator")
+
+    def __init__(self, name, path, content):
+        self.name = name
+        self.path = path
+        self.content = content
+        canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        self.hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        self.prompt = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+        self._validator = None
+
+    def __repr__(self):
+        return f"Schema({self.name!r}, hash={self.hash[:12]})"
+
+    @property
+    def validator(self):
+        """Kompilierter jsonschema-Validator (beim ersten Zugriff erzeugt)."""
+        if self._validator is None:
+            from jsonschema import Draft7Validator
+            self._validator = Draft7Validator(template_to_json_schema(self.content))
+        return self._validator
+
+    def validate(self, data):
+        """
+        Prüft data gegen die Struktur des Schemas.
+
+        Returns:
+            Liste von Fehlermeldungen "pfad: meldung" (leer, wenn gültig)
+        """
+        errors = []
+        for error in sorted(self.validator.iter_errors(data), key=lambda e: list(e.absolute_path)):
+            path = ".".join(str(part) for part in error.absolute_path) or "(root)"
+            errors.append(f"{path}: {error.message}")
+        return errors
+
+
+def resolve_schema_path(name_or_path):
+    """Pfad eines Schemas aus Registry-Name, absolutem oder projekt-relativem Pfad."""
+    if name_or_path in SCHEMA_FILES:
+        return os.path.join(SCHEMA_DIR, SCHEMA_FILES[name_or_path])
+    if os.path.isabs(name_or_path):
+        return os.path.normpath(name_or_path)
+    # Relative Pfade wie bisher in load_schema zuerst ab dem Projekt-Root auflösen
+    candidate = os.path.normpath(os.path.join(PROJECT_ROOT, name_or_path))
+    if os.path.exists(candidate):
+        return candidate
+    return os.path.abspath(name_or_path)
+
+
+def _schema_name(path):
+    filename = os.path.basename(path)
+    for name, known in SCHEMA_FILES.items():
+        if known == filename and os.path.dirname(path) == SCHEMA_DIR:
+            return name
+    return os.path.splitext(filename)[0]
+
+
+def get_schema(name_or_path):
+    """
+    Liefert ein Schema aus der Registry (einmal pro Prozess von der Platte geladen).
+
+    Args:
+        name_or_path: Registry-Name (siehe SCHEMA_FILES) oder Pfad zur Schema-Datei
+
+    Raises:
+        FileNotFoundError: wenn die Schema-Datei nicht existiert
+    """
+    path = resolve_schema_path(name_or_path)
+    schema = _schemas.get(path)
+    if schema is not None:
+        return schema
+    with _lock:
+        schema = _schemas.get(path)
+        if schema is None:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Schema nicht gefunden: {path}")
+            with open(path, 'r', encoding='utf-8') as f:
+                schema = Schema(_schema_name(path), path, json.load(f))
+            _schemas[path] = schema
+    return schema
+
+
+def preload_schemas():
+    """Lädt alle bekannten Schemas vor (z.B. beim Start der Pipeline) und gibt sie zurück."""
+    return {name: get_schema(name) for name in SCHEMA_FILES}
+
+
+def schema_hashes():
+    """Hashes aller bekannten Schemas, z.B. für Cache-Schlüssel."""
+    return {name: schema.hash for name, schema in preload_schemas().items()}
+
+
+def clear_schemas():
+    """Leert die Registry (z.B. nach Änderungen an einer Schema-Datei)."""
+    with _lock:
+        _schemas.clear()
@@ -0,0 +1,130 @@
+"""
+Abschnitts-Cache für das inkrementelle Neu-Rendern von CVs.
+
+Korrigiert ein Recruiter ein einzelnes "! bitte prüfen !"-Feld (z.B. ein Sprachniveau
+oder die Rolle in einem Projekt), wurde bisher das ganze Dokument neu aufgebaut.
+generate_cv ist deshalb in unabhängige Abschnitte zerlegt (cv_sections): Name,
+Basisinfos, Kurzprofil, Fachwissen, Aus- und Weiterbildung, Trainings, Sprachen und
+jedes einzelne Referenzprojekt.
+
+Der SectionCache merkt sich pro Abschnitt die erzeugten Body-Elemente unter dem Hash
+seines JSON-Teilbaums (plus Style-Profil und Template). Beim nächsten Render werden
+unveränderte Abschnitte nur noch kopiert; neu gerendert wird allein, was sich geändert hat.
+
+Cache-Grösse (Anzahl Abschnitte) über CV_SECTION_CACHE_SIZE, 0 schaltet den Cache ab.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+
+from docx.oxml.ns import qn
+
+try:
+    from render_cache import template_hash
+except ImportError:
+    from scripts.render_cache import template_hash
+
+DEFAULT_MAX_ENTRIES = 2048
+
+_W_SECT_PR = qn('w:sectPr')
+
+
+def _content_end(body):
+    """Index hinter dem letzten Inhaltselement (vor w:sectPr)."""
+    count = len(body)
+    if count and body[count - 1].tag == _W_SECT_PR:
+        return count - 1
+    return count
+
+
+def _insert(body, element):
+    sectPr = body.find(_W_SECT_PR)
+    if sectPr is not None:
+        sectPr.addprevious(element)
+    else:
+        body.append(element)
+
+
+class SectionCache:
+    """
+    LRU-Cache für gerenderte CV-Abschnitte (thread-sicher).
+
+    Beispiel:
+        cache = SectionCache()
+        doc = build_cv_document(data, section_cache=cache)   # rendert alles
+        data["Sprachen"][0]["Level"] = 4
+        doc = build_cv_document(data, section_cache=cache)   # rendert nur "sprachen"
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(name, section_input, styles):
+        """Schlüssel eines Abschnitts: Name, Hash des JSON-Teilbaums, Profil und Template."""
+        canonical = json.dumps(section_input, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return (name, digest, styles, template_hash())
+
+    def render(self, doc, name, section_input, styles, renderer):
+        """Hängt einen Abschnitt an doc an - aus dem Cache oder per renderer(doc, eingabe, styles)."""
+        key = self.key(name, section_input, styles)
+        body = doc.element.body
+
+        with self._lock:
+            fragments = self._entries.get(key)
+            if fragments is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if fragments is not None:
+            for fragment in fragments:
+                _insert(body, deepcopy(fragment))
+            return
+
+        start = _content_end(body)
+        renderer(doc, section_input, styles)
+        fragments = tuple(deepcopy(el) for el in body[start:_content_end(body)])
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = fragments
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_section_cache():
+    """
+    Liefert den prozessweiten Abschnitts-Cache (lazy angelegt).
+    Gibt None zurück, wenn CV_SECTION_CACHE_SIZE=0 gesetzt ist.
+    """
+    global _default_cache
+    size = int(os.environ.get("CV_SECTION_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+    if size <= 0:
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = SectionCache(max_entries=size)
+    return _default_cache
@@ -0,0 +1,172 @@
+"""
+Skill-Taxonomie: kanonische Skill-Namen, Synonyme und Kategorien an einer Stelle.
+
+Die Schlüsselwörter für die Skill-Kategorien waren bisher fest in normalize_json_structure
+verdrahtet, das Matching hat sich vollständig auf das LLM verlassen. Die Taxonomie liegt
+jetzt in scripts/skill_taxonomy.json (oder der Datei aus CV_SKILL_TAXONOMY) und wird
+einmal pro Prozess zu einem SkillIndex kompiliert:
+
+- lookup/canonical: Synonym -> Skill in O(1) (Dict über alle normalisierten Begriffe)
+- find/mentions: alle Skills in einem Text, über eine vorkompilierte Alternation
+  (längste Begriffe zuerst, nur ganze Wörter)
+- categorize: Kategorie eines Kategorienamens ("Agile Methoden" -> "Projektmethodik")
+  über die Kategorie-Schlüsselwörter (Teilstring-Suche, Reihenfolge = Priorität)
+- skills_in: kanonische Skills eines ganzen JSON-Dokuments (CV oder Stellenprofil)
+
+Genutzt von der CV-Nachbearbeitung (cv_normalizer), der lokalen Skill-Vorprüfung beim
+Matchmaking (skill_prescore) und der Kandidatensuche.
+"""
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+
+Skill = namedtuple("Skill", "name category terms")
+Skill.__doc__ = "Ein Skill: kanonischer Name, Kategorie und alle Suchbegriffe (klein geschrieben)."
+
+
+def keyword_pattern(keywords):
+    """Kompiliert Schlüsselwörter zu einer Alternation (Teilstring-Suche wie `kw in text`)."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+def normalize_term(term):
+    """Vergleichsform eines Begriffs: klein geschrieben, Leerraum vereinheitlicht."""
+    return " ".join(str(term).lower().split())
+
+
+def _word_pattern(terms):
+    # Längste Begriffe zuerst, damit "scaled agile framework" vor "agile" greift
+    ordered = sorted(terms, key=len, reverse=True)
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(t) for t in ordered) + r")(?!\w)")
+
+
+class SkillIndex:
+    """Kompilierte Skill-Taxonomie (unveränderlich, zwischen Threads teilbar)."""
+
+    def __init__(self, taxonomy):
+        self.categories = tuple(category["name"] for category in taxonomy.get("categories", ()))
+        self._category_patterns = tuple(
+            (category["name"], keyword_pattern(category["keywords"]))
+            for category in taxonomy.get("categories", ())
+            if category.get("keywords")
+        )
+
+        skills = []
+        by_term = {}
+        for entry in taxonomy.get("skills", ()):
+            terms = tuple(dict.fromkeys(
+                normalize_term(t) for t in [entry["name"], *entry.get("synonyms", ())] if str(t).strip()
+            ))
+            skill = Skill(entry["name"], entry.get("category"), terms)
+            skills.append(skill)
+            for term in terms:
+                by_term.setdefault(term, skill)
+        self.skills = tuple(skills)
+        self._by_term = by_term
+        self._pattern = _word_pattern(by_term) if by_term else None
+        self._category_scans = {
+            category: _word_pattern([t for s in self.skills if s.category == category for t in s.terms])
+            for category in {s.category for s in self.skills}
+        }
+
+    def __len__(self):
+        return len(self.skills)
+
+    def lookup(self, term):
+        """Skill zu einem Namen oder Synonym, sonst None."""
+        return self._by_term.get(normalize_term(term))
+
+    def canonical(self, term):
+        """Kanonischer Name eines Begriffs (unbekannte Begriffe unverändert)."""
+        skill = self.lookup(term)
+        return skill.name if skill else term
+
+    def find(self, text, category=None):
+        """Alle Skills, die im Text als ganze Wörter vorkommen (Reihenfolge des ersten Auftretens)."""
+        pattern = self._category_scans.get(category) if category else self._pattern
+        if pattern is None or not text:
+            return []
+        found = {}
+        for match in pattern.finditer(str(text).lower()):
+            skill = self._by_term[match.group()]
+            found.setdefault(skill.name, skill)
+        return list(found.values())
+
+    def mentions(self, text, category=None):
+        """True, wenn der Text mindestens einen Skill (der Kategorie) nennt."""
+        pattern = self._category_scans.get(category) if category else self._pattern
+        return bool(pattern and text and pattern.search(str(text).lower()))
+
+    def categorize(self, label):
+        """Kategorie zu einem Kategorienamen über die Schlüsselwörter oder None."""
+        label = label.lower()
+        for category, pattern in self._category_patterns:
+            if pattern.search(label):
+                return category
+        return None
+
+    def skills_in(self, data):
+        """Kanonische Namen aller Skills in einem JSON-Dokument (alle String-Werte)."""
+        names = set()
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                names.update(skill.name for skill in self.find(value))
+            elif isinstance(value, dict):
+                stack.extend(v for k, v in value.items() if not str(k).startswith("_"))
+            elif isinstance(value, list):
+                stack.extend(value)
+        return names
+
+
+def load_skill_index(path=None):
+    """Lädt und kompiliert eine Taxonomie-Datei (ohne Cache)."""
+    with open(path or DEFAULT_TAXONOMY_PATH, 'r', encoding='utf-8') as f:
+        return SkillIndex(json.load(f))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index():
+    """Liefert den SkillIndex (einmal pro Prozess aus CV_SKILL_TAXONOMY bzw. skill_taxonomy.json)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = load_skill_index(os.environ.get("CV_SKILL_TAXONOMY") or None)
+    return _index
+
+
+def clear_skill_index():
+    """Verwirft den geladenen Index (z.B. nach Änderungen an der Taxonomie-Datei)."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def skill_prescore(cv_data, stellenprofil_data, index=None):
+    """
+    Lokale Skill-Vorprüfung ohne LLM: welche Skills aus den Anforderungen des
+    Stellenprofils nennt der CV?
+
+    Returns:
+        dict mit gefordert, abgedeckt, fehlend (kanonische Namen) und abdeckung (0-100)
+    """
+    index = index or get_skill_index()
+    anforderungen = stellenprofil_data.get("anforderungen", stellenprofil_data) if isinstance(stellenprofil_data, dict) else {}
+    gefordert = index.skills_in(anforderungen)
+    vorhanden = index.skills_in(cv_data)
+    abgedeckt = gefordert & vorhanden
+    return {
+        "gefordert": sorted(gefordert),
+        "abgedeckt": sorted(abgedeckt),
+        "fehlend": sorted(gefordert - vorhanden),
+        "abdeckung": round(100 * len(abgedeckt) / len(gefordert)) if gefordert else None,
+    }
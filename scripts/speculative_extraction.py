@@ -0,0 +1,212 @@
+"""
+Spekulative Extraktion: PDF-Analyse startet schon beim Hochladen.
+
+Zwischen Upload und Klick auf "Starten" vergehen oft 10-30 Sekunden (Modus, Farben,
+Datenschutz-Checkbox). Der SpeculativeExtractor nutzt diese Zeit:
+
+- Textextraktion (pypdf, lokal) startet sofort, wenn eine Datei im Uploader landet
+- der LLM-Aufruf (pdf_to_json) startet erst, wenn er erlaubt ist (Datenschutzhinweis
+  bestätigt, API-Key vorhanden) - vorher verlässt nichts den Server
+- Aufträge sind über den SHA-256 der Datei und das Schema identifiziert; dieselbe Datei
+  wird auch aus mehreren Sessions nur einmal analysiert
+- extract() liefert das fertige oder noch laufende Ergebnis; ohne Spekulation (oder wenn
+  sie fehlgeschlagen ist) läuft die normale Extraktion
+- release() gibt einen Auftrag frei, wenn die Datei entfernt wird; ohne weitere Besitzer
+  wird er abgebrochen (noch nicht gestartete Schritte) bzw. sein Ergebnis verworfen
+
+Anzahl Threads über CV_SPECULATIVE_WORKERS (0 = aus, Standard 2).
+"""
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+try:
+    from pdf_to_json import extract_text_from_pdf, pdf_to_json
+except ImportError:
+    from scripts.pdf_to_json import extract_text_from_pdf, pdf_to_json
+
+DEFAULT_SCHEMA = "scripts/pdf_to_json_struktur_cv.json"
+MAX_JOBS = 32
+
+
+def file_bytes(pdf_file):
+    """Inhalt eines Uploads (UploadedFile/BytesIO) oder None für Pfade."""
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    return None
+
+
+def job_key(data, schema_path=None):
+    """Schlüssel eines Auftrags: Datei-Hash und Schema (Dateiname)."""
+    return hashlib.sha256(data).hexdigest(), os.path.basename(schema_path or DEFAULT_SCHEMA)
+
+
+class _Job:
+    def __init__(self, data, schema_path):
+        self.data = data
+        self.schema_path = schema_path or DEFAULT_SCHEMA
+        self.owners = set()
+        self.text = None
+        self.json = None
+        self.cancelled = False
+
+
+class SpeculativeExtractor:
+    """Startet Textextraktion und LLM-Aufruf für hochgeladene PDFs im Hintergrund."""
+
+    def __init__(self, max_workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+        self._jobs = OrderedDict()
+        self._owners = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, owner, pdf_file, schema_path=None, allow_llm=False, api_key=None):
+        """
+        Startet (oder übernimmt) die Analyse einer hochgeladenen Datei.
+
+        Args:
+            owner: Besitzer, z.B. "<session>:<uploader>" - ein Besitzer hält höchstens
+                einen Auftrag, ein neuer Upload gibt den alten frei
+            pdf_file: Upload (UploadedFile/BytesIO)
+            schema_path: Schema für pdf_to_json (Standard: CV-Schema)
+            allow_llm: LLM-Aufruf ebenfalls starten
+            api_key: OpenAI API Key der Session für den LLM-Aufruf (nicht aus der Umgebung,
+                damit sich Sessions keinen Key teilen)
+
+        Returns:
+            Schlüssel des Auftrags oder None (Pfad statt Upload)
+        """
+        data = file_bytes(pdf_file)
+        if data is None:
+            return None
+        key = job_key(data, schema_path)
+
+        with self._lock:
+            previous = self._owners.get(owner)
+            if previous is not None and previous != key:
+                self._release_locked(owner)
+            job = self._jobs.get(key)
+            if job is None:
+                job = _Job(data, schema_path)
+                job.text = self._executor.submit(extract_text_from_pdf, BytesIO(data))
+                self._jobs[key] = job
+                self._evict_locked()
+            self._jobs.move_to_end(key)
+            job.owners.add(owner)
+            self._owners[owner] = key
+            if allow_llm and job.json is None:
+                job.json = self._executor.submit(self._run_llm, job, api_key)
+        return key
+
+    def _run_llm(self, job, api_key=None):
+        if job.cancelled:
+            return None
+        text = job.text.result()
+        return pdf_to_json(BytesIO(job.data), None, job.schema_path, pdf_text=text, api_key=api_key)
+
+    def release(self, owner):
+        """Gibt den Auftrag eines Besitzers frei (Datei wurde entfernt)."""
+        with self._lock:
+            self._release_locked(owner)
+
+    def _release_locked(self, owner):
+        key = self._owners.pop(owner, None)
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        job.owners.discard(owner)
+        if not job.owners:
+            self._cancel(job)
+            del self._jobs[key]
+
+    def _evict_locked(self):
+        # Älteste Aufträge ohne Besitzer zuerst verwerfen, dann die ältesten überhaupt
+        while len(self._jobs) > MAX_JOBS:
+            key = next((k for k, job in self._jobs.items() if not job.owners), next(iter(self._jobs)))
+            job = self._jobs.pop(key)
+            for owner in job.owners:
+                self._owners.pop(owner, None)
+            self._cancel(job)
+
+    @staticmethod
+    def _cancel(job):
+        job.cancelled = True
+        for future in (job.text, job.json):
+            if future is not None:
+                future.cancel()
+
+    def status(self, pdf_file, schema_path=None):
+        """Stand eines Auftrags: None, "text", "text_fertig", "llm" oder "fertig"."""
+        data = file_bytes(pdf_file)
+        if data is None:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_key(data, schema_path))
+        if job is None:
+            return None
+        if job.json is not None:
+            return "fertig" if job.json.done() else "llm"
+        return "text_fertig" if job.text.done() else "text"
+
+    def extract(self, pdf_file, schema_path=None):
+        """
+        Ergebnis von pdf_to_json für eine Datei: aus dem fertigen oder laufenden Auftrag,
+        sonst (oder wenn die Spekulation fehlgeschlagen ist) normal berechnet.
+        """
+        data = file_bytes(pdf_file)
+        job = None
+        if data is not None:
+            with self._lock:
+                job = self._jobs.get(job_key(data, schema_path))
+
+        text = None
+        if job is not None:
+            if job.json is not None:
+                try:
+                    result = job.json.result()
+                    if result is not None:
+                        # Eigene Kopie: der Auftrag kann von weiteren Läufen übernommen werden
+                        return copy.deepcopy(result)
+                except Exception as e:
+                    print(f"⚠️  Spekulative Extraktion fehlgeschlagen, starte neu: {e}")
+            try:
+                text = job.text.result()
+            except Exception:
+                text = None
+
+        return pdf_to_json(pdf_file, None, schema_path or DEFAULT_SCHEMA, pdf_text=text)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_speculative_extractor():
+    """
+    Liefert den prozessweiten SpeculativeExtractor (lazy gestartet).
+    Gibt None zurück, wenn CV_SPECULATIVE_WORKERS=0 gesetzt ist.
+    """
+    global _extractor
+    workers = int(os.environ.get("CV_SPECULATIVE_WORKERS", 2))
+    if workers <= 0:
+        return None
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = SpeculativeExtractor(max_workers=workers)
+    return _extractor
+
+
+def extract(pdf_file, schema_path=None):
+    """pdf_to_json über den SpeculativeExtractor (bzw. direkt, wenn er abgeschaltet ist)."""
+    extractor = get_speculative_extractor()
+    if extractor is None:
+        return pdf_to_json(pdf_file, None, schema_path or DEFAULT_SCHEMA)
+    return extractor.extract(pdf_file, schema_path)
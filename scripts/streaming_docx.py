@@ -0,0 +1,139 @@
+"""
+Streaming-Writer für sehr grosse CVs.
+
+generate_cv baut das ganze Dokument im python-docx-Objektmodell auf; bei 40+ Referenzprojekten
+liegt der komplette Baum im Speicher und jedes Einfügen vor w:sectPr sucht den wachsenden
+Body ab. Dieser Writer nutzt dieselben Abschnitts-Funktionen (iter_cv_sections), schreibt aber
+jeden fertigen Abschnitt sofort inkrementell nach word/document.xml ins Zip und entfernt ihn
+danach wieder aus dem Body. Der Speicherbedarf hängt so nur vom grössten Abschnitt ab,
+nicht von der Anzahl Projekte.
+
+Die Abschnitte werden einzeln serialisiert statt über etree.xmlfile geschrieben: xmlfile
+deklariert die rund 40 Namespaces des Templates auf jedem Element erneut. Hier werden die
+bereits auf w:document deklarierten Namespaces aus dem Start-Tag entfernt, sodass das
+Ergebnis Byte für Byte dem von doc.save() entspricht.
+
+Header, Footer, Styles, Nummerierung und Medien werden unverändert aus dem Template
+(templates/cv_template.docx) übernommen; das Ergebnis entspricht dem von generate_cv.
+"""
+import re
+import zipfile
+
+from lxml import etree
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+from docx.oxml.ns import qn
+
+try:
+    from generate_cv import open_cv_template, iter_cv_sections, highlight_missing_data_in_document
+    from style_profile import resolve_style_profile
+except ImportError:
+    from scripts.generate_cv import open_cv_template, iter_cv_sections, highlight_missing_data_in_document
+    from scripts.style_profile import resolve_style_profile
+
+# Ab dieser Anzahl Referenzprojekte wird automatisch gestreamt
+STREAMING_PROJECT_THRESHOLD = 40
+
+_W_SECT_PR = qn('w:sectPr')
+_MARKER = 'cv-stream-insert'
+_XMLNS_DECL = re.compile(rb' xmlns(?::[\w.-]+)?="[^"]*"')
+
+
+def should_stream(data):
+    """True, wenn der CV genug Referenzprojekte für den Streaming-Writer hat."""
+    projekte = data.get("Ausgewählte_Referenzprojekte") or []
+    return len(projekte) >= STREAMING_PROJECT_THRESHOLD
+
+
+def _declared_namespaces(root):
+    """Namespace-Deklarationen auf w:document als Bytes, wie lxml sie serialisiert."""
+    return {
+        b' xmlns:%s="%s"' % (prefix.encode(), uri.encode()) if prefix else b' xmlns="%s"' % uri.encode()
+        for prefix, uri in root.nsmap.items()
+    }
+
+
+def _serialize_fragment(element, declared):
+    """Serialisiert ein Body-Element ohne die bereits auf w:document deklarierten Namespaces."""
+    xml = etree.tostring(element, encoding='UTF-8', xml_declaration=False)
+    end = xml.index(b'>')
+    start_tag = _XMLNS_DECL.sub(lambda m: b'' if m.group(0) in declared else m.group(0), xml[:end])
+    return start_tag + xml[end:]
+
+
+def _split_document(root, body):
+    """
+    Serialisiert w:document mit leerem Body (nur w:sectPr) und teilt es an der Stelle,
+    an der die Abschnitte eingefügt werden, in Kopf und Ende.
+    """
+    marker = etree.Comment(_MARKER)
+    sectPr = body.find(_W_SECT_PR)
+    if sectPr is not None:
+        sectPr.addprevious(marker)
+    else:
+        body.append(marker)
+    xml = etree.tostring(root, encoding='UTF-8', standalone=True)
+    body.remove(marker)
+    head, tail = xml.split(b'<!--%s-->' % _MARKER.encode(), 1)
+    return head, tail
+
+
+def _flush_body(doc, stream, declared, verify_highlighting):
+    """Schreibt alle fertigen Body-Elemente (ausser sectPr) und entfernt sie aus dem Baum."""
+    missed = highlight_missing_data_in_document(doc) if verify_highlighting else 0
+    body = doc.element.body
+    for child in list(body):
+        if child.tag == _W_SECT_PR:
+            continue
+        stream.write(_serialize_fragment(child, declared))
+        body.remove(child)
+    return missed
+
+
+def render_cv_streaming(data, output, style_profile=None, verify_highlighting=False):
+    """
+    Rendert einen CV direkt als Stream in eine .docx-Datei.
+
+    Args:
+        data: CV als JSON-Dict
+        output: Zielpfad oder beschreibbares File-Objekt (z.B. BytesIO)
+        style_profile: Optionales StyleProfile (Standard: styles.json)
+        verify_highlighting: Marker-Prüfmodus pro Abschnitt (siehe highlight_missing_data_in_document)
+
+    Returns:
+        output
+    """
+    styles = resolve_style_profile(style_profile)
+    doc = open_cv_template(style_profile=styles)
+    document_part = doc.part
+    package = document_part.package
+    root = doc.element
+    body = root.body
+    declared = _declared_namespaces(root)
+    missed = 0
+
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        # 1. word/document.xml abschnittweise schreiben
+        with zf.open(document_part.partname.membername, 'w', force_zip64=True) as stream:
+            head, _ = _split_document(root, body)
+            stream.write(head)
+            missed += _flush_body(doc, stream, declared, verify_highlighting)
+            for _ in iter_cv_sections(doc, data, style_profile=styles):
+                missed += _flush_body(doc, stream, declared, verify_highlighting)
+            _, tail = _split_document(root, body)
+            stream.write(tail)
+
+        # 2. Alle übrigen Parts (Header, Footer, Styles, Medien, ...) wie PackageWriter
+        parts = list(package.iter_parts())
+        for part in parts:
+            part.before_marshal()
+            if part is not document_part:
+                zf.writestr(part.partname.membername, part.blob)
+            if len(part.rels):
+                zf.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        zf.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+        zf.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+
+    if missed:
+        print(f"⚠️ {missed} nicht hervorgehobene Marker nachträglich korrigiert")
+    return output
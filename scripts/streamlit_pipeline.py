@@ -1,65 +1,26 @@
 import os
-import json
 import time
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, Callable
 
 # Local imports
-from scripts.pdf_to_json import pdf_to_json
-from scripts.generate_cv import generate_cv, validate_json_structure
-from scripts.generate_matchmaking import generate_matchmaking_json
-from scripts.generate_cv_feedback import generate_cv_feedback_json
-from scripts.generate_angebot import generate_angebot_json
-from scripts.visualize_results import generate_dashboard
+from scripts.speculative_extraction import extract
+from scripts.generate_cv import generate_cv_from_data, validate_json_structure
+from scripts.generate_matchmaking import generate_matchmaking
+from scripts.generate_cv_feedback import generate_cv_feedback
+from scripts.visualize_results import dashboard_filename, render_dashboard_html
+from scripts.style_profile import resolve_style_profile
+from scripts.render_service import get_render_service
+from scripts.artifact_writer import ArtifactWriter
+from scripts.schema_registry import preload_schemas
+from scripts.candidate_index import index_run
 
 class StreamlitCVGenerator:
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    def _update_styles(self, custom_styles, custom_logo_path):
-        """Updates the styles.json file with custom values."""
-        styles_path = os.path.join(self.base_dir, "scripts", "styles.json")
-        try:
-            with open(styles_path, 'r', encoding='utf-8') as f:
-                styles = json.load(f)
-            
-            if custom_styles:
-                # Convert hex to RGB list
-                def hex_to_rgb(hex_color):
-                    hex_color = hex_color.lstrip('#')
-                    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-                if "primary_color" in custom_styles:
-                    rgb = hex_to_rgb(custom_styles["primary_color"])
-                    styles["heading1"]["color"] = list(rgb)
-                    styles["bullet"]["color"] = list(rgb)
-                    styles["header"]["text_color"] = list(rgb)
-                
-                if "secondary_color" in custom_styles:
-                    rgb = hex_to_rgb(custom_styles["secondary_color"])
-                    styles["heading2"]["color"] = list(rgb)
-                
-                if "font" in custom_styles:
-                    font = custom_styles["font"]
-                    styles["heading1"]["font"] = font
-                    styles["heading2"]["font"] = font
-                    styles["text"]["font"] = font
-                    styles["bullet"]["font"] = font
-                    styles["header"]["text_font"] = font
-
-            if custom_logo_path:
-                # Ensure path is relative or absolute as needed by generate_cv
-                # generate_cv uses abs_path relative to scripts dir usually
-                # We'll use absolute path here to be safe
-                styles["header"]["logo_path"] = os.path.abspath(custom_logo_path)
-
-            with open(styles_path, 'w', encoding='utf-8') as f:
-                json.dump(styles, f, indent=2)
-                
-        except Exception as e:
-            print(f"⚠️ Warning: Could not update styles: {e}")
+        # Schemas einmal pro Prozess laden (spätere Läufe lesen nicht mehr von der Platte)
+        preload_schemas()
 
     def run(self, 
             cv_file, 
@@ -68,7 +29,9 @@ class StreamlitCVGenerator:
             progress_callback: Callable[[int, str, str], None] = None,
             custom_styles: Dict[str, Any] = None,
             custom_logo_path: str = None,
-            pipeline_mode: str = None) -> Dict[str, Any]:
+            pipeline_mode: str = None,
+            cv_data: Dict[str, Any] = None,
+            stellenprofil_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Runs the CV generation pipeline.
         
@@ -80,15 +43,19 @@ class StreamlitCVGenerator:
             custom_styles: Dict with keys 'primary_color', 'secondary_color', 'font'
             custom_logo_path: Path to custom logo file
             pipeline_mode: The selected pipeline mode (e.g. "Basic", "Full")
+            cv_data: Bereits extrahierte CV-Daten (überspringt pdf_to_json für den CV)
+            stellenprofil_data: Bereits extrahiertes Stellenprofil (überspringt pdf_to_json)
         """
         
         # Set API Key
         if api_key:
             os.environ["OPENAI_API_KEY"] = api_key
             
-        # Update styles.json if custom styles are provided
-        if custom_styles or custom_logo_path:
-            self._update_styles(custom_styles, custom_logo_path)
+        # Zeitstempel pro Lauf: eine Generator-Instanz wird von allen Sessions geteilt
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # Style-Profil pro Lauf (kein Überschreiben von styles.json mehr)
+        style_profile = resolve_style_profile(custom_styles=custom_styles, logo_path=custom_logo_path)
             
         results = {
             "success": False,
@@ -98,41 +65,45 @@ class StreamlitCVGenerator:
             "match_score": None,
             "stellenprofil_json": None,
             "match_json": None,
+            "feedback_json": None,
             "error": None
         }
 
+        # Zwischenergebnisse bleiben im Speicher, Dateien schreibt der Write-Behind-Writer
+        writer = ArtifactWriter()
         try:
             # --- STEP 1: Extract Job Profile (if present) ---
             if progress_callback: progress_callback(10, "Analysiere Stellenprofil...", "running")
             
-            stellenprofil_data = None
             stellenprofil_json_path = None
             
-            if job_file:
+            if job_file and stellenprofil_data is None:
                 schema_path = os.path.join(self.base_dir, "scripts", "pdf_to_json_struktur_stellenprofil.json")
-                stellenprofil_data = pdf_to_json(job_file, None, schema_path)
+                stellenprofil_data = extract(job_file, schema_path)
             
             # --- STEP 2: Extract CV ---
             if progress_callback: progress_callback(30, "Analysiere Lebenslauf...", "running")
             
-            # WICHTIG: job_profile_context=None, um Halluzinationen zu vermeiden!
-            cv_data = pdf_to_json(cv_file, output_path=None, job_profile_context=None)
+            # WICHTIG: kein Stellenprofil-Kontext, um Halluzinationen zu vermeiden!
+            # Fertige oder laufende Extraktion aus dem Upload übernehmen (speculative_extraction)
+            if cv_data is None:
+                cv_data = extract(cv_file)
             
             # Save JSONs
             vorname = cv_data.get("Vorname", "Unbekannt")
             nachname = cv_data.get("Nachname", "Unbekannt")
-            output_dir = os.path.join(self.base_dir, "output", f"{vorname}_{nachname}_{self.timestamp}")
+            output_dir = os.path.join(self.base_dir, "output", f"{vorname}_{nachname}_{timestamp}")
             os.makedirs(output_dir, exist_ok=True)
             
-            cv_json_path = os.path.join(output_dir, f"cv_{vorname}_{nachname}_{self.timestamp}.json")
-            with open(cv_json_path, 'w', encoding='utf-8') as f:
-                json.dump(cv_data, f, ensure_ascii=False, indent=2)
+            cv_json_path = writer.write_json(
+                os.path.join(output_dir, f"cv_{vorname}_{nachname}_{timestamp}.json"), cv_data
+            )
             results["cv_json"] = cv_json_path
                 
             if stellenprofil_data:
-                stellenprofil_json_path = os.path.join(output_dir, f"stellenprofil_{self.timestamp}.json")
-                with open(stellenprofil_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(stellenprofil_data, f, ensure_ascii=False, indent=2)
+                stellenprofil_json_path = writer.write_json(
+                    os.path.join(output_dir, f"stellenprofil_{timestamp}.json"), stellenprofil_data
+                )
                 results["stellenprofil_json"] = stellenprofil_json_path
 
             # --- STEP 3: Validation ---
@@ -147,76 +118,95 @@ class StreamlitCVGenerator:
             word_path = None
             matchmaking_json_path = None
             feedback_json_path = None
+            match_data = None
             
+            render_service = get_render_service()
             with ThreadPoolExecutor(max_workers=3) as executor:
-                # Word (interactive=False to suppress dialogs)
-                future_word = executor.submit(generate_cv, cv_json_path, output_dir, interactive=False)
+                # Word: CPU-gebunden, daher im warmen Prozess-Pool (GIL-frei neben den LLM-Aufrufen)
+                if render_service:
+                    future_word = render_service.submit_cv(cv_data, output_dir, style_profile=style_profile)
+                else:
+                    # interactive=False to suppress dialogs
+                    future_word = executor.submit(generate_cv_from_data, cv_data, output_dir, interactive=False, style_profile=style_profile)
                 
                 # Match
                 future_match = None
-                if stellenprofil_json_path:
-                    matchmaking_json_path = os.path.join(output_dir, f"Match_{vorname}_{nachname}_{self.timestamp}.json")
+                if stellenprofil_data:
                     schema_path = os.path.join(self.base_dir, "scripts", "matchmaking_json_schema.json")
                     future_match = executor.submit(
-                        generate_matchmaking_json,
-                        cv_json_path,
-                        stellenprofil_json_path,
-                        matchmaking_json_path,
+                        generate_matchmaking,
+                        cv_data,
+                        stellenprofil_data,
                         schema_path
                     )
                 
                 # Feedback
-                feedback_json_path = os.path.join(output_dir, f"CV_Feedback_{vorname}_{nachname}_{self.timestamp}.json")
                 feedback_schema_path = os.path.join(self.base_dir, "scripts", "cv_feedback_json_schema.json")
                 future_feedback = executor.submit(
-                    generate_cv_feedback_json,
-                    cv_json_path,
-                    feedback_json_path,
+                    generate_cv_feedback,
+                    cv_data,
                     feedback_schema_path,
-                    stellenprofil_json_path
+                    stellenprofil_data
                 )
                 
                 word_path = future_word.result()
-                if future_match: future_match.result()
-                future_feedback.result()
+                match_data = future_match.result() if future_match else None
+                feedback_data = future_feedback.result()
+
+            if match_data:
+                matchmaking_json_path = writer.write_json(
+                    os.path.join(output_dir, f"Match_{vorname}_{nachname}_{timestamp}.json"), match_data
+                )
+            feedback_json_path = writer.write_json(
+                os.path.join(output_dir, f"CV_Feedback_{vorname}_{nachname}_{timestamp}.json"), feedback_data
+            )
 
             results["word_path"] = word_path
             results["match_json"] = matchmaking_json_path
+            results["feedback_json"] = feedback_json_path
 
             # --- STEP 5: Dashboard ---
             if progress_callback: progress_callback(90, "Erstelle Dashboard...", "running")
             
-            dashboard_path = generate_dashboard(
-                cv_json_path=cv_json_path,
-                match_json_path=matchmaking_json_path if matchmaking_json_path and os.path.exists(matchmaking_json_path) else None,
-                feedback_json_path=feedback_json_path,
-                output_dir=output_dir,
+            dashboard_html = render_dashboard_html(
+                cv_data,
+                match_data,
+                feedback_data,
                 validation_warnings=info,
                 model_name=os.environ.get("MODEL_NAME", "gpt-4o"),
-                pipeline_mode=pipeline_mode
+                pipeline_mode=pipeline_mode,
+                style_profile=style_profile
             )
+            dashboard_path = writer.write_text(os.path.join(output_dir, dashboard_filename(cv_data)), dashboard_html)
             results["dashboard_path"] = dashboard_path
             
             # Get Match Score
-            if matchmaking_json_path and os.path.exists(matchmaking_json_path):
+            if match_data:
                 try:
-                    with open(matchmaking_json_path, 'r', encoding='utf-8') as f:
-                        match_data = json.load(f)
-                        score_val = match_data.get("match_score", {}).get("score_gesamt")
-                        if score_val:
-                            if isinstance(score_val, str):
-                                score_val = score_val.replace('%', '').strip()
-                                if score_val.isdigit():
-                                    results["match_score"] = int(score_val)
-                            elif isinstance(score_val, (int, float)):
+                    score_val = match_data.get("match_score", {}).get("score_gesamt")
+                    if score_val:
+                        if isinstance(score_val, str):
+                            score_val = score_val.replace('%', '').strip()
+                            if score_val.isdigit():
                                 results["match_score"] = int(score_val)
+                        elif isinstance(score_val, (int, float)):
+                            results["match_score"] = int(score_val)
                 except Exception:
                     pass
 
+            # Erst hier auf die Platte warten: die Pfade werden direkt zum Download angeboten
+            writer.close()
+            # Kandidatensuche: CV direkt aus dem Speicher in den Index übernehmen
+            index_run(self.base_dir, cv_data, cv_json_path, match_data)
             results["success"] = True
             if progress_callback: progress_callback(100, "Fertig!", "completed")
             
         except Exception as e:
+            # Bereits erzeugte Artefakte trotzdem sichern
+            try:
+                writer.close()
+            except Exception as write_error:
+                print(f"⚠️  {write_error}")
             results["error"] = str(e)
             if progress_callback: progress_callback(100, f"Fehler: {str(e)}", "error")
             
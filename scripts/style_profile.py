@@ -0,0 +1,220 @@
+"""
+Unveränderliche Style-Profile für die Dokument-Generierung.
+
+Früher wurde scripts/styles.json für jeden Lauf mit eigenen Farben, Schriften oder
+Logo überschrieben und generate_cv las ein beim Import geladenes globales `styles`.
+Parallele Sessions haben sich dabei gegenseitig die Datei überschrieben.
+
+Ein StyleProfile wird stattdessen pro Render übergeben. Profile sind unveränderlich,
+hashbar und picklebar (z.B. für Prozess-Pools) und werden in einem prozessweiten
+In-Memory-Cache unter ihrem Namen abgelegt, sodass beliebig viele Brandings parallel
+gerendert werden können, ohne eine Datei zu schreiben. Aus Kunden-Brandings abgeleitete
+Profile (resolve_style_profile) liegen in einem eigenen, begrenzten LRU-Cache.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+DEFAULT_PROFILE_NAME = "default"
+DEFAULT_STYLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles.json")
+
+# Obergrenze für abgeleitete Profile (pro Prozess), älteste ungenutzte fallen zuerst heraus
+MAX_DERIVED_PROFILES = 128
+
+_profile_cache = {}
+_derived_profiles = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _freeze(value):
+    """Wandelt dicts/lists rekursiv in schreibgeschützte Mappings/Tupel um."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Gegenstück zu _freeze: liefert eine veränderbare, JSON-kompatible Kopie."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def hex_to_rgb(hex_color):
+    """Converts hex color to RGB tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+class StyleProfile(Mapping):
+    """
+    Unveränderliches Style-Profil mit derselben Struktur wie styles.json
+    (heading1, heading2, text, bullet, header).
+
+    Verhält sich wie ein schreibgeschütztes dict: profile["text"]["font"], profile.get("header", {}).
+    Farben sind Tupel statt Listen.
+    """
+
+    __slots__ = ("_data", "_name", "_key")
+
+    def __init__(self, data, name=None):
+        self._data = _freeze(data)
+        self._name = name
+        self._key = json.dumps(_thaw(self._data), sort_keys=True)
+
+    @classmethod
+    def from_file(cls, path, name=None):
+        """Lädt ein Profil aus einer styles.json-Datei."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), name=name)
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, StyleProfile):
+            return self._key == other._key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __reduce__(self):
+        # MappingProxyType ist nicht picklebar; über die dict-Form serialisieren
+        return (StyleProfile, (self.to_dict(), self._name))
+
+    def __repr__(self):
+        return f"StyleProfile(name={self._name!r})"
+
+    def to_dict(self):
+        """Gibt eine veränderbare Kopie im styles.json-Format zurück."""
+        return _thaw(self._data)
+
+    def with_overrides(self, custom_styles=None, logo_path=None, name=None):
+        """
+        Liefert ein neues Profil mit kundenspezifischem Branding.
+
+        Args:
+            custom_styles: Dict mit den Schlüsseln 'primary_color', 'secondary_color' (Hex) und 'font'
+            logo_path: Pfad zu einem eigenen Logo
+            name: Optionaler Name des neuen Profils
+        """
+        styles = self.to_dict()
+
+        if custom_styles:
+            if "primary_color" in custom_styles:
+                rgb = list(hex_to_rgb(custom_styles["primary_color"]))
+                styles["heading1"]["color"] = rgb
+                styles["bullet"]["color"] = rgb
+                styles["header"]["text_color"] = rgb
+
+            if "secondary_color" in custom_styles:
+                styles["heading2"]["color"] = list(hex_to_rgb(custom_styles["secondary_color"]))
+
+            if "font" in custom_styles:
+                font = custom_styles["font"]
+                styles["heading1"]["font"] = font
+                styles["heading2"]["font"] = font
+                styles["text"]["font"] = font
+                styles["bullet"]["font"] = font
+                styles["header"]["text_font"] = font
+
+        if logo_path:
+            styles["header"]["logo_path"] = os.path.abspath(logo_path)
+
+        return StyleProfile(styles, name=name)
+
+
+def register_profile(name, profile):
+    """Legt ein Profil unter einem Namen im In-Memory-Cache ab und gibt es zurück."""
+    if not isinstance(profile, StyleProfile):
+        profile = StyleProfile(profile, name=name)
+    with _cache_lock:
+        _profile_cache[name] = profile
+    return profile
+
+
+def get_profile(name=DEFAULT_PROFILE_NAME):
+    """
+    Liefert ein Profil aus dem Cache.
+    Das Standardprofil wird beim ersten Zugriff einmal aus styles.json geladen.
+    """
+    profile = _profile_cache.get(name)
+    if profile is not None:
+        return profile
+    if name != DEFAULT_PROFILE_NAME:
+        raise KeyError(f"Unbekanntes Style-Profil: {name}")
+    with _cache_lock:
+        profile = _profile_cache.get(name)
+        if profile is None:
+            profile = StyleProfile.from_file(DEFAULT_STYLES_PATH, name=name)
+            _profile_cache[name] = profile
+    return profile
+
+
+def resolve_style_profile(style_profile=None, custom_styles=None, logo_path=None):
+    """
+    Ermittelt das Profil für einen Render.
+
+    Args:
+        style_profile: StyleProfile, Profilname oder None (= Standardprofil)
+        custom_styles: Optionale Branding-Anpassungen (siehe StyleProfile.with_overrides)
+        logo_path: Optionaler Pfad zu einem eigenen Logo
+
+    Abgeleitete Profile werden unter einem aus den Anpassungen gebildeten Namen in einem
+    LRU-Cache (höchstens MAX_DERIVED_PROFILES) gehalten, sodass wiederkehrende Brandings
+    nicht neu aufgebaut werden. Im Namens-Cache (get_profile) werden sie nicht registriert.
+    """
+    if style_profile is None:
+        base = get_profile()
+    elif isinstance(style_profile, StyleProfile):
+        base = style_profile
+    else:
+        base = get_profile(style_profile)
+
+    if not custom_styles and not logo_path:
+        return base
+
+    overrides = json.dumps(
+        {"styles": custom_styles or {}, "logo": os.path.abspath(logo_path) if logo_path else None},
+        sort_keys=True
+    )
+    name = f"{base.name or hash(base)}|{overrides}"
+    with _cache_lock:
+        profile = _derived_profiles.get(name)
+        if profile is not None:
+            _derived_profiles.move_to_end(name)
+            return profile
+
+    profile = base.with_overrides(custom_styles, logo_path, name=name)
+    with _cache_lock:
+        # Ein paralleler Aufruf kann dasselbe Profil schon abgelegt haben
+        profile = _derived_profiles.setdefault(name, profile)
+        _derived_profiles.move_to_end(name)
+        while len(_derived_profiles) > MAX_DERIVED_PROFILES:
+            _derived_profiles.popitem(last=False)
+    return profile
+
+
+def clear_profiles():
+    """Leert den Profil-Cache (z.B. nach Änderungen an styles.json)."""
+    with _cache_lock:
+        _profile_cache.clear()
+        _derived_profiles.clear()
@@ -1,10 +1,158 @@
 """
 Logo-Optimierungs-Script für CV Generator
 Analysiert und optimiert das Logo für die Verwendung im Header
+
+Zusätzlich: inhaltsadressierter Asset-Cache für alle Dokument-Generatoren.
+Hochgeladene Logos (oft mehrere MB) wurden bisher unverändert in jede .docx eingebettet.
+optimized_logo() erzeugt pro Logo-Inhalt und Zielbreite einmalig eine auf die
+Header-Breite bei LOGO_DPI skalierte Variante und liefert danach nur noch deren Bytes
+(In-Memory, zusätzlich auf der Platte unter CV_LOGO_CACHE_DIR bzw. output/.logo_cache).
+Der In-Memory-Teil ist ein LRU-Cache mit höchstens MAX_LOGO_VARIANTS Einträgen.
 """
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
 from PIL import Image
 
+# Zielauflösung der eingebetteten Logos (guter Kompromiss zwischen Qualität und Dateigröße)
+LOGO_DPI = 150
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", ".logo_cache"
+)
+
+# Obergrenze für optimierte Varianten im Speicher (älteste ungenutzte fallen zuerst heraus)
+MAX_LOGO_VARIANTS = 32
+
+_variants = OrderedDict()
+_digests = {}
+_cache_lock = threading.Lock()
+_lru_lock = threading.Lock()
+
+
+def _cache_dir():
+    return os.environ.get("CV_LOGO_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def _content_hash(path):
+    """
+    SHA-256 der Logo-Datei; pro (Grösse, Änderungszeit) nur einmal berechnet.
+    Gemerkt wird nur der letzte Stand je Pfad, ein neuer Upload ersetzt den alten Eintrag.
+    """
+    stat = os.stat(path)
+    path = os.path.abspath(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _digests.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _digests[path] = (signature, digest)
+    return digest
+
+
+def _get_variant(key):
+    with _lru_lock:
+        data = _variants.get(key)
+        if data is not None:
+            _variants.move_to_end(key)
+        return data
+
+
+def _put_variant(key, data):
+    with _lru_lock:
+        _variants[key] = data
+        _variants.move_to_end(key)
+        while len(_variants) > MAX_LOGO_VARIANTS:
+            _variants.popitem(last=False)
+
+
+def _resize_to_fit(img, max_width, max_height):
+    """Skaliert proportional auf höchstens max_width x max_height (nie vergrössern)."""
+    width, height = img.size
+    if width <= max_width and height <= max_height:
+        return img
+    aspect_ratio = width / height
+    if width / max_width > height / max_height:
+        new_width = max_width
+        new_height = max(1, int(max_width / aspect_ratio))
+    else:
+        new_height = max_height
+        new_width = max(1, int(max_height * aspect_ratio))
+    return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+
+
+def _render_variant(path, width_px, dpi):
+    """Erzeugt die optimierte Variante; behält das Original, wenn es bereits kleiner ist."""
+    with open(path, 'rb') as f:
+        original = f.read()
+    img = Image.open(BytesIO(original))
+    source_format = img.format
+    img = _resize_to_fit(img, width_px, img.size[1])  # Höhe ergibt sich aus der Breite
+
+    has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+    buffer = BytesIO()
+    if source_format == 'JPEG' and not has_alpha:
+        img.convert('RGB').save(buffer, 'JPEG', quality=90, optimize=True, dpi=(dpi, dpi))
+    else:
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        img.save(buffer, 'PNG', optimize=True, dpi=(dpi, dpi))
+    optimized = buffer.getvalue()
+
+    if source_format in ('PNG', 'JPEG') and len(original) <= len(optimized):
+        return original
+    return optimized
+
+
+def optimized_logo(path, width_cm, dpi=LOGO_DPI):
+    """
+    Liefert die Bytes eines für width_cm bei dpi optimierten Logos (gecacht).
+
+    Der Cache-Schlüssel ist der Inhalt der Datei (SHA-256) plus Zielbreite in Pixeln,
+    d.h. ein neu hochgeladenes Logo unter demselben Pfad wird neu optimiert.
+    Nicht lesbare Bilder werden unverändert zurückgegeben.
+    """
+    width_px = max(1, round(width_cm / 2.54 * dpi))
+    key = (_content_hash(path), width_px)
+    data = _get_variant(key)
+    if data is not None:
+        return data
+
+    with _cache_lock:
+        data = _get_variant(key)
+        if data is not None:
+            return data
+        cache_path = os.path.join(_cache_dir(), f"{key[0]}_{width_px}w.img")
+        if os.path.exists(cache_path):
+            with open(cache_path, 'rb') as f:
+                data = f.read()
+        else:
+            try:
+                data = _render_variant(path, width_px, dpi)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Logo konnte nicht optimiert werden ({e}), verwende Original: {path}")
+                with open(path, 'rb') as f:
+                    return f.read()
+            try:
+                os.makedirs(_cache_dir(), exist_ok=True)
+                tmp = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, cache_path)
+            except OSError:
+                pass  # Platten-Cache ist optional, der In-Memory-Cache genügt
+        _put_variant(key, data)
+    return data
+
+
+def optimized_logo_stream(path, width_cm, dpi=LOGO_DPI):
+    """optimized_logo als File-Objekt, z.B. für run.add_picture()."""
+    return BytesIO(optimized_logo(path, width_cm, dpi))
+
 def optimize_logo(input_path, output_path=None, max_width=800, max_height=300, dpi=150):
     """
     Optimiert ein Logo für die Verwendung in Word-Dokumenten.
@@ -31,19 +179,10 @@ def optimize_logo(input_path, output_path=None, max_width=800, max_height=300, d
     print(f"  Dateigröße: {os.path.getsize(input_path):,} Bytes ({os.path.getsize(input_path)/1024:.2f} KB)")
     
     # Berechne neue Größe (Seitenverhältnis beibehalten)
-    width, height = img.size
-    aspect_ratio = width / height
-    
-    if width > max_width or height > max_height:
-        if width / max_width > height / max_height:
-            new_width = max_width
-            new_height = int(max_width / aspect_ratio)
-        else:
-            new_height = max_height
-            new_width = int(max_height * aspect_ratio)
-        
-        print(f"\n✅ Skaliere auf: {new_width}x{new_height} Pixel")
-        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    resized = _resize_to_fit(img, max_width, max_height)
+    if resized is not img:
+        print(f"\n✅ Skaliere auf: {resized.size[0]}x{resized.size[1]} Pixel")
+        img = resized
     else:
         print(f"\n✅ Keine Skalierung notwendig")
     
@@ -2,10 +2,19 @@ import os
 import json
 from datetime import datetime
 
-def generate_dashboard(cv_json_path, match_json_path, feedback_json_path, output_dir, validation_warnings=None, model_name=None, pipeline_mode=None):
+try:
+    from style_profile import resolve_style_profile
+except ImportError:
+    from scripts.style_profile import resolve_style_profile
+
+
+def generate_dashboard(cv_json_path, match_json_path, feedback_json_path, output_dir, validation_warnings=None, model_name=None, pipeline_mode=None, style_profile=None):
     """
     Generates a professional HTML dashboard visualizing the results of the CV processing,
     matchmaking, and quality feedback.
+    Path-based wrapper around render_dashboard_html (reads the JSONs, writes the HTML file).
+
+    style_profile: Optionales StyleProfile für die CI-Farbe (Standard: styles.json)
     """
     
     # Load Data
@@ -22,15 +31,43 @@ def generate_dashboard(cv_json_path, match_json_path, feedback_json_path, output
         with open(feedback_json_path, 'r', encoding='utf-8') as f:
             feedback_data = json.load(f)
 
+    html_content = render_dashboard_html(
+        cv_data, match_data, feedback_data,
+        validation_warnings=validation_warnings,
+        model_name=model_name,
+        pipeline_mode=pipeline_mode,
+        style_profile=style_profile
+    )
+
+    # Save File
+    output_path = os.path.join(output_dir, dashboard_filename(cv_data))
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+        
+    print(f"✅ Dashboard generiert: {output_path}")
+    return output_path
+
+
+def dashboard_filename(cv_data):
+    """Dateiname des Dashboards: Dashboard_{Vorname}_{Nachname}_{Zeitstempel}.html"""
+    vorname = cv_data.get("Vorname", "")
+    nachname = cv_data.get("Nachname", "")
+    return f"Dashboard_{vorname}_{nachname}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+
+
+def render_dashboard_html(cv_data, match_data=None, feedback_data=None, validation_warnings=None, model_name=None, pipeline_mode=None, style_profile=None):
+    """
+    Renders the dashboard HTML from in-memory CV, Match and Feedback dicts.
+    Nothing is written to disk; returns the HTML as string.
+    """
+
     # Load Styles for CI/CD Color
     primary_color_rgb = "44, 62, 80" # Default dark blue
     try:
-        styles_path = os.path.join(os.path.dirname(__file__), "styles.json")
-        if os.path.exists(styles_path):
-            with open(styles_path, 'r', encoding='utf-8') as f:
-                styles = json.load(f)
-                rgb = styles.get("heading1", {}).get("color", [44, 62, 80])
-                primary_color_rgb = f"{rgb[0]}, {rgb[1]}, {rgb[2]}"
+        styles = resolve_style_profile(style_profile)
+        rgb = styles.get("heading1", {}).get("color", [44, 62, 80])
+        primary_color_rgb = f"{rgb[0]}, {rgb[1]}, {rgb[2]}"
     except Exception as e:
         print(f"Warning: Could not load styles: {e}")
 
@@ -570,12 +607,4 @@ def generate_dashboard(cv_json_path, match_json_path, feedback_json_path, output
     </html>
     """
 
-    # Save File
-    filename = f"Dashboard_{vorname}_{nachname}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-    output_path = os.path.join(output_dir, filename)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-        
-    print(f"✅ Dashboard generiert: {output_path}")
-    return output_path
+    return html_content
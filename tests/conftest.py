@@ -0,0 +1,20 @@
+"""
+Gemeinsame Fixtures für alle Tests
+"""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_render_cache(tmp_path_factory, monkeypatch):
+    """Render-Cache pro Test in einem temporären Ordner statt unter output/.render_cache"""
+    cache = tmp_path_factory.mktemp("render_cache")
+    monkeypatch.setenv("CV_RENDER_CACHE_DIR", str(cache))
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_logo_cache(tmp_path_factory, monkeypatch):
+    """Logo-Varianten pro Test in einem temporären Ordner statt unter output/.logo_cache"""
+    cache = tmp_path_factory.mktemp("logo_cache")
+    monkeypatch.setenv("CV_LOGO_CACHE_DIR", str(cache))
+    return cache
@@ -0,0 +1,95 @@
+"""
+Tests für die Caching-Schicht der Streamlit-App (st.cache_resource / st.cache_data mit Statistik)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import streamlit as st
+
+from scripts import app_cache
+from scripts.app_cache import (
+    cache_stats, clear_caches, get_style_profile, get_template_cache, load_config, read_artifact,
+    reset_cache_stats, tracked,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_caches()
+    reset_cache_stats()
+    yield
+    clear_caches()
+    reset_cache_stats()
+
+
+def stats_for(name):
+    return next(row for row in cache_stats() if row["Cache"] == name)
+
+
+class TestDataCaches:
+    """Tests für die Daten-Caches unter der Datei-Signatur"""
+
+    def test_artifact_read_once(self, tmp_path):
+        """Test dass eine unveränderte Datei nur einmal gelesen wird"""
+        path = tmp_path / "cv.docx"
+        path.write_bytes(b"word")
+        assert read_artifact(str(path)) == b"word"
+        assert read_artifact(str(path)) == b"word"
+        assert stats_for("artifact_bytes")["Aufrufe"] == 2
+        assert stats_for("artifact_bytes")["Trefferquote"] == 50.0
+
+    def test_rewritten_file_gets_new_key(self, tmp_path):
+        """Test dass eine neu geschriebene Datei nicht aus dem Cache kommt"""
+        path = tmp_path / "config.yaml"
+        path.write_text("cookie: {name: a}\n", encoding="utf-8")
+        assert load_config(str(path))["cookie"]["name"] == "a"
+        time.sleep(0.01)
+        path.write_text("cookie: {name: bb}\n", encoding="utf-8")
+        assert load_config(str(path))["cookie"]["name"] == "bb"
+        assert stats_for("load_config")["Treffer"] == 0
+
+    def test_config_copy_per_call(self, tmp_path):
+        """Test dass Änderungen am gelieferten Dict den Cache nicht verändern"""
+        path = tmp_path / "config.yaml"
+        path.write_text("credentials: {usernames: {}}\n", encoding="utf-8")
+        load_config(str(path))["credentials"]["usernames"]["neu"] = {}
+        assert load_config(str(path))["credentials"]["usernames"] == {}
+
+
+class TestResourceCaches:
+    """Tests für die prozessweit geteilten Ressourcen"""
+
+    def test_template_cache_shared(self):
+        """Test dass alle Sessions denselben Template-Cache verwenden"""
+        assert get_template_cache() is get_template_cache()
+        assert stats_for("get_template_cache")["Treffer"] == 1
+
+    def test_style_profile_per_branding(self):
+        """Test dass Style-Profile pro Branding einmal aufgebaut werden"""
+        styles = {"primary_color": "#112233", "secondary_color": "#444444", "font": "Arial"}
+        first = get_style_profile(custom_styles=styles)
+        assert get_style_profile(custom_styles=dict(styles)) is first
+        assert get_style_profile() is not first
+
+
+class TestStats:
+    """Tests für die Trefferstatistik der Admin-Seite"""
+
+    def test_redefined_cache_counts_once(self):
+        """Test dass ein bei jedem Rerun neu definierter Cache nur einmal aufgeführt wird"""
+        for _ in range(2):
+            @tracked(st.cache_data, "data")
+            def rerun_cache(value):
+                return value * 2
+            assert rerun_cache(2) == 4
+        rows = [row for row in cache_stats() if row["Cache"] == "rerun_cache"]
+        assert rows == [{"Cache": "rerun_cache", "Art": "data", "Aufrufe": 2, "Treffer": 1, "Trefferquote": 50.0}]
+        app_cache._CACHES.pop("rerun_cache")
+
+    def test_unused_cache_has_no_rate(self):
+        """Test dass ungenutzte Caches ohne Trefferquote erscheinen"""
+        assert stats_for("dashboard_html")["Trefferquote"] is None
@@ -0,0 +1,112 @@
+"""
+Tests für die In-Memory-Übergabe zwischen Pipeline-Schritten und den Write-Behind-Writer
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts.artifact_writer import ArtifactWriter, ArtifactWriteError
+from scripts.generate_cv_feedback import generate_cv_feedback, generate_cv_feedback_json
+from scripts.generate_matchmaking import generate_matchmaking
+from scripts.visualize_results import generate_dashboard, render_dashboard_html
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+FEEDBACK_SCHEMA = os.path.join(SCRIPTS_DIR, "cv_feedback_json_schema.json")
+MATCH_SCHEMA = os.path.join(SCRIPTS_DIR, "matchmaking_json_schema.json")
+
+CV_DATA = {"Vorname": "Max", "Nachname": "Mustermann", "Hauptrolle": {"Titel": "Engineer"}}
+
+
+class TestArtifactWriter:
+    """Tests für den asynchronen ArtifactWriter"""
+
+    def test_writes_json_and_text(self, tmp_path):
+        """Test dass nach close() alle Artefakte vollständig vorliegen"""
+        with ArtifactWriter() as writer:
+            json_path = writer.write_json(str(tmp_path / "run" / "cv.json"), CV_DATA)
+            html_path = writer.write_text(str(tmp_path / "run" / "dashboard.html"), "<p>ä</p>")
+
+        with open(json_path, encoding="utf-8") as f:
+            assert json.load(f) == CV_DATA
+        with open(html_path, encoding="utf-8") as f:
+            assert f.read() == "<p>ä</p>"
+        assert sorted(os.listdir(tmp_path / "run")) == ["cv.json", "dashboard.html"]
+
+    def test_snapshot_at_submit(self, tmp_path):
+        """Test dass spätere Änderungen am Dict die eingeplante Datei nicht verändern"""
+        data = dict(CV_DATA)
+        writer = ArtifactWriter()
+        path = writer.write_json(str(tmp_path / "cv.json"), data)
+        data["Vorname"] = "Geändert"
+        writer.close()
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["Vorname"] == "Max"
+
+    def test_last_write_wins(self, tmp_path):
+        """Test dass Aufträge für denselben Pfad in Reihenfolge geschrieben werden"""
+        path = str(tmp_path / "cv.json")
+        with ArtifactWriter() as writer:
+            for i in range(20):
+                writer.write_json(path, {"version": i})
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == {"version": 19}
+
+    def test_write_errors_raised_on_flush(self, tmp_path):
+        """Test dass Schreibfehler beim flush() gemeldet werden"""
+        blocker = tmp_path / "blocker"
+        blocker.write_text("kein Ordner")
+
+        writer = ArtifactWriter()
+        writer.write_json(str(blocker / "cv.json"), CV_DATA)
+        with pytest.raises(ArtifactWriteError):
+            writer.flush()
+        writer.close()
+
+
+class TestInMemoryGenerators:
+    """Tests für die Dict-basierten Generatoren (MODEL_NAME=mock)"""
+
+    @pytest.fixture(autouse=True)
+    def mock_model(self, monkeypatch):
+        monkeypatch.setenv("MODEL_NAME", "mock")
+
+    def test_generators_do_not_touch_disk(self, tmp_path, monkeypatch):
+        """Test dass die Dict-Varianten nichts schreiben"""
+        monkeypatch.chdir(tmp_path)
+        match = generate_matchmaking(CV_DATA, {"anforderungen": {}}, MATCH_SCHEMA)
+        feedback = generate_cv_feedback(CV_DATA, FEEDBACK_SCHEMA)
+        html = render_dashboard_html(CV_DATA, match, feedback)
+
+        assert "match_score" in match
+        assert "feedback_metadata" in feedback
+        assert "Max Mustermann" in html
+        assert os.listdir(tmp_path) == []
+
+    def test_path_wrapper_matches_dict_result(self, tmp_path):
+        """Test dass der pfad-basierte Wrapper dasselbe Ergebnis schreibt"""
+        cv_path = tmp_path / "cv.json"
+        cv_path.write_text(json.dumps(CV_DATA), encoding="utf-8")
+        out_path = tmp_path / "feedback.json"
+
+        returned = generate_cv_feedback_json(str(cv_path), str(out_path), FEEDBACK_SCHEMA)
+
+        with open(out_path, encoding="utf-8") as f:
+            assert json.load(f) == returned == generate_cv_feedback(CV_DATA, FEEDBACK_SCHEMA)
+
+    def test_dashboard_wrapper_writes_rendered_html(self, tmp_path):
+        """Test dass generate_dashboard weiterhin eine HTML-Datei im Ausgabeordner anlegt"""
+        cv_path = tmp_path / "cv.json"
+        cv_path.write_text(json.dumps(CV_DATA), encoding="utf-8")
+
+        dashboard_path = generate_dashboard(str(cv_path), None, None, str(tmp_path))
+
+        assert os.path.dirname(dashboard_path) == str(tmp_path)
+        assert os.path.basename(dashboard_path).startswith("Dashboard_Max_Mustermann_")
+        with open(dashboard_path, encoding="utf-8") as f:
+            assert "Max Mustermann" in f.read()
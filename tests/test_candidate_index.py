@@ -0,0 +1,189 @@
+"""
+Tests für den Kandidaten-Suchindex (SQLite/FTS5 über alle CV-JSONs)
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts.candidate_index import CandidateIndex, default_index_path, fts_query, index_run, parse_zeitraum
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_cv(vorname, skills=(), sprachen=(), trainings=(), projekte=(), rolle="Projektleiter"):
+    return {
+        "Vorname": vorname,
+        "Nachname": "Muster",
+        "Hauptrolle": {"Titel": rolle, "Beschreibung": "Erfahrung in Behörden und Banken"},
+        "Fachwissen_und_Schwerpunkte": [{"Kategorie": "Tech Stack", "Inhalt": list(skills)}],
+        "Sprachen": [{"Sprache": s, "Level": l} for s, l in sprachen],
+        "Trainings_und_Zertifizierungen": [
+            {"Titel": t, "Institution": i, "Zeitraum": z} for t, i, z in trainings
+        ],
+        "Ausgewählte_Referenzprojekte": [
+            {"Kunde": k, "Rolle": rolle, "Zeitraum": z} for k, z in projekte
+        ],
+    }
+
+
+def write_cv(directory, name, cv_data):
+    path = directory / f"cv_{name}.json"
+    path.write_text(json.dumps(cv_data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+    index.add(make_cv("Anna", ["Scaled Agile Framework", "Microsoft Azure"],
+                      [("Deutsch", 5), ("Französisch", 4)],
+                      [("PMP", "PMI", "2021")], [("SBB", "01/2021 - heute")]),
+              str(tmp_path / "cv_anna.json"), match_score=85)
+    index.add(make_cv("Beat", ["Python", "Docker"], [("English", "fluent"), ("French", "B1")],
+                      [("Professional Scrum Master", "Scrum.org", "2019")],
+                      [("Migros", "03/2015 - 12/2018")], rolle="Entwickler"),
+              str(tmp_path / "cv_beat.json"), match_score=60)
+    return index
+
+
+def names(results):
+    return [row["vorname"] for row in results]
+
+
+class TestSearch:
+    """Tests für die einzelnen Suchkriterien"""
+
+    def test_skills_with_synonyms(self, index):
+        """Test dass Skills über die Taxonomie kanonisiert und alle verlangt werden"""
+        assert names(index.search(skills=["SAFe", "Azure"])) == ["Anna"]
+        assert names(index.search(skills=["safe", "Python"])) == []
+        assert names(index.search(skills=["PSM"])) == ["Beat"]
+
+    def test_language_level(self, index):
+        """Test dass Sprachen unabhängig von der Schreibweise mit Mindest-Level gefunden werden"""
+        assert names(index.search(languages={"französisch": 4})) == ["Anna"]
+        assert names(index.search(languages={"French": 2})) == ["Anna", "Beat"]
+        assert names(index.search(languages={"Englisch": 4})) == ["Beat"]
+
+    def test_certification_and_activity(self, index):
+        """Test der Filter für Zertifizierungen und aktive Projekte"""
+        assert names(index.search(certification="scrum.org")) == ["Beat"]
+        assert names(index.search(active_since=2020)) == ["Anna"]
+        assert names(index.search(active_since="2018-12")) == ["Anna", "Beat"]
+
+    def test_fulltext_and_combination(self, index):
+        """Test der Volltextsuche (Präfix, ohne Akzente) kombiniert mit weiteren Kriterien"""
+        assert names(index.search(text="behorde")) == ["Anna", "Beat"]
+        assert names(index.search(text="migro", languages={"Englisch": 3})) == ["Beat"]
+        assert index.search(text="Entwickler")[0]["skills"] == ["Docker", "Python", "Scrum"]
+
+    def test_results_sorted_by_score(self, index):
+        """Test dass Treffer nach Match-Score sortiert und begrenzt werden"""
+        assert names(index.search()) == ["Anna", "Beat"]
+        assert names(index.search(limit=1)) == ["Anna"]
+
+    def test_languages_and_stats(self, index):
+        """Test der Hilfsabfragen für die Suchseite"""
+        assert index.languages() == ["deutsch", "englisch", "französisch"]
+        assert index.stats()["candidates"] == 2
+
+
+class TestIncrementalUpdates:
+    """Tests für sync, Ersetzen und den Pipeline-Hook"""
+
+    def test_sync_reads_only_changed_files(self, tmp_path):
+        """Test dass sync neue Dateien einträgt, unveränderte überspringt und gelöschte entfernt"""
+        output = tmp_path / "output"
+        (output / "run").mkdir(parents=True)
+        first = write_cv(output / "run", "a", make_cv("Anna", ["Python"]))
+        write_cv(output, "b", make_cv("Beat", ["Java"]))
+        (output / "run" / "Match_a.json").write_text("{}", encoding="utf-8")
+
+        index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+        assert index.sync(str(output)) == (2, 0)
+        assert index.sync(str(output)) == (0, 0)
+
+        os.remove(first)
+        assert index.sync(str(output)) == (0, 1)
+        assert names(index.search()) == ["Beat"]
+
+    def test_sync_skips_broken_files(self, tmp_path, capsys):
+        """Test dass defekte JSON-Dateien den Abgleich nicht abbrechen"""
+        (tmp_path / "cv_kaputt.json").write_text("{", encoding="utf-8")
+        index = CandidateIndex(str(tmp_path / "index.sqlite3"))
+        assert index.sync(str(tmp_path)) == (0, 0)
+        assert "übersprungen" in capsys.readouterr().out
+
+    def test_add_replaces_and_keeps_score(self, index, tmp_path):
+        """Test dass ein erneuter Eintrag ersetzt wird und den bisherigen Score behält"""
+        index.add(make_cv("Anna", ["Kubernetes"]), str(tmp_path / "cv_anna.json"))
+        assert names(index.search(skills=["k8s"])) == ["Anna"]
+        assert names(index.search(skills=["SAFe"])) == []
+        assert index.search(skills=["k8s"])[0]["match_score"] == 85
+        assert index.stats()["candidates"] == 2
+        assert index.remove(str(tmp_path / "cv_anna.json"))
+
+    def test_index_run(self, tmp_path, monkeypatch):
+        """Test dass ein Pipeline-Lauf mit Matchmaking-Score eingetragen wird"""
+        monkeypatch.delenv("CV_CANDIDATE_INDEX", raising=False)
+        cv_path = write_cv(tmp_path, "lauf", make_cv("Carla", ["Jira"]))
+        index_run(str(tmp_path), make_cv("Carla", ["Jira"]), cv_path,
+                  {"match_score": {"score_gesamt": "72%"}})
+        index = CandidateIndex(default_index_path(str(tmp_path)))
+        assert index.path == str(tmp_path / "output" / "candidate_index.sqlite3")
+        assert index.search(skills=["Jira"])[0]["match_score"] == 72
+
+    def test_index_run_never_raises(self, tmp_path, capsys):
+        """Test dass Indexfehler den Lauf nicht abbrechen"""
+        index_run(str(tmp_path), None, str(tmp_path / "cv_x.json"))
+        assert "Kandidatenindex" in capsys.readouterr().out
+
+
+class TestHelpers:
+    """Tests für Zeitraum- und Abfrage-Hilfsfunktionen"""
+
+    def test_parse_zeitraum(self):
+        """Test dass Zeiträume zu sortierbaren Monaten werden"""
+        assert parse_zeitraum("01/2020 - 03/2022") == ("2020-01", "2022-03")
+        assert parse_zeitraum("Jan 2021 - heute") == ("2021-01", "9999-12")
+        assert parse_zeitraum("05/2019") == ("2019-05", "2019-05")
+        assert parse_zeitraum("seit langem") == (None, None)
+        assert parse_zeitraum(None) == (None, None)
+
+    def test_fts_query_escapes_input(self):
+        """Test dass Sonderzeichen der FTS5-Syntax nicht durchgereicht werden"""
+        assert fts_query('C# "AND" (Azure') == '"C"* "AND"* "Azure"*'
+        assert fts_query("  ") == ""
+
+
+def test_search_in_milliseconds(tmp_path):
+    """Test dass kombinierte Abfragen über 500 CVs im Millisekundenbereich bleiben (eigener Prozess, ohne Coverage)"""
+    script = textwrap.dedent(f"""
+        import sys, time
+        sys.path.insert(0, {ROOT_DIR!r})
+        from scripts.candidate_index import CandidateIndex
+        from tests.test_candidate_index import make_cv
+
+        index = CandidateIndex({str(tmp_path / 'perf.sqlite3')!r})
+        skills = ["Python", "SAFe", "Azure", "Java", "Scrum", "Docker", "SAP", "Jira"]
+        for i in range(500):
+            index.add(make_cv(f"K{{i}}", skills[i % 8:i % 8 + 3],
+                              [("Deutsch", 5), ("Französisch", i % 5 + 1)],
+                              [("PMP", "PMI", "2020")], [("Kunde", f"01/{{2010 + i % 15}} - 12/{{2011 + i % 15}}")]),
+                      f"/cv/cv_{{i}}.json", match_score=i % 100)
+        index.search(skills=["SAFe"])
+        start = time.perf_counter()
+        for _ in range(20):
+            index.search(text="Projektleiter", skills=["SAFe", "Azure"],
+                         languages={{"Französisch": 4}}, certification="pmp", active_since=2020)
+        print((time.perf_counter() - start) / 20)
+    """)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=ROOT_DIR)
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout.strip()) < 0.05
@@ -0,0 +1,304 @@
+"""
+Tests für das Regelwerk der CV-Nachbearbeitung (Äquivalenz zur bisherigen Funktion, Metriken)
+"""
+import copy
+import json
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from scripts.benchmark_date_normalizer import SAMPLES, legacy_normalize_fields
+from scripts.cv_normalizer import (
+    RULE_NAMES,
+    apply_rules,
+    keyword_pattern,
+    parse_level_text,
+    reset_rule_metrics,
+    rule_metrics,
+)
+from scripts.pdf_to_json import normalize_json_structure
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'valid_cv.json')
+
+
+def legacy_normalize_json_structure(data):
+    """Bisherige Implementierung aus pdf_to_json (Referenz für den Vergleich)."""
+    # Korrektur 0: Hauptausbildung -> Ausbildung (Abwärtskompatibilität)
+    if "Hauptausbildung" in data and "Ausbildung" not in data:
+        data["Ausbildung"] = data["Hauptausbildung"]
+        del data["Hauptausbildung"]
+    
+    # Korrektur 1: Expertise -> Fachwissen_und_Schwerpunkte
+    if "Expertise" in data and isinstance(data["Expertise"], dict):
+        if "Fachwissen_und_Schwerpunkte" in data["Expertise"]:
+            data["Fachwissen_und_Schwerpunkte"] = data["Expertise"]["Fachwissen_und_Schwerpunkte"]
+            del data["Expertise"]
+    
+    # Korrektur 2: BulletList -> Inhalt in Fachwissen_und_Schwerpunkte
+    if "Fachwissen_und_Schwerpunkte" in data and isinstance(data["Fachwissen_und_Schwerpunkte"], list):
+        for item in data["Fachwissen_und_Schwerpunkte"]:
+            if "BulletList" in item and "Inhalt" not in item:
+                item["Inhalt"] = item["BulletList"]
+                del item["BulletList"]
+    
+    # Korrektur 2b: Erzwinge feste 3-Kategorien Struktur für Fachwissen_und_Schwerpunkte
+    if "Fachwissen_und_Schwerpunkte" in data and isinstance(data["Fachwissen_und_Schwerpunkte"], list):
+        skills = data["Fachwissen_und_Schwerpunkte"]
+        
+        # Erstelle die 3 Standard-Kategorien
+        projektmethodik_items = []
+        tech_stack_items = []
+        weitere_skills_items = []
+        
+        # Mapping von Kategorienamen zu den 3 Standard-Kategorien
+        projektmethodik_keywords = ['projekt', 'methodik', 'methodologie', 'agil', 'agile', 'scrum', 'hermes', 'safe', 'kanban', 'waterfall']
+        tech_keywords = ['tech', 'stack', 'tool', 'technolog', 'plattform', 'framework', 'sprach', 'databa', 'cloud', 
+                         'analytic', 'data', 'bi', 'microsoft', 'office', 'collaboration', 'software', 
+                         'python', 'java', 'sql', 'web', 'app', 'system', 'server']
+        
+        for item in skills:
+            kategorie_lower = item.get("Kategorie", "").lower()
+            inhalt = item.get("Inhalt", [])
+            
+            # Versuche die Kategorie zuzuordnen - Projektmethodik hat Priorität
+            if any(kw in kategorie_lower for kw in projektmethodik_keywords):
+                projektmethodik_items.extend(inhalt)
+            elif any(kw in kategorie_lower for kw in tech_keywords):
+                tech_stack_items.extend(inhalt)
+            else:
+                # Wenn unklar, prüfe auch die Inhalte
+                # Wenn es Methodiken sind (enthält bekannte Methoden-Namen)
+                methoden_in_content = any(
+                    any(method in str(i).lower() for method in ['scrum', 'agile', 'hermes', 'safe', 'kanban', 'waterfall'])
+                    for i in inhalt
+                )
+                if methoden_in_content:
+                    projektmethodik_items.extend(inhalt)
+                else:
+                    weitere_skills_items.extend(inhalt)
+        
+        # Falls Kategorien leer sind, Platzhalter einfügen
+        if not projektmethodik_items:
+            projektmethodik_items = ["! fehlt – bitte prüfen!"]
+        if not tech_stack_items:
+            tech_stack_items = ["! fehlt – bitte prüfen!"]
+        if not weitere_skills_items:
+            weitere_skills_items = ["! fehlt – bitte prüfen!"]
+        
+        # Ersetze mit fester Struktur
+        data["Fachwissen_und_Schwerpunkte"] = [
+            {"Kategorie": "Projektmethodik", "Inhalt": projektmethodik_items},
+            {"Kategorie": "Tech Stack", "Inhalt": tech_stack_items},
+            {"Kategorie": "Weitere Skills", "Inhalt": weitere_skills_items}
+        ]
+    
+    # Korrektur 3: Verschachtelte Referenzprojekte
+    if "Ausgewählte_Referenzprojekte" in data and isinstance(data["Ausgewählte_Referenzprojekte"], dict):
+        if "Referenzprojekte" in data["Ausgewählte_Referenzprojekte"]:
+            data["Ausgewählte_Referenzprojekte"] = data["Ausgewählte_Referenzprojekte"]["Referenzprojekte"]
+    
+    # Korrektur 4: Normalisiere alle Zeitformate zu MM/YYYY
+    # (Aus- und Weiterbildung, Trainings & Zertifizierungen, Referenzprojekte)
+    legacy_normalize_fields(data)
+    
+    # Korrektur 5: Normalisiere Sprachen Level und Namen
+    if "Sprachen" in data and isinstance(data["Sprachen"], list):
+        # Mapping für gängige Sprachen (Englisch -> Deutsch)
+        language_mapping = {
+            "english": "Englisch",
+            "german": "Deutsch",
+            "french": "Französisch",
+            "italian": "Italienisch",
+            "spanish": "Spanisch",
+            "portuguese": "Portugiesisch",
+            "russian": "Russisch",
+            "chinese": "Chinesisch",
+            "japanese": "Japanisch"
+        }
+
+        for item in data["Sprachen"]:
+            # 5a: Sprache Name normalisieren
+            if "Sprache" in item and isinstance(item["Sprache"], str):
+                lang_lower = item["Sprache"].lower().strip()
+                # Direktes Match
+                if lang_lower in language_mapping:
+                    item["Sprache"] = language_mapping[lang_lower]
+                # "English (Native)" -> "Englisch"
+                elif any(k in lang_lower for k in language_mapping):
+                    for k, v in language_mapping.items():
+                        if k in lang_lower:
+                            item["Sprache"] = v
+                            break
+
+            # 5b: Level normalisieren
+            if "Level" in item:
+                level = item["Level"]
+                # Wenn String
+                if isinstance(level, str):
+                    # 1. Priorität: Sterne
+                    if "★" in level or "*" in level:
+                        # Zähle Sterne (ignoriere leere Sterne ☆ wenn möglich, aber hier zählen wir nur volle)
+                        count = level.count("★") + level.count("*")
+                        if count > 0:
+                            item["Level"] = min(count, 5)
+                    
+                    # 2. Priorität: Explizite Zahl im String (z.B. "Level 5", "5/5")
+                    # Aber Vorsicht vor "C1" (enthält 1) -> Regex muss isolierte Zahl oder X/5 sein
+                    elif re.search(r'\b[1-5]\s*/\s*5', level) or re.match(r'^\s*[1-5]\s*$', level):
+                         match = re.search(r'([1-5])', level)
+                         if match:
+                             item["Level"] = int(match.group(1))
+
+                    # 3. Priorität: Text-Beschreibung
+                    elif level.lower() in ["muttersprache", "native", "native speaker"]:
+                        item["Level"] = 5
+                    elif any(x in level.lower() for x in ["verhandlungssicher", "fluent", "business fluent", "c2", "c1"]):
+                        item["Level"] = 4
+                    elif any(x in level.lower() for x in ["sehr gute kenntnisse", "very good", "proficient", "b2"]):
+                        item["Level"] = 3
+                    elif any(x in level.lower() for x in ["gute kenntnisse", "good", "intermediate", "b1"]):
+                        item["Level"] = 2
+                    elif any(x in level.lower() for x in ["grundkenntnisse", "basic", "beginner", "a1", "a2"]):
+                        item["Level"] = 1
+
+    return data
+
+
+class TestRules:
+    """Tests für einzelne Regeln"""
+
+    def test_nested_structures_unwrapped(self):
+        """Test dass Expertise, BulletList und verschachtelte Projekte korrigiert werden"""
+        data = normalize_json_structure({
+            "Hauptausbildung": "MSc",
+            "Expertise": {"Fachwissen_und_Schwerpunkte": [
+                {"Kategorie": "Agile Methoden", "BulletList": ["Scrum"]},
+                {"Kategorie": "Cloud", "Inhalt": ["Azure"]},
+            ]},
+            "Ausgewählte_Referenzprojekte": {"Referenzprojekte": [{"Zeitraum": "2020"}]},
+        })
+        assert data["Ausbildung"] == "MSc" and "Hauptausbildung" not in data
+        assert data["Fachwissen_und_Schwerpunkte"] == [
+            {"Kategorie": "Projektmethodik", "Inhalt": ["Scrum"]},
+            {"Kategorie": "Tech Stack", "Inhalt": ["Azure"]},
+            {"Kategorie": "Weitere Skills", "Inhalt": ["! fehlt – bitte prüfen!"]},
+        ]
+        assert data["Ausgewählte_Referenzprojekte"] == [{"Zeitraum": "01/2020"}]
+
+    def test_unclear_category_classified_by_content(self):
+        """Test dass Methoden im Inhalt eine unklare Kategorie zu Projektmethodik machen"""
+        data = normalize_json_structure({"Fachwissen_und_Schwerpunkte": [
+            {"Kategorie": "Sonstiges", "Inhalt": ["Kanban Boards"]},
+            {"Kategorie": "Sonstiges", "Inhalt": ["Führung"]},
+        ]})
+        assert data["Fachwissen_und_Schwerpunkte"][0]["Inhalt"] == ["Kanban Boards"]
+        assert data["Fachwissen_und_Schwerpunkte"][2]["Inhalt"] == ["Führung"]
+
+    @pytest.mark.parametrize("level, expected", [
+        ("★★★☆☆", 3),
+        ("4/5", 4),
+        (" 2 ", 2),
+        ("Native", 5),
+        ("C1", 4),
+        ("Very good", 3),
+        ("B1", 2),
+        ("Basic", 1),
+        ("unbekannt", None),
+    ])
+    def test_parse_level_text(self, level, expected):
+        """Test der Priorität Sterne, Zahl, Text"""
+        assert parse_level_text(level) == expected
+
+    def test_languages_mapped(self):
+        """Test dass englische Sprachnamen übersetzt werden"""
+        data = normalize_json_structure({"Sprachen": [
+            {"Sprache": "English (Native)", "Level": "native"},
+            {"Sprache": "Deutsch", "Level": 5},
+        ]})
+        assert data["Sprachen"] == [{"Sprache": "Englisch", "Level": 5}, {"Sprache": "Deutsch", "Level": 5}]
+
+    def test_keyword_pattern_matches_substrings(self):
+        """Test dass die Alternation wie `kw in text` sucht und Sonderzeichen maskiert"""
+        pattern = keyword_pattern(["c++", "bi"])
+        assert pattern.search("mobile apps")
+        assert pattern.search("c++ entwicklung")
+        assert not pattern.search("c entwicklung")
+
+
+class TestRuleMetrics:
+    """Tests für die Treffer-Zähler"""
+
+    def test_hits_counted_per_rule(self):
+        """Test dass jede Regel ihre Änderungen zählt"""
+        reset_rule_metrics()
+        hits = apply_rules({
+            "Sprachen": [{"Sprache": "german", "Level": "C2"}, {"Sprache": "Deutsch", "Level": 4}],
+            "Trainings_und_Zertifizierungen": [{"Zeitraum": "2019"}, {"Zeitraum": "01/2019"}],
+        })
+        assert hits == {"sprache_uebersetzt": 1, "level_normalisiert": 1, "zeitraum_normalisiert": 1}
+
+        metrics = rule_metrics()
+        assert set(metrics) == set(RULE_NAMES)
+        assert metrics["zeitraum_normalisiert"] == 1
+        assert metrics["expertise_entpackt"] == 0
+
+    def test_fixture_matches_legacy(self):
+        """Test dass das Fixture-CV wie bisher normalisiert wird"""
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        expected = copy.deepcopy(data)
+        legacy_normalize_json_structure(expected)
+        normalize_json_structure(data)
+        assert data == expected
+
+
+_text = st.one_of(
+    st.sampled_from(SAMPLES + [
+        "Agile Methoden", "Tech Stack", "Cloud & Data", "Sonstiges", "SAFe", "Scrum Master",
+        "English", "german (fluent)", "Français", "C1", "5/5", "★★★★☆", "Native speaker", "* * *",
+        "gute Kenntnisse", "Level 3", "3", "B2", "",
+    ]),
+    st.text(max_size=12),
+)
+_skill = st.fixed_dictionaries(
+    {"Kategorie": _text},
+    optional={"Inhalt": st.lists(_text, max_size=3), "BulletList": st.lists(_text, max_size=3)},
+)
+_dated = st.fixed_dictionaries({}, optional={"Zeitraum": _text, "Titel": _text})
+_sprache = st.fixed_dictionaries({}, optional={
+    "Sprache": st.one_of(_text, st.none()), "Level": st.one_of(_text, st.integers(0, 6))
+})
+_cv = st.fixed_dictionaries({}, optional={
+    "Hauptausbildung": _text,
+    "Ausbildung": _text,
+    "Expertise": st.fixed_dictionaries({}, optional={"Fachwissen_und_Schwerpunkte": st.lists(_skill, max_size=4)}),
+    "Fachwissen_und_Schwerpunkte": st.lists(_skill, max_size=4),
+    "Aus_und_Weiterbildung": st.lists(_dated, max_size=3),
+    "Trainings_und_Zertifizierungen": st.lists(_dated, max_size=3),
+    "Ausgewählte_Referenzprojekte": st.one_of(
+        st.lists(_dated, max_size=3),
+        st.fixed_dictionaries({"Referenzprojekte": st.lists(_dated, max_size=3)}),
+    ),
+    "Sprachen": st.lists(_sprache, max_size=3),
+})
+
+
+class TestEquivalenceProperties:
+    """Property-basierte Äquivalenz zur bisherigen Implementierung"""
+
+    @given(data=_cv)
+    @settings(max_examples=1000, deadline=None)
+    def test_matches_legacy(self, data):
+        """Test dass beliebige CV-Strukturen identisch korrigiert werden (inkl. Schlüsselreihenfolge)
+
+        Skill-Inhalte stammen aus einem Vokabular, in dem die Methoden der Skill-Taxonomie
+        und die bisherige Methodenliste übereinstimmen (die Taxonomie kennt mehr Synonyme).
+        """
+        expected = legacy_normalize_json_structure(copy.deepcopy(data))
+        actual = normalize_json_structure(data)
+        assert json.dumps(actual, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
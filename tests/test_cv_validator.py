@@ -0,0 +1,129 @@
+"""
+Tests für den kompilierten CV-Validator (Pfade, Schweregrade, Memoisierung)
+"""
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts.cv_validator import (
+    CRITICAL,
+    INFO,
+    clear_validation_memo,
+    compile_cv_validator,
+    format_path,
+    validate_cv,
+)
+from scripts.generate_cv import validate_json_structure
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_PATH = os.path.join(PROJECT_ROOT, 'tests', 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestCvValidator:
+    """Tests für Befunde mit Pfad und Schweregrad"""
+
+    def test_valid_cv_has_no_critical_issues(self, cv_data):
+        """Test dass das gültige Fixture keine kritischen Befunde liefert"""
+        result = validate_cv(cv_data)
+        assert result.critical == []
+
+    def test_issue_paths_and_severities(self, cv_data):
+        """Test dass jeder Befund einen maschinenlesbaren Pfad und Schweregrad hat"""
+        del cv_data["Nachname"]
+        cv_data["Sprachen"][0]["Level"] = 9
+        del cv_data["Ausgewählte_Referenzprojekte"][0]["Kunde"]
+
+        issues = {(issue.path, issue.severity, issue.code) for issue in validate_cv(cv_data)}
+
+        assert (("Nachname",), CRITICAL, "missing") in issues
+        assert (("Sprachen", 0, "Level"), INFO, "level") in issues
+        assert (("Ausgewählte_Referenzprojekte", 0, "Kunde"), CRITICAL, "missing") in issues
+
+    def test_to_list_is_json_serializable(self, cv_data):
+        """Test dass die Befunde als JSON ausgegeben werden können"""
+        cv_data["Sprachen"][0]["Level"] = "unbekannt"
+        issues = validate_cv(cv_data).to_list()
+        assert json.loads(json.dumps(issues))[0]["path"] == "Sprachen[0].Level"
+
+    def test_tolerated_schema_fields_not_reported(self, cv_data):
+        """Test dass Technologien/Methodik (im Schema Pflicht) beim Rendern toleriert werden"""
+        for projekt in cv_data["Ausgewählte_Referenzprojekte"]:
+            projekt.pop("Technologien", None)
+            projekt.pop("Methodik", None)
+        assert validate_cv(cv_data).critical == []
+
+    def test_hauptrolle_word_count_rule(self, cv_data):
+        """Test der projektspezifischen Regel für Hauptrolle.Beschreibung"""
+        cv_data["Hauptrolle"]["Beschreibung"] = "Zu kurz"
+        _, info = validate_json_structure(cv_data)
+        assert "Hauptrolle.Beschreibung sollte 5-10 Wörter haben (aktuell 2)" in info
+
+    def test_compiled_from_schema(self):
+        """Test dass Pflichtfelder und Typen aus dem übergebenen Schema stammen"""
+        validate = compile_cv_validator({
+            "required": ["Name", "Liste"],
+            "properties": {
+                "Name": {"type": "string"},
+                "Liste": {"type": "array", "items": {"type": "object", "required": ["a"]}},
+            },
+        })
+        issues = validate({"Name": 1, "Liste": [{"b": 1}]})
+        assert [(i.path, i.severity) for i in issues] == [(("Name",), INFO), (("Liste", 0, "a"), CRITICAL)]
+
+    def test_format_path(self):
+        """Test der Pfad-Darstellung"""
+        assert format_path(("Sprachen", 0, "Level")) == "Sprachen[0].Level"
+        assert format_path(()) == ""
+
+
+class TestValidationPerformance:
+    """Tests für Laufzeit und Memoisierung"""
+
+    def test_memoized_by_document_hash(self, cv_data):
+        """Test dass eine zweite Validierung mit gleichem Hash das gemerkte Ergebnis liefert"""
+        clear_validation_memo()
+        first = validate_cv(cv_data, doc_hash="abc")
+        assert validate_cv(cv_data, doc_hash="abc") is first
+        assert validate_cv(cv_data) is not first
+
+    def test_large_cv_validates_in_under_a_millisecond(self):
+        """Test dass ein CV mit 500 Referenzprojekten in unter 1 ms validiert wird"""
+        # Eigener Interpreter: im Test-Prozess verfälscht das Coverage-Tracing die Messung
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMING_SCRIPT, FIXTURE_PATH],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            cwd=PROJECT_ROOT
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        best = float(result.stdout.strip())
+        assert best < 0.001, f"Validierung dauert {best * 1000:.2f} ms"
+
+
+_TIMING_SCRIPT = """
+import copy, json, sys, time
+from scripts.cv_validator import validate_cv
+with open(sys.argv[1], encoding="utf-8") as f:
+    data = json.load(f)
+projekt = data["Ausgewählte_Referenzprojekte"][0]
+data["Ausgewählte_Referenzprojekte"] = [copy.deepcopy(projekt) for _ in range(500)]
+validate_cv(data)
+timings = []
+for _ in range(20):
+    start = time.perf_counter()
+    validate_cv(data)
+    timings.append(time.perf_counter() - start)
+print(min(timings))
+"""
@@ -0,0 +1,113 @@
+"""
+Tests für den tabellengesteuerten Datums-Normalizer (Äquivalenz zur bisherigen Funktion, Batch-API)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from scripts.benchmark_date_normalizer import SAMPLES, build_docs, legacy_normalize_date_format, legacy_normalize_fields
+from scripts.date_normalizer import cache_info, clear_cache, normalize_date, normalize_zeitraum_fields
+from scripts.pdf_to_json import normalize_date_format, normalize_json_structure
+
+
+class TestNormalizeDate:
+    """Tests für einzelne Zeitangaben"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("2020", "01/2020"),
+        ("Jan 2020", "01/2020"),
+        ("Januar 2020", "01/2020"),
+        ("Sept. 2019", "09/2019"),
+        ("03.2021", "03/2021"),
+        ("2020 - 2021", "01/2020 - 01/2021"),
+        ("Okt 2015 — Dez 2017", "10/2015 - 12/2017"),
+        ("01/2019 – heute", "01/2019 - heute"),
+        (" Heute ", " Heute "),
+        ("Frühjahr 2020", "Frühjahr 2020"),
+        ("", ""),
+        (None, None),
+        (2020, 2020),
+    ])
+    def test_examples(self, value, expected):
+        """Test der dokumentierten Beispiele"""
+        assert normalize_date(value) == expected
+        assert normalize_date_format(value) == expected
+
+    def test_samples_match_legacy(self):
+        """Test dass alle Benchmark-Beispiele wie bisher normalisiert werden"""
+        for value in SAMPLES:
+            assert normalize_date(value) == legacy_normalize_date_format(value)
+
+    def test_repeated_strings_served_from_cache(self):
+        """Test dass wiederholte Strings aus dem LRU-Cache kommen"""
+        clear_cache()
+        normalize_date("Jan 2020")
+        normalize_date("Jan 2020")
+        assert cache_info().hits == 1
+
+    def test_str_subclass_returned_unchanged(self):
+        """Test dass unveränderte str-Unterklassen dasselbe Objekt bleiben"""
+        class Marked(str):
+            pass
+        value = Marked("Frühjahr 2020")
+        assert normalize_date(value) is value
+
+
+class TestNormalizeZeitraumFields:
+    """Tests für die Batch-Normalisierung"""
+
+    def test_single_document(self):
+        """Test dass alle drei Listen eines CVs normalisiert werden"""
+        data = {
+            "Aus_und_Weiterbildung": [{"Zeitraum": "2010"}],
+            "Trainings_und_Zertifizierungen": [{"Zeitraum": "Mai 2019"}, {"Titel": "ohne Zeitraum"}],
+            "Ausgewählte_Referenzprojekte": [{"Zeitraum": "2020 - heute"}],
+        }
+        assert normalize_zeitraum_fields(data) == 3
+        assert data["Aus_und_Weiterbildung"][0]["Zeitraum"] == "01/2010"
+        assert data["Trainings_und_Zertifizierungen"][0]["Zeitraum"] == "05/2019"
+        assert data["Ausgewählte_Referenzprojekte"][0]["Zeitraum"] == "01/2020 - heute"
+
+    def test_many_documents_match_field_by_field(self):
+        """Test dass die Batch-Funktion über mehrere CVs dasselbe liefert wie bisher"""
+        expected, actual = build_docs(5, 12), build_docs(5, 12)
+        for doc in expected:
+            legacy_normalize_fields(doc)
+        normalize_zeitraum_fields(actual)
+        assert actual == expected
+
+    def test_normalize_json_structure_normalizes_zeitraum(self):
+        """Test dass normalize_json_structure die Zeiträume weiterhin normalisiert"""
+        data = normalize_json_structure({"Ausgewählte_Referenzprojekte": [{"Zeitraum": "Jan 2020 – Dez 2021"}]})
+        assert data["Ausgewählte_Referenzprojekte"][0]["Zeitraum"] == "01/2020 - 12/2021"
+
+
+class TestEquivalenceProperties:
+    """Property-basierte Äquivalenz zur bisherigen Implementierung"""
+
+    _token = st.sampled_from([
+        "2020", "1999", "01", "12", "Jan", "jan.", "Januar", "MÄRZ", "Mär.", "sept", "Dec.",
+        "heute", "Today", "aktuell", "Frühjahr", "/", ".", " ", "  ", "\t", "\n",
+        " - ", " – ", " — ", "-", "–",
+    ])
+    _composed = st.lists(_token, max_size=8).map("".join)
+
+    @given(value=st.one_of(_composed, st.text(max_size=30)))
+    @settings(max_examples=2000, deadline=None)
+    def test_matches_legacy(self, value):
+        """Test dass beliebige Strings identisch normalisiert werden"""
+        assert normalize_date(value) == legacy_normalize_date_format(value)
+
+    @given(values=st.lists(_composed, max_size=10))
+    @settings(max_examples=200, deadline=None)
+    def test_batch_matches_legacy(self, values):
+        """Test dass die Batch-Funktion wie die bisherige Schleife normalisiert"""
+        expected = {"Ausgewählte_Referenzprojekte": [{"Zeitraum": v} for v in values]}
+        actual = {"Ausgewählte_Referenzprojekte": [{"Zeitraum": v} for v in values]}
+        legacy_normalize_fields(expected)
+        normalize_zeitraum_fields(actual)
+        assert actual == expected
@@ -0,0 +1,70 @@
+"""
+Unit Tests für die vorgeparsten OOXML-Fragmente
+"""
+import os
+import sys
+
+from docx import Document
+from docx.oxml.ns import qn
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.docx_fragments import (
+    CELL_BORDERS_NONE, clone, cell_shading,
+    remove_table_borders, remove_cell_borders, set_cell_background_and_borders
+)
+
+
+class TestDocxFragments:
+    """Tests for the cloneable border/shading fragments"""
+
+    def test_clone_is_independent(self):
+        """Test that a clone can be modified without touching the template"""
+        copy = clone(CELL_BORDERS_NONE)
+        copy.remove(copy[0])
+
+        assert len(CELL_BORDERS_NONE) == 4
+        assert len(copy) == 3
+
+    def test_cell_shading_uses_fill_color(self):
+        """Test that shading fragments carry the requested fill color"""
+        white = cell_shading("FFFFFF")
+        yellow = cell_shading("FFFF00")
+
+        assert white.get(qn('w:fill')) == "FFFFFF"
+        assert yellow.get(qn('w:fill')) == "FFFF00"
+        assert white is not cell_shading("FFFFFF")
+
+    def test_remove_cell_borders_replaces_existing(self):
+        """Test that repeated calls leave exactly one tcBorders element"""
+        table = Document().add_table(rows=1, cols=1)
+        cell = table.rows[0].cells[0]
+
+        remove_cell_borders(cell)
+        remove_cell_borders(cell)
+
+        tcPr = cell._element.tcPr
+        assert len(tcPr.findall(qn('w:tcBorders'))) == 1
+
+    def test_remove_table_borders_replaces_existing(self):
+        """Test that table borders are set once and hide every side"""
+        table = Document().add_table(rows=2, cols=2)
+
+        remove_table_borders(table)
+        remove_table_borders(table)
+
+        borders = table._element.tblPr.findall(qn('w:tBorders'))
+        assert len(borders) == 1
+        assert all(side.get(qn('w:val')) == "none" for side in borders[0])
+
+    def test_set_cell_background_and_borders(self):
+        """Test that background and borders are both applied to the cell"""
+        table = Document().add_table(rows=1, cols=1)
+        cell = table.rows[0].cells[0]
+
+        set_cell_background_and_borders(cell, "FFFFFF")
+
+        tcPr = cell._element.tcPr
+        assert tcPr.find(qn('w:shd')).get(qn('w:fill')) == "FFFFFF"
+        assert tcPr.find(qn('w:tcBorders')) is not None
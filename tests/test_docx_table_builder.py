@@ -0,0 +1,85 @@
+"""
+Unit Tests für den Bulk-Tabellenbau
+"""
+import os
+import sys
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.shared import Inches
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.docx_table_builder import styled_run, build_table, append_table
+from scripts.generate_cv import add_education_table, add_sprachen_table, add_trainings_table
+
+
+def _cell(text, **run_kwargs):
+    return {"paragraphs": [{"runs": [styled_run(text, "Aptos", 11, (0, 0, 0), **run_kwargs)]}]}
+
+
+class TestDocxTableBuilder:
+    """Tests for building whole w:tbl trees in one pass"""
+
+    def test_table_is_readable_by_python_docx(self):
+        """Test that the built table behaves like one created by doc.add_table"""
+        doc = Document()
+        rows = [[_cell("a1"), _cell("b1", bold=True)], [_cell("a2"), _cell("b2")]]
+        append_table(doc, build_table(rows, [Inches(1), Inches(4)], doc._block_width))
+
+        table = doc.tables[0]
+        assert len(table.rows) == 2
+        assert [c.text for c in table.rows[1].cells] == ["a2", "b2"]
+        assert table.rows[0].cells[1].paragraphs[0].runs[0].bold is True
+        assert table.rows[0].cells[0].width == Inches(1)
+
+    def test_table_is_inserted_before_section_properties(self):
+        """Test that the table is placed before w:sectPr"""
+        doc = Document()
+        append_table(doc, build_table([[_cell("x")]], [Inches(1)], doc._block_width))
+
+        body = doc.element.body
+        assert body[-1].tag == qn('w:sectPr')
+        assert body[-2].tag == qn('w:tbl')
+
+    def test_line_breaks_and_break_after(self):
+        """Test that newlines and break_after become w:br elements"""
+        doc = Document()
+        rows = [[{"paragraphs": [{"runs": [
+            styled_run("Institut", "Aptos", 11, (0, 0, 0), break_after=True),
+            styled_run("Zeile 1\nZeile 2", "Aptos", 11, (0, 0, 0)),
+        ]}]}]]
+        tbl = build_table(rows, [Inches(1)], doc._block_width)
+
+        assert len(tbl.findall('.//' + qn('w:br'))) == 2
+
+    def test_trainings_table_renders_all_rows(self):
+        """Test that every training becomes one row with three cells"""
+        doc = Document()
+        trainings = [{"Zeitraum": str(2000 + i), "Institution": f"Inst {i}", "Titel": f"Titel {i}"} for i in range(50)]
+        add_trainings_table(doc, trainings)
+
+        table = doc.tables[0]
+        assert len(table.rows) == 50
+        assert [c.text for c in table.rows[49].cells] == ["2049", "Inst 49", "Titel 49"]
+
+    def test_education_table_soft_line_break(self):
+        """Test that institution and title share one paragraph separated by a line break"""
+        doc = Document()
+        add_education_table(doc, [{"Zeitraum": "2010", "Institution": "ETH", "Abschluss": "MSc"}])
+
+        info = doc.tables[0].rows[0].cells[1]
+        assert len(info.paragraphs) == 1
+        assert info._element.find('.//' + qn('w:br')) is not None
+
+    def test_sprachen_table_stars(self):
+        """Test that languages are rendered with full and empty stars"""
+        doc = Document()
+        add_sprachen_table(doc, [{"Sprache": "Deutsch", "Level": 5}, {"Sprache": "Englisch", "Level": 3}])
+
+        row = doc.tables[0].rows[0]
+        assert row.cells[0].text == "Deutsch"
+        assert row.cells[1].text == "★★★★★"
+        assert row.cells[3].text == "★★★☆☆"
+        assert doc.tables[0].rows[1].cells[0].text == ""
@@ -0,0 +1,51 @@
+"""
+Unit Tests für die HTML-Vorschau
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.html_preview import render_cv_html, SECTION_RENDERERS
+from scripts.generate_cv import cv_sections
+from scripts.style_profile import get_profile
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestHTMLPreview:
+    """Tests for the HTML preview renderer"""
+
+    def test_every_word_section_has_html_renderer(self, cv_data):
+        assert {name for name, _, _ in cv_sections(cv_data)} <= set(SECTION_RENDERERS)
+
+    def test_sections_in_word_order(self, cv_data):
+        html = render_cv_html(cv_data)
+        headings = ["Kurzprofil", "Expertise", "Aus- und Weiterbildung", "Trainings &amp; Zertifizierungen",
+                    "Sprachen", "Ausgewählte Referenzprojekte"]
+        positions = [html.index(h) for h in headings]
+        assert positions == sorted(positions)
+        for projekt in cv_data["Ausgewählte_Referenzprojekte"]:
+            assert projekt["Kunde"] in html
+
+    def test_uses_style_profile(self, cv_data):
+        custom = get_profile().with_overrides({"primary_color": "#0000FF", "font": "Arial"})
+        html = render_cv_html(cv_data, custom)
+        assert "#0000ff" in html
+        assert "'Arial'" in html
+
+    def test_missing_data_and_escaping(self, cv_data):
+        data = dict(cv_data, Kurzprofil="<b>Text</b> ! bitte prüfen !")
+        html = render_cv_html(data)
+        assert "&lt;b&gt;Text&lt;/b&gt;" in html
+        assert "<mark>! bitte prüfen !</mark>" in html
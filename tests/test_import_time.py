@@ -0,0 +1,66 @@
+"""
+Import-Zeit-Regressionstests (python -X importtime)
+Stellt sicher, dass die Generierungs-Module headless bleiben (kein tkinter/dialogs)
+und ihr Import-Budget einhalten.
+"""
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in Millisekunden (kumulierte Import-Zeit laut -X importtime).
+# Auf langsamen CI-Maschinen über CV_IMPORT_BUDGET_FACTOR skalierbar.
+IMPORT_BUDGETS_MS = {
+    "scripts.generate_cv": 300,
+    "scripts.pipeline": 300,
+    "scripts.streamlit_pipeline": 1500,
+}
+
+GUI_MODULES = ("tkinter", "_tkinter", "scripts.dialogs")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+
+def _import_profile(module):
+    """Importiert module in einem frischen Interpreter und liefert {Modul: kumulierte µs}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        cwd=PROJECT_ROOT
+    )
+    assert result.returncode == 0, f"Import fehlgeschlagen: {result.stderr[-2000:]}"
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            profile[match.group(3).strip()] = int(match.group(2))
+    return profile
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+class TestHeadlessImports:
+    """Tests für die Trennung von Generierung und GUI-Frontends"""
+
+    def test_no_gui_imports(self, module):
+        """Test dass das Modul weder tkinter noch die Dialoge lädt"""
+        profile = _import_profile(module)
+        loaded = [name for name in GUI_MODULES if name in profile]
+        assert not loaded, f"{module} lädt GUI-Module: {loaded}"
+
+    def test_import_time_budget(self, module):
+        """Test dass das Modul sein Import-Budget einhält"""
+        factor = float(os.environ.get("CV_IMPORT_BUDGET_FACTOR", "1"))
+        budget_ms = IMPORT_BUDGETS_MS[module] * factor
+
+        profile = _import_profile(module)
+        elapsed_ms = profile[module] / 1000
+        assert elapsed_ms <= budget_ms, (
+            f"{module}: Import dauert {elapsed_ms:.0f} ms (Budget {budget_ms:.0f} ms)"
+        )
@@ -0,0 +1,335 @@
+"""
+Tests für die Hintergrund-Warteschlange der Pipeline-Läufe (SQLite-Aufträge und Worker)
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO, StringIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import job_queue
+from scripts.job_queue import (
+    JobLimitError, JobQueue, WorkerPool, key_fingerprint, run_pipeline_job,
+    submit_pipeline_job,
+)
+from scripts.run_store import RunStore, clear_run_stores
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), user_limit=1)
+
+
+class FakeGenerator:
+    """Ersetzt StreamlitCVGenerator: meldet Fortschritt und liefert ein Ergebnis."""
+
+    def __init__(self, tmp_path, fail=False):
+        self.tmp_path = tmp_path
+        self.fail = fail
+        self.calls = []
+
+    def run(self, cv_file, job_file=None, api_key=None, progress_callback=None, custom_styles=None,
+            custom_logo_path=None, pipeline_mode=None, cv_data=None, stellenprofil_data=None):
+        self.calls.append({"cv_file": cv_file, "job_file": job_file, "cv_data": cv_data})
+        try:
+            progress_callback(10, "Analysiere Stellenprofil...", "running")
+            progress_callback(30, "Analysiere Lebenslauf...", "running")
+            if self.fail:
+                raise RuntimeError("API nicht erreichbar")
+        except Exception as e:
+            progress_callback(100, f"Fehler: {e}", "error")
+            return {"success": False, "error": str(e)}
+        progress_callback(100, "Fertig!", "completed")
+        return {
+            "success": True,
+            "error": None,
+            "cv_json": str(self.tmp_path / "cv_Max_Muster_20250101_120000.json"),
+            "word_path": str(self.tmp_path / "cv.docx"),
+            "match_score": 81,
+        }
+
+
+class TestQueue:
+    """Tests für Einstellen, Abholen und Abfragen von Aufträgen"""
+
+    def test_per_user_limit(self, queue):
+        """Test dass ein Nutzer nur user_limit offene Aufträge haben kann"""
+        first = queue.submit("anna", {"mode": "Basic"})
+        with pytest.raises(JobLimitError):
+            queue.submit("anna", {"mode": "Basic"})
+        queue.submit("ben", {"mode": "Basic"})
+        queue.cancel(first)
+        queue.submit("anna", {"mode": "Basic"})
+
+    def test_claim_is_atomic(self, tmp_path):
+        """Test dass parallele Worker jeden Auftrag genau einmal bekommen"""
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), user_limit=0)
+        ids = {queue.submit(f"user{i}", {"i": i}) for i in range(40)}
+        claimed = []
+
+        def worker(pid):
+            while True:
+                job = queue.claim(pid)
+                if job is None:
+                    return
+                claimed.append(job["id"])
+
+        threads = [threading.Thread(target=worker, args=(pid,)) for pid in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(claimed) == sorted(ids)
+
+    def test_claim_only_matching_key(self, queue):
+        """Test dass Worker nur Aufträge mit ihrem API-Key abholen"""
+        job_id = queue.submit("anna", {}, key_id=key_fingerprint("sk-a"))
+        assert queue.claim(1, key_fingerprint("sk-b")) is None
+        assert queue.claim(1, key_fingerprint("sk-a"))["id"] == job_id
+        assert "sk-a" not in open(queue.path, "rb").read().decode(errors="ignore")
+
+    def test_waiting_job_needs_release(self, queue, monkeypatch):
+        """Test dass wartende Aufträge erst nach mark_ready (oder dem Timeout) laufen"""
+        job_id = queue.submit("anna", {}, status="waiting")
+        assert queue.claim(1) is None
+        monkeypatch.setattr(job_queue, "WAIT_TIMEOUT_S", -1)
+        assert queue.claim(1)["id"] == job_id
+
+    def test_progress_events_for_polling(self, queue):
+        """Test dass Fortschritt gespeichert und ab einer Meldung abgefragt werden kann"""
+        job_id = queue.submit("anna", {})
+        queue.claim(1)
+        queue.report_progress(job_id, 10, "Analysiere Stellenprofil...")
+        queue.report_progress(job_id, 30, "Analysiere Lebenslauf...")
+        events = queue.events(job_id)
+        assert [e["percent"] for e in events] == [10, 30]
+        assert queue.events(job_id, after=events[0]["id"])[0]["text"] == "Analysiere Lebenslauf..."
+        assert queue.get(job_id)["progress"] == 30
+
+    def test_reattach_after_refresh(self, queue):
+        """Test dass ein nicht abgeholter Auftrag über den Nutzer wiedergefunden wird"""
+        job_id = queue.submit("anna", {"mode": "Basic"})
+        assert [job["id"] for job in queue.list_jobs("anna", unacknowledged=True)] == [job_id]
+        queue.claim(1)
+        queue.finish(job_id, {"success": True})
+        assert queue.get(job_id)["result"] == {"success": True}
+        queue.acknowledge(job_id)
+        assert queue.list_jobs("anna", unacknowledged=True) == []
+        assert queue.list_jobs("ben") == []
+
+
+class TestCancellationAndRecovery:
+    """Tests für Abbruch und abgestürzte Worker"""
+
+    def test_cancel_queued_removes_inputs(self, queue):
+        """Test dass ein wartender Auftrag sofort verworfen wird"""
+        job_id = queue.submit("anna", {})
+        os.makedirs(queue.job_dir(job_id))
+        assert queue.cancel(job_id)
+        assert queue.get(job_id)["status"] == "cancelled"
+        assert not os.path.exists(queue.job_dir(job_id))
+        assert queue.claim(1) is None
+        assert not queue.cancel(job_id)
+
+    def test_cancel_running_stops_at_next_step(self, queue, tmp_path):
+        """Test dass ein laufender Auftrag beim nächsten Schritt abbricht und abgebrochen bleibt"""
+        job_id = queue.submit("anna", {"cv_path": "MOCK_CV.pdf"})
+        job = queue.claim(1)
+        queue.cancel(job_id)
+        results = run_pipeline_job(queue, job, str(tmp_path), FakeGenerator(tmp_path))
+        assert not results["success"]
+        assert queue.get(job_id)["status"] == "cancelled"
+
+    def test_recover_requeues_dead_worker(self, queue, monkeypatch):
+        """Test dass Aufträge eines abgestürzten Workers wieder eingestellt werden"""
+        job_id = queue.submit("anna", {})
+        queue.claim(999999)
+        monkeypatch.setattr(job_queue, "_pid_alive", lambda pid: False)
+        assert queue.recover() == 1
+        assert queue.claim(2)["id"] == job_id
+        assert queue.recover() == 0
+        assert queue.get(job_id)["status"] == "failed"
+
+    def test_recover_keeps_live_worker(self, queue):
+        """Test dass Aufträge laufender Worker nicht angefasst werden"""
+        job_id = queue.submit("anna", {})
+        queue.claim(os.getpid())
+        assert queue.recover() == 0
+        assert queue.get(job_id)["status"] == "running"
+
+
+class TestWorkerPool:
+    """Tests für den gemeinsamen Worker-Pool aller API-Keys"""
+
+    def test_one_bounded_pool_for_all_keys(self, tmp_path, monkeypatch):
+        """Test dass neue API-Keys keine weiteren Worker starten"""
+        monkeypatch.setenv("CV_JOB_QUEUE", str(tmp_path / "jobs.sqlite3"))
+        monkeypatch.setenv("CV_JOB_WORKERS", "0")
+        monkeypatch.setattr(job_queue, "_work", lambda *args: args[3].wait())
+        try:
+            pool = job_queue.get_worker_pool(str(tmp_path), "sk-a")
+            for i in range(5):
+                assert job_queue.get_worker_pool(str(tmp_path), f"sk-{i}") is pool
+            assert pool.alive() == 1
+            assert key_fingerprint("sk-4") in pool._keys
+        finally:
+            job_queue.stop_worker_pools()
+
+    def test_keys_from_stdin(self):
+        """Test dass ein Worker-Prozess die Keys der App aus stdin übernimmt"""
+        keys = {}
+        job_queue._read_keys(StringIO('{"api_key": "sk-a"}\nkaputt\n{"api_key": "sk-b"}\n'), keys)
+        assert keys == {key_fingerprint("sk-a"): "sk-a", key_fingerprint("sk-b"): "sk-b"}
+
+    def test_claim_any_known_key(self, queue):
+        """Test dass ein Worker Aufträge aller ihm bekannten Keys abholt"""
+        first = queue.submit("anna", {}, key_id=key_fingerprint("sk-a"))
+        queue.user_limit = 0
+        second = queue.submit("ben", {}, key_id=key_fingerprint("sk-b"))
+        known = [key_fingerprint("sk-a"), key_fingerprint("sk-b")]
+        assert {queue.claim(1, known)["id"], queue.claim(1, known)["id"]} == {first, second}
+        assert queue.claim(1, []) is None
+
+
+class TestPidProbe:
+    """Tests für die Prüfung, ob ein Worker- bzw. App-Prozess noch läuft"""
+
+    def test_live_process_survives_probe(self):
+        """Test dass die Prüfung einen laufenden Prozess nicht beendet"""
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            assert job_queue._pid_alive(child.pid)
+            assert job_queue._pid_alive(child.pid)
+            assert child.poll() is None
+        finally:
+            child.terminate()
+            child.wait(10)
+        assert not job_queue._pid_alive(child.pid)
+
+    def test_windows_probe_only_queries(self):
+        """Test dass unter Windows nur OpenProcess/GetExitCodeProcess verwendet werden"""
+        class FakeKernel32:
+            def __init__(self, exit_code):
+                self.exit_code = exit_code
+                self.calls = []
+
+            def OpenProcess(self, access, inherit, pid):
+                self.calls.append("OpenProcess")
+                return 42
+
+            def GetExitCodeProcess(self, handle, code):
+                self.calls.append("GetExitCodeProcess")
+                code._obj.value = self.exit_code
+                return 1
+
+            def CloseHandle(self, handle):
+                self.calls.append("CloseHandle")
+                return 1
+
+        running = FakeKernel32(job_queue._STILL_ACTIVE)
+        assert job_queue._windows_pid_alive(1234, running)
+        assert running.calls == ["OpenProcess", "GetExitCodeProcess", "CloseHandle"]
+        assert not job_queue._windows_pid_alive(1234, FakeKernel32(0))
+
+
+class TestPipelineJobs:
+    """Tests für Einstellen und Ausführen von Pipeline-Läufen"""
+
+    @pytest.fixture
+    def store_path(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "runs.sqlite3")
+        monkeypatch.setenv("CV_RUN_STORE", path)
+        clear_run_stores()
+        yield path
+        clear_run_stores()
+
+    def test_upload_saved_and_run_recorded(self, queue, tmp_path, store_path):
+        """Test dass Uploads im Auftragsverzeichnis landen und der Lauf im Verlauf steht"""
+        upload = BytesIO(b"%PDF cv")
+        upload.name = "lebenslauf.pdf"
+        job_id = submit_pipeline_job(queue, "anna", upload, mode="Basic (Nur CV)", api_key="sk-a")
+        job = queue.claim(1, key_fingerprint("sk-a"))
+        assert job["id"] == job_id
+        with open(job["params"]["cv_path"], "rb") as f:
+            assert f.read() == b"%PDF cv"
+
+        generator = FakeGenerator(tmp_path)
+        run_pipeline_job(queue, job, str(tmp_path), generator)
+        done = queue.get(job_id)
+        assert done["status"] == "completed"
+        assert not os.path.exists(queue.job_dir(job_id))
+        run = RunStore(store_path).get_run(done["result"]["run_id"])
+        assert run["candidate_name"] == "Max Muster"
+        assert run["match_score"] == 81
+
+    def test_failed_run_keeps_error(self, queue, tmp_path, store_path):
+        """Test dass ein Fehler der Pipeline am Auftrag gespeichert wird"""
+        job_id = submit_pipeline_job(queue, "anna", "MOCK_CV.pdf")
+        run_pipeline_job(queue, queue.claim(1, key_fingerprint(None)), str(tmp_path), FakeGenerator(tmp_path, fail=True))
+        job = queue.get(job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "API nicht erreichbar"
+        assert queue.events(job_id)[-1]["state"] == "error"
+        assert RunStore(store_path).count_runs() == 0
+
+    def test_speculative_result_handed_over(self, queue, tmp_path, store_path):
+        """Test dass eine laufende spekulative Extraktion abgewartet und übergeben wird"""
+        release = threading.Event()
+
+        class Extractor:
+            def status(self, pdf_file, schema_path=None):
+                return "llm"
+
+            def extract(self, pdf_file, schema_path=None):
+                release.wait(5)
+                return {"Vorname": "Max", "Nachname": "Muster"}
+
+        upload = BytesIO(b"%PDF cv")
+        job_id = submit_pipeline_job(queue, "anna", upload, extractor=Extractor())
+        assert queue.get(job_id)["status"] == "waiting"
+        release.set()
+        for _ in range(50):
+            job = queue.claim(1, key_fingerprint(None))
+            if job:
+                break
+            time.sleep(0.05)
+        assert job["id"] == job_id
+        generator = FakeGenerator(tmp_path)
+        run_pipeline_job(queue, job, str(tmp_path), generator)
+        assert generator.calls[0]["cv_data"] == {"Vorname": "Max", "Nachname": "Muster"}
+
+
+def test_worker_pool_runs_mock_pipeline(tmp_path, monkeypatch):
+    """Test eines vollständigen Mock-Laufs über den Worker (Thread-Modus)"""
+    monkeypatch.setenv("MODEL_NAME", "mock")
+    monkeypatch.setenv("CV_RUN_STORE", str(tmp_path / "runs.sqlite3"))
+    monkeypatch.setenv("CV_CANDIDATE_INDEX", str(tmp_path / "index.sqlite3"))
+    monkeypatch.setenv("CV_RENDER_WORKERS", "0")
+    clear_run_stores()
+    # Schemas und Vorlagen aus dem Projekt, Ausgaben im temporären Verzeichnis
+    project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    for name in ("scripts", "templates"):
+        os.symlink(os.path.join(project_dir, name), tmp_path / name)
+    base_dir = str(tmp_path)
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+    job_id = submit_pipeline_job(queue, "anna", "MOCK_CV.pdf", mode="Basic (Nur CV)", api_key="mock-key")
+    pool = WorkerPool(queue.path, base_dir, workers=0, poll_interval=0.05)
+    pool.add_key("mock-key")
+    pool.ensure()
+    try:
+        for _ in range(600):
+            job = queue.get(job_id)
+            if job["status"] not in job_queue.ACTIVE_STATES:
+                break
+            time.sleep(0.1)
+    finally:
+        pool.stop()
+        clear_run_stores()
+    assert job["status"] == "completed", job["error"]
+    assert os.path.exists(job["result"]["word_path"])
+    assert [e["percent"] for e in queue.events(job_id)][-1] == 100
@@ -0,0 +1,90 @@
+"""
+Unit Tests für den Logo-Asset-Cache
+"""
+import io
+import os
+import sys
+from collections import OrderedDict
+
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts import utils_optimize_logo
+from scripts.utils_optimize_logo import optimized_logo, LOGO_DPI
+from scripts.generate_angebot_word import build_angebot_document
+
+
+def _write_logo(path, size=(3000, 1000), color=(255, 121, 0)):
+    Image.new("RGB", size, color).save(path, "PNG")
+    return str(path)
+
+
+class TestOptimizedLogo:
+    """Tests for the content-hashed logo variants"""
+
+    def test_variant_is_sized_for_header_width(self, tmp_path):
+        path = _write_logo(tmp_path / "logo.png")
+        data = optimized_logo(path, 4.0)
+
+        img = Image.open(io.BytesIO(data))
+        assert img.size[0] == round(4.0 / 2.54 * LOGO_DPI)
+        assert len(data) < os.path.getsize(path)
+
+    def test_variant_is_computed_once(self, tmp_path, monkeypatch):
+        path = _write_logo(tmp_path / "logo.png")
+        first = optimized_logo(path, 4.0)
+
+        monkeypatch.setattr(utils_optimize_logo, "_render_variant", _fail)
+        assert optimized_logo(path, 4.0) is first
+
+    def test_disk_cache_survives_new_process(self, tmp_path, monkeypatch, isolated_logo_cache):
+        path = _write_logo(tmp_path / "logo.png")
+        monkeypatch.setattr(utils_optimize_logo, "_variants", OrderedDict())
+        first = optimized_logo(path, 4.0)
+
+        monkeypatch.setattr(utils_optimize_logo, "_variants", OrderedDict())
+        monkeypatch.setattr(utils_optimize_logo, "_render_variant", _fail)
+        assert optimized_logo(path, 4.0) == first
+        assert os.listdir(isolated_logo_cache)
+
+    def test_new_upload_under_same_path_is_reoptimized(self, tmp_path):
+        path = _write_logo(tmp_path / "custom_logo.png")
+        first = optimized_logo(path, 4.0)
+        _write_logo(tmp_path / "custom_logo.png", size=(1200, 1200), color=(0, 0, 255))
+
+        second = optimized_logo(path, 4.0)
+        assert second != first
+        assert Image.open(io.BytesIO(second)).size[1] == Image.open(io.BytesIO(second)).size[0]
+
+    def test_memory_cache_is_bounded(self, tmp_path, monkeypatch):
+        """Test dass wiederholte Uploads unter demselben Pfad den Speicher nicht füllen"""
+        monkeypatch.setattr(utils_optimize_logo, "_variants", OrderedDict())
+        monkeypatch.setattr(utils_optimize_logo, "MAX_LOGO_VARIANTS", 2)
+        for i in range(4):
+            path = _write_logo(tmp_path / "custom_logo.png", size=(200 + i, 100), color=(i, 0, 0))
+            optimized_logo(path, 4.0)
+
+        assert len(utils_optimize_logo._variants) == 2
+        assert [p for p in utils_optimize_logo._digests if p.startswith(str(tmp_path))] == [path]
+
+    def test_small_logo_is_not_upscaled(self, tmp_path):
+        path = _write_logo(tmp_path / "small.png", size=(100, 40))
+        assert Image.open(io.BytesIO(optimized_logo(path, 4.0))).size == (100, 40)
+
+
+class TestLogoEmbedding:
+    """Tests that generated documents embed the optimized variant"""
+
+    def test_angebot_embeds_optimized_logo(self):
+        doc = build_angebot_document({})
+        images = [p for p in doc.part.package.iter_parts() if p.partname.startswith("/word/media/")]
+        logo_path = os.path.join(os.path.dirname(__file__), '..', 'templates', 'logo.png')
+
+        assert images
+        assert images[0].blob == optimized_logo(logo_path, 4.0)
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("Logo wurde erneut optimiert")
@@ -0,0 +1,93 @@
+"""
+Unit Tests für das Hervorheben fehlender Daten
+"""
+import os
+import sys
+
+from docx import Document
+from docx.enum.text import WD_COLOR_INDEX
+from docx.oxml.ns import qn
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.generate_cv import (
+    MISSING_DATA_MARKER, MISSING_DATA_VARIANTS, split_missing_data, add_normal_text,
+    add_bullet_item, add_trainings_table, highlight_missing_data_in_document
+)
+
+
+class TestSplitMissingData:
+    """Tests for the precompiled marker pattern"""
+
+    def test_text_without_marker_is_unchanged(self):
+        """Test that plain text comes back as a single segment"""
+        assert split_missing_data("Python, Java") == [("Python, Java", False)]
+        assert split_missing_data("") == [("", False)]
+
+    def test_all_variants_are_normalized(self):
+        """Test that every marker variant is normalized to the standard marker"""
+        for variant in MISSING_DATA_VARIANTS:
+            assert split_missing_data(variant) == [(MISSING_DATA_MARKER, True)]
+
+    def test_multiple_markers_in_one_text(self):
+        """Test that several markers and the text around them keep their order"""
+        text = "A ! fehlt – bitte prüfen! B ! bitte prüfen!"
+        assert split_missing_data(text) == [
+            ("A ", False), (MISSING_DATA_MARKER, True), (" B ", False), (MISSING_DATA_MARKER, True)
+        ]
+
+
+class TestHighlightAtInsertion:
+    """Tests that markers are highlighted while the runs are written"""
+
+    def test_normal_text_highlights_marker(self):
+        """Test that add_normal_text splits and highlights the marker"""
+        doc = Document()
+        p = add_normal_text(doc, "Kurzprofil ! fehlt - bitte prüfen ! Ende")
+
+        assert [r.text for r in p.runs] == ["Kurzprofil ", MISSING_DATA_MARKER, " Ende"]
+        assert p.runs[1].font.highlight_color == WD_COLOR_INDEX.YELLOW
+        assert p.runs[0].font.highlight_color is None
+
+    def test_bullet_item_highlights_marker(self):
+        """Test that bullet items highlight markers"""
+        doc = Document()
+        p = add_bullet_item(doc, MISSING_DATA_MARKER)
+
+        assert p.runs[-1].font.highlight_color == WD_COLOR_INDEX.YELLOW
+
+    def test_table_builder_highlights_marker(self):
+        """Test that tables built in bulk highlight markers"""
+        doc = Document()
+        add_trainings_table(doc, [{"Zeitraum": "2020", "Institution": "! bitte prüfen!", "Titel": "Kurs"}])
+
+        runs = doc.tables[0].rows[0].cells[1].paragraphs[0].runs
+        assert [r.text for r in runs] == [MISSING_DATA_MARKER]
+        assert runs[0].font.highlight_color == WD_COLOR_INDEX.YELLOW
+
+
+class TestVerificationPass:
+    """Tests for the optional post-pass verification mode"""
+
+    def test_nothing_to_fix_after_insertion_highlighting(self):
+        """Test that the post-pass finds nothing when runs were written with the helpers"""
+        doc = Document()
+        add_normal_text(doc, "Text " + MISSING_DATA_MARKER)
+        add_trainings_table(doc, [{"Zeitraum": MISSING_DATA_MARKER, "Institution": "X", "Titel": "Y"}])
+
+        assert highlight_missing_data_in_document(doc) == 0
+
+    def test_fixes_unhighlighted_marker_in_place(self):
+        """Test that a raw marker run is split in place and keeps its position and formatting"""
+        doc = Document()
+        p = doc.add_paragraph()
+        raw = p.add_run("Vorher ! fehlt — bitte prüfen ! Nachher")
+        raw.bold = True
+        p.add_run(" Ende")
+
+        assert highlight_missing_data_in_document(doc) == 1
+        assert [r.text for r in p.runs] == ["Vorher ", MISSING_DATA_MARKER, " Nachher", " Ende"]
+        assert all(r.bold for r in p.runs[:3])
+        assert p.runs[1].font.highlight_color == WD_COLOR_INDEX.YELLOW
+        assert len(doc.element.body.findall('.//' + qn('w:highlight'))) == 1
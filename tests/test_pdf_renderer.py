@@ -0,0 +1,57 @@
+"""
+Unit Tests für den PDF-Renderer
+"""
+import io
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pypdf import PdfReader
+
+from scripts.pdf_renderer import render_cv_pdf, SECTION_RENDERERS
+from scripts.generate_cv import cv_sections
+from scripts.render_service import render_cv_pdf as service_render_cv_pdf
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _pdf_text(pdf_bytes):
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    return [page.extract_text() for page in reader.pages]
+
+
+class TestPDFRenderer:
+    """Tests for the reportlab based PDF output"""
+
+    def test_every_word_section_has_pdf_renderer(self, cv_data):
+        assert {name for name, _, _ in cv_sections(cv_data)} <= set(SECTION_RENDERERS)
+
+    def test_renders_sections_in_word_order(self, cv_data):
+        pages = _pdf_text(render_cv_pdf(cv_data))
+        first_page = pages[0]
+
+        assert f"{cv_data['Vorname']} {cv_data['Nachname']}" in first_page
+        positions = [first_page.index(h) for h in ["Kurzprofil", "Expertise", "Sprachen"]]
+        assert positions == sorted(positions)
+        # Referenzprojekte beginnen wie im Word-Dokument auf einer neuen Seite
+        assert "Ausgewählte Referenzprojekte" not in first_page
+        rest = "".join(pages[1:])
+        for projekt in cv_data["Ausgewählte_Referenzprojekte"]:
+            assert projekt["Kunde"] in rest
+
+    def test_render_service_writes_pdf_file(self, cv_data, tmp_path):
+        path = service_render_cv_pdf(cv_data, str(tmp_path))
+        assert path.endswith(".pdf")
+        with open(path, 'rb') as f:
+            assert f.read(5) == b"%PDF-"
@@ -0,0 +1,92 @@
+"""
+Tests für den schnellen CLI-Start der Pipeline
+(lazy Imports, Verbindungsprüfung im Hintergrund, --startup-profile)
+"""
+import os
+import sys
+import threading
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import pipeline
+
+
+class _FakeDialogs(types.SimpleNamespace):
+    """Ersetzt scripts.dialogs und protokolliert die Aufrufe"""
+
+    def __init__(self, welcome_result=None, on_welcome=None):
+        super().__init__(calls=[])
+        self.welcome_result = welcome_result
+        self.on_welcome = on_welcome
+
+    def show_welcome(self):
+        self.calls.append("welcome")
+        if self.on_welcome:
+            self.on_welcome()
+        return self.welcome_result
+
+    def show_error(self, message, title=None, details=None):
+        self.calls.append(("error", title))
+
+
+@pytest.fixture
+def fake_dialogs(monkeypatch):
+    def install(**kwargs):
+        dialogs = _FakeDialogs(**kwargs)
+        monkeypatch.setattr(pipeline, "_dialogs", lambda: dialogs)
+        monkeypatch.setattr(pipeline, "prewarm_imports", lambda: None)
+        return dialogs
+    return install
+
+
+class TestStartup:
+    """Tests für den nicht-blockierenden Start von pipeline.main"""
+
+    def test_welcome_dialog_not_blocked_by_connectivity_check(self, fake_dialogs, monkeypatch):
+        """Test dass der Willkommens-Dialog erscheint, bevor die Verbindungsprüfung fertig ist"""
+        release = threading.Event()
+        check_finished = threading.Event()
+
+        def slow_check(self):
+            release.wait(5)
+            check_finished.set()
+            return True
+
+        monkeypatch.setattr(pipeline.CVPipeline, "check_internet_connection", slow_check)
+        seen_during_welcome = []
+        dialogs = fake_dialogs(on_welcome=lambda: seen_during_welcome.append(check_finished.is_set()))
+
+        assert pipeline.main([]) == 1  # keine Datei ausgewählt
+        release.set()
+
+        assert dialogs.calls == ["welcome"]
+        assert seen_during_welcome == [False]
+
+    def test_no_internet_reported_after_file_selection(self, fake_dialogs, monkeypatch, tmp_path):
+        """Test dass eine fehlende Verbindung nach der Dateiauswahl gemeldet wird"""
+        cv_pdf = tmp_path / "cv.pdf"
+        cv_pdf.write_bytes(b"%PDF-1.4")
+        monkeypatch.setattr(pipeline.CVPipeline, "check_internet_connection", lambda self: False)
+        monkeypatch.setattr(pipeline.CVPipeline, "run", lambda *a: pytest.fail("run darf nicht starten"))
+        dialogs = fake_dialogs(welcome_result=(str(cv_pdf), None))
+
+        assert pipeline.main([]) == 1
+        assert dialogs.calls == ["welcome", ("error", "Keine Internetverbindung")]
+
+    def test_startup_profile_reports_first_dialog(self, fake_dialogs, monkeypatch, capsys):
+        """Test dass --startup-profile die Zeit bis zum ersten Dialog ausgibt"""
+        monkeypatch.setattr(pipeline.CVPipeline, "check_internet_connection", lambda self: True)
+        fake_dialogs()
+
+        pipeline.main(["--startup-profile"])
+
+        out = capsys.readouterr().out
+        assert "[startup] Erster Dialog (Willkommen):" in out
+
+    def test_positional_arguments_still_supported(self):
+        """Test dass CV und Stellenprofil weiterhin positionell übergeben werden können"""
+        args = pipeline.parse_args(["cv.pdf", "stelle.pdf", "--startup-profile"])
+        assert (args.cv_path, args.stellenprofil_path, args.startup_profile) == ("cv.pdf", "stelle.pdf", True)
@@ -0,0 +1,144 @@
+"""
+Unit Tests für den Render-Cache
+"""
+import json
+import os
+import sys
+import time
+
+import pytest
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts import render_cache
+from scripts.generate_cv import generate_cv
+from scripts.style_profile import get_profile
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestRenderKey:
+    """Tests for the cache key"""
+
+    def test_key_ignores_key_order(self, cv_data):
+        reordered = dict(reversed(list(cv_data.items())))
+        assert render_cache.render_key(reordered) == render_cache.render_key(cv_data)
+
+    def test_key_changes_with_content_and_profile(self, cv_data):
+        key = render_cache.render_key(cv_data)
+        changed = dict(cv_data, Vorname="Erika")
+        custom = get_profile().with_overrides({"font": "Arial"})
+
+        assert render_cache.render_key(changed) != key
+        assert render_cache.render_key(cv_data, custom) != key
+
+    def test_key_changes_with_generator_version(self, cv_data, monkeypatch):
+        key = render_cache.render_key(cv_data)
+        monkeypatch.setattr(render_cache, "CV_GENERATOR_VERSION", "test")
+        assert render_cache.render_key(cv_data) != key
+
+
+class TestGenerateCVCache:
+    """Tests that generate_cv skips unchanged renders"""
+
+    def test_same_directory_returns_existing_file(self, tmp_path, monkeypatch):
+        first = generate_cv(FIXTURE_PATH, str(tmp_path), interactive=False)
+
+        monkeypatch.setattr("scripts.generate_cv.build_cv_document", _fail_render)
+        second = generate_cv(FIXTURE_PATH, str(tmp_path), interactive=False)
+
+        assert second == first
+        assert len(list(tmp_path.glob("*.docx"))) == 1
+
+    def test_new_run_directory_gets_copy(self, tmp_path, monkeypatch):
+        (tmp_path / "run1").mkdir()
+        (tmp_path / "run2").mkdir()
+        first = generate_cv(FIXTURE_PATH, str(tmp_path / "run1"), interactive=False)
+
+        monkeypatch.setattr("scripts.generate_cv.build_cv_document", _fail_render)
+        second = generate_cv(FIXTURE_PATH, str(tmp_path / "run2"), interactive=False)
+
+        assert os.path.dirname(second) == str(tmp_path / "run2")
+        assert not os.path.samefile(first, second)
+        with open(first, "rb") as a, open(second, "rb") as b:
+            assert a.read() == b.read()
+
+    def test_edited_delivery_keeps_cache_entry(self, tmp_path, monkeypatch):
+        (tmp_path / "run1").mkdir()
+        (tmp_path / "run2").mkdir()
+        first = generate_cv(FIXTURE_PATH, str(tmp_path / "run1"), interactive=False)
+        with open(first, "r+b") as f:
+            f.write(b"bearbeitet")
+
+        monkeypatch.setattr("scripts.generate_cv.build_cv_document", _fail_render)
+        second = generate_cv(FIXTURE_PATH, str(tmp_path / "run2"), interactive=False)
+        with open(second, "rb") as f:
+            assert not f.read().startswith(b"bearbeitet")
+
+    def test_new_logo_at_same_path_renders_again(self, tmp_path, cv_data):
+        """Test dass ein neuer Logo-Upload (gleicher Pfad) nicht das alte Dokument liefert"""
+        (tmp_path / "run1").mkdir()
+        (tmp_path / "run2").mkdir()
+        logo = tmp_path / "custom_logo.png"
+        profile = get_profile().with_overrides(logo_path=str(logo))
+        Image.new("RGB", (40, 20), "red").save(logo)
+        key = render_cache.render_key(cv_data, profile)
+        generate_cv(FIXTURE_PATH, str(tmp_path / "run1"), interactive=False, style_profile=profile)
+        time.sleep(0.01)
+        Image.new("RGB", (40, 20), "blue").save(logo)
+        generate_cv(FIXTURE_PATH, str(tmp_path / "run2"), interactive=False, style_profile=profile)
+
+        assert render_cache.render_key(cv_data, profile) != key
+        assert len(os.listdir(render_cache.cache_dir())) == 2
+
+    def test_changed_profile_renders_again(self, tmp_path):
+        (tmp_path / "run1").mkdir()
+        (tmp_path / "run2").mkdir()
+        first = generate_cv(FIXTURE_PATH, str(tmp_path / "run1"), interactive=False)
+        custom = get_profile().with_overrides({"font": "Arial"})
+        second = generate_cv(FIXTURE_PATH, str(tmp_path / "run2"), interactive=False, style_profile=custom)
+
+        assert not os.path.samefile(first, second)
+        assert len(os.listdir(render_cache.cache_dir())) == 2
+
+    def test_cache_can_be_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CV_RENDER_CACHE", "0")
+        generate_cv(FIXTURE_PATH, str(tmp_path), interactive=False)
+        assert not os.listdir(render_cache.cache_dir())
+
+
+class TestPrune:
+    """Tests für die Begrenzung des Cache-Ordners"""
+
+    def _entry(self, name, size, age):
+        os.makedirs(render_cache.cache_dir(), exist_ok=True)
+        path = os.path.join(render_cache.cache_dir(), f"{name}.docx")
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_old_entries_removed(self):
+        old = self._entry("alt", 10, age=40 * 24 * 3600)
+        new = self._entry("neu", 10, age=0)
+        assert render_cache.prune() == 1
+        assert not os.path.exists(old)
+        assert os.path.exists(new)
+
+    def test_size_limit_keeps_recently_used(self):
+        paths = [self._entry(f"e{i}", 100, age=100 - i) for i in range(5)]
+        assert render_cache.prune(max_bytes=250) == 3
+        assert [os.path.exists(p) for p in paths] == [False, False, False, True, True]
+
+
+def _fail_render(*args, **kwargs):
+    raise AssertionError("Render trotz Cache-Treffer")
@@ -0,0 +1,67 @@
+"""
+Unit Tests für den Render-Service (Prozess-Pool)
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.render_service import RenderService, render_cv, get_render_service
+from scripts.style_profile import get_profile
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _document_xml(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as z:
+        return z.read('word/document.xml').decode('utf-8')
+
+
+class TestRenderCV:
+    """Tests for the worker render function"""
+
+    def test_render_to_bytes(self, cv_data):
+        """Test that a CV dict renders to a valid .docx without touching the disk"""
+        xml = _document_xml(render_cv(cv_data, as_bytes=True))
+        assert cv_data["Vorname"] in xml
+
+    def test_render_to_file(self, cv_data, tmp_path):
+        """Test that the file name follows the generate_cv convention"""
+        path = render_cv(cv_data, str(tmp_path))
+        assert os.path.basename(path).startswith(f"cv_{cv_data['Vorname']}_{cv_data['Nachname']}_")
+        assert os.path.exists(path)
+
+    def test_service_can_be_disabled(self, monkeypatch):
+        """Test that CV_RENDER_WORKERS=0 disables the pool"""
+        monkeypatch.setenv("CV_RENDER_WORKERS", "0")
+        assert get_render_service() is None
+
+
+class TestRenderService:
+    """Tests for the warm process pool"""
+
+    def test_batch_render_in_worker_processes(self, cv_data):
+        """Test that a batch is rendered in worker processes with per-job profiles"""
+        custom = get_profile().with_overrides({"font": "Arial"})
+        other = dict(cv_data, Vorname="Erika")
+
+        with RenderService(max_workers=1) as service:
+            worker_pids = service.warm_up()
+            results = service.render_cv_batch([cv_data, other], style_profile=custom, as_bytes=True)
+
+        assert os.getpid() not in worker_pids
+        assert cv_data["Vorname"] in _document_xml(results[0])
+        assert "Erika" in _document_xml(results[1])
+        assert 'w:ascii="Arial"' in _document_xml(results[0])
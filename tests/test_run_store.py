@@ -0,0 +1,143 @@
+"""
+Tests für den SQLite-Verlauf der Pipeline-Läufe (ersetzt run_history.json)
+"""
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import run_store
+from scripts.run_store import RunStore, clear_run_stores, get_run_store, import_json_history
+
+
+def make_entry(i, **extra):
+    entry = {
+        "timestamp": f"20250101_{i:06d}",
+        "candidate_name": f"Kandidat {i}",
+        "mode": "Full (CV + Stellenprofil + Match + Feedback)",
+        "word_path": f"/out/{i}/cv.docx",
+        "pdf_path": None,
+        "cv_json": f"/out/{i}/cv_Kandidat_{i}.json",
+        "dashboard_path": None,
+        "match_score": 70 + i % 30,
+        "stellenprofil_json": None,
+        "match_json": None,
+        "offer_word_path": None,
+    }
+    entry.update(extra)
+    return entry
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RunStore(str(tmp_path / "runs.sqlite3"))
+
+
+class TestRunStore:
+    """Tests für Eintragen und seitenweises Lesen"""
+
+    def test_roundtrip_keeps_entry_format(self, store):
+        """Test dass ein Lauf im bisherigen Verlaufsformat zurückkommt"""
+        entry = make_entry(1, match_score="85%")
+        run_id = store.add_run(entry, metrics={"dauer_s": 12.5})
+        stored = store.get_run(run_id)
+        assert stored == {**entry, "id": run_id, "match_score": 85}
+        assert store.get_metrics(run_id) == {"dauer_s": 12.5}
+
+    def test_no_cap_and_pagination(self, store):
+        """Test dass es keine Obergrenze gibt und Seiten neueste zuerst liefern"""
+        for i in range(120):
+            store.add_run(make_entry(i))
+        assert store.count_runs() == 120
+        first = store.list_runs(limit=20)
+        assert [e["candidate_name"] for e in first[:2]] == ["Kandidat 119", "Kandidat 118"]
+        last = store.list_runs(limit=20, offset=100)
+        assert [e["candidate_name"] for e in last][-1] == "Kandidat 0"
+        assert store.list_runs(limit=20, offset=120) == []
+
+    def test_duplicate_run_returns_existing_id(self, store):
+        """Test dass derselbe Lauf (Zeitstempel und Kandidat) nicht doppelt eingetragen wird"""
+        first = store.add_run(make_entry(1))
+        assert store.add_run(make_entry(1)) == first
+        assert store.count_runs() == 1
+
+    def test_add_artifact_and_delete(self, store):
+        """Test dass ein nachträglich erstelltes Angebot am Lauf gespeichert wird"""
+        run_id = store.add_run(make_entry(1))
+        store.add_artifact(run_id, "offer_word_path", "/out/1/Angebot.docx")
+        assert store.get_run(run_id)["offer_word_path"] == "/out/1/Angebot.docx"
+        assert store.delete_run(run_id)
+        assert store.get_run(run_id) is None
+
+    def test_add_pdf_artifact(self, store):
+        """Test dass ein nachträglich erstelltes PDF im Verlauf erscheint"""
+        run_id = store.add_run(make_entry(1))
+        store.add_artifact(run_id, "pdf_path", "/out/1/cv.pdf")
+        assert store.list_runs()[0]["pdf_path"] == "/out/1/cv.pdf"
+
+    def test_concurrent_inserts_are_not_lost(self, store):
+        """Test dass parallele Sessions keine Einträge verlieren"""
+        def worker(start):
+            for i in range(start, start + 25):
+                store.add_run(make_entry(i))
+
+        threads = [threading.Thread(target=worker, args=(n * 25,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.count_runs() == 100
+
+
+class TestJsonImport:
+    """Tests für die Übernahme eines bestehenden run_history.json"""
+
+    def test_import_is_idempotent(self, store, tmp_path):
+        """Test dass der Import die Reihenfolge erhält und mehrfach laufen darf"""
+        path = tmp_path / "run_history.json"
+        path.write_text(json.dumps([make_entry(2), make_entry(1), "kaputt"]), encoding="utf-8")
+        assert import_json_history(store, str(path)) == 2
+        assert import_json_history(store, str(path)) == 0
+        assert [e["candidate_name"] for e in store.list_runs()] == ["Kandidat 2", "Kandidat 1"]
+        assert import_json_history(store, str(tmp_path / "fehlt.json")) == 0
+
+    def test_get_run_store_migrates_once(self, tmp_path, monkeypatch):
+        """Test dass beim ersten Öffnen das alte run_history.json übernommen wird"""
+        monkeypatch.delenv("CV_RUN_STORE", raising=False)
+        (tmp_path / "output").mkdir()
+        (tmp_path / "output" / "run_history.json").write_text(json.dumps([make_entry(1)]), encoding="utf-8")
+        clear_run_stores()
+        try:
+            store = get_run_store(str(tmp_path))
+            assert store.count_runs() == 1
+            assert get_run_store(str(tmp_path)) is store
+        finally:
+            clear_run_stores()
+
+    def test_get_run_store_migrates_existing_database(self, tmp_path, monkeypatch):
+        """Test dass der Import auch greift, wenn die Datenbank vorher ohne Import angelegt wurde"""
+        monkeypatch.delenv("CV_RUN_STORE", raising=False)
+        (tmp_path / "output").mkdir()
+        (tmp_path / "output" / "run_history.json").write_text(json.dumps([make_entry(1)]), encoding="utf-8")
+        RunStore(str(tmp_path / "output" / "run_history.sqlite3")).add_run(make_entry(2))
+        clear_run_stores()
+        try:
+            store = get_run_store(str(tmp_path))
+            assert store.count_runs() == 2
+            assert store.get_meta(run_store.LEGACY_IMPORT_KEY)
+        finally:
+            clear_run_stores()
+
+    def test_cli_import(self, tmp_path, monkeypatch, capsys):
+        """Test des einmaligen Imports über die Kommandozeile"""
+        monkeypatch.delenv("CV_RUN_STORE", raising=False)
+        path = tmp_path / "run_history.json"
+        path.write_text(json.dumps([make_entry(1)]), encoding="utf-8")
+        assert run_store.main(["import", str(path)]) == 0
+        assert RunStore(str(tmp_path / "run_history.sqlite3")).count_runs() == 1
+        assert "1 Läufe importiert" in capsys.readouterr().out
+        assert run_store.main([]) == 2
@@ -0,0 +1,116 @@
+"""
+Tests für die zentrale Schema-Registry
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import schema_registry
+from scripts.pdf_to_json import load_schema
+from scripts.schema_registry import (
+    SCHEMA_FILES,
+    clear_schemas,
+    get_schema,
+    preload_schemas,
+    schema_hashes,
+    template_to_json_schema,
+)
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+class TestSchemaRegistry:
+    """Tests für Laden, Hashing und Prompt-Serialisierung"""
+
+    def test_preloads_all_known_schemas(self):
+        """Test dass alle fünf Schemas geladen werden"""
+        schemas = preload_schemas()
+        assert set(schemas) == set(SCHEMA_FILES)
+        for name, schema in schemas.items():
+            assert schema.name == name
+            assert json.loads(schema.prompt) == schema.content
+
+    def test_loaded_once_per_process(self, monkeypatch):
+        """Test dass die Datei nur beim ersten Zugriff gelesen wird"""
+        clear_schemas()
+        first = get_schema("matchmaking")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Schema erneut von der Platte gelesen")
+        monkeypatch.setattr(schema_registry, "open", fail, raising=False)
+
+        assert get_schema("matchmaking") is first
+        assert get_schema(os.path.join(SCRIPTS_DIR, "matchmaking_json_schema.json")) is first
+        assert get_schema("scripts/matchmaking_json_schema.json") is first
+
+    def test_hash_ignores_formatting(self, tmp_path):
+        """Test dass der Hash nur vom Inhalt abhängt, nicht von der Formatierung"""
+        content = {"b": [1, 2], "a": {"x": ""}}
+        pretty, compact = tmp_path / "pretty.json", tmp_path / "compact.json"
+        pretty.write_text(json.dumps(content, indent=4), encoding="utf-8")
+        compact.write_text(json.dumps(content, separators=(",", ":")), encoding="utf-8")
+
+        assert get_schema(str(pretty)).hash == get_schema(str(compact)).hash
+        assert schema_hashes()["cv"] == get_schema("cv").hash
+
+    def test_missing_schema_raises(self, tmp_path):
+        """Test dass fehlende Schemas wie bisher FileNotFoundError auslösen"""
+        with pytest.raises(FileNotFoundError):
+            get_schema(str(tmp_path / "fehlt.json"))
+
+    def test_load_schema_returns_private_copy(self):
+        """Test dass load_schema eine veränderbare Kopie liefert"""
+        schema = load_schema()
+        schema["Vorname"] = "verändert"
+        assert get_schema("cv").content["Vorname"] != "verändert"
+
+
+class TestCompiledValidators:
+    """Tests für die aus den Vorlagen abgeleiteten Validatoren"""
+
+    def test_template_to_json_schema(self):
+        """Test dass Hinweis-Felder ignoriert und Strukturen übernommen werden"""
+        compiled = template_to_json_schema({
+            "_extraction_control": {},
+            "Name": "",
+            "_hint_Name": "Hinweis",
+            "Sprachen": [{"Sprache": "", "Level": 0}],
+        })
+        assert compiled["required"] == ["Name", "Sprachen"]
+        assert compiled["properties"]["Sprachen"]["items"]["required"] == ["Sprache", "Level"]
+
+    def test_valid_match_result(self):
+        """Test dass eine strukturell vollständige Antwort keine Fehler liefert"""
+        schema = get_schema("matchmaking")
+        assert schema.validate(_fill(schema.content)) == []
+
+    def test_reports_missing_fields_and_wrong_containers(self):
+        """Test dass fehlende Felder und falsche Typen gemeldet werden"""
+        schema = get_schema("matchmaking")
+        data = _fill(schema.content)
+        del data["match_score"]
+        data["muss_kriterien_abgleich"] = "keine Liste"
+
+        errors = schema.validate(data)
+        assert any("'match_score' is a required property" in e for e in errors)
+        assert any(e.startswith("muss_kriterien_abgleich:") for e in errors)
+
+    def test_marker_allowed_for_numeric_fields(self):
+        """Test dass '! bitte prüfen !' auch in Zahlenfeldern akzeptiert wird"""
+        schema = get_schema("cv")
+        data = _fill(schema.content)
+        data["Sprachen"][0]["Level"] = "! bitte prüfen !"
+        assert schema.validate(data) == []
+
+
+def _fill(template):
+    """Baut aus einer Vorlage ein minimales, strukturell gültiges Dokument."""
+    if isinstance(template, dict):
+        return {k: _fill(v) for k, v in template.items() if not k.startswith("_")}
+    if isinstance(template, list):
+        return [_fill(template[0])] if template else []
+    return template
@@ -0,0 +1,81 @@
+"""
+Unit Tests für den Abschnitts-Cache (inkrementelles Neu-Rendern)
+"""
+import copy
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.generate_cv import build_cv_document, cv_sections
+from scripts.section_cache import SectionCache
+from scripts.style_profile import get_profile
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _document_xml(doc):
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as z:
+        return z.read('word/document.xml')
+
+
+class TestCVSections:
+    """Tests for the section split"""
+
+    def test_one_section_per_project(self, cv_data):
+        names = [name for name, _, _ in cv_sections(cv_data)]
+        assert names[:7] == ["name", "basisinfos", "kurzprofil", "fachwissen",
+                             "ausbildung", "trainings", "sprachen"]
+        assert names.count("referenzprojekt") == len(cv_data["Ausgewählte_Referenzprojekte"])
+
+
+class TestSectionCache:
+    """Tests that cached sections reproduce the full render"""
+
+    def test_cached_render_is_identical(self, cv_data):
+        cache = SectionCache()
+        expected = _document_xml(build_cv_document(cv_data))
+
+        assert _document_xml(build_cv_document(cv_data, section_cache=cache)) == expected
+        assert _document_xml(build_cv_document(cv_data, section_cache=cache)) == expected
+        assert cache.hits == cache.misses == len(cv_sections(cv_data))
+
+    def test_only_changed_section_is_rendered(self, cv_data):
+        cache = SectionCache()
+        build_cv_document(cv_data, section_cache=cache)
+        misses = cache.misses
+
+        edited = copy.deepcopy(cv_data)
+        edited["Sprachen"][0]["Level"] = 1 if edited["Sprachen"][0]["Level"] != 1 else 2
+        xml = _document_xml(build_cv_document(edited, section_cache=cache))
+
+        assert cache.misses == misses + 1
+        assert xml == _document_xml(build_cv_document(edited))
+
+    def test_profile_is_part_of_key(self, cv_data):
+        cache = SectionCache()
+        build_cv_document(cv_data, section_cache=cache)
+        custom = get_profile().with_overrides({"font": "Arial"})
+        xml = _document_xml(build_cv_document(cv_data, style_profile=custom, section_cache=cache))
+
+        assert cache.hits == 0
+        assert b'w:ascii="Arial"' in xml
+
+    def test_lru_limit(self, cv_data):
+        cache = SectionCache(max_entries=3)
+        build_cv_document(cv_data, section_cache=cache)
+        assert len(cache) == 3
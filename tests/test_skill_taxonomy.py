@@ -0,0 +1,124 @@
+"""
+Tests für die Skill-Taxonomie (Index, Synonyme, Kategorien, Vorprüfung)
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import skill_taxonomy
+from scripts.generate_matchmaking import generate_matchmaking
+from scripts.pdf_to_json import normalize_json_structure
+from scripts.skill_taxonomy import SkillIndex, clear_skill_index, get_skill_index, skill_prescore
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def index():
+    return get_skill_index()
+
+
+class TestSkillIndex:
+    """Tests für Lookup und Textsuche"""
+
+    def test_lookup_synonyms(self, index):
+        """Test dass Synonyme unabhängig von Schreibweise auf den kanonischen Skill zeigen"""
+        assert index.lookup("Scaled  Agile Framework").name == "SAFe"
+        assert index.canonical("k8s") == "Kubernetes"
+        assert index.canonical("Unbekannt") == "Unbekannt"
+
+    def test_find_prefers_longest_term_and_whole_words(self, index):
+        """Test dass längere Begriffe gewinnen und nur ganze Wörter gefunden werden"""
+        found = index.find("Azure DevOps, Scaled Agile Framework, Javaskript, C#")
+        assert [skill.name for skill in found] == ["Azure", "SAFe", "C#"]
+
+    def test_find_by_category(self, index):
+        """Test der Suche auf eine Kategorie beschränkt"""
+        assert index.mentions("Arbeit nach HERMES 5", "Projektmethodik")
+        assert not index.mentions("Python und Docker", "Projektmethodik")
+
+    def test_categorize_labels(self, index):
+        """Test dass Kategorienamen über die Schlüsselwörter zugeordnet werden"""
+        assert index.categorize("Agile Methoden") == "Projektmethodik"
+        assert index.categorize("Cloud & Data") == "Tech Stack"
+        assert index.categorize("Führung") is None
+
+    def test_skills_in_document(self, index):
+        """Test dass alle Skills eines CVs (ohne Hinweis-Felder) gefunden werden"""
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data["_hint_Skills"] = "Oracle"
+        skills = index.skills_in(data)
+        assert {"Python", "Scrum"} <= skills
+        assert "Oracle" not in skills
+
+    def test_custom_taxonomy_from_env(self, tmp_path, monkeypatch):
+        """Test dass eine eigene Taxonomie-Datei geladen werden kann"""
+        path = tmp_path / "taxonomy.json"
+        path.write_text(json.dumps({
+            "categories": [{"name": "Tech Stack", "keywords": ["tech"]}],
+            "skills": [{"name": "Rust", "category": "Tech Stack", "synonyms": ["rustlang"]}],
+        }), encoding="utf-8")
+        monkeypatch.setenv("CV_SKILL_TAXONOMY", str(path))
+        clear_skill_index()
+        try:
+            assert get_skill_index().canonical("RustLang") == "Rust"
+            assert len(get_skill_index()) == 1
+        finally:
+            monkeypatch.delenv("CV_SKILL_TAXONOMY")
+            clear_skill_index()
+
+    def test_empty_taxonomy(self):
+        """Test dass ein leerer Index nichts findet"""
+        empty = SkillIndex({})
+        assert empty.find("Python") == []
+        assert not empty.mentions("Python")
+        assert empty.categorize("Tech") is None
+
+
+class TestTaxonomyUsers:
+    """Tests für Nachbearbeitung und Matchmaking-Vorprüfung"""
+
+    def test_normalization_uses_taxonomy_synonyms(self):
+        """Test dass Methoden-Synonyme eine unklare Kategorie zu Projektmethodik machen"""
+        data = normalize_json_structure({"Fachwissen_und_Schwerpunkte": [
+            {"Kategorie": "Sonstiges", "Inhalt": ["PRINCE2 Practitioner"]},
+        ]})
+        assert data["Fachwissen_und_Schwerpunkte"][0]["Inhalt"] == ["PRINCE2 Practitioner"]
+
+    def test_skill_prescore(self, index):
+        """Test der lokalen Vorprüfung gegen die Anforderungen des Stellenprofils"""
+        cv = {"Fachwissen_und_Schwerpunkte": [{"Kategorie": "Tech Stack", "Inhalt": ["Python", "Microsoft Azure"]}]}
+        profil = {"anforderungen": {"muss_kriterien": ["Azure Cloud", "Python"], "soll_kriterien": ["SAFe"]}}
+        result = skill_prescore(cv, profil, index)
+        assert result == {
+            "gefordert": ["Azure", "Python", "SAFe"],
+            "abgedeckt": ["Azure", "Python"],
+            "fehlend": ["SAFe"],
+            "abdeckung": 67,
+        }
+        assert skill_prescore(cv, {}, index)["abdeckung"] is None
+
+    def test_matchmaking_contains_prescore(self, monkeypatch):
+        """Test dass das Matchmaking-Ergebnis die lokale Vorprüfung enthält"""
+        monkeypatch.setenv("MODEL_NAME", "mock")
+        match = generate_matchmaking(
+            {"Fachwissen_und_Schwerpunkte": [{"Inhalt": ["Scrum"]}]},
+            {"anforderungen": {"muss_kriterien": ["Scrum Master"]}},
+            os.path.join(SCRIPTS_DIR, "matchmaking_json_schema.json"),
+        )
+        assert match["skill_vorpruefung"]["abgedeckt"] == ["Scrum"]
+
+    def test_index_loaded_once(self, monkeypatch):
+        """Test dass die Taxonomie nur einmal pro Prozess geladen wird"""
+        first = get_skill_index()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Taxonomie erneut geladen")
+        monkeypatch.setattr(skill_taxonomy, "load_skill_index", fail)
+        assert get_skill_index() is first
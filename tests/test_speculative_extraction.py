@@ -0,0 +1,154 @@
+"""
+Tests für die spekulative Extraktion beim Hochladen (Textextraktion und LLM im Hintergrund)
+"""
+import os
+import sys
+import threading
+from io import BytesIO
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from scripts import speculative_extraction
+from scripts.speculative_extraction import SpeculativeExtractor, job_key
+
+JOB_SCHEMA = "scripts/pdf_to_json_struktur_stellenprofil.json"
+
+
+class FakeExtraction:
+    """Ersetzt pypdf und den LLM-Aufruf; zählt Aufrufe und kann den LLM-Aufruf blockieren."""
+
+    def __init__(self):
+        self.texts = []
+        self.calls = []
+        self.api_keys = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def extract_text(self, stream):
+        text = stream.read().decode()
+        self.texts.append(text)
+        return f"TEXT:{text}"
+
+    def pdf_to_json(self, pdf_path, output_path=None, schema_path=None, job_profile_context=None, pdf_text=None,
+                    api_key=None):
+        self.release.wait(5)
+        self.api_keys.append(api_key)
+        self.calls.append((os.path.basename(schema_path), pdf_text))
+        if self.fail:
+            raise RuntimeError("API nicht erreichbar")
+        return {"quelle": pdf_text, "Sprachen": []}
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    fake = FakeExtraction()
+    monkeypatch.setattr(speculative_extraction, "extract_text_from_pdf", fake.extract_text)
+    monkeypatch.setattr(speculative_extraction, "pdf_to_json", fake.pdf_to_json)
+    return fake
+
+
+@pytest.fixture
+def extractor():
+    extractor = SpeculativeExtractor(max_workers=2)
+    yield extractor
+    extractor.shutdown()
+
+
+def upload(content):
+    return BytesIO(content.encode())
+
+
+class TestSpeculation:
+    """Tests für Start, Übernahme und Teilen von Aufträgen"""
+
+    def test_text_only_until_allowed(self, fake, extractor):
+        """Test dass ohne Zustimmung nur der Text lokal extrahiert wird"""
+        extractor.prefetch("s1:cv", upload("cv"))
+        assert extractor.status(upload("cv")) in ("text", "text_fertig")
+        assert extractor.extract(upload("cv")) == {"quelle": "TEXT:cv", "Sprachen": []}
+        assert fake.texts == ["cv"]
+        assert len(fake.calls) == 1
+
+    def test_pipeline_takes_speculative_result(self, fake, extractor):
+        """Test dass die Pipeline das Ergebnis des Hintergrund-Aufrufs übernimmt (als Kopie)"""
+        extractor.prefetch("s1:cv", upload("cv"), allow_llm=True)
+        first = extractor.extract(upload("cv"))
+        first["Sprachen"].append("verändert")
+        assert extractor.extract(upload("cv")) == {"quelle": "TEXT:cv", "Sprachen": []}
+        assert fake.calls == [("pdf_to_json_struktur_cv.json", "TEXT:cv")]
+
+    def test_api_key_passed_per_call(self, fake, extractor, monkeypatch):
+        """Test dass der Key der Session an pdf_to_json geht und nicht in die Umgebung"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        extractor.prefetch("s1:cv", upload("cv"), allow_llm=True, api_key="sk-session-1")
+        extractor.extract(upload("cv"))
+        assert fake.api_keys == ["sk-session-1"]
+        assert "OPENAI_API_KEY" not in os.environ
+
+    def test_waits_for_inflight_call(self, fake, extractor):
+        """Test dass ein laufender Aufruf abgewartet statt neu gestartet wird"""
+        fake.release.clear()
+        extractor.prefetch("s1:job", upload("job"), JOB_SCHEMA, allow_llm=True)
+        threading.Timer(0.1, fake.release.set).start()
+        assert extractor.extract(upload("job"), os.path.abspath(JOB_SCHEMA))["quelle"] == "TEXT:job"
+        assert fake.calls == [("pdf_to_json_struktur_stellenprofil.json", "TEXT:job")]
+
+    def test_same_file_shared_between_sessions(self, fake, extractor):
+        """Test dass dieselbe Datei aus zwei Sessions nur einmal analysiert wird"""
+        extractor.prefetch("s1:cv", upload("cv"), allow_llm=True)
+        extractor.prefetch("s2:cv", upload("cv"), allow_llm=True)
+        extractor.release("s1:cv")
+        extractor.extract(upload("cv"))
+        assert len(fake.texts) == 1
+        assert len(fake.calls) == 1
+
+    def test_failed_speculation_falls_back(self, fake, extractor, capsys):
+        """Test dass ein fehlgeschlagener Hintergrund-Aufruf normal wiederholt wird"""
+        fake.fail = True
+        extractor.prefetch("s1:cv", upload("cv"), allow_llm=True)
+        with pytest.raises(RuntimeError):
+            extractor.extract(upload("cv"))
+        assert "fehlgeschlagen" in capsys.readouterr().out
+        fake.fail = False
+        assert extractor.extract(upload("cv"))["quelle"] == "TEXT:cv"
+
+    def test_paths_bypass_speculation(self, fake, extractor):
+        """Test dass Dateipfade (CLI, Mock-Modus) direkt extrahiert werden"""
+        assert extractor.prefetch("s1:cv", "MOCK_CV.pdf") is None
+        assert extractor.extract("MOCK_CV.pdf")["quelle"] is None
+
+
+class TestCancellation:
+    """Tests für das Abbrechen beim Entfernen einer Datei"""
+
+    def test_removed_file_is_cancelled(self, fake, extractor):
+        """Test dass ein freigegebener Auftrag verworfen wird und nicht mehr übernommen wird"""
+        fake.release.clear()
+        extractor.prefetch("s1:cv", upload("alt"), allow_llm=True)
+        extractor.release("s1:cv")
+        assert extractor.status(upload("alt")) is None
+        fake.release.set()
+        assert extractor.extract(upload("alt"))["quelle"] is None
+
+    def test_new_upload_replaces_old(self, fake, extractor):
+        """Test dass ein neuer Upload im selben Uploader den alten Auftrag freigibt"""
+        extractor.prefetch("s1:cv", upload("alt"))
+        extractor.prefetch("s1:cv", upload("neu"))
+        assert extractor.status(upload("alt")) is None
+        assert extractor.status(upload("neu")) is not None
+
+    def test_job_key_uses_hash_and_schema(self):
+        """Test dass Aufträge nach Inhalt und Schema unterschieden werden"""
+        assert job_key(b"x") == job_key(b"x", "/abs/scripts/pdf_to_json_struktur_cv.json")
+        assert job_key(b"x") != job_key(b"x", JOB_SCHEMA)
+        assert job_key(b"x") != job_key(b"y")
+
+
+def test_disabled_by_env(monkeypatch, fake):
+    """Test dass CV_SPECULATIVE_WORKERS=0 die Spekulation abschaltet"""
+    monkeypatch.setenv("CV_SPECULATIVE_WORKERS", "0")
+    assert speculative_extraction.get_speculative_extractor() is None
+    assert speculative_extraction.extract(upload("cv"))["quelle"] is None
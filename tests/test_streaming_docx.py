@@ -0,0 +1,91 @@
+"""
+Unit Tests für den Streaming-Writer (grosse CVs)
+"""
+import copy
+import io
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.generate_cv import build_cv_document, generate_cv
+from scripts.streaming_docx import STREAMING_PROJECT_THRESHOLD, render_cv_streaming, should_stream
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+
+
+@pytest.fixture
+def cv_data():
+    with open(FIXTURE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def large_cv_data(cv_data):
+    data = copy.deepcopy(cv_data)
+    projekt = data["Ausgewählte_Referenzprojekte"][0]
+    projekte = []
+    for i in range(STREAMING_PROJECT_THRESHOLD + 5):
+        p = copy.deepcopy(projekt)
+        p["Kunde"] = f"Kunde {i}"
+        projekte.append(p)
+    data["Ausgewählte_Referenzprojekte"] = projekte
+    return data
+
+
+def _parts(docx_bytes):
+    with zipfile.ZipFile(io.BytesIO(docx_bytes)) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+def _saved_bytes(data):
+    buffer = io.BytesIO()
+    build_cv_document(data).save(buffer)
+    return buffer.getvalue()
+
+
+def _streamed_bytes(data):
+    buffer = io.BytesIO()
+    render_cv_streaming(data, buffer)
+    return buffer.getvalue()
+
+
+class TestShouldStream:
+    """Tests for the streaming threshold"""
+
+    def test_small_cv_is_not_streamed(self, cv_data):
+        assert not should_stream(cv_data)
+        assert not should_stream({})
+
+    def test_large_cv_is_streamed(self, large_cv_data):
+        assert should_stream(large_cv_data)
+
+
+class TestStreamingOutput:
+    """Tests that the streamed .docx matches the object-model output"""
+
+    @pytest.mark.parametrize("fixture_name", ["cv_data", "large_cv_data"])
+    def test_parts_identical_to_doc_save(self, fixture_name, request):
+        data = request.getfixturevalue(fixture_name)
+        expected = _parts(_saved_bytes(data))
+        streamed = _parts(_streamed_bytes(data))
+
+        assert sorted(streamed) == sorted(expected)
+        for name, blob in expected.items():
+            assert streamed[name] == blob, name
+
+    def test_generate_cv_streams_large_cv(self, large_cv_data, tmp_path):
+        """Test that generate_cv switches to the streaming writer automatically"""
+        json_path = tmp_path / "large_cv.json"
+        json_path.write_text(json.dumps(large_cv_data, ensure_ascii=False), encoding='utf-8')
+
+        out = generate_cv(str(json_path), str(tmp_path), interactive=False)
+
+        with zipfile.ZipFile(out) as z:
+            xml = z.read('word/document.xml').decode('utf-8')
+        assert f"Kunde {STREAMING_PROJECT_THRESHOLD + 4}" in xml
@@ -0,0 +1,123 @@
+"""
+Unit Tests für die Style-Profile
+"""
+import os
+import pickle
+import sys
+import threading
+import zipfile
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.style_profile import (
+    StyleProfile, DEFAULT_STYLES_PATH, get_profile, register_profile, resolve_style_profile
+)
+from scripts.generate_cv import generate_cv
+
+
+class TestStyleProfile:
+    """Tests for the immutable style profile"""
+
+    def test_default_profile_matches_styles_json(self):
+        """Test that the default profile is loaded from styles.json"""
+        profile = get_profile()
+        assert profile == StyleProfile.from_file(DEFAULT_STYLES_PATH)
+        assert profile["heading1"]["color"] == (255, 121, 0)
+        assert get_profile() is profile
+
+    def test_profile_is_immutable(self):
+        """Test that neither the profile nor nested sections can be modified"""
+        profile = get_profile()
+        with pytest.raises(TypeError):
+            profile["text"]["font"] = "Arial"
+        with pytest.raises(TypeError):
+            profile["text"] = {}
+
+    def test_overrides_create_new_profile(self):
+        """Test that overrides leave the base profile untouched"""
+        base = get_profile()
+        custom = base.with_overrides({"primary_color": "#0000FF", "font": "Arial"}, "logo.png")
+
+        assert custom["heading1"]["color"] == (0, 0, 255)
+        assert custom["bullet"]["color"] == (0, 0, 255)
+        assert custom["text"]["font"] == "Arial"
+        assert os.path.isabs(custom["header"]["logo_path"])
+        assert base["heading1"]["color"] == (255, 121, 0)
+        assert base["text"]["font"] == "Aptos"
+
+    def test_resolve_caches_derived_profiles(self):
+        """Test that the same branding resolves to the cached profile"""
+        first = resolve_style_profile(custom_styles={"secondary_color": "#112233"})
+        second = resolve_style_profile(custom_styles={"secondary_color": "#112233"})
+
+        assert first is second
+        assert first["heading2"]["color"] == (17, 34, 51)
+        assert resolve_style_profile() is get_profile()
+
+    def test_derived_profiles_are_bounded(self, monkeypatch):
+        """Test dass abgeleitete Profile nur begrenzt und nicht im Namens-Cache gehalten werden"""
+        from scripts import style_profile
+        monkeypatch.setattr(style_profile, "MAX_DERIVED_PROFILES", 2)
+        first = resolve_style_profile(custom_styles={"font": "Font 1"})
+        for i in range(2, 5):
+            resolve_style_profile(custom_styles={"font": f"Font {i}"})
+
+        assert len(style_profile._derived_profiles) == 2
+        assert resolve_style_profile(custom_styles={"font": "Font 1"}) is not first
+        with pytest.raises(KeyError):
+            get_profile(first.name)
+
+    def test_named_profiles(self):
+        """Test that profiles can be registered and looked up by name"""
+        profile = register_profile("test_kunde", get_profile().with_overrides({"font": "Calibri"}))
+
+        assert resolve_style_profile("test_kunde") is profile
+        with pytest.raises(KeyError):
+            get_profile("gibt_es_nicht")
+
+    def test_pickle_roundtrip(self):
+        """Test that profiles survive pickling (e.g. for process pools)"""
+        profile = get_profile().with_overrides({"font": "Arial"}, name="pickled")
+        restored = pickle.loads(pickle.dumps(profile))
+
+        assert restored == profile
+        assert restored.name == "pickled"
+        assert hash(restored) == hash(profile)
+
+
+class TestConcurrentRendering:
+    """Tests that different brandings can render in parallel without touching styles.json"""
+
+    def test_parallel_renders_use_their_own_profile(self, tmp_path):
+        fixture = os.path.join(os.path.dirname(__file__), 'fixtures', 'valid_cv.json')
+        with open(DEFAULT_STYLES_PATH, 'rb') as f:
+            styles_before = f.read()
+
+        fonts = ["Arial", "Calibri", "Verdana"]
+        results = {}
+
+        def render(font):
+            out_dir = tmp_path / font
+            out_dir.mkdir()
+            profile = resolve_style_profile(custom_styles={"font": font})
+            results[font] = generate_cv(fixture, str(out_dir), interactive=False, style_profile=profile)
+
+        threads = [threading.Thread(target=render, args=(font,)) for font in fonts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for font in fonts:
+            with zipfile.ZipFile(results[font]) as z:
+                xml = z.read('word/document.xml').decode('utf-8')
+            assert f'w:ascii="{font}"' in xml
+            for other in fonts:
+                if other != font:
+                    assert f'w:ascii="{other}"' not in xml
+
+        with open(DEFAULT_STYLES_PATH, 'rb') as f:
+            assert f.read() == styles_before